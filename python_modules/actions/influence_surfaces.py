@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+''' Influence surfaces for moving loads (road vehicles and trains).
+
+    Instead of solving the model for each position of the vehicles
+    (one load pattern for each position), the model is solved once for
+    a unit load on each node of the deck. The values of the chosen
+    result quantities (internal forces, reactions, displacements,...)
+    obtained for each of those unit loads define the influence surfaces
+    of the quantities. The effect of the wheel loads at any position is
+    then obtained by interpolating on those surfaces (in plan) so the
+    governing positions of the vehicles can be searched using numpy
+    without solving the model again.
+
+    The interpolation doesn't take into account the dispersal of the
+    wheel loads through the pavement and deck layers, so the governing
+    positions must be verified using ordinary load patterns (see
+    InfluenceSurfaces.defGoverningLoadPatterns).
+
+    Only the concentrated (wheel) loads are considered; the uniform
+    loads of the lanes and the tracks are treated as usual.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import sys
+import numpy as np
+from scipy.interpolate import LinearNDInterpolator
+import xc
+from misc_utils import log_messages as lmsg
+
+class InfluenceQuantity(object):
+    ''' Result quantity whose influence surface will be computed.
+
+    :ivar name: name of the quantity.
+    :ivar getValue: function (without arguments) that returns the value
+                    of the quantity for the current state of the model.
+    :ivar needsReactions: true if the nodal reactions must be computed
+                          to obtain the value.
+    '''
+    def __init__(self, name, getValue, needsReactions= False):
+        ''' Constructor.
+
+        :param name: name of the quantity.
+        :param getValue: function (without arguments) that returns the
+                         value of the quantity.
+        :param needsReactions: true if the nodal reactions must be computed
+                               to obtain the value.
+        '''
+        self.name= name
+        self.getValue= getValue
+        self.needsReactions= needsReactions
+
+def node_displacement_quantity(node, dof, name= None):
+    ''' Return the quantity corresponding to a displacement of a node.
+
+    :param node: node.
+    :param dof: index of the degree of freedom.
+    :param name: name of the quantity.
+    '''
+    if(name is None):
+        name= 'disp_'+str(node.tag)+'_'+str(dof)
+    return InfluenceQuantity(name= name, getValue= lambda: node.getDisp[dof])
+
+def node_reaction_quantity(node, dof, name= None):
+    ''' Return the quantity corresponding to a reaction of a node.
+
+    :param node: node.
+    :param dof: index of the degree of freedom.
+    :param name: name of the quantity.
+    '''
+    if(name is None):
+        name= 'reac_'+str(node.tag)+'_'+str(dof)
+    return InfluenceQuantity(name= name, getValue= lambda: node.getReaction[dof], needsReactions= True)
+
+def element_quantity(element, propertyName, name= None):
+    ''' Return the quantity corresponding to a property of an element
+        (i.e. 'getMz1', 'getN',...).
+
+    :param element: element.
+    :param propertyName: name of the property.
+    :param name: name of the quantity.
+    '''
+    if(name is None):
+        name= propertyName+'_'+str(element.tag)
+    return InfluenceQuantity(name= name, getValue= lambda: getattr(element, propertyName))
+
+class MovingLoad(object):
+    ''' Load model moving along a path.
+
+    :ivar path: path of the load (notional lane, track axis,...); it must
+                provide a getWheelLoads(loadModel, relativePosition)
+                method (see roadway_traffic.load_model_base.NotionalLane
+                or railway_traffic.track_axis.TrackAxis).
+    :ivar loadModel: load model (tandem, train model,...).
+    '''
+    def __init__(self, path, loadModel):
+        ''' Constructor.
+
+        :param path: path of the load (notional lane, track axis,...).
+        :param loadModel: load model (tandem, train model,...).
+        '''
+        self.path= path
+        self.loadModel= loadModel
+
+    def getWheelLoadArrays(self, relativePositions):
+        ''' Return the positions of the wheels (array of shape
+            (numPositions, numWheels, 3)) and their loads (array of shape
+            (numPositions, numWheels)) for each relative position of the
+            load model along its path.
+
+        :param relativePositions: relative positions of the load model
+                                  along its path (0 -> beginning, 1-> end).
+        '''
+        positions= list()
+        loads= list()
+        for rp in relativePositions:
+            wheelLoads= self.path.getWheelLoads(self.loadModel, rp)
+            positions.append([[wl.position.x, wl.position.y, wl.position.z] for wl in wheelLoads])
+            loads.append([wl.load for wl in wheelLoads])
+        return np.array(positions, dtype= float), np.array(loads, dtype= float)
+
+class InfluenceSurfaces(object):
+    ''' Influence surfaces of some result quantities for loads acting
+        on the nodes of a deck.
+
+    :ivar quantities: result quantities (InfluenceQuantity objects).
+    :ivar nodeTags: tags of the loaded nodes.
+    :ivar positions: positions of the loaded nodes (one row for each
+                     node).
+    :ivar values: value of each quantity (columns) for a unit load acting
+                  on each node (rows).
+    '''
+    def __init__(self, quantities):
+        ''' Constructor.
+
+        :param quantities: result quantities (InfluenceQuantity objects).
+        '''
+        self.quantities= quantities
+        self.nodeTags= list()
+        self.positions= np.zeros((0,3))
+        self.values= np.zeros((0,len(quantities)))
+        self.interpolator= None
+
+    def getQuantityNames(self):
+        ''' Return the names of the quantities.'''
+        return [q.name for q in self.quantities]
+
+    def compute(self, modelSpace, loadedNodes, loadDirection= xc.Vector([0,0,-1])):
+        ''' Compute the influence surfaces solving the model for a unit
+            load on each of the nodes. If the solution algorithm of the
+            model space is linear, the stiffness matrix is formed and
+            factored only once and each unit load only changes the
+            right hand side. If any of the unit loads can't be solved
+            the computation is aborted, the surfaces are left empty and
+            the error code is returned.
+
+        :param modelSpace: model space of the (linear) model.
+        :param loadedNodes: nodes to load (i.e. the nodes of the deck).
+        :param loadDirection: direction of the unit load.
+        '''
+        retval= 0
+        numDOFs= modelSpace.preprocessor.getNodeHandler.numDOFs
+        loadVector= [0.0]*numDOFs
+        for i in range(0, min(len(loadDirection), numDOFs)):
+            loadVector[i]= loadDirection[i]
+        calculateNodalReactions= any([q.needsReactions for q in self.quantities])
+        nodeTags= list()
+        positions= list()
+        values= list()
+        # Reuse the factored stiffness matrix.
+        algorithm= modelSpace.getAnalysis().analysisAggregation.getSolutionAlgorithm
+        factorOnce= hasattr(algorithm, 'factorOnce')
+        if(factorOnce):
+            previousFactorOnce= algorithm.factorOnce
+            algorithm.factorOnce= True
+        for n in loadedNodes:
+            lpName= 'influence_unit_load_'+str(n.tag)
+            lp= modelSpace.newLoadPattern(name= lpName)
+            lp.newNodalLoad(n.tag, xc.Vector(loadVector))
+            modelSpace.revertToStart()
+            modelSpace.addLoadCaseToDomain(lpName)
+            result= modelSpace.analyze(calculateNodalReactions= calculateNodalReactions)
+            if(result==0):
+                values.append([q.getValue() for q in self.quantities])
+            modelSpace.removeLoadPattern(lpName)
+            if(result!=0):
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.error(className+'.'+methodName+"; can't solve the unit load on node: "+str(n.tag)+'. Computation aborted.')
+                retval= result
+                break
+            pos= n.getInitialPos3d
+            positions.append([pos.x, pos.y, pos.z])
+            nodeTags.append(n.tag)
+        if(factorOnce):
+            algorithm.factorOnce= previousFactorOnce
+        modelSpace.revertToStart()
+        if(retval!=0): # don't use partial results.
+            nodeTags= list()
+            positions= list()
+            values= list()
+        self.nodeTags= nodeTags
+        self.positions= np.array(positions, dtype= float).reshape(-1,3)
+        self.values= np.array(values, dtype= float).reshape(-1,len(self.quantities))
+        self.interpolator= None
+        return retval
+
+    def save(self, fileName):
+        ''' Write the influence surfaces in a numpy (.npz) file.
+
+        :param fileName: name of the file.
+        '''
+        np.savez(fileName, names= np.array(self.getQuantityNames()), nodeTags= np.array(self.nodeTags, dtype= int), positions= self.positions, values= self.values)
+
+    def load(self, fileName):
+        ''' Read the influence surfaces from a numpy (.npz) file written by
+            the save method. The names of the quantities must match.
+
+        :param fileName: name of the file.
+        '''
+        with np.load(fileName) as data:
+            names= [str(name) for name in data['names']]
+            if(names!=self.getQuantityNames()):
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.error(className+'.'+methodName+'; quantities in file: '+str(fileName)+' don\'t match: '+str(names))
+            self.nodeTags= data['nodeTags'].tolist()
+            self.positions= data['positions']
+            self.values= data['values']
+        self.interpolator= None
+
+    def getInterpolator(self):
+        ''' Return the function that interpolates the influence surfaces
+            in plan (the value is zero outside the loaded area).'''
+        if(self.interpolator is None):
+            self.interpolator= LinearNDInterpolator(self.positions[:,0:2], self.values, fill_value= 0.0)
+        return self.interpolator
+
+    def getValues(self, positions):
+        ''' Return the value of the influence surfaces (columns) at each of
+            the positions (rows).
+
+        :param positions: array containing the coordinates of the positions
+                          (one row for each position).
+        '''
+        positions= np.asarray(positions, dtype= float)
+        return self.getInterpolator()(positions[:,0:2])
+
+    def getEffects(self, wheelPositions, wheelLoads):
+        ''' Return the values of the quantities (columns) due to the wheel
+            loads in each position of the vehicle (rows).
+
+        :param wheelPositions: positions of the wheels (array of shape
+                               (numPositions, numWheels, 3)).
+        :param wheelLoads: loads of the wheels (array of shape
+                           (numPositions, numWheels)).
+        '''
+        numPositions, numWheels= wheelLoads.shape
+        values= self.getValues(wheelPositions.reshape(-1,3)).reshape(numPositions, numWheels, -1)
+        return np.einsum('pw,pwq->pq', wheelLoads, values)
+
+    def getMovingLoadEffects(self, movingLoad, relativePositions):
+        ''' Return the values of the quantities (columns) due to the moving
+            load at each relative position (rows).
+
+        :param movingLoad: moving load (MovingLoad object).
+        :param relativePositions: relative positions of the load model
+                                  along its path (0 -> beginning, 1-> end).
+        '''
+        wheelPositions, wheelLoads= movingLoad.getWheelLoadArrays(relativePositions)
+        return self.getEffects(wheelPositions, wheelLoads)
+
+    def getGoverningPositions(self, movingLoads, numPositions= 101, numRefinements= 1, allowUnloaded= True):
+        ''' Return the positions of the moving loads that produce the
+            maximum and the minimum value of each quantity. The loads act
+            simultaneously (i.e. tandems on different lanes) so, as the
+            problem is linear, the governing position of each one of them
+            is searched independently.
+
+            The positions are searched on a uniform grid of relative
+            positions; then the grid is refined around the best position
+            found.
+
+            Return a dictionary with an entry for each quantity; each entry
+            contains the dictionaries 'max' and 'min' with the value of the
+            quantity and the relative positions of the moving loads (None
+            if the load is removed because its effect is favourable).
+
+        :param movingLoads: list of MovingLoad objects.
+        :param numPositions: number of positions in the search grid.
+        :param numRefinements: number of refinements of the search grid.
+        :param allowUnloaded: if true, the moving loads that reduce the
+                              absolute value of the effect are removed.
+        '''
+        names= self.getQuantityNames()
+        retval= dict()
+        for name in names:
+            retval[name]= {'max':{'value':0.0, 'relativePositions':list()}, 'min':{'value':0.0, 'relativePositions':list()}}
+        for movingLoad in movingLoads:
+            for sign, key in [(1.0, 'max'), (-1.0, 'min')]:
+                bestValues, bestPositions= self.searchPositions(movingLoad, sign, numPositions, numRefinements)
+                for name, value, rp in zip(names, bestValues, bestPositions):
+                    governing= retval[name][key]
+                    if(allowUnloaded and (sign*value<0.0)):
+                        governing['relativePositions'].append(None)
+                    else:
+                        governing['value']+= value
+                        governing['relativePositions'].append(rp)
+        return retval
+
+    def searchPositions(self, movingLoad, sign, numPositions= 101, numRefinements= 1):
+        ''' Return the maximum value of each quantity multiplied by sign
+            and the relative position of the moving load that produces it.
+
+        :param movingLoad: moving load (MovingLoad object).
+        :param sign: 1.0 to search the maximum values, -1.0 to search the
+                     minimum ones.
+        :param numPositions: number of positions in the search grid.
+        :param numRefinements: number of refinements of the search grid.
+        '''
+        numQuantities= len(self.quantities)
+        bestValues= np.full(numQuantities, -np.inf)
+        bestPositions= np.zeros(numQuantities)
+        relativePositions= np.linspace(0.0, 1.0, numPositions)
+        step= 1.0/(numPositions-1)
+        for i in range(0, numRefinements+1):
+            effects= sign*self.getMovingLoadEffects(movingLoad, relativePositions)
+            indexes= np.argmax(effects, axis= 0)
+            values= effects[indexes, np.arange(numQuantities)]
+            improved= values>bestValues
+            bestValues[improved]= values[improved]
+            bestPositions[improved]= relativePositions[indexes[improved]]
+            # Refine around the best positions found.
+            relativePositions= np.unique(np.clip(np.concatenate([np.linspace(rp-step, rp+step, 11) for rp in np.unique(bestPositions)]), 0.0, 1.0))
+            step/= 5.0
+        return sign*bestValues, bestPositions.tolist()
+
+    def defGoverningLoadPatterns(self, modelSpace, movingLoads, governingPositions, defLoads, quantityNames= None, namePrefix= 'influence_'):
+        ''' Define a load pattern for each of the governing positions of the
+            moving loads (maximum and minimum of each quantity), so they
+            can be verified as usual.
+
+        :param modelSpace: model space of the model.
+        :param movingLoads: list of MovingLoad objects.
+        :param governingPositions: governing positions returned by
+                                   getGoverningPositions.
+        :param defLoads: function that defines the loads in the current
+                         load pattern; it's called with the list of load
+                         models (None for the unloaded paths) and the list
+                         of relative positions as arguments (i.e.
+                         NotionalLanes.defDeckPunctualLoadsThroughLayers or
+                         TrackAxes.defDeckWheelLoadsThroughLayers).
+        :param quantityNames: names of the quantities to define load
+                              patterns for (if None define them for all
+                              the quantities).
+        :param namePrefix: prefix for the names of the load patterns.
+        '''
+        if(quantityNames is None):
+            quantityNames= self.getQuantityNames()
+        retval= list()
+        for name in quantityNames:
+            for key in ['max', 'min']:
+                relativePositions= governingPositions[name][key]['relativePositions']
+                loadModels= list()
+                positions= list()
+                for movingLoad, rp in zip(movingLoads, relativePositions):
+                    if(rp is None): # unloaded.
+                        loadModels.append(None)
+                        positions.append(0.5)
+                    else:
+                        loadModels.append(movingLoad.loadModel)
+                        positions.append(rp)
+                lpName= namePrefix+name+'_'+key
+                lp= modelSpace.newLoadPattern(name= lpName)
+                modelSpace.setCurrentLoadPattern(lpName)
+                defLoads(loadModels, positions)
+                retval.append(lp)
+        return retval
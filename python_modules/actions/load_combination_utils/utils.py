@@ -10,6 +10,7 @@ __email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
 import math
 import sys
 import json
+import numpy as np
 import loadCombinations
 from actions import combinations
 from misc_utils import log_messages as lmsg
@@ -19,6 +20,11 @@ class CombGenerator(object):
 
     :ivar controlCombGenerator: C++ object used to compute the combinations.
     :ivar actionsAdnFactors: actions with its factors (partial safety factors and combination factors).
+    :ivar notDeterminantActions: names of the actions that cannot be
+                                 determinant.
+    :ivar prunedCombinations: dictionary containing the names of the
+                              combinations removed by pruneCombinations
+                              for each situation.
     '''
 
     def __init__(self, combGeneratorName, factors):
@@ -26,6 +32,8 @@ class CombGenerator(object):
         self.name= combGeneratorName
         self.controlCombGenerator= loadCombinations.LoadCombGenerator()
         self.actionsAndFactors= self.controlCombGenerator.actionWeighting.create(self.name, factors)
+        self.notDeterminantActions= list()
+        self.prunedCombinations= dict()
 
     def getFactors(self):
         ''' Return a pointer to the container of the partial safety factors
@@ -56,6 +64,8 @@ class CombGenerator(object):
         newAction= loadCombinations.Action(actionName, actionDescription)
         newAction.not_determinant= notDeterminant
         retval= self.controlCombGenerator.insert(self.name, family, newAction, combinationFactorsName, partialSafetyFactorsName)
+        if(notDeterminant):
+            self.notDeterminantActions.append(actionName)
         if(dependsOn is not None):
             retval.relationships.appendMain(dependsOn)
         if(incompatibleActions is not None):
@@ -90,6 +100,49 @@ class CombGenerator(object):
     def computeCombinations(self):
         ''' Compute the load combinations.'''
         self.controlCombGenerator.genera()
+        self.prunedCombinations= dict()
+
+    def pruneCombinations(self, situations= ['SLSRare', 'SLSFrequent', 'SLSQuasiPermanent', 'ULSTransient', 'ULSAccidental', 'ULSSeismic'], actionEffects= None, actionSigns= None, ignoreNotDeterminant= False, tol= 1e-6):
+        ''' Remove the combinations that cannot give the maximum or the
+            minimum value of any of the result components (see the
+            pruneCombinations function). The removed combinations keep
+            their names but they are not returned by getNamedCombinations
+            and, consequently, they are not written or exported. Return the
+            number of combinations removed.
+
+        :param situations: project situations to prune.
+        :param actionEffects: dictionary containing the effects of each
+                              action (see pruneCombinations function).
+        :param actionSigns: dictionary containing the sign of the effects
+                            of each action (see pruneCombinations function).
+        :param ignoreNotDeterminant: if True, the effects of the actions that
+                                     cannot be determinant are considered
+                                     negligible when comparing the
+                                     combinations.
+        :param tol: relative tolerance (see getTolerance function).
+        '''
+        negligibleActions= None
+        if(ignoreNotDeterminant):
+            negligibleActions= self.notDeterminantActions
+        retval= 0
+        for sit in situations:
+            namedCombinations= self.getNamedCombinations(sit, skipPruned= False)
+            combExpressions= dict()
+            for key in namedCombinations:
+                combExpressions[key]= namedCombinations[key].name
+            removed= pruneCombinations(combExpressions, actionEffects= actionEffects, actionSigns= actionSigns, negligibleActions= negligibleActions, tol= tol)
+            self.prunedCombinations[sit]= set(removed)
+            retval+= len(removed)
+            if(len(removed)>0):
+                lmsg.log(sit+': '+str(len(removed))+' of '+str(len(combExpressions))+' combinations removed.')
+        return retval
+
+    def getNumberOfPrunedCombinations(self):
+        ''' Return the number of combinations removed by pruneCombinations.'''
+        retval= 0
+        for sit in self.prunedCombinations:
+            retval+= len(self.prunedCombinations[sit])
+        return retval
 
     def getLoadCombinations(self):
         ''' Return a container with the computed load combinations.'''
@@ -131,7 +184,7 @@ class CombGenerator(object):
         '''
         return self.getLoadCombinations().getULSSeismicCombinations
 
-    def getNamedCombinations(self, situation: str):
+    def getNamedCombinations(self, situation: str, skipPruned= True):
         ''' Return a dictionary containing the load combinations 
             corresponding to the situation argument, with its assigned 
             names as key of the dictionary.
@@ -139,6 +192,8 @@ class CombGenerator(object):
         :param situation: project situation ('SLSRare' or 'SLSFrequent' 
                            or 'SLSQuasiPermanent' or 'ULSTransient' 
                            or 'ULSAccidental' or 'ULSSeismic'.
+        :param skipPruned: if True, don't return the combinations removed
+                           by pruneCombinations.
         '''
         if(situation== 'SLSRare'):
             prefix= 'SLSR'
@@ -163,7 +218,11 @@ class CombGenerator(object):
             methodName= sys._getframe(0).f_code.co_name
             lmsg.error(className+'.'+methodName+'; situation: '+str(situation) + ' unknown.')   
         # Assign a name to each combination.
-        return getNamedCombinations(loadCombinations, prefix)
+        retval= getNamedCombinations(loadCombinations, prefix)
+        if(skipPruned and (situation in self.prunedCombinations)):
+            for key in self.prunedCombinations[situation]:
+                retval.pop(key, None)
+        return retval
 
     def getLoadCombinationsDict(self, situations= ['SLSRare', 'SLSFrequent', 'SLSQuasiPermanent', 'ULSTransient', 'ULSAccidental', 'ULSSeismic']):
         ''' Return a dictionary containing the load combinations corresponding
@@ -317,6 +376,229 @@ def splitCombination(loadCombination:str, loads):
     retval= '+'.join(tmp1), '+'.join(tmp2)
     return retval
 
+def getFactorsMatrix(combExpressions, actionNames= None):
+    ''' Return the names of the actions and a matrix whose rows contain the
+        factors of each combination.
+
+    :param combExpressions: list of combination expressions (i.e.
+                            "1.35*G1+1.50*Q1").
+    :param actionNames: names of the actions (columns of the matrix). If
+                        None, all the actions in the combinations are used.
+    '''
+    combDicts= [getCombinationDict(expr) for expr in combExpressions]
+    if(actionNames is None):
+        actionNames= list()
+        for combDict in combDicts:
+            for action in combDict:
+                if(action not in actionNames):
+                    actionNames.append(action)
+    columns= dict(zip(actionNames, range(len(actionNames))))
+    retval= np.zeros((len(combDicts), len(actionNames)))
+    for i, combDict in enumerate(combDicts):
+        for action in combDict:
+            retval[i, columns[action]]= combDict[action]
+    return actionNames, retval
+
+def getTolerance(values, tol):
+    ''' Return the absolute tolerance corresponding to the relative
+        tolerance argument: tol times the largest absolute value (or
+        tol if that value is smaller than one).
+
+    :param values: values to compare.
+    :param tol: relative tolerance.
+    '''
+    scale= np.abs(values).max(axis= 0) if(np.size(values)>0) else 0.0
+    return tol*np.maximum(scale, 1.0)
+
+def getIntervalCandidates(factors, lowerEffects, upperEffects, tol= 1e-6):
+    ''' Return a boolean array that is True for the combinations that can
+        give the maximum or the minimum value of at least one of the result
+        components. The effects of each action are known to be between the
+        lower and upper values, so each combination gives a value between
+        the bounds obtained with them; a combination cannot give the maximum
+        if its upper bound is smaller than the lower bound of another one
+        (and conversely for the minimum).
+
+    :param factors: factors of each combination (one row for each
+                    combination and one column for each action).
+    :param lowerEffects: lower values of the effects of each action (one
+                         row for each action and one column for each result
+                         component).
+    :param upperEffects: upper values of the effects of each action.
+    :param tol: relative tolerance (see getTolerance), the bounds of
+                each result component are compared using the largest
+                absolute value of its bounds.
+    '''
+    positiveFactors= np.maximum(factors, 0.0)
+    negativeFactors= np.minimum(factors, 0.0)
+    lowerBounds= positiveFactors.dot(lowerEffects)+negativeFactors.dot(upperEffects)
+    upperBounds= positiveFactors.dot(upperEffects)+negativeFactors.dot(lowerEffects)
+    margin= getTolerance(np.concatenate((lowerBounds, upperBounds)), tol)
+    maxCandidates= upperBounds>=(lowerBounds.max(axis= 0)-margin)
+    minCandidates= lowerBounds<=(upperBounds.min(axis= 0)+margin)
+    return np.logical_or(maxCandidates, minCandidates).any(axis= 1)
+
+def getComponentSignCandidates(factors, signs, margin):
+    ''' Return a boolean array that is True for the combinations that can
+        give the maximum or the minimum value of a result component when
+        only the signs of the effects of the actions on that component
+        are known.
+
+        If all the actions whose sign is known push the result in their
+        sign direction, a combination with larger (signed) factors and the
+        same factors for the actions of unknown sign gives a larger result.
+        A combination is removed when there is another one that gives a
+        larger (or equal) result and another one that gives a smaller
+        (or equal) result; repeated combinations are removed too (the first
+        one is kept).
+
+    :param factors: factors of each combination (one row for each
+                    combination and one column for each action).
+    :param signs: sign of the effects of each action on the result
+                  component: 1.0 or -1.0 if the sign is known, nan if it
+                  is unknown and 0.0 if the effects of the action are
+                  negligible.
+    :param margin: absolute tolerance for the comparison of the factors.
+    '''
+    unknown= np.isnan(signs)
+    known= np.logical_and(np.logical_not(unknown), signs!=0.0)
+    signedFactors= factors[:,known]*signs[known]
+    retval= np.ones(len(factors), dtype= bool)
+    # Group the combinations that have the same factors for the actions
+    # of unknown sign.
+    groups= dict()
+    unknownFactors= np.round(factors[:,unknown]/margin)
+    for i, row in enumerate(unknownFactors):
+        groups.setdefault(tuple(row), list()).append(i)
+    for indexes in groups.values():
+        rows= signedFactors[indexes]
+        # Remove the repeated combinations.
+        uniqueKeys= dict()
+        uniqueIndexes= list()
+        for i, row in zip(indexes, np.round(rows/margin)):
+            key= tuple(row)
+            if(key in uniqueKeys):
+                retval[i]= False
+            else:
+                uniqueKeys[key]= i
+                uniqueIndexes.append(i)
+        rows= signedFactors[uniqueIndexes]
+        for k, i in enumerate(uniqueIndexes):
+            diff= rows-rows[k]
+            diff[k]= np.nan # don't compare with itself.
+            greater= (diff>=-margin).all(axis= 1).any()
+            smaller= (diff<=margin).all(axis= 1).any()
+            if(greater and smaller):
+                retval[i]= False
+    return retval
+
+def getSignCandidates(factors, signs, tol= 1e-6):
+    ''' Return a boolean array that is True for the combinations that can
+        give the maximum or the minimum value of at least one of the result
+        components when only the signs of the action effects are known
+        (see getComponentSignCandidates).
+
+    :param factors: factors of each combination (one row for each
+                    combination and one column for each action).
+    :param signs: signs of the effects of each action (one row for each
+                  action and one column for each result component; a
+                  one-dimensional array is a single result component):
+                  1.0 or -1.0 if the sign is known, nan if it is unknown
+                  and 0.0 if the effects of the action are negligible.
+    :param tol: relative tolerance (see getTolerance), the factors are
+                compared using the largest absolute value of the factors.
+    '''
+    signs= np.asarray(signs, dtype= float)
+    if(signs.ndim==1):
+        signs= signs.reshape(-1,1)
+    margin= getTolerance(np.ravel(factors), tol)
+    retval= np.zeros(len(factors), dtype= bool)
+    for componentSigns in signs.T:
+        retval= np.logical_or(retval, getComponentSignCandidates(factors, componentSigns, margin))
+    return retval
+
+def pruneCombinations(combinations:dict, actionEffects= None, actionSigns= None, negligibleActions= None, tol= 1e-6):
+    ''' Return the names of the combinations that cannot give the maximum
+        or the minimum of any of the result components, so they can be
+        removed without changing the envelopes of the results.
+
+    :param combinations: dictionary containing the expression of each
+                         combination (i.e. {'ULS01':'1.35*G1+1.50*Q1',...}).
+    :param actionEffects: dictionary containing the effects of each action;
+                          the values can be the results obtained for the
+                          action (array with the result components of
+                          interest) or a (lower, upper) tuple with an
+                          envelope of those results.
+    :param actionSigns: dictionary containing the sign of the effects of
+                        the actions; the values can be a number (1 or -1)
+                        if the sign is the same for all the result
+                        components or an array with the sign of the effects
+                        on each result component (nan if unknown). The sign
+                        of the actions not in the dictionary is considered
+                        unknown.
+    :param negligibleActions: names of the actions whose effects are
+                              negligible when comparing the combinations.
+    :param tol: relative tolerance (see getTolerance).
+    '''
+    keys= list(combinations.keys())
+    if(len(keys)<2):
+        return list()
+    if(negligibleActions is None):
+        negligibleActions= list()
+    actionNames, factors= getFactorsMatrix([combinations[key] for key in keys])
+    candidates= np.ones(len(keys), dtype= bool)
+    if(actionEffects is not None):
+        missingActions= [a for a in actionNames if((a not in actionEffects) and (a not in negligibleActions))]
+        if(len(missingActions)>0):
+            functionName= sys._getframe(0).f_code.co_name
+            lmsg.warning(functionName+'; effects of actions: '+str(missingActions)+' unknown. Effects not used.')
+        else:
+            lowerEffects= list()
+            upperEffects= list()
+            sz= None
+            for a in actionNames:
+                if(a in actionEffects):
+                    effects= actionEffects[a]
+                    if(isinstance(effects, tuple)):
+                        lower= np.ravel(np.asarray(effects[0], dtype= float))
+                        upper= np.ravel(np.asarray(effects[1], dtype= float))
+                    else:
+                        lower= np.ravel(np.asarray(effects, dtype= float))
+                        upper= lower
+                    sz= len(lower)
+                else:
+                    lower= None
+                    upper= None
+                lowerEffects.append(lower)
+                upperEffects.append(upper)
+            if(sz is not None):
+                for i, a in enumerate(actionNames): # negligible actions.
+                    if(lowerEffects[i] is None):
+                        lowerEffects[i]= np.zeros(sz)
+                        upperEffects[i]= np.zeros(sz)
+                candidates= np.logical_and(candidates, getIntervalCandidates(factors, np.array(lowerEffects), np.array(upperEffects), tol= tol))
+    if(actionSigns is not None):
+        sz= 1 # number of result components.
+        for a in actionSigns:
+            sz= max(sz, np.size(actionSigns[a]))
+        signs= list()
+        for a in actionNames:
+            if(a in negligibleActions):
+                signs.append(np.zeros(sz))
+            elif(a in actionSigns):
+                actionSign= np.ravel(np.sign(np.asarray(actionSigns[a], dtype= float)))
+                if(len(actionSign)==1):
+                    actionSign= np.full(sz, actionSign[0])
+                elif(len(actionSign)!=sz):
+                    functionName= sys._getframe(0).f_code.co_name
+                    lmsg.error(functionName+'; action: '+a+' has '+str(len(actionSign))+' signs, '+str(sz)+' expected. Signs ignored.')
+                    actionSign= np.full(sz, np.nan)
+                signs.append(actionSign)
+            else:
+                signs.append(np.full(sz, np.nan))
+        candidates= np.logical_and(candidates, getSignCandidates(factors, np.array(signs), tol= tol))
+    return [key for key, candidate in zip(keys, candidates) if not candidate]
+
 def getFileNameFromCombinationExpresion(loadCombination:str):
     ''' Return a valid filename from the combination expression.'''
     return ''.join(x for x in loadCombination if x.isalnum())
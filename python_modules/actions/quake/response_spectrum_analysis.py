@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+''' Response spectrum analysis. The eigenvalue problem is solved only
+    once; the peak response of each mode (displacements, reactions and
+    internal forces) is obtained by solving the equivalent static loads
+    of the mode and the modal responses are combined using the SRSS or
+    the CQC rules. The responses to the spectra acting along each
+    direction are combined using the SRSS or the 100/30 rules.
+
+    The modal responses are stored in arrays (one row for each mode) so
+    the combinations are computed at once for all the modes and all the
+    result values.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com ana.ortega@ciccp.es"
+
+import sys
+import itertools
+import numpy
+import xc
+from solution import predefined_solutions
+from postprocess import load_superposition as ls
+from actions.load_combination_utils import utils
+from misc_utils import log_messages as lmsg
+
+# Labels of the directions of the seismic action (DOF index: label).
+directionLabels= ['X', 'Y', 'Z']
+
+def get_cqc_correlation_coefficients(angularFrequencies, dampings= 0.05):
+    ''' Return the matrix of cross-correlation coefficients between the
+        modes used in the CQC combination (Der Kiureghian expression).
+
+    :param angularFrequencies: angular frequencies of the modes.
+    :param dampings: damping ratio of each mode (or a single value for
+                     all the modes).
+    '''
+    w= numpy.asarray(angularFrequencies, dtype= float)
+    z= numpy.broadcast_to(numpy.asarray(dampings, dtype= float), w.shape)
+    r= w[numpy.newaxis,:]/w[:,numpy.newaxis] # r_ij= w_j/w_i
+    zi= z[:,numpy.newaxis]
+    zj= z[numpy.newaxis,:]
+    num= 8.0*numpy.sqrt(zi*zj)*(zi+r*zj)*r**1.5
+    denom= (1.0-r**2)**2+4.0*zi*zj*r*(1.0+r**2)+4.0*(zi**2+zj**2)*r**2
+    return num/denom
+
+def srss_combination(modalValues):
+    ''' Return the square root of the sum of the squares of the modal
+        values argument.
+
+    :param modalValues: array containing the peak responses of each mode
+                        (axis -2 corresponds to the modes, axis -1 to the
+                        result values).
+    '''
+    return numpy.sqrt(numpy.sum(numpy.square(modalValues), axis= -2))
+
+def cqc_combination(modalValues, correlationCoefficients):
+    ''' Return the complete quadratic combination of the modal values
+        argument.
+
+    :param modalValues: array containing the peak responses of each mode
+                        (axis -2 corresponds to the modes, axis -1 to the
+                        result values).
+    :param correlationCoefficients: matrix of cross-correlation
+                                    coefficients between the modes (see
+                                    get_cqc_correlation_coefficients).
+    '''
+    values= numpy.asarray(modalValues, dtype= float)
+    tmp= numpy.matmul(correlationCoefficients, values)
+    sumOfProducts= numpy.sum(values*tmp, axis= -2)
+    return numpy.sqrt(numpy.maximum(sumOfProducts, 0.0))
+
+def combine_directions(directionalValues, method= '100/30', factor= 0.3):
+    ''' Return the combination of the responses to the seismic action
+        along each direction.
+
+    :param directionalValues: array containing the peak responses for
+                              each direction (axis 0 corresponds to the
+                              directions).
+    :param method: 'SRSS' or '100/30' (the response to one of the
+                   directions plus the given fraction of the responses
+                   to the others, taking the maximum of all the
+                   permutations).
+    :param factor: fraction of the responses to the other directions
+                   (defaults to 0.3).
+    '''
+    values= numpy.abs(numpy.asarray(directionalValues, dtype= float))
+    retval= None
+    if(method=='SRSS'):
+        retval= numpy.sqrt(numpy.sum(numpy.square(values), axis= 0))
+    elif(method=='100/30'):
+        total= numpy.sum(values, axis= 0)
+        # E_a+factor*(sum(E)-E_a) for each direction a.
+        retval= numpy.max((1.0-factor)*values+factor*total, axis= 0)
+    else:
+        methodName= sys._getframe(0).f_code.co_name
+        lmsg.error(methodName+"; unknown directional combination method: '"+str(method)+"'.")
+    return retval
+
+class ResponseSpectrumAnalysis(object):
+    ''' Response spectrum analysis of a linear model.
+
+    :ivar feProblem: XC finite element problem.
+    :ivar spectra: dictionary whose keys are the indexes of the DOFs
+                   corresponding to the directions of the seismic action
+                   (0: X, 1: Y, 2: Z) and whose values are the response
+                   spectra for each direction (functions that return the
+                   spectral acceleration for a given period, i.e. the eval
+                   method of NCSP.HorizontalElasticResponseSpectrum).
+    :ivar numModes: number of modes to compute.
+    :ivar dampings: damping ratio of each mode (or a single value for all
+                    the modes).
+    :ivar systemPrefix: string that identifies the SOE and solver types
+                        used to solve the eigenvalue problem.
+    :ivar loadPatternPrefix: prefix of the names of the load patterns that
+                             contain the equivalent static loads of each
+                             mode.
+    :ivar periods: periods of the modes.
+    :ivar angularFrequencies: angular frequencies of the modes.
+    :ivar participationFactors: modal participation factors (one row for
+                                each mode, one column for each direction).
+    :ivar effectiveModalMasses: effective modal masses (one row for each
+                                mode, one column for each direction).
+    :ivar totalMasses: total mass for each direction.
+    :ivar modalResults: peak modal responses (see LoadPatternResults class
+                        in load_superposition module).
+    :ivar modalLoadPatternNames: names of the load patterns defined by
+                                 defineModalLoadPatterns.
+    '''
+    def __init__(self, feProblem, spectra, numModes, dampings= 0.05, systemPrefix= 'sym_band', loadPatternPrefix= 'mode'):
+        ''' Constructor.
+
+        :param feProblem: XC finite element problem.
+        :param spectra: dictionary whose keys are the indexes of the DOFs
+                        corresponding to the directions of the seismic
+                        action (0: X, 1: Y, 2: Z) and whose values are
+                        the response spectra for each direction.
+        :param numModes: number of modes to compute.
+        :param dampings: damping ratio of each mode (or a single value for
+                         all the modes).
+        :param systemPrefix: string that identifies the SOE and solver
+                             types used to solve the eigenvalue problem.
+        :param loadPatternPrefix: prefix of the names of the load patterns
+                                  that contain the equivalent static loads
+                                  of each mode.
+        '''
+        self.feProblem= feProblem
+        self.spectra= spectra
+        self.numModes= numModes
+        self.dampings= dampings
+        self.systemPrefix= systemPrefix
+        self.loadPatternPrefix= loadPatternPrefix
+        self.periods= None
+        self.angularFrequencies= None
+        self.participationFactors= None
+        self.effectiveModalMasses= None
+        self.totalMasses= None
+        self.modalResults= None
+        self.modalLoadPatternNames= list() # names of the defined load patterns.
+        self.nodeOffsets= None # (node, offset of its DOFs)
+        self.massEigenvectors= None # M·Φ (one column for each mode).
+
+    def getDirections(self):
+        ''' Return the indexes of the DOFs corresponding to the directions
+            of the seismic action.'''
+        return sorted(self.spectra.keys())
+
+    def getDirectionLabels(self):
+        ''' Return the labels of the directions of the seismic action.'''
+        return [directionLabels[d] for d in self.getDirections()]
+
+    def getTotalSet(self):
+        ''' Return the set that contains all the entities of the model.'''
+        return self.feProblem.getPreprocessor.getSets.getSet('total')
+
+    def computeModes(self):
+        ''' Solve the eigenvalue problem and compute the modal
+            participation factors and the effective modal masses for each
+            direction. The mass matrices of the nodes and the elements are
+            taken into account.'''
+        analysis= predefined_solutions.frequency_analysis(self.feProblem, systemPrefix= self.systemPrefix)
+        result= analysis.analyze(self.numModes)
+        if(result!=0):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.error(className+'.'+methodName+"; can't solve the eigenvalue problem.")
+            return result
+        self.angularFrequencies= numpy.array(list(analysis.getAngularFrequencies()), dtype= float)
+        self.periods= numpy.array(list(analysis.getPeriods()), dtype= float)
+        totalSet= self.getTotalSet()
+        # Eigenvectors (one row for each DOF, one column for each mode).
+        self.nodeOffsets= dict()
+        eigenvectorRows= list()
+        offset= 0
+        for n in totalSet.nodes:
+            eigenvectors= n.getEigenvectors
+            rows= [[eigenvectors(i,j) for j in range(0, self.numModes)] for i in range(0, eigenvectors.noRows)]
+            self.nodeOffsets[n.tag]= (n, offset)
+            eigenvectorRows.extend(rows)
+            offset+= len(rows)
+        eigenvectors= numpy.array(eigenvectorRows, dtype= float).reshape(offset, self.numModes)
+        # Influence vectors (one column for each direction).
+        directions= self.getDirections()
+        influence= numpy.zeros((offset, len(directions)))
+        for (n, nodeOffset) in self.nodeOffsets.values():
+            for j, dof in enumerate(directions):
+                if(dof<n.getNumberDOF):
+                    influence[nodeOffset+dof, j]= 1.0
+        # Products of the mass matrix by the eigenvectors and the
+        # influence vectors.
+        self.massEigenvectors= numpy.zeros(eigenvectors.shape)
+        massInfluence= numpy.zeros(influence.shape)
+        massCarriers= [([n.tag], n.mass) for n in totalSet.nodes]
+        massCarriers.extend([(list(e.getNodes.getExternalNodes), e.mass) for e in totalSet.elements])
+        for (nodeTags, mass) in massCarriers:
+            m= numpy.array([[mass(i,j) for j in range(0, mass.noCols)] for i in range(0, mass.noRows)], dtype= float)
+            if(m.size>0 and numpy.any(m)):
+                indexes= list()
+                for tag in nodeTags:
+                    (n, nodeOffset)= self.nodeOffsets[tag]
+                    indexes.extend(range(nodeOffset, nodeOffset+n.getNumberDOF))
+                self.massEigenvectors[indexes]+= m @ eigenvectors[indexes]
+                massInfluence[indexes]+= m @ influence[indexes]
+        generalizedMasses= numpy.sum(eigenvectors*self.massEigenvectors, axis= 0)
+        participations= self.massEigenvectors.T @ influence # L= Φ^T·M·r
+        self.participationFactors= participations/generalizedMasses[:,numpy.newaxis]
+        self.effectiveModalMasses= participations**2/generalizedMasses[:,numpy.newaxis]
+        self.totalMasses= numpy.sum(influence*massInfluence, axis= 0)
+        return result
+
+    def getEffectiveModalMassRatios(self):
+        ''' Return the ratio between the effective modal mass of each mode
+            and the total mass (one row for each mode, one column for each
+            direction).'''
+        return self.effectiveModalMasses/self.totalMasses
+
+    def getCumulativeEffectiveModalMassRatios(self):
+        ''' Return the cumulative effective modal mass ratios (one row for
+            each mode, one column for each direction).'''
+        return numpy.cumsum(self.getEffectiveModalMassRatios(), axis= 0)
+
+    def getSpectralAccelerations(self):
+        ''' Return the spectral accelerations corresponding to the period
+            of each mode (one row for each mode, one column for each
+            direction).'''
+        directions= self.getDirections()
+        retval= numpy.zeros((len(self.periods), len(directions)))
+        for j, dof in enumerate(directions):
+            spectrum= self.spectra[dof]
+            retval[:,j]= [spectrum(T) for T in self.periods]
+        return retval
+
+    def getCorrelationCoefficients(self):
+        ''' Return the matrix of cross-correlation coefficients between
+            the modes.'''
+        return get_cqc_correlation_coefficients(self.angularFrequencies, self.dampings)
+
+    def getModalLoadPatternName(self, mode, dof):
+        ''' Return the name of the load pattern that contains the
+            equivalent static loads of the mode for the given direction.
+
+        :param mode: index of the mode (starting at 1).
+        :param dof: index of the DOF corresponding to the direction.
+        '''
+        return self.loadPatternPrefix+str(mode)+directionLabels[dof]
+
+    def getModalLoadPatternNames(self):
+        ''' Return the names of the modal load patterns ordered by
+            direction and mode.'''
+        retval= list()
+        for dof in self.getDirections():
+            for mode in range(1, self.numModes+1):
+                retval.append(self.getModalLoadPatternName(mode, dof))
+        return retval
+
+    def removeModalLoadPatterns(self):
+        ''' Remove the load patterns defined by a previous call to
+            defineModalLoadPatterns.'''
+        loadPatterns= self.feProblem.getPreprocessor.getLoadHandler.getLoadPatterns
+        for lpName in self.modalLoadPatternNames:
+            loadPatterns.removeLoadPattern(lpName)
+        self.modalLoadPatternNames= list()
+
+    def defineModalLoadPatterns(self):
+        ''' Define the load patterns containing the equivalent static loads
+            of each mode and direction (F= M·Φ_i·Γ_i·Sa(T_i)). The load
+            patterns of a previous run are replaced.'''
+        self.removeModalLoadPatterns()
+        loadPatterns= self.feProblem.getPreprocessor.getLoadHandler.getLoadPatterns
+        if(loadPatterns.currentTimeSeries=='nil'):
+            loadPatterns.newTimeSeries('constant_ts', self.loadPatternPrefix+'TimeSeries')
+            loadPatterns.currentTimeSeries= self.loadPatternPrefix+'TimeSeries'
+        # Load factors (one row for each mode, one column for each direction).
+        factors= self.participationFactors*self.getSpectralAccelerations()
+        for j, dof in enumerate(self.getDirections()):
+            loads= self.massEigenvectors*factors[:,j]
+            for i in range(0, self.numModes):
+                lpName= self.getModalLoadPatternName(i+1, dof)
+                lp= loadPatterns.newLoadPattern('default', lpName)
+                self.modalLoadPatternNames.append(lpName)
+                for (n, nodeOffset) in self.nodeOffsets.values():
+                    nodeLoad= loads[nodeOffset:nodeOffset+n.getNumberDOF, i]
+                    if(numpy.any(nodeLoad)):
+                        lp.newNodalLoad(n.tag, xc.Vector(nodeLoad.tolist()))
+
+    def solveModalLoadPatterns(self, setCalc, constrainedNodeSet= None, solutionProcedureType= predefined_solutions.SimpleStaticLinear, woodArmerAlsoForAxialForces= False):
+        ''' Compute the peak response of each mode for the elements and
+            nodes of the set argument.
+
+        :param setCalc: set of elements and nodes to obtain the results for.
+        :param constrainedNodeSet: nodes to obtain the reactions for.
+        :param solutionProcedureType: type of the (linear) solution
+                                      procedure used to solve the
+                                      equivalent static loads.
+        :param woodArmerAlsoForAxialForces: if true, use Wood-Armer method
+                                            for both axial and bending
+                                            internal forces otherwise, use
+                                            it only for bending moments.
+        '''
+        solutionProcedure= solutionProcedureType(self.feProblem)
+        self.modalResults= ls.LoadPatternResults(elements= setCalc.elements, nodes= setCalc.nodes, constrainedNodes= constrainedNodeSet, woodArmerAlsoForAxialForces= woodArmerAlsoForAxialForces)
+        retval= self.modalResults.solveLoadPatterns(solutionProcedure, self.getModalLoadPatternNames())
+        if(retval!=0):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.error(className+'.'+methodName+"; can't solve the modal load patterns.")
+        preprocessor= self.feProblem.getPreprocessor
+        preprocessor.resetLoadCase()
+        preprocessor.getDomain.revertToStart()
+        return retval
+
+    def run(self, setCalc= None, constrainedNodeSet= None, solutionProcedureType= predefined_solutions.SimpleStaticLinear, woodArmerAlsoForAxialForces= False):
+        ''' Solve the eigenvalue problem and compute the peak response of
+            each mode.
+
+        :param setCalc: set of elements and nodes to obtain the results for
+                        (defaults to the whole model).
+        :param constrainedNodeSet: nodes to obtain the reactions for.
+        :param solutionProcedureType: type of the (linear) solution
+                                      procedure used to solve the
+                                      equivalent static loads.
+        :param woodArmerAlsoForAxialForces: if true, use Wood-Armer method
+                                            for both axial and bending
+                                            internal forces otherwise, use
+                                            it only for bending moments.
+        '''
+        retval= self.computeModes()
+        if(retval==0):
+            self.defineModalLoadPatterns()
+            if(setCalc is None):
+                setCalc= self.getTotalSet()
+            retval= self.solveModalLoadPatterns(setCalc, constrainedNodeSet= constrainedNodeSet, solutionProcedureType= solutionProcedureType, woodArmerAlsoForAxialForces= woodArmerAlsoForAxialForces)
+        return retval
+
+    def getModalResponses(self):
+        ''' Return the peak modal internal forces, displacements and
+            reactions in arrays of shape (number of directions, number of
+            modes, number of values).'''
+        numDirections= len(self.spectra)
+        numRows= numDirections*self.numModes # rows of the modal load patterns.
+        retval= list()
+        for values in [self.modalResults.internalForces, self.modalResults.displacements, self.modalResults.reactions]:
+            retval.append(values[:numRows].reshape(numDirections, self.numModes, -1))
+        return retval
+
+    def getDirectionalResponses(self, modalCombination= 'CQC'):
+        ''' Return the internal forces, displacements and reactions
+            obtained by combining the modal responses for each direction
+            (one row for each direction).
+
+        :param modalCombination: modal combination rule ('SRSS' or 'CQC').
+        '''
+        retval= list()
+        correlationCoefficients= None
+        if(modalCombination=='CQC'):
+            correlationCoefficients= self.getCorrelationCoefficients()
+        elif(modalCombination!='SRSS'):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.error(className+'.'+methodName+"; unknown modal combination method: '"+str(modalCombination)+"'.")
+            return retval
+        for values in self.getModalResponses():
+            if(correlationCoefficients is None):
+                retval.append(srss_combination(values))
+            else:
+                retval.append(cqc_combination(values, correlationCoefficients))
+        return retval
+
+    def getPeakResponses(self, modalCombination= 'CQC', directionalCombination= '100/30', factor= 0.3):
+        ''' Return the peak internal forces, displacements and reactions.
+
+        :param modalCombination: modal combination rule ('SRSS' or 'CQC').
+        :param directionalCombination: directional combination rule
+                                       ('SRSS' or '100/30').
+        :param factor: fraction of the responses to the other directions
+                       used in the 100/30 rule.
+        '''
+        return [combine_directions(values, method= directionalCombination, factor= factor) for values in self.getDirectionalResponses(modalCombination)]
+
+    def getEnvelopeCombinations(self, combName, modalCombination= 'CQC', directionalCombination= '100/30', factor= 0.3, baseCombination= None, solutionProcedureType= predefined_solutions.SimpleStaticLinear, signedComponents= ['N', 'My', 'Mz']):
+        ''' Return a dictionary whose keys are the names of the
+            envelope combinations and whose values are the internal
+            forces, displacements and reactions of each one (base ± peak
+            responses).
+
+            The peak responses have no sign, so a combination is written
+            for each permutation of the signs of the internal force
+            components in signedComponents (i.e. combName+'+N-My+Mz'),
+            which makes the envelopes suitable for the interaction checks
+            of those components. The rest of the values (other internal
+            force components, displacements and reactions) take the sign
+            of the first component. If signedComponents is empty only
+            two combinations are written (combName+'+' and combName+'-'),
+            which envelope each result value separately and must not be
+            used for interaction checks.
+
+        :param combName: name of the seismic combination.
+        :param modalCombination: modal combination rule ('SRSS' or 'CQC').
+        :param directionalCombination: directional combination rule
+                                       ('SRSS' or '100/30').
+        :param factor: fraction of the responses to the other directions
+                       used in the 100/30 rule.
+        :param baseCombination: expression of the static loads that act
+                                with the seismic action (i.e.
+                                '1.0*G+0.3*Q'). The load patterns of the
+                                expression are solved only once.
+        :param solutionProcedureType: type of the (linear) solution
+                                      procedure used to solve the static
+                                      loads.
+        :param signedComponents: internal force components whose signs are
+                                 permuted (see rawInternalForcesComponents
+                                 in load_superposition module).
+        '''
+        peakResponses= self.getPeakResponses(modalCombination= modalCombination, directionalCombination= directionalCombination, factor= factor)
+        baseResponses= [numpy.zeros(values.shape) for values in peakResponses]
+        if(baseCombination):
+            baseFactors= utils.getCombinationDict(baseCombination)
+            pending= [lpName for lpName in baseFactors if lpName not in self.modalResults.loadPatternNames]
+            if(pending):
+                solutionProcedure= solutionProcedureType(self.feProblem)
+                self.modalResults.solveLoadPatterns(solutionProcedure, pending)
+                preprocessor= self.feProblem.getPreprocessor
+                preprocessor.resetLoadCase()
+                preprocessor.getDomain.revertToStart()
+            factors= numpy.zeros((1, len(self.modalResults.loadPatternNames)))
+            for lpName in baseFactors:
+                if(lpName in self.modalResults.loadPatternNames): # missing load patterns already reported by solveLoadPatterns.
+                    factors[0, self.modalResults.loadPatternNames.index(lpName)]= baseFactors[lpName]
+            baseResponses= [values[0] for values in self.modalResults.combine(factors)]
+        signedComponents= list(signedComponents) if signedComponents else list()
+        components= numpy.array(self.modalResults.getInternalForcesComponents(), dtype= str)
+        [baseIntForces, baseDisplacements, baseReactions]= baseResponses
+        [peakIntForces, peakDisplacements, peakReactions]= peakResponses
+        retval= dict()
+        for signs in itertools.product([1.0, -1.0], repeat= max(len(signedComponents), 1)):
+            suffix= ''.join([('+' if s>0 else '-')+c for s, c in itertools.zip_longest(signs, signedComponents, fillvalue= '')])
+            intForcesSigns= numpy.full(peakIntForces.shape, signs[0])
+            for s, c in zip(signs, signedComponents):
+                intForcesSigns[components==c]= s
+            retval[combName+suffix]= [baseIntForces+intForcesSigns*peakIntForces, baseDisplacements+signs[0]*peakDisplacements, baseReactions+signs[0]*peakReactions]
+        return retval
+
+    def saveEnvelope(self, limitStateData, combName, modalCombination= 'CQC', directionalCombination= '100/30', factor= 0.3, baseCombination= None, solutionProcedureType= predefined_solutions.SimpleStaticLinear, signedComponents= ['N', 'My', 'Mz']):
+        ''' Write the internal forces, displacements and reactions of the
+            envelope combinations (see getEnvelopeCombinations) in the
+            files of the limit state argument, so they can be checked as
+            any other combination.
+
+        :param limitStateData: limit state to write the results for.
+        :param combName: name of the seismic combination.
+        :param modalCombination: modal combination rule ('SRSS' or 'CQC').
+        :param directionalCombination: directional combination rule
+                                       ('SRSS' or '100/30').
+        :param factor: fraction of the responses to the other directions
+                       used in the 100/30 rule.
+        :param baseCombination: expression of the static loads that act
+                                with the seismic action (i.e.
+                                '1.0*G+0.3*Q').
+        :param solutionProcedureType: type of the (linear) solution
+                                      procedure used to solve the static
+                                      loads.
+        :param signedComponents: internal force components whose signs are
+                                 permuted (see getEnvelopeCombinations).
+        '''
+        envelopes= self.getEnvelopeCombinations(combName, modalCombination= modalCombination, directionalCombination= directionalCombination, factor= factor, baseCombination= baseCombination, solutionProcedureType= solutionProcedureType, signedComponents= signedComponents)
+        combNames= list(envelopes.keys())
+        sink, writtenCombinations= limitStateData.openResultsSink(combNames)
+        for name in combNames:
+            intForces, displacements, reactions= envelopes[name]
+            sink.writeCombination(name, self.modalResults.getInternalForcesDict(name, intForces), self.modalResults.getReactionsDict(name, reactions), self.modalResults.getDisplacementLines(name, displacements))
+        sink.close()
+        return combNames
@@ -16,6 +16,7 @@ from actions.railway_traffic import locomotive_load as ll
 from actions.railway_traffic import train_load_model as tlm
 from actions.railway_traffic import track_axis as ta
 from actions.railway_traffic import load_model_base as lmb
+from model.sets import spatial_index
     
 def get_traction_force(Lab:float):
     ''' Return the traction force according to expression (6.20) of 
@@ -264,7 +265,7 @@ class TrackAxis(ta.TrackAxis):
         railCentrifugalLoads= self.getRailCentrifugalLoads(leftRailCentrifugalLoad= railCentrifugalLoadsPerMeter[0], rightRailCentrifugalLoad= railCentrifugalLoadsPerMeter[1], trainModel= trainModel, relativePosition= relativePosition)
         retval= list()
         # Apply loads to the originSet nodes.
-        deckMidplane= originSet.nodes.getRegressionPlane(0.0)
+        deckMidplane= spatial_index.get_spatial_index(originSet).getNodesRegressionPlane()
         for rcl in railCentrifugalLoads:
             retval.extend(rcl.defDeckRailLoadsThroughLayers(spreadingLayers= spreadingLayers, originSet= originSet, deckMidplane= deckMidplane, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio))
         return retval
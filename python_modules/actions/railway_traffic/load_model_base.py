@@ -13,6 +13,7 @@ import sys
 import geom
 import xc
 from actions import loads
+from model.sets import spatial_index
 from misc_utils import log_messages as lmsg
 from actions.railway_traffic import dynamic_factor_load as dfl
 from actions.railway_traffic import track_axis as ta
@@ -286,7 +287,7 @@ class TrackAxes(object):
                     implementation remarks in boussinesq module).
         :param gravityDir: direction of the gravity field (unit vector).
         '''
-        setMidplane= originSet.nodes.getRegressionPlane(0.0)
+        setMidplane= spatial_index.get_spatial_index(originSet).getNodesRegressionPlane()
         backfillLoads= self.getBackfillConcentratedLoads(trainModels= trainModels, relativePositions= relativePositions, wallMidplane= setMidplane, gravityDir= gravityDir)
         phi= embankment.layers[0].soil.phi
         sz= len(backfillLoads)
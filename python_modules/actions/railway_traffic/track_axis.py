@@ -14,6 +14,7 @@ import sys
 import geom
 import xc
 from actions import loads
+from model.sets import spatial_index
 from misc_utils import log_messages as lmsg
 from actions.railway_traffic import train_load_model as tm
 from actions.railway_traffic import uniform_rail_load as url
@@ -277,7 +278,7 @@ class TrackAxis(object):
         # Compute rail uniform loads.
         railUniformLoads= self.getRailUniformLoads(trainModel= trainModel, relativePosition= relativePosition, directionVector= directionVector)
         # Distribute the load over deck nodes.
-        deckMidplane= originSet.nodes.getRegressionPlane(0.0)
+        deckMidplane= spatial_index.get_spatial_index(originSet).getNodesRegressionPlane()
         retval= list()
         for rul in railUniformLoads:
             retval.extend(rul.defDeckRailUniformLoadsThroughLayers(spreadingLayers= spreadingLayers, originSet= originSet, deckMidplane= deckMidplane, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio))
@@ -298,7 +299,7 @@ class TrackAxis(object):
                                    surface and the deck mid-plane (see
                                    clause 4.3.6 on Eurocode 1-2:2003).
         '''
-        deckMidplane= originSet.nodes.getRegressionPlane(0.0)
+        deckMidplane= spatial_index.get_spatial_index(originSet).getNodesRegressionPlane()
         # Get braking loads on each rail.
         railBrakingLoads= self.getRailsBrakingLoads()
         numRails= len(railBrakingLoads)
@@ -329,7 +330,7 @@ class TrackAxis(object):
         # Compute rail uniform loads.
         railUniformLoads= self.getRailUniformLoads(trainModel= trainModel, relativePosition= relativePosition, directionVector= directionVector)
         # Distribute the load over deck nodes.
-        deckMidplane= originSet.nodes.getRegressionPlane(0.0)
+        deckMidplane= spatial_index.get_spatial_index(originSet).getNodesRegressionPlane()
         retval= list()
         for rul in railUniformLoads:
             retval.extend(rul.defDeckRailUniformLoadsThroughEmbankment(embankment= embankment, originSet= originSet, deckMidplane= deckMidplane, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio))
@@ -396,7 +397,7 @@ class TrackAxis(object):
         :param directionVector: unitary vector in the direction of the load.
         '''
         railUniformLoads= self.getRailUniformLoads(trainModel= trainModel, relativePosition= relativePosition, directionVector= directionVector)
-        setMidplane= originSet.nodes.getRegressionPlane(0.0)
+        setMidplane= spatial_index.get_spatial_index(originSet).getNodesRegressionPlane()
         for rul in railUniformLoads:
             rul.clip(setMidplane)  # Avoid "negative" pressures over the wall.
             rul.defBackfillUniformLoads(originSet= originSet, embankment= embankment, delta= delta, eta= eta)
@@ -450,7 +451,7 @@ class TrackAxis(object):
         railWindLoads= self.getRailWindLoads(leftRailWindLoad= railWindLoadsPerMeter[0], rightRailWindLoad= railWindLoadsPerMeter[1], trainModel= trainModel, windDirection= windDirection)
         retval= list()
         # Apply loads to the originSet nodes.
-        deckMidplane= originSet.nodes.getRegressionPlane(0.0)
+        deckMidplane= spatial_index.get_spatial_index(originSet).getNodesRegressionPlane()
         for rcl in railWindLoads:
             retval.extend(rcl.defDeckRailLoadsThroughLayers(spreadingLayers= spreadingLayers, originSet= originSet, deckMidplane= deckMidplane, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio))
         return retval
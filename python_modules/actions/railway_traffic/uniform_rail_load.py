@@ -14,6 +14,7 @@ import sys
 import geom
 import xc
 from actions import loads
+from model.sets import spatial_index
 from misc_utils import log_messages as lmsg
 from actions.railway_traffic import dynamic_factor_load as dfl
 from actions.railway_traffic import track_axis as ta
@@ -191,16 +192,11 @@ class RailLoadBase(dfl.DynamicFactorLoad):
         :param originSet: set to pick the loaded nodes from.
         :param deckMidplane: midplane of the loaded surface.
         '''
-        # Pick loaded nodes.
-        retval= list()
+        # Pick loaded nodes (the local coordinates of the projection on the
+        # mid-plane are those of the node itself).
         tol= .01
         ref= deckMidplane.getRef()
-        for n in originSet.nodes:
-            posProj= deckMidplane.getProjection(n.getInitialPos3d)
-            nodePos2d= ref.getLocalPosition(posProj)
-            if(loadedContour.In(nodePos2d, tol)):  # node in loaded contour.
-                retval.append(n)
-        return retval
+        return spatial_index.get_spatial_index(originSet).getNodesInsideLocalPolygons([(ref, loadedContour)], tol= tol)[0]
 
     def computeNodalBrakingLoads(self, loadedNodes, brakingLoad):
         ''' Compute the load vector for each loaded node due to braking.
@@ -303,7 +299,7 @@ class RailLoadBase(dfl.DynamicFactorLoad):
         if((abs(dynamicLoad)>0) and (len(vertexList)>1)):
             v0= vertexList[0]
             # Compute mid-plane of the loaded wall.
-            wallMidplane= originSet.nodes.getRegressionPlane(0.0)
+            wallMidplane= spatial_index.get_spatial_index(originSet).getNodesRegressionPlane()
             for v1 in vertexList[1:]:
                 segment= geom.Segment3d(v0,v1)
                 # Check if segment is too near to the wall.
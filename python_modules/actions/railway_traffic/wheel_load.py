@@ -13,6 +13,7 @@ import sys
 import geom
 import xc
 from actions import loads
+from actions.utils import wheel_load_picking
 from misc_utils import log_messages as lmsg
 from geotechnics import horizontal_surcharge as hs
 from geotechnics import boussinesq
@@ -106,18 +107,7 @@ class WheelLoadBase(object):
                                 area and the middle surface of the
                                 bridge deck.
         '''
-        retval= list()
-        if(self.localCooSystem):
-            reference, loadedContour= self.getLoadedContour(spreadingLayers= spreadingLayers)
-            tol= .01
-            for n in originSet.nodes:
-                nodePos2d= reference.getLocalPosition(n.getInitialPos3d)
-                if(loadedContour.In(nodePos2d, tol)):  # node in loaded contour.
-                    retval.append(n)
-        else:
-            n= originSet.getNearestNode(self.position)
-            retval= [n]
-        return retval
+        return wheel_load_picking.pick_deck_nodes_through_layers(wheelLoads= [self], originSet= originSet, spreadingLayers= spreadingLayers)[0]
 
     def getDeckLoadedContourThroughLayers(self, spreadingLayers, deckThickness, deckSpreadingRatio= 1/1):
         ''' Return the loaded contour of the wheel taking into account
@@ -181,29 +171,7 @@ class WheelLoadBase(object):
                                    surface and the deck mid-plane (see
                                    clause 4.3.6 on Eurocode 1-2:2003).
         '''
-        nNodes= len(originSet.nodes)  # Number of nodes in the origin set.
-        retval= list()
-        if(nNodes>3):
-            if(self.localCooSystem):
-                # Compute the deck mid-plane as the regression plane
-                # of the positions of its nodes.
-                deckMidplane= originSet.nodes.getRegressionPlane(0.0)
-                # Compute the loaded contour.
-                reference, loadedContour= self.getDeckLoadedContourThroughEmbankment(embankment= embankment, deckMidplane= deckMidplane, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio)
-                tol= .01
-                for n in originSet.nodes:
-                    nodePos2d= reference.getLocalPosition(n.getInitialPos3d)
-                    if(loadedContour.In(nodePos2d, tol)):  # node in loaded contour.
-                        retval.append(n)
-            else:
-                n= originSet.getNearestNode(self.position)
-                retval= [n]
-        else:
-            className= type(self).__name__
-            methodName= sys._getframe(0).f_code.co_name
-            lmsg.error(className+'.'+methodName+'; the set: \''+originSet.name+'\' must have at least 3 nodes, it has: '+str(nNodes))
-        return retval
-
+        return wheel_load_picking.pick_deck_nodes_through_embankment(wheelLoads= [self], originSet= originSet, embankment= embankment, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio)[0]
 
 class WheelLoad(WheelLoadBase):
     ''' Loaded railway wheel.
@@ -15,6 +15,7 @@ import geom
 import xc
 from actions import loads
 from model.geometry import geom_utils as gu
+from actions.utils import wheel_load_picking
 from misc_utils import log_messages as lmsg
 from geotechnics import horizontal_surcharge as hs
 from geotechnics import boussinesq
@@ -135,17 +136,7 @@ class WheelLoad(object):
                                 area and the middle surface of the 
                                 bridge deck.
         '''
-        if(self.localCooSystem):
-            reference, loadedContour= self.getLoadedContour(spreadingLayers= spreadingLayers)
-            tol= .01
-            self.nodes= list()
-            for n in originSet.nodes:
-                nodePos2d= reference.getLocalPosition(n.getInitialPos3d)
-                if(loadedContour.In(nodePos2d, tol)): # node in loaded contour.
-                    self.nodes.append(n)
-        else:
-            n= originSet.getNearestNode(self.position)
-            self.nodes= [n]
+        self.nodes= wheel_load_picking.pick_deck_nodes_through_layers(wheelLoads= [self], originSet= originSet, spreadingLayers= spreadingLayers)[0]
 
     def getDeckLoadedContourThroughEmbankment(self, embankment, deckMidplane, deckThickness, deckSpreadingRatio= 1/1):
         ''' Return the loaded contour of the wheel taking into account
@@ -190,27 +181,7 @@ class WheelLoad(object):
                                    surface and the deck mid-plane (see 
                                    clause 4.3.6 on Eurocode 1-2:2003).
         '''
-        nNodes= len(originSet.nodes) # Number of nodes in the origin set.
-        if(nNodes>3):
-            if(self.localCooSystem):
-                # Compute the deck mid-plane as the regression plane
-                # of the positions of its nodes.
-                deckMidplane= originSet.nodes.getRegressionPlane(0.0)
-                # Compute the loaded contour.
-                reference, loadedContour= self.getDeckLoadedContourThroughEmbankment(embankment= embankment, deckMidplane= deckMidplane, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio)
-                tol= .01
-                self.nodes= list()
-                for n in originSet.nodes:
-                    nodePos2d= reference.getLocalPosition(n.getInitialPos3d)
-                    if(loadedContour.In(nodePos2d, tol)): # node in loaded contour.
-                        self.nodes.append(n)
-            else:
-                n= originSet.getNearestNode(self.position)
-                self.nodes= [n]
-        else:
-            className= type(self).__name__
-            methodName= sys._getframe(0).f_code.co_name
-            lmsg.error(className+'.'+methodName+'; the set: \''+originSet.name+'\' must have at least 3 nodes, it has: '+str(nNodes))
+        self.nodes= wheel_load_picking.pick_deck_nodes_through_embankment(wheelLoads= [self], originSet= originSet, embankment= embankment, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio)[0]
 
     def getLoadVector(self, gravityDir= xc.Vector([0,0,-1]), brakingDir= None):
         ''' Return the load vector at the contact surface.
@@ -824,8 +795,9 @@ class NotionalLanes(object):
         '''
         retval= self.getWheelLoads(tandems= tandems, relativePositions= relativePositions)
         if(originSet): # pick the loaded by each wheel
-            for wheelLoad in retval:
-                wheelLoad.pickDeckNodesThroughLayers(originSet= originSet, spreadingLayers= spreadingLayers)
+            loadedNodes= wheel_load_picking.pick_deck_nodes_through_layers(wheelLoads= retval, originSet= originSet, spreadingLayers= spreadingLayers)
+            for wl, nodes in zip(retval, loadedNodes):
+                wl.nodes= nodes
         return retval
     
     def getBackfillConcentratedLoads(self, tandems, relativePositions, gravityDir= xc.Vector([0,0,-1]), brakingDir= None):
@@ -946,8 +918,9 @@ class NotionalLanes(object):
         '''
         retval= self.getWheelLoads(tandems= tandems, relativePositions= relativePositions)
         if(originSet): # pick the loaded by each wheel
-            for load in retval:
-                load.pickDeckNodesThroughEmbankment(originSet= originSet, embankment= embankment, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio)
+            loadedNodes= wheel_load_picking.pick_deck_nodes_through_embankment(wheelLoads= retval, originSet= originSet, embankment= embankment, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio)
+            for wl, nodes in zip(retval, loadedNodes):
+                wl.nodes= nodes
         return retval
     
     def defDeckPunctualLoadsThroughEmbankment(self, tandems, relativePositions, embankment, deckThickness, deckSpreadingRatio= 1/1, originSet= None, gravityDir= xc.Vector([0,0,-1]), brakingDir= None):
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+''' Pick the deck nodes loaded by a group of wheels (road or railway
+    traffic). The node positions of the set are extracted once (see
+    model.sets.spatial_index) and the loaded contours of all the wheels
+    are checked against them in a single batch.
+
+    The wheel loads must provide the position and localCooSystem
+    attributes and the getLoadedContour and
+    getDeckLoadedContourThroughEmbankment methods (see
+    actions.roadway_traffic.load_model_base.WheelLoad and
+    actions.railway_traffic.wheel_load.WheelLoadBase).'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022,  LCPT AO_O "
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com ana.ortega.ort@gmail.com"
+
+import sys
+from model.sets import spatial_index
+from misc_utils import log_messages as lmsg
+
+def pick_loaded_nodes(wheelLoads, originSet, getLoadedContour, tol= .01):
+    ''' Return the deck nodes loaded by each of the wheels.
+
+    :param wheelLoads: wheel loads.
+    :param originSet: set to pick the loaded nodes from.
+    :param getLoadedContour: function that returns the reference system
+                             and the loaded contour of the wheel argument.
+    :param tol: tolerance for the point in polygon test.
+    '''
+    retval= [None]*len(wheelLoads)
+    contourIndexes= list()
+    localPolygons= list()
+    for i, wl in enumerate(wheelLoads):
+        if(wl.localCooSystem):
+            contourIndexes.append(i)
+            localPolygons.append(getLoadedContour(wl))
+        else:
+            n= originSet.getNearestNode(wl.position)
+            retval[i]= [n]
+    if(contourIndexes):
+        loadedNodes= spatial_index.get_spatial_index(originSet).getNodesInsideLocalPolygons(localPolygons, tol= tol)
+        for i, nodes in zip(contourIndexes, loadedNodes):
+            retval[i]= nodes
+    return retval
+
+def pick_deck_nodes_through_layers(wheelLoads, originSet, spreadingLayers= None):
+    ''' Return the deck nodes loaded by each of the wheels.
+
+    :param wheelLoads: wheel loads.
+    :param originSet: set to pick the loaded nodes from.
+    :param spreadingLayers: list of tuples containing the depth
+                            and the spread-to-depth ratio of
+                            the layers between the wheel contact
+                            area and the middle surface of the
+                            bridge deck.
+    '''
+    return pick_loaded_nodes(wheelLoads= wheelLoads, originSet= originSet, getLoadedContour= lambda wl: wl.getLoadedContour(spreadingLayers= spreadingLayers))
+
+def pick_deck_nodes_through_embankment(wheelLoads, originSet, embankment, deckThickness, deckSpreadingRatio= 1/1):
+    ''' Return the deck nodes loaded by each of the wheels.
+
+    :param wheelLoads: wheel loads.
+    :param originSet: set to pick the loaded nodes from.
+    :param embankment: embankment object as defined in
+                       earthworks.embankment.
+    :param deckThickness: thickness of the deck.
+    :param deckSpreadingRatio: spreading ratio of the load between the deck
+                               surface and the deck mid-plane (see
+                               clause 4.3.6 on Eurocode 1-2:2003).
+    '''
+    nNodes= len(originSet.nodes)  # Number of nodes in the origin set.
+    retval= [list() for wl in wheelLoads]
+    if(nNodes>3):
+        # Compute the deck mid-plane as the regression plane of the
+        # positions of its nodes (stored in the spatial index of the set).
+        deckMidplane= spatial_index.get_spatial_index(originSet).getNodesRegressionPlane()
+        retval= pick_loaded_nodes(wheelLoads= wheelLoads, originSet= originSet, getLoadedContour= lambda wl: wl.getDeckLoadedContourThroughEmbankment(embankment= embankment, deckMidplane= deckMidplane, deckThickness= deckThickness, deckSpreadingRatio= deckSpreadingRatio))
+    else:
+        functionName= sys._getframe(0).f_code.co_name
+        lmsg.error(functionName+'; the set: \''+originSet.name+'\' must have at least 3 nodes, it has: '+str(nNodes))
+    return retval
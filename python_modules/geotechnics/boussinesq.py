@@ -163,6 +163,108 @@ def stress_increment_vector_under_concentrated_load(P, x, y, z, unitVectorDir, e
     return BoussinesqStresses(P= P, x= x, y= y, z= z, eta= eta).getCartesianStressVector(unitVectorDir= unitVectorDir)
 
 
+def get_cartesian_stress_components(P, x, y, z, eta= 1.0, radiusLowerBound= BoussinesqStresses.radiusLowerBound):
+    ''' Return the cartesian components (sigma_xx, sigma_yy, sigma_zz,
+        sigma_xy, sigma_xz, sigma_yz) of the stress tensor at the points
+        inside an homogeneous and elastic soil due to concentrated loads
+        on the surface. The arguments can be numpy arrays of any shapes
+        compatible for broadcasting (i.e. x, y and z can be matrices with
+        one row for each point and one column for each load), so the
+        stresses for all the (point, load) pairs are computed in a
+        few array operations. The results are the same obtained with
+        BoussinesqStresses.getStressTensorCartesian.
+
+    :param P: value of the loads.
+    :param x: x-coordinates of the points relative to the loaded points.
+    :param y: y-coordinates of the points relative to the loaded points.
+    :param z: z-coordinates of the points relative to the loaded points.
+    :param eta: Poisson's ratio (ATTENTION: defaults to 1.0: see 
+                commentaries in Bowles book (page 633).
+    :param radiusLowerBound: lower limit to the radius of the point
+                             (see BoussinesqStresses).
+    '''
+    x, y, z= np.broadcast_arrays(np.asarray(x, dtype= float), np.asarray(y, dtype= float), np.asarray(z, dtype= float))
+    under= (z<0.0) # The point is under the loaded point.
+    Z= np.where(under, -z, 0.0) # Z oriented downwards in this function.
+    r2= x**2+y**2
+    r= np.sqrt(r2)
+    R2= r2+Z**2
+    R= np.maximum(np.sqrt(R2), radiusLowerBound)
+    R5= R**5
+    P_twoPi= np.where(under, P/(2.0*math.pi), 0.0)
+    P3_twoPi_R5= 3.0*P_twoPi/R5
+    sigma_zz= P3_twoPi_R5*Z**3
+    sigma_rr= P_twoPi*(3*r2*Z/R5-(1-2*eta)/(R*(R+Z)))
+    # R2 is zero only if the point is not under the load (P_twoPi= 0).
+    safeR2= np.where(under, R2, 1.0)
+    sigma_thth= P_twoPi*(1-2*eta)/safeR2*(R/(R+Z)-Z/R)
+    tau_rz= P3_twoPi_R5*r*Z**2
+    # Transform to cartesian coordinates (theta= atan2(y, x)).
+    safeR= np.where(r>0.0, r, 1.0)
+    cosTheta= np.where(r>0.0, x/safeR, 1.0)
+    sinTheta= np.where(r>0.0, y/safeR, 0.0)
+    sigma_xx= cosTheta**2*sigma_rr+sinTheta**2*sigma_thth
+    sigma_yy= sinTheta**2*sigma_rr+cosTheta**2*sigma_thth
+    sigma_xy= cosTheta*sinTheta*(sigma_rr-sigma_thth)
+    sigma_xz= cosTheta*tau_rz
+    sigma_yz= sinTheta*tau_rz
+    return sigma_xx, sigma_yy, sigma_zz, sigma_xy, sigma_xz, sigma_yz
+
+def get_stress_increment_vectors(loadPositions, loadValues, points, unitVectorDirs, eta= 1.0, maxPairs= 1<<20):
+    ''' Return the stress vectors at the points inside an homogeneous
+        and elastic soil due to a set of concentrated loads on the surface
+        (sum of the contributions of all the loads). The computation is
+        made by blocks of points so the memory used is bounded by the
+        maxPairs argument.
+
+    :param loadPositions: positions of the loads (array with shape (nLoads, 3)).
+    :param loadValues: values of the loads (array with shape (nLoads,)).
+    :param points: points whose stress increment will be computed (array
+                   with shape (nPoints, 3)).
+    :param unitVectorDirs: stress direction vectors (must be unit vectors) 
+                           corresponding to the points (array with shape
+                           (nPoints, 3)).
+    :param eta: Poisson's ratio (ATTENTION: defaults to 1.0: see 
+                commentaries in Bowles book (page 633).
+    :param maxPairs: maximum number of (point, load) pairs computed at once.
+    '''
+    loadPositions= np.asarray(loadPositions, dtype= float).reshape(-1, 3)
+    loadValues= np.broadcast_to(np.asarray(loadValues, dtype= float), (len(loadPositions),))
+    points= np.asarray(points, dtype= float).reshape(-1, 3)
+    unitVectorDirs= np.asarray(unitVectorDirs, dtype= float).reshape(-1, 3)
+    numPoints= len(points)
+    retval= np.zeros((numPoints, 3))
+    if(len(loadPositions)>0):
+        chunkSize= max(1, maxPairs//len(loadPositions))
+        for start in range(0, numPoints, chunkSize):
+            end= min(start+chunkSize, numPoints)
+            relPos= points[start:end, np.newaxis, :]-loadPositions[np.newaxis, :, :]
+            sxx, syy, szz, sxy, sxz, syz= get_cartesian_stress_components(P= loadValues[np.newaxis, :], x= relPos[:,:,0], y= relPos[:,:,1], z= relPos[:,:,2], eta= eta)
+            # Sum the stress tensors of all the loads.
+            sxx= sxx.sum(axis= 1); syy= syy.sum(axis= 1); szz= szz.sum(axis= 1)
+            sxy= sxy.sum(axis= 1); sxz= sxz.sum(axis= 1); syz= syz.sum(axis= 1)
+            n= unitVectorDirs[start:end]
+            retval[start:end, 0]= sxx*n[:,0]+sxy*n[:,1]+sxz*n[:,2]
+            retval[start:end, 1]= sxy*n[:,0]+syy*n[:,1]+syz*n[:,2]
+            retval[start:end, 2]= sxz*n[:,0]+syz*n[:,1]+szz*n[:,2]
+    return retval
+
+def get_coordinates_array(objs):
+    ''' Return a numpy array with the coordinates of the points or
+        vectors argument.
+
+    :param objs: list of geom.Pos3d or geom.Vector3d objects.
+    '''
+    return np.array([[o.x, o.y, o.z] for o in objs], dtype= float).reshape(-1, 3)
+
+def get_vector3d_list(values):
+    ''' Return a list of geom.Vector3d objects from the rows of the
+        array argument.
+
+    :param values: array with shape (n, 3).
+    '''
+    return [geom.Vector3d(float(v[0]), float(v[1]), float(v[2])) for v in values]
+
 class BoussinesqLoad(object):
     ''' Base class for object that compute soil stresses using the 
         Boussinesq equations.
@@ -197,30 +299,59 @@ class BoussinesqLoad(object):
 
         :param elements: elements to compute the pressure on.
         :param stressVectors: value of the stress vector (cartesian coord.)
-                              on the centroid of each element.
+                              on the centroid of each element (list of
+                              geom.Vector3d objects or array with shape
+                              (nElements, 3)).
         :param delta: friction angle between the soil and the element material.
         '''
-        tanDelta= math.tan(delta)
+        elements= list(elements)
         retval= list()
-        for e, stressVector in zip(elements, stressVectors):
-            iVector= e.getIVector3d(True)
-            jVector= e.getJVector3d(True)
-            kVector= e.getKVector3d(True)
+        if(len(elements)>0):
+            if(not isinstance(stressVectors, np.ndarray)):
+                stressVectors= get_coordinates_array(stressVectors)
+            tanDelta= math.tan(delta)
+            iVectors= get_coordinates_array([e.getIVector3d(True) for e in elements])
+            jVectors= get_coordinates_array([e.getJVector3d(True) for e in elements])
+            kVectors= get_coordinates_array([e.getKVector3d(True) for e in elements])
             # Normal pressure.
-            normalPressure= stressVector.dot(kVector)
-            maxTangentPressure= abs(tanDelta*normalPressure)
+            normalPressures= np.einsum('ij,ij->i', stressVectors, kVectors)
+            maxTangentPressures= np.abs(tanDelta*normalPressures)
             # Pressure parallel to i vector.
-            tangentIPressure= stressVector.dot(iVector)
-            if(abs(tangentIPressure)>maxTangentPressure):
-                tangentIPressure= math.copysign(maxTangentPressure, tangentIPressure)
+            tangentIPressures= np.clip(np.einsum('ij,ij->i', stressVectors, iVectors), -maxTangentPressures, maxTangentPressures)
             # Pressure parallel to j vector.
-            tangentJPressure= stressVector.dot(jVector)
-            if(abs(tangentJPressure)>maxTangentPressure):
-                tangentJPressure= math.copysign(maxTangentPressure, tangentJPressure)
-            # Append the computed values to the returned list.
-            retval.append([e, tangentIPressure, tangentJPressure, normalPressure])
+            tangentJPressures= np.clip(np.einsum('ij,ij->i', stressVectors, jVectors), -maxTangentPressures, maxTangentPressures)
+            for e, tI, tJ, n in zip(elements, tangentIPressures.tolist(), tangentJPressures.tolist(), normalPressures.tolist()):
+                retval.append([e, tI, tJ, n])
         return retval
     
+    def getStressIncrementArray(self, points, unitVectorDirs, eta= 1.0, maxPairs= 1<<20):
+        ''' Return the stress increment vectors for the points inside
+            an homogeneous and elastic soil due to this load as a numpy
+            array with shape (nPoints, 3).
+
+        :param points: points whose stress increment will be computed.
+        :param unitVectorDirs: stress direction vectors (must be unit vectors) 
+                               corresponding to the points.
+        :param eta: Poisson's ratio (ATTENTION: defaults to 1.0: see 
+                    commentaries in Bowles book (page 633).
+        :param maxPairs: maximum number of (point, loaded point) pairs
+                         computed at once (see get_stress_increment_vectors).
+        '''
+        loadPositions, loadValues= self.getLoadedPointsArrays()
+        return get_stress_increment_vectors(loadPositions= loadPositions, loadValues= loadValues, points= get_coordinates_array(points), unitVectorDirs= get_coordinates_array(unitVectorDirs), eta= eta, maxPairs= maxPairs)
+
+    def getStressIncrement(self, points, unitVectorDirs, eta= 1.0):
+        ''' Return the vector increment in the soil stress for the points
+            inside an homogeneous and elastic soil due to this load.
+
+        :param points: points whose stress increment will be computed.
+        :param unitVectorDirs: stress direction vectors (must be unit vectors) 
+                               corresponding to the points.
+        :param eta: Poisson's ratio (ATTENTION: defaults to 1.0: see 
+                    commentaries in Bowles book (page 633).
+        '''
+        return get_vector3d_list(self.getStressIncrementArray(points= points, unitVectorDirs= unitVectorDirs, eta= eta))
+    
     def computePressuresOnElements(self, elements, eta= 1.0, delta= 0.0):
         ''' Compute pressures due to this load on the elements argument.
 
@@ -234,7 +365,7 @@ class BoussinesqLoad(object):
             # Compute element orientation with respect to this load.
             loadedPoints, unitVectors= self.computeElementOrientation(elements= elements)
             # Compute the pressure values.
-            stressVectors= self.getStressIncrement(points= loadedPoints, unitVectorDirs= unitVectors)
+            stressVectors= self.getStressIncrementArray(points= loadedPoints, unitVectorDirs= unitVectors, eta= eta)
             # Compute loads on elements.
             retval= self.computeElementalLoads(elements= elements, stressVectors= stressVectors, delta= delta)
         return retval
@@ -271,23 +402,9 @@ class ConcentratedLoad(BoussinesqLoad):
         ''' Return true if the maximum load is smaller that tol.'''
         return (abs(self.Q)<tol)
     
-    def getStressIncrement(self, points, unitVectorDirs, eta= 1.0):
-        ''' Return the vector increment in the soil stress for the points
-            inside an homogeneous and elastic soil due to a concentrated load.
-
-        :param points: points whose stress increment will be computed.
-        :param unitVectorDirs: stress direction vectors (must be unit vectors) 
-                               corresponding to the points.
-        :param eta: Poisson's ratio (ATTENTION: defaults to 1.0: see 
-                    commentaries in Bowles book (page 633).
-        '''
-        retval= list()
-        xLoad= self.loadedPoint.x; yLoad= self.loadedPoint.y; zLoad= self.loadedPoint.z
-        for p, vDir in zip(points, unitVectorDirs):
-            bs= BoussinesqStresses(P= self.Q, x=(p.x-xLoad), y= (p.y-yLoad), z= (p.z-zLoad), eta= eta)
-            stressVector= bs.getCartesianStressVector(unitVectorDir= vDir)
-            retval.append(stressVector)
-        return retval
+    def getLoadedPointsArrays(self):
+        ''' Return the position of the load and its value as numpy arrays.'''
+        return get_coordinates_array([self.loadedPoint]), np.array([self.Q], dtype= float)
 
     def getCentroid(self):
         ''' Return the position of the load centroid.'''
@@ -345,29 +462,13 @@ class LinearLoad(BoussinesqLoad):
         retval.append((points[-1], Q))
         return retval
     
-    def getStressIncrement(self, points, unitVectorDirs, eta= 1.0):
-        ''' Return the increment in the vertical stress for the points inside
-            an homogeneous and elastic soil due to a load distributed on
-            this quadrilateral area.
-
-        :param points: points whose stress increment will be computed.
-        :param unitVectorDirs: stress direction vectors (must be a unit vector) 
-                               corresponding to the points.
-        :param eta: Poisson's ratio (ATTENTION: defaults to 1.0: see 
-                    commentaries in Bowles book (page 633).
-        '''
-        loadedPoints= self.getSamplePoints()
-        retval= list()
-        for p, vDir in zip(points, unitVectorDirs):
-            stressVector= geom.Vector3d(0.0,0.0,0.0)
-            for loadedPoint in loadedPoints:
-                position= loadedPoint[0]
-                load= loadedPoint[1]
-                xLoad= position.x; yLoad= position.y; zLoad= position.z
-                bs= BoussinesqStresses(P= load, x=(p.x-xLoad), y= (p.y-yLoad), z= (p.z-zLoad), eta= eta)
-                stressVector+= bs.getCartesianStressVector(unitVectorDir= vDir)
-            retval.append(stressVector)
-        return retval
+    def getLoadedPointsArrays(self):
+        ''' Return the positions of the sample points and the load values
+            on them as numpy arrays.'''
+        samplePoints= self.getSamplePoints()
+        positions= get_coordinates_array([sp[0] for sp in samplePoints])
+        values= np.array([sp[1] for sp in samplePoints], dtype= float)
+        return positions, values
         
 class QuadLoadedArea(BoussinesqLoad):
     ''' Four-sided polygon under vertical uniform pressure.
@@ -403,14 +504,9 @@ class QuadLoadedArea(BoussinesqLoad):
         ''' Return the position of the load centroid.'''
         return self.getPolygon().getCenterOfMass()
     
-    def getSamplePoints(self):
-        ''' Return the points uniformly distributed along the surface.'''
-        def Ni(xi, eta):
-            ''' Shape functions.'''
-            return [0.25*(1-xi)*(1-eta),
-                    0.25*(1+xi)*(1-eta),
-                    0.25*(1+xi)*(1+eta),
-                    0.25*(1-xi)*(1+eta)]
+    def getSamplePointsArray(self):
+        ''' Return the coordinates of the points uniformly distributed
+            along the surface as a numpy array with shape (nPoints, 3).'''
         def getIntervalCenters(n):
             ''' Get the centers of the intervals in natural coordinates.
 
@@ -418,52 +514,29 @@ class QuadLoadedArea(BoussinesqLoad):
             '''
             sz= 2.0/n
             xi= np.linspace(start= -1, stop= 1, num= n+1, endpoint= True)
-            return [ x+sz/2.0 for x in xi[:-1]] # Centers of the intervals.       
+            return xi[:-1]+sz/2.0 # Centers of the intervals.       
         avgWidth= (self.vertices[0].dist(self.vertices[1])+self.vertices[2].dist(self.vertices[3]))/2.0
         avgLength= (self.vertices[0].dist(self.vertices[3])+self.vertices[1].dist(self.vertices[2]))/2.0
         nDivWidth= int(math.ceil(avgWidth/self.eSize))
         nDivLength= int(math.ceil(avgLength/self.eSize))
-        xi_i= getIntervalCenters(n= nDivWidth)
-        eta_i= getIntervalCenters(n= nDivLength)
-        retval= list()
-        for xi in xi_i:
-            for eta in eta_i:
-                ni= Ni(xi= xi, eta= eta)
-                x= 0; y= 0; z= 0
-                for shape, vertex in zip(ni, self.vertices):
-                    x+= shape*vertex.x
-                    y+= shape*vertex.y
-                    z+= shape*vertex.z
-                retval.append(geom.Pos3d(x,y,z))
-        return retval
-
-    def getStressIncrement(self, points, unitVectorDirs, eta= 1.0):
-        ''' Return the increment in the vertical stress for the points inside
-            an homogeneous and elastic soil due to a load distributed on
-            this quadrilateral area.
+        xi, eta= np.meshgrid(getIntervalCenters(n= nDivWidth), getIntervalCenters(n= nDivLength), indexing= 'ij')
+        xi= xi.ravel(); eta= eta.ravel()
+        # Shape functions.
+        shapeFunctions= np.column_stack([0.25*(1-xi)*(1-eta),
+                                         0.25*(1+xi)*(1-eta),
+                                         0.25*(1+xi)*(1+eta),
+                                         0.25*(1-xi)*(1+eta)])
+        return shapeFunctions.dot(get_coordinates_array(self.vertices))
+    
+    def getSamplePoints(self):
+        ''' Return the points uniformly distributed along the surface.'''
+        return [geom.Pos3d(float(p[0]), float(p[1]), float(p[2])) for p in self.getSamplePointsArray()]
 
-        :param points: points whose stress increment will be computed.
-        :param unitVectorDirs: stress direction vectors (must be a unit vector) 
-                               corresponding to the points.
-        :param eta: Poisson's ratio (ATTENTION: defaults to 1.0: see 
-                    commentaries in Bowles book (page 633).
-        '''
-        loadedPoints= self.getSamplePoints()
+    def getLoadedPointsArrays(self):
+        ''' Return the positions of the sample points and the load values
+            on them as numpy arrays.'''
+        positions= self.getSamplePointsArray()
         area= geom.Polygon3d(self.vertices).getArea()
-        tributaryArea= area/len(loadedPoints)
+        tributaryArea= area/len(positions)
         P= self.q*tributaryArea # punctual load.
-        retval= list()
-        for p, vDir in zip(points, unitVectorDirs):
-            stressVector= geom.Vector3d(0.0,0.0,0.0)
-            for loadedPoint in loadedPoints:
-                xLoad= loadedPoint.x; yLoad= loadedPoint.y; zLoad= loadedPoint.z
-                bs= BoussinesqStresses(P= P, x=(p.x-xLoad), y= (p.y-yLoad), z= (p.z-zLoad), eta= eta)
-                stressVector+= bs.getCartesianStressVector(unitVectorDir= vDir)
-            retval.append(stressVector)
-        return retval
-
-
-
-        
-
-    
+        return positions, np.full(len(positions), P)
@@ -14,7 +14,8 @@ import re
 import sys
 import datetime
 import math
-from scipy.spatial.distance import cdist
+import numpy as np
+from scipy.spatial import cKDTree
 from misc_utils import log_messages as lmsg
 from import_export import block_topology_entities as bte
 
@@ -30,6 +31,42 @@ def nameToImport(testName,namesToImport):
             return True
     return False
 
+def weldPoints(coordinates, threshold):
+    ''' Merge the points that are closer than the threshold distance.
+        The points are processed in order: each point is merged with the
+        nearest of the previously selected k-points if its distance to it
+        is not greater than the threshold, otherwise it becomes a new
+        k-point. The pairs of points closer than the threshold are
+        obtained from a KD-tree, so only the points that have close
+        neighbors need to be processed one by one.
+
+    :param coordinates: array containing the coordinates of the points
+                        (one row for each point).
+    :param threshold: minimum distance between two points to be
+                      considered different points.
+    :returns: list with the indexes of the points selected as k-points and
+              list with the index of the k-point corresponding to each
+              point.
+    '''
+    coordinates= np.asarray(coordinates, dtype= float)
+    numPoints= len(coordinates)
+    # Pairs (i, j) with i<j closer than the threshold.
+    pairs= cKDTree(coordinates).query_pairs(r= threshold, output_type= 'ndarray')
+    # For each point the nearest previous point is the first candidate.
+    dist= np.linalg.norm(coordinates[pairs[:,0]]-coordinates[pairs[:,1]], axis= 1)
+    order= np.lexsort((pairs[:,0], dist, pairs[:,1]))
+    pairs= pairs[order].tolist()
+    isKPoint= [True]*numPoints
+    welded= dict() # point index -> index of the point that is its k-point.
+    for i, j in pairs:
+        if(isKPoint[i] and (j not in welded)): # nearest k-point found.
+            welded[j]= i
+            isKPoint[j]= False
+    kPointIndexes= [i for i in range(numPoints) if isKPoint[i]]
+    kPointNumbers= dict((i, k) for k, i in enumerate(kPointIndexes))
+    pointKPointIndexes= [kPointNumbers[welded.get(i, i)] for i in range(numPoints)]
+    return kPointIndexes, pointKPointIndexes
+
 class ReaderBase(object):
     '''Base class for DXF and FreeCAD readers.
 
@@ -45,6 +82,9 @@ class ReaderBase(object):
      :ivar propertyDict: dictionary that relies each object name with its properties (labels and attributes).
      :ivar lines: dictionary storing the imported lines.
      :ivar facesTree: dictionary storing the imported faces.
+     :ivar kPoints: array containing the coordinates of the k-points
+                    (one row for each k-point).
+     :ivar kPointsTree: KD-tree used to search for the nearest k-point.
     '''
     def __init__(self,fileName, getRelativeCoo, threshold= 0.01, importLines= True, importSurfaces= True):
         ''' Constructor.
@@ -67,15 +107,19 @@ class ReaderBase(object):
         self.propertyDict= dict()
         self.lines= dict()
         self.facesTree= dict()
+        self.kPoints= None
+        self.kPointsTree= None
 
     def getIndexNearestPoint(self, pt):
         ''' Return the index of the point that is nearest to the argument.
 
         :param pt: point to compute the distance to.
         '''
+        if(self.kPointsTree is None):
+            self.kPointsTree= cKDTree(self.kPoints)
         # Convert the index to Python regular int to avoid problems
         # with serialization.
-        return int(cdist([pt], self.kPoints).argmin())
+        return int(self.kPointsTree.query(pt)[1])
 
     def getNearestPoint(self, pt):
         return self.kPoints[self.getIndexNearestPoint(pt)]
@@ -87,18 +131,20 @@ class ReaderBase(object):
         retval.logMessage= '# imported from file: '+self.fileName+' on '
         retval.logMessage+= str(datetime.datetime.now())
 
-        if(self.kPoints):
+        if((self.kPoints is not None) and (len(self.kPoints)>0)):
+            # Points corresponding to each k-point.
+            kPointsPoints= dict()
+            for k in self.points:
+                kPointsPoints.setdefault(self.points[k][0], list()).append(k)
             pointCounter= 0
             for p in self.kPoints:
                 key= self.kPointsNames[pointCounter]
                 bp= bte.BlockProperties()
                 bp.copyFrom(self.propertyDict[key])
                 # Add labels and attributes of points
-                for k in self.points:
-                    pp= self.points[k][0]
-                    if(pp==pointCounter):
-                        bp.extend(self.propertyDict[k])
-                retval.appendPoint(id= pointCounter,x= p[0],y= p[1],z= p[2], pointProperties= bp)
+                for k in kPointsPoints.get(pointCounter, list()):
+                    bp.extend(self.propertyDict[k])
+                retval.appendPoint(id= pointCounter,x= float(p[0]),y= float(p[1]),z= float(p[2]), pointProperties= bp)
                 pointCounter+= 1
 
             blockCounter= 0
@@ -152,28 +198,19 @@ class ReaderBase(object):
         indexDict= None
         keys= list(points.keys())
         if(len(keys)>0):
-            # Append first point
-            pointName= keys[0]
-            self.kPoints= [points[pointName]]
-            objProperties= properties[pointName]
-            self.propertyDict[pointName]= objProperties
+            kPointIndexes, pointKPointIndexes= weldPoints([points[pointName] for pointName in keys], self.threshold)
+            self.kPoints= np.array([points[keys[i]] for i in kPointIndexes], dtype= float)
+            self.kPointsTree= cKDTree(self.kPoints)
             indexDict= dict()
-            indexDict[0]= pointName
-            # Iterate through the rest of the points
-            for pointName in keys[1:]:
-                p= points[pointName]
-                objProperties= properties[pointName]
-                indexNearestPoint= self.getIndexNearestPoint(p)
-                nearestPoint= self.kPoints[indexNearestPoint]
-                dist= cdist([p],[nearestPoint])[0][0]
-                if(dist>self.threshold): # new point.
-                    indexNearestPoint= len(self.kPoints) # The point itself.
-                    self.kPoints.append(p)
-                    self.propertyDict[pointName]= objProperties
-                    indexDict[indexNearestPoint]= pointName
-                else:
-                    pointName= indexDict[indexNearestPoint]
-                    self.propertyDict[pointName].extend(objProperties)
+            for indexKPoint, i in enumerate(kPointIndexes):
+                pointName= keys[i]
+                self.propertyDict[pointName]= properties[pointName]
+                indexDict[indexKPoint]= pointName
+            # Merge the properties of the welded points.
+            for pointName, indexKPoint in zip(keys, pointKPointIndexes):
+                kPointName= indexDict[indexKPoint]
+                if(kPointName!=pointName):
+                    self.propertyDict[kPointName].extend(properties[pointName])
         else:
             lmsg.warning('No points in :'+self.fileName+' file.')
         return indexDict
@@ -100,6 +100,7 @@ class AISCAnalysisContext(analysis_context.AnalysisContextBase):
             self.slsSolutionSteps(comb= comb, limitState= limitState)
         limitState.writeInternalForces(self.internalForcesDict)
         self.failedCombinationsMessage(loadCombinations, limitState)
+        self.clearPreloadStates() # remove the database of the preloaded states.
 
     def restoreStiffness(self):
         ''' Restore the initial stiffness of the softened elements.'''
@@ -188,6 +189,7 @@ class AISCAnalysisContext(analysis_context.AnalysisContextBase):
         limitState.writeInternalForces(self.internalForcesDict)
         limitState.writeReactions(self.reactionsDict)
         self.failedCombinationsMessage(loadCombinations, limitState)
+        self.clearPreloadStates() # remove the database of the preloaded states.
 
 class SimpleAISCAnalysisContext(AISCAnalysisContext):
     ''' Simple analysis context with no elements to deactivate.
@@ -414,6 +414,20 @@ class BiaxialBendingNormalStressController(lsc.LimitStateControllerBase2Sections
         '''
         super(BiaxialBendingNormalStressController,self).__init__(limitStateLabel= limitStateLabel, solutionProcedureType= solutionProcedureType)
 
+    def getShapeEfficiencies(self, steelShape, internalForces):
+        ''' Return the biaxial bending efficiencies of the steel shape
+            argument under each of the internal forces of the list
+            argument (see LimitStateControllerBase.getShapeEfficiencies).
+
+        :param steelShape: steel shape to check.
+        :param internalForces: internal forces acting on the steel shape
+                               (one item for each combination and section).
+        '''
+        retval= lsc.get_biaxial_bending_efficiencies(steelShape, internalForces)
+        if(retval is not None):
+            retval= retval[0]
+        return retval
+
     def updateEfficiency(self, elem, elementInternalForces):
         ''' Compute the efficiency of the element steel shape
             subjected to the internal forces argument and update
@@ -424,14 +438,16 @@ class BiaxialBendingNormalStressController(lsc.LimitStateControllerBase2Sections
         '''
         # Get element section properties.
         steelShape= elem.getProp('crossSection') # steel shape to check.
-        for sectionIForces in elementInternalForces: # Check each element section.
-            # Compute efficiency.
-            CFtmp,NcRdtmp,McRdytmp,McRdztmp,MvRdztmp,MbRdztmp= steelShape.getBiaxialBendingEfficiency(Nd= sectionIForces.N,Myd= sectionIForces.My,Mzd= sectionIForces.Mz,Vyd= sectionIForces.Vy,chiN= sectionIForces.chiN, chiLT= sectionIForces.chiLT)
-            sectionLabel= self.getSectionLabel(sectionIForces.idSection)
-            label= self.limitStateLabel+sectionLabel
+        sectionsIForces= lsc.group_internal_forces_by_section(elementInternalForces)
+        for idSection, sectionIForces in sectionsIForces.items(): # Check each element section.
+            # Compute efficiency for all the combinations.
+            CF,NcRd,McRdy,McRdz,MvRdz,MbRdz= lsc.get_biaxial_bending_efficiencies(steelShape, sectionIForces)
+            sectionLabel= self.getSectionLabel(idSection)
+            def getControlVars(i, CFtmp):
+                lf= sectionIForces[i]
+                return self.ControlVars(sectionLabel,lf.idComb,CFtmp,lf.N,lf.My,lf.Mz,float(NcRd[i]),float(McRdy[i]),float(McRdz[i]),float(MvRdz[i]),float(MbRdz[i]),lf.chiLT, lf.chiN)
             # Update efficiency.
-            if(CFtmp>elem.getProp(label).CF):
-                elem.setProp(label,self.ControlVars(sectionLabel,sectionIForces.idComb,CFtmp,sectionIForces.N,sectionIForces.My,sectionIForces.Mz,NcRdtmp,McRdytmp,McRdztmp,MvRdztmp,MbRdztmp,sectionIForces.chiLT, sectionIForces.chiN))
+            self.updateGoverningControlVars(elem, sectionIForces, CF, getControlVars)
         
 
 class ShearController(lsc.LimitStateControllerBase2Sections):
@@ -448,6 +464,17 @@ class ShearController(lsc.LimitStateControllerBase2Sections):
         '''
         super(ShearController,self).__init__(limitStateLabel= limitStateLabel, solutionProcedureType= solutionProcedureType)
 
+    def getShapeEfficiencies(self, steelShape, internalForces):
+        ''' Return the shear efficiencies of the steel shape argument
+            under each of the internal forces of the list argument (see
+            LimitStateControllerBase.getShapeEfficiencies).
+
+        :param steelShape: steel shape to check.
+        :param internalForces: internal forces acting on the steel shape
+                               (one item for each combination and section).
+        '''
+        return lsc.get_y_shear_efficiencies(steelShape, internalForces)
+
     def updateEfficiency(self, elem, elementInternalForces):
         ''' Compute the efficiency of the element steel shape
             subjected to the internal forces argument and update
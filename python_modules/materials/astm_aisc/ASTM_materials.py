@@ -17,6 +17,7 @@ __email__= "l.pereztato@ciccp.es, ana.ortega@ciccp.es "
 import inspect
 import sys
 import math
+import numpy as np
 import scipy.interpolate
 import geom
 from geom_utils import closest_pair_of_points as cpp
@@ -1536,6 +1537,37 @@ class ASTMShape(object):
             CF= ratioN/2.0+(ratioMz+ratioMy) # equation H1-1b
         return (CF,NcRd,McRdy,McRdz,MvRdz,MbRdz)
 
+    def getBiaxialBendingEfficiencies(self, Nd, Myd, Mzd, Vyd, chiN, chiLT):
+        '''Return the biaxial bending efficiencies according to section H1
+           of AISC-360-16 for the internal forces in the arguments (one
+           value for each load combination). The section strengths are
+           computed only once.
+
+        :param Nd: required axial strengths (array).
+        :param Myd: required bending strengths, minor axis (array).
+        :param Mzd: required bending strengths, major axis (array).
+        :param Vyd: required shear strengths, major axis (array).
+        :param chiN: axial load reduction factors (array).
+        :param chiLT: lateral buckling reduction factors (array).
+        '''
+        Nd= np.asarray(Nd, dtype= float)
+        chiN= np.asarray(chiN, dtype= float)
+        chiLT= np.asarray(chiLT, dtype= float)
+        compression= (Nd<0)
+        NcRd= np.empty_like(Nd) # available axial strength.
+        if(compression.any()):
+            NcRd[compression]= chiN[compression]*self.getReferenceCompressiveStrength()
+        if(not compression.all()):
+            NcRd[~compression]= self.getDesignTensileStrength()
+        ratioN= np.abs(Nd)/NcRd
+        McRdy= self.getDesignFlexuralStrength(None, None, majorAxis= False) # available flexural strength minor axis.
+        McRdz= self.getReferenceFlexuralStrength() # reference flexural strength major axis.
+        MvRdz= np.full_like(Nd, McRdz) # available flexural strength due to shear interaction.
+        MbRdz= chiLT*MvRdz # available flexural strength major axis.
+        ratioM= np.abs(Mzd)/MbRdz+np.abs(Myd)/McRdy
+        CF= np.where(ratioN>=0.2, ratioN+8.0/9.0*ratioM, ratioN/2.0+ratioM) # equations H1-1a and H1-1b
+        return (CF, NcRd, np.full_like(Nd, McRdy), np.full_like(Nd, McRdz), MvRdz, MbRdz)
+
     def setupULSControlVars(self, elems, chiN=1.0, chiLT=1.0):
         '''For each element creates the variables
            needed to check ultimate limit state criterion to be satisfied.
@@ -1868,6 +1900,21 @@ class LShape(ASTMShape, aisc_metric_shapes.LShape):
         # Moments about principal axes (signs inverted).
         MW, MZ= self.getPrincipalAxesMoments(Mz= -Mzd, My= -Myd)
         return self.getBiaxialBendingEfficiencyPrincipalAxes(Nd= Nd, MZ= MZ, MW= MW, chiN= chiN, chiLT= chiLT)
+
+    def getBiaxialBendingEfficiencies(self, Nd, Myd, Mzd, Vyd, chiN, chiLT):
+        '''Return the biaxial bending efficiencies according to section H2
+           of AISC-360-16 for the internal forces in the arguments (one
+           value for each load combination).
+
+        :param Nd: required axial strengths (array).
+        :param Myd: required bending strengths, minor axis (array).
+        :param Mzd: required bending strengths, major axis (array).
+        :param Vyd: required shear strengths, major axis (array).
+        :param chiN: axial load reduction factors (array).
+        :param chiLT: lateral buckling reduction factors (array).
+        '''
+        # Principal axes computation: evaluate each combination.
+        return aisc_metric_shapes.LShape.getBiaxialBendingEfficiencies(self, Nd= Nd, Myd= Myd, Mzd= Mzd, Vyd= Vyd, chiN= chiN, chiLT= chiLT)
     
     def getDict(self):
         ''' Put member values in a dictionary.'''
@@ -107,6 +107,7 @@ class AnalysisContext(analysis_context.AnalysisContextBase):
             self.slsSolutionSteps(comb= comb, limitState= limitState)
         limitState.writeInternalForces(self.internalForcesDict)
         self.failedCombinationsMessage(loadCombinations, limitState)
+        self.clearPreloadStates() # remove the database of the preloaded states.
 
     def eluSolutionSteps(self, comb, limitState):
         ''' Compute internal forces (solve).
@@ -177,6 +178,7 @@ class AnalysisContext(analysis_context.AnalysisContextBase):
         limitState.writeInternalForces(self.internalForcesDict)
         limitState.writeReactions(self.reactionsDict)
         self.failedCombinationsMessage(loadCombinations, limitState)
+        self.clearPreloadStates() # remove the database of the preloaded states.
 
 class SimpleAnalysisContext(AnalysisContext):
     ''' Simple analysis context with no elements to deactivate.
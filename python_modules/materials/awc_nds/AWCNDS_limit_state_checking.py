@@ -934,15 +934,17 @@ class BiaxialBendingNormalStressController(lsc.LimitStateControllerBase2Sections
             methodName= sys._getframe(0).f_code.co_name
             lmsg.warning(className+'.'+methodName+'; undefined "crossSection" property for element: '+str(elem.tag)+'; nothing done.')
         else:
+            sectionsIForces= lsc.group_internal_forces_by_section(elementInternalForces)
             # Check each element section.
-            for lf in elementInternalForces:
-                # Compute efficiency.
-                CFtmp= crossSection.getBiaxialBendingEfficiency(Nd= lf.N, Myd= lf.My, Mzd= lf.Mz, FcE= lf.FcE, FbE= lf.FbE, chiN= lf.chiN, chiLT= lf.chiLT)[0]
-                sectionLabel= self.getSectionLabel(lf.idSection)
-                label= self.limitStateLabel+sectionLabel
+            for idSection, sectionIForces in sectionsIForces.items():
+                # Compute efficiency for all the combinations.
+                CF= crossSection.getBiaxialBendingEfficiencies(Nd= [lf.N for lf in sectionIForces], Myd= [lf.My for lf in sectionIForces], Mzd= [lf.Mz for lf in sectionIForces], FcE= [lf.FcE for lf in sectionIForces], FbE= [lf.FbE for lf in sectionIForces], chiN= [lf.chiN for lf in sectionIForces], chiLT= [lf.chiLT for lf in sectionIForces])
+                sectionLabel= self.getSectionLabel(idSection)
+                def getControlVars(i, CFtmp):
+                    lf= sectionIForces[i]
+                    return self.ControlVars(idSection= sectionLabel, combName= lf.idComb, CF= CFtmp, N= lf.N, My= lf.My, Mz= lf.Mz, FcE= lf.FcE, FbE= lf.FbE, chiN= lf.chiN, chiLT= lf.chiLT)
                 # Update efficiency.
-                if(CFtmp>elem.getProp(label).CF):
-                    elem.setProp(label,self.ControlVars(idSection= sectionLabel, combName= lf.idComb, CF= CFtmp, N= lf.N, My= lf.My, Mz= lf.Mz, FcE= lf.FcE, FbE= lf.FbE, chiN= lf.chiN, chiLT= lf.chiLT))
+                self.updateGoverningControlVars(elem, sectionIForces, CF, getControlVars)
                 
 class ShearController(lsc.LimitStateControllerBase2Sections):
     '''Object that controls shear limit state.'''
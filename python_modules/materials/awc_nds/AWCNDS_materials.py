@@ -15,6 +15,7 @@ __email__= "l.pereztato@ciccp.es, ana.ortega@ciccp.es "
 
 import math
 import sys
+import numpy as np
 from enum import IntEnum
 import scipy.interpolate
 from misc_utils import log_messages as lmsg
@@ -652,6 +653,27 @@ class WoodSection(object):
                     CF= self.getFlexuralEfficiency(Md= Mzd, majorAxis= True, chiLT= chiLT) # reference flexural strength major axis.
         return (CF,)    
 
+    def getBiaxialBendingEfficiencies(self, Nd, Myd, Mzd, FcE, FbE, chiN, chiLT):
+        '''Return the biaxial bending efficiencies according to clause
+           3.9 of AWC-NDS2018 for the internal forces in the arguments (one
+           value for each load combination).
+
+        :param Nd: required axial strengths.
+        :param Myd: required bending strengths (minor axis).
+        :param Mzd: required bending strengths (major axis).
+        :param FcE: critical buckling design values for compression
+                    members (F_{cE}) as defined in section 3.9.2 of NDS-2.018
+                    (one tuple for each combination).
+        :param FbE: critical bucking design values for bending according to 
+                    section 3.3.3.8 of NDS-2018.
+        :param chiN: column stability factors clause 3.7.1 of AWC-NDS2018.
+        :param chiLT: beam stability factors clause 3.3.3 of AWC-NDS2018.
+        '''
+        # The expressions of clause 3.9 depend on the sign of the axial
+        # force and on the bending axis, so each combination is evaluated
+        # separately.
+        retval= [self.getBiaxialBendingEfficiency(Nd= n, Myd= my, Mzd= mz, FcE= fcE, FbE= fbE, chiN= cN, chiLT= cLT)[0] for n, my, mz, fcE, fbE, cN, cLT in zip(Nd, Myd, Mzd, FcE, FbE, chiN, chiLT)]
+        return np.array(retval, dtype= float)
     
     def getYShearEfficiency(self, Vy):
         '''Return major axis shear efficiency according to AISC-360-16.
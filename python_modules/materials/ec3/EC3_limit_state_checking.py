@@ -349,6 +349,20 @@ class BiaxialBendingNormalStressController(lsc.LimitStateControllerBase2Sections
         '''
         super(BiaxialBendingNormalStressController,self).__init__(limitStateLabel, solutionProcedureType= solutionProcedureType)
     
+    def getShapeEfficiencies(self, steelShape, internalForces):
+        ''' Return the biaxial bending efficiencies of the steel shape
+            argument under each of the internal forces of the list
+            argument (see LimitStateControllerBase.getShapeEfficiencies).
+
+        :param steelShape: steel shape to check.
+        :param internalForces: internal forces acting on the steel shape
+                               (one item for each combination and section).
+        '''
+        retval= lsc.get_biaxial_bending_efficiencies(steelShape, internalForces)
+        if(retval is not None):
+            retval= retval[0]
+        return retval
+
     def updateEfficiency(self, elem, elementInternalForces):
         ''' Compute the efficiency of the element steel shape
             subjected to the internal forces argument and update
@@ -360,15 +374,17 @@ class BiaxialBendingNormalStressController(lsc.LimitStateControllerBase2Sections
         # Get element section properties.
         steelShape= elem.getProp('crossSection')
         if(steelShape):
+            sectionsIForces= lsc.group_internal_forces_by_section(elementInternalForces)
             # Check each element section.
-            for lf in elementInternalForces: 
-                # Compute efficiency.
-                CFtmp,NcRdtmp,McRdytmp,McRdztmp,MvRdztmp,MbRdztmp= steelShape.getBiaxialBendingEfficiency(Nd= lf.N, Myd= lf.My, Mzd= lf.Mz, Vyd= lf.Vy, chiLT= lf.chiLT, chiN= lf.chiN)
-                sectionLabel= self.getSectionLabel(lf.idSection)
-                label= self.limitStateLabel+sectionLabel
+            for idSection, sectionIForces in sectionsIForces.items():
+                # Compute efficiency for all the combinations.
+                CF,NcRd,McRdy,McRdz,MvRdz,MbRdz= lsc.get_biaxial_bending_efficiencies(steelShape, sectionIForces)
+                sectionLabel= self.getSectionLabel(idSection)
+                def getControlVars(i, CFtmp):
+                    lf= sectionIForces[i]
+                    return self.ControlVars(sectionLabel+'s',lf.idComb,CFtmp,lf.N,lf.My,lf.Mz,float(NcRd[i]),float(McRdy[i]),float(McRdz[i]),float(MvRdz[i]),float(MbRdz[i]), chiN= lf.chiN, chiLT= lf.chiLT)
                 # Update efficiency.
-                if(CFtmp>elem.getProp(label).CF):
-                    elem.setProp(label, self.ControlVars(sectionLabel+'s',lf.idComb,CFtmp,lf.N,lf.My,lf.Mz,NcRdtmp,McRdytmp,McRdztmp,MvRdztmp,MbRdztmp, chiN= lf.chiN, chiLT= lf.chiLT))
+                self.updateGoverningControlVars(elem, sectionIForces, CF, getControlVars)
         else:
             className= type(self).__name__
             methodName= sys._getframe(0).f_code.co_name
@@ -389,6 +405,17 @@ class ShearController(lsc.LimitStateControllerBase2Sections):
         '''
         super(ShearController,self).__init__(limitStateLabel= limitStateLabel, solutionProcedureType= solutionProcedureType)
 
+    def getShapeEfficiencies(self, steelShape, internalForces):
+        ''' Return the shear efficiencies of the steel shape argument
+            under each of the internal forces of the list argument (see
+            LimitStateControllerBase.getShapeEfficiencies).
+
+        :param steelShape: steel shape to check.
+        :param internalForces: internal forces acting on the steel shape
+                               (one item for each combination and section).
+        '''
+        return lsc.get_y_shear_efficiencies(steelShape, internalForces)
+
     def updateEfficiency(self, elem, elementInternalForces):
         ''' Compute the efficiency of the element steel shape
             subjected to the internal forces argument and update
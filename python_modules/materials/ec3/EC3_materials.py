@@ -12,6 +12,7 @@ __email__= " ana.Ortega.Ort@gmail.com, l.pereztato@gmail.com"
 
 import math
 import sys
+import numpy as np
 from materials import steel_base
 from materials import typical_materials
 from materials.ec3 import EC3_limit_state_checking as EC3lsc
@@ -197,7 +198,7 @@ class EC3Shape(object):
         eps= math.sqrt(235e6/self.steelType.fy)
         limits=[33*eps, 38*eps, 42*eps]
         classif=0
-        while ratioCT>limits[classif]:
+        while (classif<len(limits)) and (ratioCT>limits[classif]): # class 4 if all the limits are exceeded.
             classif+=1
         return (classif+1)
     
@@ -213,7 +214,7 @@ class EC3Shape(object):
         eps=math.sqrt(235e6/self.steelType.fy)
         limits=[72*eps,83*eps,124*eps]
         classif=0
-        while ratioCT>limits[classif]:
+        while (classif<len(limits)) and (ratioCT>limits[classif]): # class 4 if all the limits are exceeded.
             classif+=1
         return (classif+1)
         
@@ -248,7 +249,7 @@ class EC3Shape(object):
         eps=math.sqrt(235e6/self.steelType.fy)
         limits=[9*eps,10*eps,14*eps]
         classif=0
-        while ratioCT>limits[classif]:
+        while (classif<len(limits)) and (ratioCT>limits[classif]): # class 4 if all the limits are exceeded.
             classif+=1
         return (classif+1)
 
@@ -596,6 +597,66 @@ class EC3Shape(object):
             lmsg.warning(className+'.'+methodName+': not implemented for cross section class greater than 2.')
             return None
 
+    def getBiaxBendCoeffsArrays(self, NEd, NplRd):
+        '''Return (alpha,beta) constants for bi-axial bending criterion 
+        (clause 6.2.9 of EC3.1.1) for each of the axial forces in the
+        NEd array.
+
+        :param NEd: design values of the axial force (array).
+        :param NplRd: design plastic resistances to normal forces of the 
+                      gross cross-section (array).
+        '''
+        n= np.asarray(NEd, dtype= float)/NplRd
+        if self.name[0] in ['I','H']: # I and H sections.
+            alpha= np.full_like(n, 2.0)
+            beta= np.maximum(1.0,5*n)
+        elif self.name[:2] == 'CH': # circular hollow sections.
+            alpha= np.full_like(n, 2.0)
+            beta= np.full_like(n, 2.0)
+        elif self.name[:2] in ['RH','SH']: # rectangular hollow sections.
+            alpha= np.minimum(6.0,np.abs(1.66/(1-1.13*n**2)))
+            beta= alpha
+        else:  #conservative
+            alpha= np.ones_like(n)
+            beta= np.ones_like(n)
+        return (alpha,beta)
+
+    def getBiaxialBendingEfficiencies(self, Nd, Myd, Mzd, Vyd, chiN, chiLT):
+        '''Return biaxial bending efficiencies (clause 6.2.9 of EC3.1.1)
+        for the internal forces in the arguments (one value for each load
+        combination). The section resistances are computed only once
+        (only class 1 and 2 cross-sections are considered currently).
+
+        :param Nd: design values of the axial force (array).
+        :param Myd: design values of the bending moment about y-y axis (array).
+        :param Mzd: design values of the bending moment about z-z axis (array).
+        :param Vyd: design values of the shear force on y axis (array).
+        :param chiN: flexural buckling reduction factors (array).
+        :param chiLT: lateral buckling reduction factors (array).
+        '''
+        if(self.sectionClass<=2):
+            Nd= np.asarray(Nd, dtype= float)
+            # Axial efficiency.
+            NcRd= np.asarray(chiN, dtype= float)*self.getNcRd() # Flexural buckling reduction.
+            nCF= np.abs(Nd)/NcRd
+            # Bending efficiency.
+            bendingFactor= (1-np.power(nCF,1.7))
+            McRdy= self.getMcRdy()*bendingFactor
+            McRdz= self.getMcRdz()*bendingFactor
+            # Bending resistance under shear (computed once for each shear value).
+            uniqueVyd, inverse= np.unique(np.asarray(Vyd, dtype= float), return_inverse= True)
+            MvRdz= np.array([self.getMvRdz(float(v)) for v in uniqueVyd], dtype= float)[inverse.ravel()]
+            MbRdz= np.asarray(chiLT, dtype= float)*MvRdz # Lateral buckling reduction.
+            alpha, beta= self.getBiaxBendCoeffsArrays(Nd,NcRd)
+            mCF= (np.abs(Mzd)/MbRdz)**alpha+(np.abs(Myd)/McRdy)**beta # Bending efficiency
+            CF= np.sqrt(nCF**2+mCF**2)
+            return (CF,NcRd,McRdy,McRdz,MvRdz,MbRdz)
+        else:
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.warning(className+'.'+methodName+': not implemented for cross section class greater than 2.')
+            return None
+
     def setupULSControlVars(self, elems, chiN= 1.0, chiLT=1.0):
         '''For each element creates the variables
            needed to check ultimate limit state criterion to be satisfied.
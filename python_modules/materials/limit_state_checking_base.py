@@ -12,6 +12,7 @@ __email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
 
 import sys
 import math
+import numpy as np
 from misc_utils import log_messages as lmsg
 from materials.sections.fiber_section import fiber_sets
 from solution import predefined_solutions
@@ -104,6 +105,59 @@ class EURebarController(RebarController):
         
         return retval
         
+def group_internal_forces_by_section(elementInternalForces):
+    ''' Return a dictionary containing the internal forces of each section
+        of the element (one item for each combination, in the same order
+        that in the argument).
+
+    :param elementInternalForces: internal forces acting on the element
+                                  sections.
+    '''
+    retval= dict()
+    for lf in elementInternalForces:
+        retval.setdefault(lf.idSection, list()).append(lf)
+    return retval
+
+def get_internal_forces_array(sectionInternalForces, attributeName):
+    ''' Return a numpy array containing the values of the attribute
+        argument (N, My, Mz, Vy, chiN, chiLT,...) for each item of the
+        internal forces list.
+
+    :param sectionInternalForces: internal forces acting on an element
+                                  section (one item for each combination).
+    :param attributeName: name of the attribute to extract.
+    '''
+    return np.array([getattr(lf, attributeName) for lf in sectionInternalForces], dtype= float)
+
+def get_biaxial_bending_efficiencies(steelShape, internalForces):
+    ''' Return the biaxial bending efficiencies of the steel shape argument
+        under each of the internal forces of the list argument, along with
+        the resistances used to compute them (see the
+        getBiaxialBendingEfficiencies method of the steel shape).
+
+    :param steelShape: steel shape to check.
+    :param internalForces: internal forces acting on the steel shape
+                           (one item for each combination).
+    '''
+    N= get_internal_forces_array(internalForces, 'N')
+    My= get_internal_forces_array(internalForces, 'My')
+    Mz= get_internal_forces_array(internalForces, 'Mz')
+    Vy= get_internal_forces_array(internalForces, 'Vy')
+    chiN= get_internal_forces_array(internalForces, 'chiN')
+    chiLT= get_internal_forces_array(internalForces, 'chiLT')
+    return steelShape.getBiaxialBendingEfficiencies(Nd= N, Myd= My, Mzd= Mz, Vyd= Vy, chiN= chiN, chiLT= chiLT)
+
+def get_y_shear_efficiencies(steelShape, internalForces):
+    ''' Return the major axis shear efficiencies of the steel shape
+        argument under each of the internal forces of the list argument.
+
+    :param steelShape: steel shape to check.
+    :param internalForces: internal forces acting on the steel shape
+                           (one item for each combination).
+    '''
+    Vy= get_internal_forces_array(internalForces, 'Vy')
+    return np.abs(np.asarray(steelShape.getYShearEfficiency(Vyd= Vy), dtype= float))
+
 defaultStaticLinearSolutionProcedure= predefined_solutions.SimpleStaticLinear
 defaultStaticNonLinearSolutionProcedure= predefined_solutions.PlainNewtonRaphson
     
@@ -166,6 +220,21 @@ class LimitStateControllerBase(object):
         methodName= sys._getframe(0).f_code.co_name
         lmsg.error(className+'.'+methodName+': not implemented yet.')
 
+    def getShapeEfficiencies(self, steelShape, internalForces):
+        ''' Return the efficiencies of the steel shape argument under
+            each of the internal forces of the list argument, without
+            updating the control variables of any element (used to choose
+            the section of a member, see steel_member_sizing module).
+
+        :param steelShape: steel shape to check.
+        :param internalForces: internal forces acting on the steel shape
+                               (one item for each combination and section).
+        '''
+        className= type(self).__name__
+        methodName= sys._getframe(0).f_code.co_name
+        lmsg.error(className+'.'+methodName+': not implemented yet.')
+        return None
+
     def readInternalForces(self, intForcCombFileName, setCalc=None):
         '''Launch checking.
 
@@ -227,6 +296,31 @@ class LimitStateControllerBase2Sections(LimitStateControllerBase):
     def getSectionLabel(self, idSection):
         ''' Return the label that corresponds to the index argument.'''
         return self.elementSections[idSection]
+
+    def updateGoverningControlVars(self, elem, sectionInternalForces, CFs, getControlVars):
+        ''' Update the control vars of the element section with those
+            of the governing combination (the one with the biggest
+            efficiency) if its efficiency is bigger than the previous one.
+            Only the control vars of the governing combination are
+            created.
+
+        :param elem: finite element whose section will be checked.
+        :param sectionInternalForces: internal forces acting on the element
+                                      section (one item for each
+                                      combination).
+        :param CFs: efficiencies of the section (one for each item of
+                    sectionInternalForces).
+        :param getControlVars: function that returns the control vars
+                               corresponding to the index (in
+                               sectionInternalForces) of the governing
+                               combination.
+        '''
+        if(len(CFs)>0):
+            i= int(np.argmax(CFs)) # first of the maximum values.
+            CF= float(CFs[i])
+            label= self.limitStateLabel+self.getSectionLabel(sectionInternalForces[i].idSection)
+            if(CF>elem.getProp(label).CF):
+                elem.setProp(label, getControlVars(i, CF))
     
     def initControlVars(self,setCalc):
         '''Initialize control variables over elements.
@@ -10,10 +10,7 @@ __email__= "l.pereztato@ciccp.es, ana.ortega@ciccp.es "
 import sys
 # Macros
 from misc_utils import log_messages as lmsg
-
-# TO ENHANCE: Interactions diagrams ("d" and "k") are calculated each time we 
-# call the checking routines. Maybe it's a good idea to calculate them once and
-# write them in a file to use them as needed.
+from materials.sections.fiber_section import interaction_diagram_cache as idc
 
 class SectionContainer(object):
     ''' Section container.
@@ -25,6 +22,13 @@ class SectionContainer(object):
                                    associates each element with the two 
                                    interactions diagrams of materials 
                                    to be used in the verification.
+    :ivar interactionDiagramsCacheFolder: folder where the interaction
+                                          diagrams are stored to reuse them
+                                          in subsequent runs (if None the
+                                          diagrams are only reused inside
+                                          the current run).
+    :ivar interactionDiagramCache: cache used in the last call to
+                                   calcInteractionDiagrams.
     '''
     def __init__(self):
         ''' Container for the reinforced concrete definitions (name, concrete
@@ -35,6 +39,8 @@ class SectionContainer(object):
         self.mapSections= {} # Dictionary with pairs (sectionName, reference to
                              # section definition.
         self.mapInteractionDiagrams= None
+        self.interactionDiagramsCacheFolder= None
+        self.interactionDiagramCache= None
 
     def getDict(self):
         ''' Return a dictionary containing the object data.'''
@@ -115,26 +121,26 @@ class SectionContainer(object):
                 rcs.defRCSection(preprocessor= preprocessor, matDiagType= matDiagType)
 
 
-    def calcInteractionDiagrams(self, preprocessor, diagramType= 'NMyMz'):
-        '''Calculates 3D interaction diagrams for each section.
+    def calcInteractionDiagrams(self, preprocessor, diagramType= 'NMyMz', cacheFolder= None):
+        '''Calculates 3D interaction diagrams for each section. The
+           sections with identical contents share the same diagram, which
+           is computed only once.
 
         :param preprocessor:   XC preprocessor for the finite element model.
         :param diagramType:    three dimensional diagram: NMyMz
                                bi-dimensional diagram: NMy
                                bi-dimensional diagram: NMz
+        :param cacheFolder: folder where the diagrams are stored to reuse
+                            them in subsequent runs (if None use the value
+                            of interactionDiagramsCacheFolder).
         '''
+        if(cacheFolder is None):
+            cacheFolder= self.interactionDiagramsCacheFolder
+        self.interactionDiagramCache= idc.InteractionDiagramCache(cacheFolder)
         self.mapInteractionDiagrams= {}
         for s in self.sections:
             for rcs in s.lstRCSects:
-                diag= None
-                if(diagramType=='NMyMz'):
-                    diag= rcs.defInteractionDiagram(preprocessor)
-                elif(diagramType=='NMy'):
-                    diag= rcs.defInteractionDiagramNMy(preprocessor)
-                elif(diagramType=='NMz'):
-                    diag= rcs.defInteractionDiagramNMz(preprocessor)
-                else:
-                    lmsg.error("calcInteractionDiagrams; interaction diagram type: " + diagramType + "' unknown.")
+                diag= self.interactionDiagramCache.getDiagram(preprocessor, rcs, diagramType)
                 self.mapInteractionDiagrams[rcs.name]= diag
 
     def report(self, os= sys.stdout, indentation= ''):
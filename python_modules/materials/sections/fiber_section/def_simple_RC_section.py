@@ -507,12 +507,12 @@ class LongReinfLayers(object):
 
         :param dct: dictionary containing the values of the object members.
         '''
-        super().setFromDict(dct)
-        tmp= dct['rebarRows']
-        if(len(tmp)>0):
-            className= type(self).__name__
-            methodName= sys._getframe(0).f_code.co_name
-            lmsg.error(className+'.'+methodName+"; reading rebar rows list not implementd yet.")
+        self.rebarRows= list()
+        for rowDict in dct['rebarRows']:
+            row= ReinfRow(rebarsDiam= rowDict['rebarsDiam'], rebarsSpacing= rowDict['rebarsSpacing'], width= rowDict['width'])
+            row.setFromDict(rowDict)
+            self.rebarRows.append(row)
+        self.reinfLayers= list()
             
     def append(self, rebarRow:ReinfRow):
         ''' Append a reinforcement row to the list.
@@ -1395,6 +1395,34 @@ class BasicRectangularRCSection(RCSectionBase, section_properties.RectangularSec
         retval= BasicRectangularRCSection(name= self.name, sectionDescr= self.sectionDescr, concrType= self.getConcreteType(), reinfSteelType= self.getReinfSteelType(), width= self.b, depth= self.h, nDivIJ= self.getNDivIJ(), nDivJK= self.getNDivJK())
         return retval
 
+    def getDict(self):
+        ''' Return a dictionary containing the object data.'''
+        retval= section_properties.RectangularSection.getDict(self)
+        retval.update({'sectionDescr': self.sectionDescr, 'concrType': self.getConcreteType().materialName, 'reinfSteelType': self.getReinfSteelType().materialName, 'b': self.b, 'h': self.h, 'swapReinforcementAxes': self.swapReinforcementAxes, 'shReinfZ': self.shReinfZ.getDict(), 'shReinfY': self.shReinfY.getDict(), 'torsionReinf': self.torsionReinf.getDict()})
+        return retval
+
+    def setFromDict(self, dct):
+        ''' Set the data values from the dictionary argument. Only the
+            names of the concrete and the reinforcing steel are stored in
+            the dictionary, so the materials of the section are not
+            changed (a warning is issued if their names don't match).
+
+        :param dct: dictionary containing the values of the object members.
+        '''
+        section_properties.RectangularSection.setFromDict(self, dct)
+        self.sectionDescr= dct['sectionDescr']
+        self.b= dct['b']
+        self.h= dct['h']
+        self.swapReinforcementAxes= dct['swapReinforcementAxes']
+        self.shReinfZ.setFromDict(dct['shReinfZ'])
+        self.shReinfY.setFromDict(dct['shReinfY'])
+        self.torsionReinf.setFromDict(dct['torsionReinf'])
+        for material, materialName in [(self.getConcreteType(), dct['concrType']), (self.getReinfSteelType(), dct['reinfSteelType'])]:
+            if((material is None) or (material.materialName!=materialName)):
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.warning(className+'.'+methodName+'; material: '+str(materialName)+' must be assigned to the section: '+str(self.name)+'.')
+
     def getShearReinfY(self):
         '''Return the shear reinforcement for Vy.'''
         retval= self.shReinfY
@@ -1636,6 +1664,22 @@ class RCRectangularSection(BasicRectangularRCSection):
         retval= RCRectangularSection(name= self.name, sectionDescr= self.sectionDescr, concrType= self.getConcreteType(), reinfSteelType= self.getReinfSteelType(), width= self.b, depth= self.h, nDivIJ= self.getNDivIJ(), nDivJK= self.getNDivJK())
         return retval
 
+    def getDict(self):
+        ''' Return a dictionary containing the object data.'''
+        retval= super(RCRectangularSection, self).getDict()
+        retval.update({'minCover': self.minCover, 'positvRebarRows': self.positvRebarRows.getDict(), 'negatvRebarRows': self.negatvRebarRows.getDict()})
+        return retval
+
+    def setFromDict(self, dct):
+        ''' Set the data values from the dictionary argument.
+
+        :param dct: dictionary containing the values of the object members.
+        '''
+        super(RCRectangularSection, self).setFromDict(dct)
+        self.minCover= dct['minCover']
+        self.positvRebarRows.setFromDict(dct['positvRebarRows'])
+        self.negatvRebarRows.setFromDict(dct['negatvRebarRows'])
+
     def report(self, os= sys.stdout, indentation= ''):
         ''' Get a report of the object contents.'''
         super(RCRectangularSection, self).report(os, indentation)
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+''' Cache of the interaction diagrams of reinforced concrete sections.
+
+    The diagrams are identified by a hash of the section contents: the
+    fibers (position, area and material), the definition of the concrete
+    and reinforcing steel materials, the type of stress-strain diagram
+    and the parameters used to compute the interaction diagram. The name
+    of the section is not part of the hash, so sections with different
+    names but identical contents share the same diagram.
+
+    If a cache folder is given the diagrams are also written to disk so
+    they can be reused in subsequent runs (and by other limit states).'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) , Ana Ortega (AO_O) "
+__copyright__= "Copyright 2022, LCPT, AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es, ana.ortega@ciccp.es "
+
+import os
+import sys
+import json
+import hashlib
+import geom
+from misc_utils import log_messages as lmsg
+
+# Increase this number when the hashed contents change, so the diagrams
+# stored by previous versions are not used.
+cacheFormatVersion= 1
+
+diagramTypes= ['NMyMz', 'NMy', 'NMz']
+
+def getMaterialData(material):
+    ''' Return a dictionary with the scalar attributes of the material
+        definition (concrete or steel) that define its stress-strain
+        behaviour. The tags of the XC materials are excluded because
+        they depend on the order of definition.
+
+    :param material: material definition (concrete or steel object).
+    '''
+    retval= {'className': type(material).__name__}
+    for key, value in vars(material).items():
+        if(not key.startswith('matTag')):
+            if(isinstance(value, (bool, int, float, str)) or (value is None)):
+                retval[key]= value
+    return retval
+
+def getInteractionDiagramParametersData(idParams):
+    ''' Return a dictionary with the values of the parameters used to
+        compute the interaction diagram.
+
+    :param idParams: interaction diagram parameters
+                     (xc.InteractionDiagramParameters object).
+    '''
+    pivots= idParams.pivotsUltimateStrains
+    return {'threshold': idParams.threshold, 'incEps': idParams.incEps, 'incTheta': idParams.incTheta, 'ultimateStrainAPivot': pivots.ultimateStrainAPivot, 'ultimateStrainBPivot': pivots.ultimateStrainBPivot, 'ultimateStrainCPivot': pivots.ultimateStrainCPivot, 'concreteSetName': str(idParams.concreteSetName), 'rebarSetName': str(idParams.rebarSetName)}
+
+def getFibersData(fiberSection, materialNames):
+    ''' Return a list with the position, area and material of each fiber
+        of the section.
+
+    :param fiberSection: XC fiber section.
+    :param materialNames: dictionary that returns the name used in the
+                          hash for each material tag.
+    '''
+    retval= list()
+    for f in fiberSection.getFibers():
+        matTag= f.getMaterial().tag
+        matName= materialNames.get(matTag, 'material'+str(matTag))
+        retval.append([f.getLocY(), f.getLocZ(), f.getArea(), matName])
+    return retval
+
+def getSectionHash(rcSection, diagramType):
+    ''' Return a hash that identifies the interaction diagram of the
+        section. The fiber section must be already defined
+        (see defRCSection) and the interaction diagram parameters too
+        (see defInteractionDiagramParameters).
+
+    :param rcSection: reinforced concrete section definition.
+    :param diagramType: type of the diagram (NMyMz, NMy or NMz).
+    '''
+    sectionParameters= rcSection.fiberSectionParameters
+    idParams= sectionParameters.idParams
+    materialNames= {idParams.concreteTag: 'concrete', idParams.reinforcementTag: 'steel'}
+    data= {'version': cacheFormatVersion,
+           'diagramType': diagramType,
+           'sectionType': type(rcSection.fs).__name__,
+           'diagType': sectionParameters.diagType,
+           'concrete': getMaterialData(sectionParameters.concrType),
+           'steel': getMaterialData(sectionParameters.reinfSteelType),
+           'idParams': getInteractionDiagramParametersData(idParams),
+           'fibers': getFibersData(rcSection.fs, materialNames)}
+    contents= json.dumps(data, sort_keys= True).encode('utf-8')
+    return hashlib.sha256(contents).hexdigest()
+
+class InteractionDiagramCache(object):
+    ''' Reuse the interaction diagrams of identical sections.
+
+    :ivar cacheFolder: folder where the diagrams are stored (if None
+                       the diagrams are shared only inside the current
+                       run).
+    :ivar diagrams: dictionary containing the diagrams already computed
+                    or read (key: hash of the section contents).
+    :ivar hits: number of diagrams found in memory.
+    :ivar diskHits: number of diagrams read from the cache folder.
+    :ivar misses: number of diagrams computed.
+    '''
+    def __init__(self, cacheFolder= None):
+        ''' Constructor.
+
+        :param cacheFolder: folder where the diagrams are stored (if None
+                            the diagrams are shared only inside the
+                            current run).
+        '''
+        self.cacheFolder= cacheFolder
+        if(self.cacheFolder):
+            os.makedirs(self.cacheFolder, exist_ok= True)
+        self.diagrams= dict()
+        self.hits= 0
+        self.diskHits= 0
+        self.misses= 0
+
+    def getFileName(self, sectionHash, diagramType):
+        ''' Return the name of the file that stores the diagram.
+
+        :param sectionHash: hash of the section contents.
+        :param diagramType: type of the diagram (NMyMz, NMy or NMz).
+        '''
+        if(diagramType=='NMyMz'):
+            extension= '.dat'
+        else:
+            extension= '.json'
+        return os.path.join(self.cacheFolder, sectionHash+extension)
+
+    def computeDiagram(self, preprocessor, rcSection, diagramType):
+        ''' Compute the interaction diagram of the section.
+
+        :param preprocessor: preprocessor of the finite element problem.
+        :param rcSection: reinforced concrete section definition.
+        :param diagramType: type of the diagram (NMyMz, NMy or NMz).
+        '''
+        materialHandler= preprocessor.getMaterialHandler
+        idParams= rcSection.fiberSectionParameters.idParams
+        if(diagramType=='NMyMz'):
+            retval= materialHandler.calcInteractionDiagram(rcSection.name, idParams)
+        elif(diagramType=='NMy'):
+            retval= materialHandler.calcInteractionDiagramNMy(rcSection.name, idParams)
+        else:
+            retval= materialHandler.calcInteractionDiagramNMz(rcSection.name, idParams)
+        return retval
+
+    def writeDiagram(self, diagram, fileName, diagramType):
+        ''' Write the diagram in the cache folder. The file is written
+            first with a temporary name and then renamed, so an
+            interrupted run doesn't leave incomplete diagrams.
+
+        :param diagram: interaction diagram to write.
+        :param fileName: name of the output file.
+        :param diagramType: type of the diagram (NMyMz, NMy or NMz).
+        '''
+        tmpFileName= fileName+'.'+str(os.getpid())+'.tmp'
+        if(diagramType=='NMyMz'):
+            diagram.writeTo(tmpFileName)
+        else:
+            vertices= [[p.x, p.y] for p in diagram.getVertexList()]
+            with open(tmpFileName, 'w') as outfile:
+                json.dump(vertices, outfile)
+        os.replace(tmpFileName, fileName)
+
+    def readDiagram(self, preprocessor, diagramName, fileName, diagramType):
+        ''' Read the diagram from the cache folder.
+
+        :param preprocessor: preprocessor of the finite element problem.
+        :param diagramName: name of the new diagram.
+        :param fileName: name of the input file.
+        :param diagramType: type of the diagram (NMyMz, NMy or NMz).
+        '''
+        materialHandler= preprocessor.getMaterialHandler
+        if(diagramType=='NMyMz'):
+            retval= materialHandler.newInteractionDiagram(diagramName)
+            retval.readFrom(fileName)
+        else:
+            with open(fileName) as json_file:
+                vertices= json.load(json_file)
+            retval= materialHandler.new2DInteractionDiagram(diagramName)
+            for v in vertices:
+                retval.appendVertex(geom.Pos2d(v[0], v[1]))
+        return retval
+
+    def getDiagram(self, preprocessor, rcSection, diagramType= 'NMyMz'):
+        ''' Return the interaction diagram of the section; the diagram is
+            computed only if there is no diagram for an identical section
+            in memory or in the cache folder.
+
+        :param preprocessor: preprocessor of the finite element problem.
+        :param rcSection: reinforced concrete section definition.
+        :param diagramType: type of the diagram (NMyMz, NMy or NMz).
+        '''
+        if(diagramType not in diagramTypes):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.error(className+'.'+methodName+"; interaction diagram type: '" + diagramType + "' unknown.")
+            return None
+        if(not rcSection.fiberSectionRepr):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.error(className+'.'+methodName+"; fiber section representation for section: "+ rcSection.name + ";  not defined yet; use defRCSection (or defRCSection2d) method.\n")
+        rcSection.defInteractionDiagramParameters(preprocessor)
+        sectionHash= getSectionHash(rcSection, diagramType)
+        retval= self.diagrams.get(sectionHash, None)
+        if(retval is not None):
+            self.hits+= 1
+        else:
+            fileName= None
+            if(self.cacheFolder):
+                fileName= self.getFileName(sectionHash, diagramType)
+            if(fileName and os.path.exists(fileName)):
+                retval= self.readDiagram(preprocessor, 'diagInt'+rcSection.name, fileName, diagramType)
+                self.diskHits+= 1
+            else:
+                retval= self.computeDiagram(preprocessor, rcSection, diagramType)
+                self.misses+= 1
+                if(fileName and (retval is not None)):
+                    self.writeDiagram(retval, fileName, diagramType)
+            if(retval is not None):
+                self.diagrams[sectionHash]= retval
+        return retval
+
+    def getStatistics(self):
+        ''' Return a dictionary with the number of diagrams found in memory,
+            read from disk and computed.'''
+        return {'hits': self.hits, 'diskHits': self.diskHits, 'misses': self.misses}
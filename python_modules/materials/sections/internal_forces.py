@@ -8,6 +8,7 @@ __version__= "3.0"
 __email__= "l.pereztato@gmail.com"
 
 import math
+import numpy
 from misc_utils import log_messages as lmsg
 
 class CrossSectionInternalForces:
@@ -303,3 +304,66 @@ class ShellMaterialInternalForces:
                                    otherwise use it only for bending moments.
         '''
         return [self.getWoodArmer1(alsoForAxialForces),self.getWoodArmer2(alsoForAxialForces)]
+
+# Column order of the arrays used to process the internal forces of
+# many shell material points at once.
+shellInternalForcesComponents= ['n1', 'n2', 'n12', 'm1', 'm2', 'm12', 'q13', 'q23']
+# Column order of the arrays used to process the internal forces of many
+# cross sections at once (see CrossSectionInternalForces.getComponents).
+crossSectionInternalForcesComponents= ['N', 'Vy', 'Vz', 'T', 'My', 'Mz']
+
+def transformShellInternalForcesArray(shellForces, theta):
+    '''Computes the internal forces of the rows of the argument in a
+       system rotated theta degrees with respect to the z(3) axis (see
+       transformInternalForces).
+
+    :param shellForces: array with one row for each material point whose
+                        columns are those of shellInternalForcesComponents.
+    :param theta: rotation angle (a number or an array with one value 
+                  for each row).
+    '''
+    shellForces= numpy.asarray(shellForces, dtype= float)
+    cos2T= numpy.cos(2*numpy.asarray(theta, dtype= float))
+    sin2T= numpy.sin(2*numpy.asarray(theta, dtype= float))
+    retval= shellForces.copy()
+    for i0, i1, i2 in [(0,1,2), (3,4,5)]: # membrane and bending.
+        f0= shellForces[:,i0]; f1= shellForces[:,i1]; f2= shellForces[:,i2]
+        tmpA= (f0+f1)/2.0
+        tmpB= (f0-f1)/2.0*cos2T+f2*sin2T
+        retval[:,i0]= tmpA+tmpB
+        retval[:,i2]= -(f0-f1)/2.0*sin2T+f2*cos2T
+        retval[:,i1]= tmpA-tmpB
+    q13= shellForces[:,6]; q23= shellForces[:,7]
+    tmpA= (q13+q23)/2.0
+    tmpB= (q13-q23)/2.0*cos2T
+    retval[:,6]= tmpA+tmpB
+    retval[:,7]= tmpA-tmpB
+    return retval
+
+def getWoodArmerArray(shellForces, alsoForAxialForces= False):
+    '''Returns the Wood-Armer method internal forces of the rows of the
+       argument (see ShellMaterialInternalForces.getWoodArmer).
+
+    :param shellForces: array with one row for each material point whose
+                        columns are those of shellInternalForcesComponents.
+    :param alsoForAxialForces: if true use Wood-Armer method for both
+                               axial and bending internal forces 
+                               otherwise use it only for bending moments.
+    :returns: array of shape (number of rows, 2, 6) containing the internal
+              forces for axis 1 and axis 2 of each row (columns of
+              crossSectionInternalForcesComponents).
+    '''
+    shellForces= numpy.asarray(shellForces, dtype= float).reshape(-1,8)
+    n1, n2, n12, m1, m2, m12, q13, q23= shellForces.T
+    retval= numpy.zeros((len(shellForces),2,6))
+    for i, (n, m, q) in enumerate([(n1, m1, q13), (n2, m2, q23)]):
+        N= n
+        Vz= n12
+        if(alsoForAxialForces):
+            N= n+numpy.copysign(n12, n)
+            Vz= numpy.zeros_like(n12)
+        retval[:,i,0]= N
+        retval[:,i,1]= q
+        retval[:,i,2]= Vz
+        retval[:,i,4]= m+numpy.copysign(m12, m)
+    return retval
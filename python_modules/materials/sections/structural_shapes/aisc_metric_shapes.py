@@ -29,15 +29,13 @@ __email__= "l.pereztato@gmail.com"
 
 import sys
 import math
-from materials.sections.structural_shapes import aisc_shapes_dictionaries as shapes
+from materials.sections.structural_shapes import aisc_shapes_catalogs as shapes
 from materials.sections.structural_shapes import bs_en_10210_shapes
-from materials.sections.structural_shapes import aisc_shapes_labels as labels
 from materials.sections import structural_steel
 from materials.sections import section_properties
 from misc_utils import log_messages as lmsg
 import geom
 from import_export import block_topology_entities as bte
-from scipy.interpolate import griddata
 
 # Shear areas.
 
@@ -47,8 +45,12 @@ from scipy.interpolate import griddata
 # *************************************************************************
 # AISC W profiles.
 # *************************************************************************
-for item in shapes.W:
-    shape= shapes.W[item]
+def setWShapeData(shape):
+    ''' Compute the derived properties of the AISC W shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     shape['Avy']= shape['h']*shape['tw'] # depth of the section* web thickness
     shape['Avz']= 2/3.0*(2*shape['b']*shape['tf']) # 2/3 * combined area of the flanges. 
     shape['alpha']= shape['Avy']/shape['A']
@@ -57,6 +59,7 @@ for item in shapes.W:
     shape['AreaQz']= 2*shape['b']*shape['tf'] 
     shape['AreaQy']= shape['A']-shape['AreaQz']
 W= shapes.W
+W.addSetup(setWShapeData)
 
 def getShapePlasticAxialLoad(shape):
     ''' Return the plastic axial load of the shape.
@@ -1351,8 +1354,12 @@ class IShape(WShape, structural_steel.IShape):
 # AISC C profiles.
 # *************************************************************************
 
-for item in shapes.C:
-    shape= shapes.C[item]
+def setCShapeData(shape):
+    ''' Compute the derived properties of the AISC C shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     shape['G']= shape['E']/(2*(1+shape['nu']))
     shape['hi']= shape['h']-2*shape['tf']
     shape['Avy']= shape['h']*shape['tw'] # depth of the section* web thickness
@@ -1360,6 +1367,7 @@ for item in shapes.C:
     shape['AreaQz']= 2*shape['b']*shape['tf']
     shape['AreaQy']= shape['A']-shape['AreaQz']
 C= shapes.C
+C.addSetup(setCShapeData)
 
 class CShape(structural_steel.UShape):
     '''C shape.
@@ -1705,12 +1713,17 @@ class CShape(structural_steel.UShape):
 # GEOMETRIC axes: axes parallel to the angle legs.
 # PRINCIPAL axes: principal axes of inertia of the angle.
 
-for item in shapes.L:
-    shape= shapes.L[item]
+def setLShapeData(shape):
+    ''' Compute the derived properties of the AISC L shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     shape['G']= shape['E']/(2*(1+shape['nu']))
     shape['Avy']= (shape['b_flat']-shape['t']/2.0)*shape['t'] # depth of the section x thickness.
     shape['Avz']= (shape['h']-shape['t']/2.0)*shape['t'] # width of the section x thickness. 
 L= shapes.L
+L.addSetup(setLShapeData)
 
 class LShape(structural_steel.LShape):
     '''L shape.
@@ -2024,6 +2037,7 @@ class LShape(structural_steel.LShape):
             h= self.get('h')
             if(b<h):
                 b, h= h, b # swap
+            from scipy.interpolate import griddata # slow import, only needed here.
             retval= float(griddata(self.beta_w_points, self.beta_w_values, ([b],[h]), method='linear'))
         return retval
     
@@ -2406,8 +2420,12 @@ class SimpleLShape(LShape):
 # AISC Hollow Structural Sections.
 # *************************************************************************
 
-for item in shapes.HSS:
-    shape= shapes.HSS[item]
+def setHSSShapeData(shape):
+    ''' Compute the derived properties of the AISC HSS shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     shape['alpha']= 5/12.0
     shape['G']= shape['E']/(2*(1+shape['nu']))
     if('h_flat' in shape): # rectangular
@@ -2419,8 +2437,9 @@ for item in shapes.HSS:
         shape['Avz']= tmp
     shape['AreaQz']= shape['Avz']
     shape['AreaQy']= shape['Avy']
-    
 HSS= shapes.HSS
+HSS.addSetup(setHSSShapeData)
+    
 
 class HSSShape(structural_steel.QHShape):
     ''' Hollow structural section.
@@ -2982,18 +3001,18 @@ class HSSShape(structural_steel.QHShape):
         '''Return the limiting width-to-thickness ratio for the walls 
            of a moderate ductile member according to table D1.1 
            of AISC 341-16.'''
-        E= shape.get('E')
-        Fy= shape.steelType.fy
-        Ry= shape.steelType.Ry
+        E= self.get('E')
+        Fy= self.steelType.fy
+        Ry= self.steelType.Ry
         return 0.76*math.sqrt(E/Fy/Ry) # Case 4
     
     def getLambdaHD(self):
         '''Return the limiting width-to-thickness ratio for the walls 
            of a highly ductile member according to table D1.1 
            of AISC 341-16.'''
-        E= shape.get('E')
-        Fy= shape.steelType.fy
-        Ry= shape.steelType.Ry
+        E= self.get('E')
+        Fy= self.steelType.fy
+        Ry= self.steelType.Ry
         return 0.65*math.sqrt(E/Fy/Ry) # Case 4
 
 HFSHS= bs_en_10210_shapes.HFSHS
@@ -3018,8 +3037,12 @@ class HFSHSShape(HSSShape):
         '''Return HSS design wall thickess'''
         return self.get('e')
     
-for item in shapes.CHSS:
-    shape= shapes.CHSS[item]
+def setCHSSShapeData(shape):
+    ''' Compute the derived properties of the AISC CHSS shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     shape['alpha']= 5/12.0
     shape['G']= shape['E']/(2*(1+shape['nu']))
     tmp= math.pi*(shape['OD']-shape['t'])/2.0*shape['t']
@@ -3027,8 +3050,9 @@ for item in shapes.CHSS:
     shape['Avz']= tmp
     shape['AreaQz']= shape['Avz']
     shape['AreaQy']= shape['Avy']
-
 CHSS= shapes.CHSS
+CHSS.addSetup(setCHSSShapeData)
+
 
 class CHSSShape(structural_steel.CHShape):
     ''' Circular hollow structural section.
@@ -3174,7 +3198,7 @@ class CHSSShape(structural_steel.CHShape):
            equation F8-4 of  AISC-360-16.
         '''
         slendernessRatio= self.get('slendernessRatio')
-        E= shape.get('E')
+        E= self.get('E')
         return 0.33*E/slendernessRatio
 
     def getLambdaPWallBending(self):
@@ -3261,27 +3285,29 @@ class CHSSShape(structural_steel.CHShape):
         '''Return the limiting width-to-thickness ratio for the wall 
            of a moderate ductile member according to table D1.1 
            of AISC 341-16.'''
-        E= shape.get('E')
-        Fy= shape.steelType.fy
-        Ry= shape.steelType.Ry
+        E= self.get('E')
+        Fy= self.steelType.fy
+        Ry= self.steelType.Ry
         return 0.062*(E/Fy/Ry) # Case 10
     
     def getLambdaHD(self):
         '''Return the limiting width-to-thickness ratio for the wall 
            of a highly ductile member according to table D1.1 
            of AISC 341-16.'''
-        E= shape.get('E')
-        Fy= shape.steelType.fy
-        Ry= shape.steelType.Ry
+        E= self.get('E')
+        Fy= self.steelType.fy
+        Ry= self.steelType.Ry
         return 0.053*math.sqrt(E/Fy/Ry) # Case 10
     
 # Label conversion metric->US customary | US customary -> metric.
 def getUSLabel(metricLabel):
     '''Return the US customary label from the metric one.'''
+    from materials.sections.structural_shapes import aisc_shapes_labels as labels
     return labels.MetricLabel[metricLabel]
 
 def getMetricLabel(USLabel):
     '''Return the metric label from the US customary one.'''
+    from materials.sections.structural_shapes import aisc_shapes_labels as labels
     return labels.USLabel[USLabel]
 
 
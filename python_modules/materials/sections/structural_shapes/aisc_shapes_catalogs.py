@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+''' AISC's structural steel shapes (metric units) stored in binary
+    catalogs (see shape_catalog module). Each family is loaded the first
+    time one of its shapes is looked up.
+
+    The catalogs are written from the aisc_shapes_dictionaries module by
+    the aux/write_shape_catalogs.py script.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AOO)"
+__copyright__= "Copyright 2022, LCPT and AOO"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+from materials.sections.structural_shapes import shape_catalog
+
+W= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_w_shapes.npy'))
+M= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_m_shapes.npy'))
+S= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_s_shapes.npy'))
+HP= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_hp_shapes.npy'))
+C= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_c_shapes.npy'))
+MC= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_mc_shapes.npy'))
+L= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_l_shapes.npy'))
+WT= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_wt_shapes.npy'))
+MT= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_mt_shapes.npy'))
+ST= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_st_shapes.npy'))
+TwoL= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_twol_shapes.npy'))
+HSS= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_hss_shapes.npy'))
+CHSS= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_chss_shapes.npy'))
+PIPE= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName('aisc_pipe_shapes.npy'))
@@ -58,8 +58,12 @@ import re
 '''
 
 IPE= arcelor_shapes_dictionaries.IPE
-for item in IPE:
-    shape= IPE[item]
+def setIPEShapeData(shape):
+    ''' Compute the derived properties of the Arcelor IPE shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     Avy= shape['Avy']
     A= shape['A']
     E= shape['E']
@@ -76,6 +80,7 @@ for item in IPE:
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= A-2*b*tf+(tw+2*r)*tf
     shape['AreaQz']= A-hi*tw
+IPE.addSetup(setIPEShapeData)
     
 # Arcelor IPN steel shapes.
 
@@ -103,8 +108,12 @@ for item in IPE:
 # XXX Check shear distortion constants:
 #   alpha-> alphaY,alphaZ}
 IPN= arcelor_shapes_dictionaries.IPN
-for item in IPN:
-    shape= IPN[item]
+def setIPNShapeData(shape):
+    ''' Compute the derived properties of the Arcelor IPN shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     Avy= shape['Avy']
     A= shape['A']
     E= shape['E']
@@ -120,7 +129,8 @@ for item in IPN:
     shape['alpha']= Avy/A
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= 2*b*tf+(tw+2*r1)*tf
-    shape['AreaQz']= A-d*tw
+    shape['AreaQz']= A-shape['d']*tw
+IPN.addSetup(setIPNShapeData)
     
 # Arcelor HE steel shapes.
 
@@ -148,8 +158,12 @@ for item in IPN:
 #    alpha-> alphaY,alphaZ
 
 HE= arcelor_shapes_dictionaries.HE
-for item in HE:
-    shape= HE[item]
+def setHEShapeData(shape):
+    ''' Compute the derived properties of the Arcelor HE shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     Avy= shape['Avy']
     A= shape['A']
     E= shape['E']
@@ -166,6 +180,7 @@ for item in HE:
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= A-2*b*tf+(tw+2*r)*tf
     shape['AreaQz']= A-hi*tw
+HE.addSetup(setHEShapeData)
 
 # Arcelor UPN steel shapes.
 
@@ -190,8 +205,12 @@ for item in HE:
 # are swapped with respect to those in the catalog.
 
 UPN= arcelor_shapes_dictionaries.UPN
-for item in UPN:
-    shape= UPN[item]
+def setUPNShapeData(shape):
+    ''' Compute the derived properties of the Arcelor UPN shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     Avy= shape['Avy']
     A= shape['A']
     E= shape['E']
@@ -205,12 +224,17 @@ for item in UPN:
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= A-2*b*tf+(tw+r1)*tf
     shape['AreaQz']= A-d*tw
+UPN.addSetup(setUPNShapeData)
 
 # Arcelor L steel shapes.
 
 L= arcelor_shapes_dictionaries.L
-for item in L:
-    shape= L[item]
+def setLShapeData(shape):
+    ''' Compute the derived properties of the Arcelor L shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -222,6 +246,7 @@ for item in L:
     shape['AreaQz']= t*(b-t-r2)
     shape['It']= 2/3.0*b*t*t*t
     shape['alpha']= shape['AreaQy']/A
+L.addSetup(setLShapeData)
 
 # Arcelor U shaped sheet pile.
 
@@ -248,8 +273,12 @@ for item in L:
 # Warning: area in m2/m, inertia in m4/m, Wz in m3/m and so on
 
 AU= arcelor_shapes_dictionaries.AU
-for item in AU:
-    shape= AU[item]
+def setAUShapeData(shape):
+    ''' Compute the derived properties of the Arcelor AU shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     h= shape['h'] #Height
     tf= shape['t'] #Flange thickness
     tw= shape['s'] #Web thickness
@@ -261,6 +290,7 @@ for item in AU:
     nu= shape['nu']
     shape['alpha']= Avy/A
     shape['G']= E/(2*(1+nu))
+AU.addSetup(setAUShapeData)
 
 # Arcelor square hollow tubes.
 # Cross section axis:
@@ -288,8 +318,12 @@ for item in AU:
 # values are identical: no need to exchange.
 
 SHS= arcelor_shapes_dictionaries.SHS
-for item in SHS:
-    shape= SHS[item]
+def setSHSShapeData(shape):
+    ''' Compute the derived properties of the Arcelor SHS shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -302,12 +336,17 @@ for item in SHS:
     shape['AreaQz']= 2*0.7*b*e
     shape['Wyel']= shape['Wzel']
     shape['Wypl']= shape['Wzpl']
+SHS.addSetup(setSHSShapeData)
 
 # Arcelor rectangular hollow tubes.
 
 RHS= arcelor_shapes_dictionaries.RHS
-for item in RHS:
-    shape= RHS[item]
+def setRHSShapeData(shape):
+    ''' Compute the derived properties of the Arcelor RHS shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -318,12 +357,17 @@ for item in RHS:
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= 2*0.7*h*e
     shape['AreaQz']= 2*0.7*b*e
+RHS.addSetup(setRHSShapeData)
 
 # Tata steel circular hollow tubes.
 
 CHS= arcelor_shapes_dictionaries.CHS
-for item in CHS:
-    shape= CHS[item]
+def setCHSShapeData(shape):
+    ''' Compute the derived properties of the Arcelor CHS shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -331,12 +375,17 @@ for item in CHS:
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= 0.5*A
     shape['AreaQz']= 0.5*A
+CHS.addSetup(setCHSShapeData)
   
 # ARCELOR's hot rolled round steel bars.
 
 R= arcelor_shapes_dictionaries.R
-for item in R:
-    shape= R[item]
+def setRShapeData(shape):
+    ''' Compute the derived properties of the Arcelor R shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -356,10 +405,15 @@ for item in R:
     shape['Wypl']= 4.0*r**3/3.0
     shape['Wzpl']= 4.0*r**3/3.0
     shape['J']= math.pi*r**4/2.0
+R.addSetup(setRShapeData)
 
 UC= arcelor_shapes_dictionaries.UC
-for item in UC:
-    shape= UC[item]
+def setUCShapeData(shape):
+    ''' Compute the derived properties of the Arcelor UC shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -375,11 +429,16 @@ for item in UC:
     shape['alpha']= 1.0/2.0
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= A-2*b*tf+(tw+2*r)*tf
-    shape['AreaQz']= A-hi*tw
+    shape['AreaQz']= A-hw*tw
+UC.addSetup(setUCShapeData)
     
 UB= arcelor_shapes_dictionaries.UB
-for item in UB:
-    shape= UB[item]
+def setUBShapeData(shape):
+    ''' Compute the derived properties of the Arcelor UB shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -395,7 +454,8 @@ for item in UB:
     shape['alpha']= 1.0/2.0
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= A-2*b*tf+(tw+2*r)*tf
-    shape['AreaQz']= A-hi*tw
+    shape['AreaQz']= A-hw*tw
+UB.addSetup(setUBShapeData)
 
   
 from materials.sections import structural_steel
@@ -8,8 +8,7 @@ __version__= "3.0"
 __email__= "l.pereztato@ciccp.es, ana.ortega@ciccp.es "
 
 
-import importlib.resources
-import json
+from materials.sections.structural_shapes import shape_catalog
 
 ''' ARCELOR's structural steel shapes (metric units).'''
 
@@ -59,9 +58,7 @@ import json
 
 arcelor_shapes= dict()
 
-IPE= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_ipe_profiles.json") as file:
-    IPE= json.load(file)
+IPE= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_ipe_profiles.npy"))
 arcelor_shapes['IPE']= IPE
 
 # Arcelor IPN steel shapes.
@@ -90,9 +87,7 @@ arcelor_shapes['IPE']= IPE
 # XXX Check shear distortion constants:
 #   alpha-> alphaY,alphaZ}
 
-IPN= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_ipn_profiles.json") as file:
-    IPN= json.load(file)
+IPN= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_ipn_profiles.npy"))
 arcelor_shapes['IPN']= IPN
 
 
@@ -121,9 +116,7 @@ arcelor_shapes['IPN']= IPN
 # XXX Check shear distortion constants:
 #    alpha-> alphaY,alphaZ
 
-HE= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_he_profiles.json") as file:
-    HE= json.load(file)
+HE= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_he_profiles.npy"))
 arcelor_shapes['HE']= HE
 
 
@@ -152,9 +145,7 @@ arcelor_shapes['HE']= HE
 # XXX Check shear distortion constants:
 #    alpha-> alphaY,alphaZ
 
-HL= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_hl_profiles.json") as file:
-    HL= json.load(file)
+HL= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_hl_profiles.npy"))
 arcelor_shapes['HL']= HL
 
 # Arcelor UPN steel shapes.
@@ -179,16 +170,12 @@ arcelor_shapes['HL']= HL
 # (strong axis parallel to z axis) in other words: values for Y and Z axis 
 # are swapped with respect to those in the catalog.
 
-UPN= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_upn_profiles.json") as file:
-    UPN= json.load(file)
+UPN= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_upn_profiles.npy"))
 arcelor_shapes['UPN']= UPN
 
 # Arcelor L steel shapes.
 
-L= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_l_profiles.json") as file:
-    L= json.load(file)
+L= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_l_profiles.npy"))
 arcelor_shapes['L']= L
 
 # Arcelor U shaped sheet pile.
@@ -216,9 +203,7 @@ arcelor_shapes['L']= L
 # Warning: area in m2/m, inertia in m4/m, Wz in m3/m and so on
 
 
-AU= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_au_profiles.json") as file:
-    AU= json.load(file)
+AU= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_au_profiles.npy"))
 arcelor_shapes['AU']= AU
 
 #Code to import data.
@@ -264,9 +249,7 @@ arcelor_shapes['AU']= AU
 # values are identical: no need to exchange.
 
 
-SHS= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_shs_profiles.json") as file:
-    SHS= json.load(file)
+SHS= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_shs_profiles.npy"))
 arcelor_shapes['SHS']= SHS
 
 '''
@@ -276,35 +259,25 @@ XXX Check shear distortion constants
 
 # Arcelor rectangular hollow tubes.
 
-RHS= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_rhs_profiles.json") as file:
-    RHS= json.load(file)
+RHS= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_rhs_profiles.npy"))
 arcelor_shapes['RHS']= RHS
 
 # Tata profiles
 
 # Tata steel circular hollow tubes.
-CHS= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_chs_profiles.json") as file:
-    CHS= json.load(file)
+CHS= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_chs_profiles.npy"))
 arcelor_shapes['CHS']= CHS
 
 
 # ARCELOR's hot rolled round steel bars.
-R= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_r_profiles.json") as file:
-    R= json.load(file)
+R= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_r_profiles.npy"))
 arcelor_shapes['R']= R
 
 # ARCELOR's UK universal columns.
-UC= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_uc_profiles.json") as file:
-    UC= json.load(file)
+UC= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_uc_profiles.npy"))
 arcelor_shapes['UC']= UC
 
 # ARCELOR's UK universal beams.
-UB= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "arcelor_ub_profiles.json") as file:
-    UB= json.load(file)
+UB= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("arcelor_ub_profiles.npy"))
 arcelor_shapes['UB']= UB
 
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+''' Write the binary steel shape catalogs (see shape_catalog module) from
+    the aisc_shapes_dictionaries module and the JSON files of this
+    directory. Run it each time those sources are updated:
+
+    python write_shape_catalogs.py
+'''
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AOO)"
+__copyright__= "Copyright 2022, LCPT and AOO"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import json
+from materials.sections.structural_shapes import shape_catalog
+from materials.sections.structural_shapes import aisc_shapes_dictionaries
+
+# AISC shape families.
+aiscFamilies= ['W', 'M', 'S', 'HP', 'C', 'MC', 'L', 'WT', 'MT', 'ST', 'TwoL', 'HSS', 'CHSS', 'PIPE']
+# JSON files containing a single family.
+jsonFiles= ['arcelor_ipe_profiles.json', 'arcelor_ipn_profiles.json', 'arcelor_he_profiles.json', 'arcelor_hl_profiles.json', 'arcelor_upn_profiles.json', 'arcelor_l_profiles.json', 'arcelor_au_profiles.json', 'arcelor_shs_profiles.json', 'arcelor_rhs_profiles.json', 'arcelor_chs_profiles.json', 'arcelor_r_profiles.json', 'arcelor_uc_profiles.json', 'arcelor_ub_profiles.json', 'bs_en_10210_hfshs_profiles.json']
+# JSON files containing several families.
+multipleFamilyJsonFiles= ['bs_en_10219_profiles.json', 'common_micropile_tubes.json']
+
+def get_aisc_catalog_file_name(family):
+    ''' Return the name of the catalog file for the AISC family argument.
+
+    :param family: family name (W, C, HSS,...).
+    '''
+    return 'aisc_'+family.lower()+'_shapes.npy'
+
+def get_json_catalog_file_name(jsonFileName, family= None):
+    ''' Return the name of the catalog file for the JSON file argument.
+
+    :param jsonFileName: name of the JSON file.
+    :param family: family name if the JSON file contains several families.
+    '''
+    retval= os.path.splitext(jsonFileName)[0]
+    if(family):
+        retval+= '_'+family.lower()
+    return retval+'.npy'
+
+if __name__ == "__main__":
+    for family in aiscFamilies:
+        fileName= shape_catalog.getCatalogFileName(get_aisc_catalog_file_name(family))
+        shape_catalog.writeShapeCatalog(fileName, getattr(aisc_shapes_dictionaries, family))
+        print(fileName)
+    for jsonFileName in jsonFiles+multipleFamilyJsonFiles:
+        with open(shape_catalog.getCatalogFileName(jsonFileName)) as f:
+            shapes= json.load(f)
+        if(jsonFileName in multipleFamilyJsonFiles):
+            families= shapes
+        else:
+            families= {None: shapes}
+        for family in families:
+            fileName= shape_catalog.getCatalogFileName(get_json_catalog_file_name(jsonFileName, family))
+            shape_catalog.writeShapeCatalog(fileName, families[family])
+            print(fileName)
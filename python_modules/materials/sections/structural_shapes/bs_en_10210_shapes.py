@@ -13,8 +13,12 @@ from materials.sections.structural_shapes import bs_en_10210_shapes_dictionaries
 ''' Eurocode 3 (in accordance with the UK National Annex) (BS EN 10210-2: 2006).'''
 
 HFSHS= bs_en_10210_shapes_dictionaries.HFSHS
-for item in HFSHS:
-    shape= HFSHS[item]
+def setHFSHSShapeData(shape):
+    ''' Compute the derived properties of the BS EN 10210 HFSHS shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -27,6 +31,7 @@ for item in HFSHS:
     shape['Avz']= 2*0.7*b*e
     shape['Wyel']= shape['Wzel']
     shape['Wypl']= shape['Wzpl']
+HFSHS.addSetup(setHFSHSShapeData)
 
 class HFSHSShape(structural_steel.QHShape):
     def __init__(self,steel,name):
@@ -8,8 +8,7 @@ __version__= "3.0"
 __email__= "l.pereztato@ciccp.es, ana.ortega@ciccp.es "
 
 
-import importlib.resources
-import json
+from materials.sections.structural_shapes import shape_catalog
 
 bs_en_10210_shapes= dict()
 
@@ -34,7 +33,5 @@ bs_en_10210_shapes= dict()
 # in XC (strong axis parallel to z axis) in other words: values for Y
 # and Z axis are swapped with respect to those in the catalog.
 
-HFSHS= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "bs_en_10210_hfshs_profiles.json") as file:
-    HFSHS= json.load(file)
+HFSHS= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("bs_en_10210_hfshs_profiles.npy"))
 bs_en_10210_shapes['HFSHS']= HFSHS
@@ -13,8 +13,12 @@ from materials.sections.structural_shapes import bs_en_10219_shapes_dictionaries
 # EN 10219 cold formed square hollow tubes.
 
 CFSHS= bs_en_10219_shapes_dictionaries.shapes['CFSHS']
-for item in CFSHS:
-    shape= CFSHS[item]
+def setCFSHSShapeData(shape):
+    ''' Compute the derived properties of the EN 10219 CFSHS shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -27,6 +31,7 @@ for item in CFSHS:
     shape['Avz']= 2*0.7*b*e
     shape['Wyel']= shape['Wzel']
     shape['Wypl']= shape['Wzpl']
+CFSHS.addSetup(setCFSHSShapeData)
     
 class CFSHSShape(structural_steel.QHShape):
     ''' Cold formed square hollow sections according to 
@@ -46,8 +51,12 @@ class CFSHSShape(structural_steel.QHShape):
 #  EN 10219 cold formed rectangular hollow tubes.
 
 CFRHS= bs_en_10219_shapes_dictionaries.shapes['RHS']
-for item in CFRHS:
-    shape= CFRHS[item]
+def setCFRHSShapeData(shape):
+    ''' Compute the derived properties of the EN 10219 CFRHS shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -58,6 +67,7 @@ for item in CFRHS:
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= 2*0.7*h*e
     shape['AreaQz']= 2*0.7*b*e
+CFRHS.addSetup(setCFRHSShapeData)
     
 class CFRHSShape(structural_steel.QHShape):
     ''' Cold formed rectangular hollow sections according to 
@@ -77,8 +87,12 @@ class CFRHSShape(structural_steel.QHShape):
 # EN 10219 cold formed circular hollow tubes.
 
 CFCHS= bs_en_10219_shapes_dictionaries.shapes['CFCHS']
-for item in CFCHS:
-    shape= CFCHS[item]
+def setCFCHSShapeData(shape):
+    ''' Compute the derived properties of the EN 10219 CFCHS shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -86,6 +100,7 @@ for item in CFCHS:
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= 0.5*A
     shape['AreaQz']= 0.5*A
+CFCHS.addSetup(setCFCHSShapeData)
 
 class CFCHSShape(structural_steel.SteelShape):
     ''' Cold formed circular hollow sections according to 
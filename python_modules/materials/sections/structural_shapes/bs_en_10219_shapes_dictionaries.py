@@ -8,8 +8,7 @@ __version__= "3.0"
 __email__= "l.pereztato@ciccp.es, ana.ortega@ciccp.es "
 
 
-import importlib.resources
-import json
+from materials.sections.structural_shapes import shape_catalog
 
 bs_en_10210_shapes= dict()
 
@@ -32,6 +31,7 @@ bs_en_10210_shapes= dict()
 # in XC (strong axis parallel to z axis) in other words: values for Y
 # and Z axis are swapped with respect to those in the catalog.
 
-shapes= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "bs_en_10219_profiles.json") as file:
-    shapes= json.load(file)
+shapes= dict()
+shapes['CFCHS']= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("bs_en_10219_profiles_cfchs.npy"))
+shapes['CFSHS']= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("bs_en_10219_profiles_cfshs.npy"))
+shapes['RHS']= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("bs_en_10219_profiles_rhs.npy"))
@@ -8,8 +8,7 @@ __version__= "3.0"
 __email__= "l.pereztato@ciccp.es, ana.ortega@ciccp.es "
 
 
-import importlib.resources
-import json
+from materials.sections.structural_shapes import shape_catalog
 
 # Section axis: 
 
@@ -30,6 +29,5 @@ import json
 # in XC (strong axis parallel to z axis) in other words: values for Y
 # and Z axis are swapped with respect to those in the catalog.
 
-shapes= None
-with importlib.resources.open_text("materials.sections.structural_shapes.aux", "common_micropile_tubes.json") as file:
-    shapes= json.load(file)
+shapes= dict()
+shapes['MP']= shape_catalog.ShapeCatalog(shape_catalog.getCatalogFileName("common_micropile_tubes_mp.npy"))
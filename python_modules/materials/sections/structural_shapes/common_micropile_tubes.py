@@ -13,8 +13,12 @@ from materials.sections.structural_shapes import common_micropile_shapes_diction
 # Micropile circular hollow tubes.
 
 MP=  common_micropile_shapes_dictionaries.shapes['MP']
-for item in MP:
-    shape= MP[item]
+def setMPShapeData(shape):
+    ''' Compute the derived properties of the micropile tube shape
+        argument (called when the shape is looked up in the catalog).
+
+    :param shape: dictionary containing the properties of the shape.
+    '''
     A= shape['A']
     E= shape['E']
     nu= shape['nu']
@@ -22,6 +26,7 @@ for item in MP:
     shape['G']= E/(2*(1+nu))
     shape['AreaQy']= 0.5*A
     shape['AreaQz']= 0.5*A
+MP.addSetup(setMPShapeData)
 
 class MicropileTubeShape(structural_steel.CHShape):
     ''' Cold formed circular hollow sections according to 
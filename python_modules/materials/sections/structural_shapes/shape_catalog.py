@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+''' Steel shape catalogs stored in compact binary tables.
+
+    Each family of shapes (AISC W shapes, Arcelor IPE shapes,...) is
+    stored in a NumPy file (.npy) containing a structured array with one
+    record for each shape and one column for each property. The file is
+    memory mapped the first time the catalog is accessed, and the
+    dictionary of a shape is created only when the shape is looked up by
+    its designation, so importing the modules that define the catalogs
+    doesn't read any data.
+
+    The binary files are written from the catalog sources (the
+    aisc_shapes_dictionaries module and the JSON files in the aux
+    directory) by the aux/write_shape_catalogs.py script.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AOO)"
+__copyright__= "Copyright 2022, LCPT and AOO"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import ast
+import collections.abc
+import numpy
+
+# Directory containing the catalog files.
+catalogDirectory= os.path.join(os.path.dirname(os.path.abspath(__file__)), 'aux')
+
+# Name of the column that contains the designation of the shapes.
+keyColumnName= '_key'
+# Prefix of the columns that store the type of the values of a property
+# whose values are not all of the same type.
+kindColumnPrefix= '_kind_'
+# Types of the values stored in the kind columns.
+valueKinds= [float, int, bool, str, type(None)]
+missingValueKind= len(valueKinds) # property not defined for the shape.
+# Type of the values of each column type.
+columnKinds= {'U': str, '?': bool, 'i': int, 'f': float}
+
+def getCatalogFileName(fileName):
+    ''' Return the path of the catalog file argument.
+
+    :param fileName: name of the catalog file (i.e. 'aisc_w_shapes.npy').
+    '''
+    return os.path.join(catalogDirectory, fileName)
+
+def getValueKind(value):
+    ''' Return the index of the type of the value argument in valueKinds.
+
+    :param value: value to classify.
+    '''
+    return valueKinds.index(type(value))
+
+def getShapeTable(shapes):
+    ''' Return a structured array containing the properties of the shapes
+        of the dictionary argument (see writeShapeCatalog).
+
+    :param shapes: dictionary containing the properties of each shape
+                   (i.e. aisc_shapes_dictionaries.W).
+    '''
+    keys= list(shapes.keys())
+    # Property names in order of appearance (a property that is not
+    # defined for all the shapes is placed after the property that
+    # precedes it in the first shape that defines it, so the dictionaries
+    # of the shapes keep the order of the source).
+    propertyNames= list()
+    for key in keys:
+        position= 0
+        for name in shapes[key]:
+            if(name in propertyNames):
+                position= propertyNames.index(name)+1
+            else:
+                propertyNames.insert(position, name)
+                position+= 1
+    dtype= [(keyColumnName, 'U'+str(max([len(key) for key in keys]+[1])))]
+    columns= {keyColumnName: keys}
+    for name in propertyNames:
+        values= list()
+        kinds= list()
+        for key in keys:
+            shape= shapes[key]
+            if(name in shape):
+                values.append(shape[name])
+                kinds.append(getValueKind(shape[name]))
+            else:
+                values.append(None)
+                kinds.append(missingValueKind)
+        presentKinds= set(kinds)
+        if(presentKinds=={valueKinds.index(str)}):
+            columnType= 'U'
+        elif(presentKinds=={valueKinds.index(bool)}):
+            columnType= '?'
+        elif(presentKinds=={valueKinds.index(int)}):
+            columnType= 'i8'
+        elif(valueKinds.index(str) not in presentKinds):
+            columnType= 'f8'
+            values= [float(v) if (v is not None) else numpy.nan for v in values]
+        else: # mixed strings and other values.
+            columnType= 'U'
+            values= [v if isinstance(v, str) else repr(v) for v in values]
+        if(columnType=='U'):
+            columnType+= str(max([len(v) for v in values]+[1]))
+        dtype.append((name, columnType))
+        columns[name]= values
+        # Store the type of each value if it can't be deduced from the
+        # column type.
+        if(presentKinds!={valueKinds.index(columnKinds[columnType[0]])}):
+            kindName= kindColumnPrefix+name
+            dtype.append((kindName, 'u1'))
+            columns[kindName]= kinds
+    retval= numpy.zeros(len(keys), dtype= dtype)
+    for name in columns:
+        retval[name]= columns[name]
+    return retval
+
+def writeShapeCatalog(fileName, shapes):
+    ''' Write the properties of the shapes of the dictionary argument in
+        a binary file.
+
+    :param fileName: name of the output file.
+    :param shapes: dictionary containing the properties of each shape
+                   (i.e. aisc_shapes_dictionaries.W).
+    '''
+    numpy.save(fileName, getShapeTable(shapes), allow_pickle= False)
+
+class ShapeCatalog(collections.abc.MutableMapping):
+    ''' Family of steel shapes stored in a binary table (see
+        writeShapeCatalog). It behaves like the dictionary of shapes
+        used to define it: the shapes are looked up by designation and
+        each one of them is a dictionary containing its properties.
+
+    :ivar fileName: name of the catalog file.
+    :ivar setupFunctions: functions called on the dictionary of each
+                          shape when it's created (i.e. to compute its
+                          shear areas).
+    '''
+    def __init__(self, fileName, setupFunctions= None):
+        ''' Constructor.
+
+        :param fileName: name of the catalog file.
+        :param setupFunctions: functions called on the dictionary of each
+                               shape when it's created.
+        '''
+        self.fileName= fileName
+        self.setupFunctions= list()
+        if(setupFunctions):
+            self.setupFunctions.extend(setupFunctions)
+        self._table= None # Memory mapped table.
+        self._index= None # Row of each designation in the table.
+        self._keys= None # Designations of the shapes.
+        self._shapes= dict() # Shapes already created.
+
+    def load(self):
+        ''' Map the catalog file into memory and read the designations of
+            the shapes (if not already done).'''
+        if(self._table is None):
+            self._table= numpy.load(self.fileName, mmap_mode= 'r', allow_pickle= False)
+            self._keys= self._table[keyColumnName].tolist()
+            self._index= dict(zip(self._keys, range(0, len(self._keys))))
+
+    def getPropertyNames(self):
+        ''' Return the names of the properties stored in the catalog.'''
+        self.load()
+        return [name for name in self._table.dtype.names if not name.startswith('_')]
+
+    def getPropertyValues(self, name, keys= None):
+        ''' Return an array containing the values of the given property
+            for the shapes whose designations are passed as argument
+            (NaN if the property is not defined for a shape or it's not a
+            number). The values are read directly from the table so the
+            dictionaries of the shapes are not created.
+
+        :param name: name of the property (i.e. 'A', 'Wzpl',...).
+        :param keys: designations of the shapes (defaults to all the shapes
+                     of the catalog).
+        '''
+        self.load()
+        if(keys is None):
+            keys= self._keys
+        retval= numpy.full(len(keys), numpy.nan)
+        names= self._table.dtype.names
+        if((name in names) and (self._table.dtype[name].kind in 'biuf')):
+            stored= [(i, self._index[key]) for i, key in enumerate(keys) if (key in self._index) and (key not in self._shapes)]
+            if(stored):
+                positions, rows= zip(*stored)
+                retval[list(positions)]= self._table[name][list(rows)]
+        # Shapes already created (their values may have been modified) and
+        # shapes added after loading the table.
+        for i, key in enumerate(keys):
+            shape= self._shapes.get(key, None)
+            if(shape is not None):
+                value= shape.get(name, None)
+                if(isinstance(value, (int, float)) and not isinstance(value, bool)):
+                    retval[i]= value
+        return retval
+
+    def _createShape(self, row):
+        ''' Return the dictionary of the shape stored in the given row.'''
+        record= self._table[row]
+        names= self._table.dtype.names
+        retval= dict()
+        for name in names:
+            if(not name.startswith('_')):
+                value= record[name].item()
+                kindName= kindColumnPrefix+name
+                if(kindName in names):
+                    kind= int(record[kindName])
+                    if(kind==missingValueKind):
+                        continue
+                    valueType= valueKinds[kind]
+                    if(valueType is type(None)):
+                        value= None
+                    elif(isinstance(value, str)):
+                        if(valueType is not str): # stored as repr(value).
+                            value= ast.literal_eval(value)
+                    else:
+                        value= valueType(value)
+                retval[name]= value
+        for function in self.setupFunctions:
+            function(retval)
+        return retval
+
+    def addSetup(self, function):
+        ''' Add a function to call on the dictionary of each shape when
+            it's created. The function is also called on the shapes
+            already created.
+
+        :param function: function whose argument is the shape dictionary.
+        '''
+        self.setupFunctions.append(function)
+        for key in self._shapes:
+            function(self._shapes[key])
+
+    def __getitem__(self, key):
+        ''' Return the dictionary of the shape with the given designation.
+
+        :param key: designation of the shape (i.e. 'W14X90').
+        '''
+        retval= self._shapes.get(key, None)
+        if(retval is None):
+            self.load()
+            row= self._index[key] # raises KeyError if not found.
+            retval= self._createShape(row)
+            self._shapes[key]= retval
+        return retval
+
+    def __setitem__(self, key, value):
+        ''' Add or replace a shape.
+
+        :param key: designation of the shape.
+        :param value: dictionary containing the properties of the shape.
+        '''
+        self.load()
+        if((key not in self._index) and (key not in self._shapes)):
+            self._keys.append(key)
+        self._shapes[key]= value
+
+    def __delitem__(self, key):
+        ''' Remove a shape.
+
+        :param key: designation of the shape.
+        '''
+        self.load()
+        if(key not in self):
+            raise KeyError(key)
+        self._keys.remove(key)
+        self._index.pop(key, None)
+        self._shapes.pop(key, None)
+
+    def __contains__(self, key):
+        ''' Return true if the catalog contains a shape with the given
+            designation (the shape is not created).
+
+        :param key: designation of the shape.
+        '''
+        self.load()
+        return (key in self._index) or (key in self._shapes)
+
+    def __iter__(self):
+        ''' Iterate over the designations of the shapes.'''
+        self.load()
+        return iter(list(self._keys))
+
+    def __len__(self):
+        ''' Return the number of shapes in the catalog.'''
+        self.load()
+        return len(self._keys)
+
+    def __repr__(self):
+        return type(self).__name__+'('+repr(os.path.basename(self.fileName))+')'
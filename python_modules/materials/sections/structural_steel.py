@@ -11,6 +11,7 @@ __version__= "3.0"
 __email__= " ana.Ortega.Ort@gmail.com, l.pereztato@gmail.com"
 
 import math
+import numpy as np
 from materials.sections import section_properties as sp
 from postprocess import def_vars_control as vc
 from misc_utils import log_messages as lmsg
@@ -200,6 +201,27 @@ class SteelShape(sp.SectionProperties):
         '''
         return min(self.getNcrY(LeqY),self.getNcrZ(LeqZ))
 
+    def getBiaxialBendingEfficiencies(self, Nd, Myd, Mzd, Vyd, chiN, chiLT):
+        '''Return the biaxial bending efficiencies for the internal forces
+           in the arguments (one value for each load combination). Each
+           component of the returned tuple is a numpy array with the
+           corresponding value (CF, NcRd, McRdy, McRdz, MvRdz, MbRdz) of
+           getBiaxialBendingEfficiency for each combination.
+
+           This implementation calls getBiaxialBendingEfficiency for each
+           combination; the derived classes can redefine it to compute the
+           section strengths only once.
+
+        :param Nd: required axial strengths (array).
+        :param Myd: required bending strengths, minor axis (array).
+        :param Mzd: required bending strengths, major axis (array).
+        :param Vyd: required shear strengths, major axis (array).
+        :param chiN: axial load reduction factors (array).
+        :param chiLT: lateral buckling reduction factors (array).
+        '''
+        values= [self.getBiaxialBendingEfficiency(Nd= float(n), Myd= float(my), Mzd= float(mz), Vyd= float(vy), chiN= float(cN), chiLT= float(cLT)) for n, my, mz, vy, cN, cLT in zip(Nd, Myd, Mzd, Vyd, chiN, chiLT)]
+        return tuple(np.array(column, dtype= float) for column in zip(*values))
+
     def setupULSControlVars(self,elems):
         '''For each element creates the variables
            needed to check ultimate limit state criterion to satisfy.
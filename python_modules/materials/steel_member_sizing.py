@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+''' Automatic sizing of steel members: choose the lightest shape of one
+    or more shape catalogs that satisfies the limit state checks under
+    the internal forces of a group of members.
+
+    The candidates are first filtered with vectorized necessary
+    conditions computed from the catalog columns (the plastic
+    resistances of the gross section, computed without material safety
+    factors and reduction factors, can't be smaller than the design
+    forces). The remaining shapes are checked by increasing weight using
+    the limit state controllers (see the getShapeEfficiencies method of
+    the EC3 and AISC controllers), so the first shape that passes is the
+    lightest one.
+
+    All the members of a group get the same shape, so the members that
+    must share a designation (i.e. the columns of a frame line or members
+    connected by a splice) are sized jointly by putting them in the same
+    group.
+'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com ana.ortega@ciccp.es"
+
+import re
+import sys
+import copy
+import numpy
+from misc_utils import log_messages as lmsg
+
+def get_catalog_property_values(catalog, keys, propertyName):
+    ''' Return an array containing the values of the property argument for
+        the shapes of the catalog whose designations are passed as argument
+        (NaN if the property is not defined or is not a number).
+
+    :param catalog: shape catalog (ShapeCatalog object or dictionary of
+                    shapes).
+    :param keys: designations of the shapes.
+    :param propertyName: name of the property ('P', 'A', 'Wzpl',...).
+    '''
+    if(hasattr(catalog, 'getPropertyValues')): # binary catalog.
+        retval= catalog.getPropertyValues(propertyName, keys)
+    else:
+        retval= numpy.full(len(keys), numpy.nan)
+        for i, key in enumerate(keys):
+            value= catalog[key].get(propertyName, None)
+            if(isinstance(value, (int, float)) and not isinstance(value, bool)):
+                retval[i]= value
+    return retval
+
+class ShapeCandidates(object):
+    ''' Shapes of a catalog that can be chosen for a group of members.
+
+    :ivar shapeClass: class of the steel shapes (i.e. EC3_materials.IPEShape
+                      or ASTM_materials.WShape). Its constructor receives
+                      the steel material and the shape designation.
+    :ivar steel: steel material of the shapes.
+    :ivar catalog: catalog containing the shapes of the family (i.e.
+                   arcelor_metric_shapes.IPE or aisc_metric_shapes.W).
+    :ivar namePattern: regular expression that the designations of the
+                       candidates must match (None: all the shapes).
+    :ivar minDepth: minimum depth of the candidates (None: no limit).
+    :ivar maxDepth: maximum depth of the candidates (None: no limit).
+    :ivar depthPropertyName: name of the property that contains the depth
+                             of the shapes.
+    :ivar shapeSetup: function called on each candidate shape after its
+                      creation (i.e. to set its section class).
+    :ivar maxSectionClass: candidates whose section class (Eurocode 3
+                           classification) is greater than this value are
+                           discarded (the EC3 biaxial bending check only
+                           considers class 1 and 2 sections).
+    '''
+    weightPropertyName= 'P' # mass per unit length.
+    maxSectionClass= 2
+
+    def __init__(self, shapeClass, steel, catalog, namePattern= None, minDepth= None, maxDepth= None, depthPropertyName= 'h', shapeSetup= None):
+        ''' Constructor.
+
+        :param shapeClass: class of the steel shapes.
+        :param steel: steel material of the shapes.
+        :param catalog: catalog containing the shapes of the family.
+        :param namePattern: regular expression that the designations of
+                            the candidates must match.
+        :param minDepth: minimum depth of the candidates.
+        :param maxDepth: maximum depth of the candidates.
+        :param depthPropertyName: name of the property that contains the
+                                  depth of the shapes.
+        :param shapeSetup: function called on each candidate shape after
+                           its creation.
+        '''
+        self.shapeClass= shapeClass
+        self.steel= steel
+        self.catalog= catalog
+        self.namePattern= namePattern
+        self.minDepth= minDepth
+        self.maxDepth= maxDepth
+        self.depthPropertyName= depthPropertyName
+        self.shapeSetup= shapeSetup
+
+    def getNames(self):
+        ''' Return the designations of the shapes of the catalog that
+            satisfy the name and depth constraints.'''
+        retval= list(self.catalog.keys())
+        if(self.namePattern):
+            regex= re.compile(self.namePattern)
+            retval= [key for key in retval if regex.match(key)]
+        if((self.minDepth is not None) or (self.maxDepth is not None)):
+            depths= get_catalog_property_values(self.catalog, retval, self.depthPropertyName)
+            valid= numpy.isfinite(depths)
+            if(self.minDepth is not None):
+                valid&= (depths>=self.minDepth)
+            if(self.maxDepth is not None):
+                valid&= (depths<=self.maxDepth)
+            retval= [key for key, ok in zip(retval, valid) if ok]
+        return retval
+
+    def getPropertyValues(self, names, propertyName):
+        ''' Return an array containing the values of the property argument
+            for the shapes whose designations are passed as argument.
+
+        :param names: designations of the shapes.
+        :param propertyName: name of the property.
+        '''
+        return get_catalog_property_values(self.catalog, names, propertyName)
+
+    def getFeasible(self, names, maxN, maxMy, maxMz):
+        ''' Return a boolean array that is false for the shapes that can't
+            resist the given internal forces even with their plastic
+            resistance (a property that is not available in the catalog
+            doesn't discard any shape).
+
+        :param names: designations of the shapes.
+        :param maxN: maximum absolute value of the axial force.
+        :param maxMy: maximum absolute value of the bending moment about
+                      the y axis (minor axis).
+        :param maxMz: maximum absolute value of the bending moment about
+                      the z axis (major axis).
+        '''
+        fy= self.steel.fy
+        retval= numpy.ones(len(names), dtype= bool)
+        for propertyName, requiredValue in [('A', maxN), ('Wypl', maxMy), ('Wzpl', maxMz)]:
+            if(requiredValue>0.0):
+                resistance= self.getPropertyValues(names, propertyName)*fy
+                retval&= ~(resistance<requiredValue) # NaN values don't discard.
+        return retval
+
+    def createShape(self, name, compression= True):
+        ''' Return the steel shape object corresponding to the given
+            designation (None if its section class is greater than
+            maxSectionClass).
+
+        :param name: designation of the shape.
+        :param compression: true if the shape is subjected to compression
+                            (used to classify the Eurocode 3 sections if
+                            shapeSetup is not defined).
+        '''
+        retval= self.shapeClass(self.steel, name)
+        if(self.shapeSetup):
+            self.shapeSetup(retval)
+        elif(getattr(retval, 'sectionClass', 0) is None): # Eurocode 3 shapes.
+            if(compression):
+                retval.sectionClass= retval.getClassInCompression() # conservative.
+            else:
+                retval.sectionClass= retval.getClassInBending()
+        if(getattr(retval, 'sectionClass', 0)>self.maxSectionClass):
+            retval= None
+        return retval
+
+class SizingGroup(object):
+    ''' Members that must have the same steel shape.
+
+    :ivar name: name of the group.
+    :ivar internalForces: internal forces acting on the sections of the
+                          elements of the group (list of
+                          CrossSectionInternalForces objects, one for each
+                          element section and combination).
+    :ivar members: steel members of the group (see steel_member_base
+                   module); if not None their buckling reduction factors
+                   are computed for each candidate shape (otherwise the
+                   chiN and chiLT values of the internal forces are used).
+    :ivar shape: shape chosen for the group (None if no candidate passed).
+    :ivar efficiency: efficiency of the chosen shape.
+    :ivar numberOfChecks: number of candidate shapes checked.
+    '''
+    def __init__(self, name, internalForces, members= None):
+        ''' Constructor.
+
+        :param name: name of the group.
+        :param internalForces: internal forces acting on the sections of
+                               the elements of the group.
+        :param members: steel members of the group (their elements must be
+                        already created).
+        '''
+        self.name= name
+        self.internalForces= internalForces
+        self.members= members
+        self.shape= None
+        self.efficiency= None
+        self.numberOfChecks= 0
+
+    def hasCompression(self):
+        ''' Return true if the members of the group are compressed under
+            any of the combinations.'''
+        retval= False
+        for lf in self.internalForces:
+            if(lf.N<0.0):
+                retval= True
+                break
+        return retval
+
+    def getInternalForcesEnvelope(self):
+        ''' Return the maximum absolute values of the axial force and the
+            bending moments of the group.'''
+        retval= [0.0, 0.0, 0.0]
+        for lf in self.internalForces:
+            retval= [max(retval[0], abs(lf.N)), max(retval[1], abs(lf.My)), max(retval[2], abs(lf.Mz))]
+        return retval
+
+    def setShape(self, shape):
+        ''' Assign the shape argument to the members of the group and
+            update their reduction factors.
+
+        :param shape: steel shape.
+        '''
+        if(self.members):
+            for m in self.members:
+                m.shape= shape
+                m.updateReductionFactors()
+
+    def getInternalForces(self, shape):
+        ''' Return the internal forces of the group with the reduction
+            factors (chiN, chiLT) that correspond to the shape argument.
+
+        :param shape: steel shape.
+        '''
+        retval= list()
+        if(self.members):
+            self.setShape(shape)
+            reductionFactors= dict()
+            for m in self.members:
+                for e in m.elemSet:
+                    reductionFactors[e.tag]= (e.getProp('chiN') if e.hasProp('chiN') else None, e.getProp('chiLT') if e.hasProp('chiLT') else None)
+            for lf in self.internalForces:
+                chiN, chiLT= reductionFactors.get(lf.tagElem, (None, None))
+                lfCopy= copy.copy(lf)
+                lfCopy.chiN= chiN if (chiN is not None) else getattr(lf, 'chiN', 1.0)
+                lfCopy.chiLT= chiLT if (chiLT is not None) else getattr(lf, 'chiLT', 1.0)
+                retval.append(lfCopy)
+        else:
+            for lf in self.internalForces:
+                if(hasattr(lf, 'chiN') and hasattr(lf, 'chiLT')):
+                    retval.append(lf)
+                else:
+                    lfCopy= copy.copy(lf)
+                    lfCopy.chiN= getattr(lf, 'chiN', 1.0)
+                    lfCopy.chiLT= getattr(lf, 'chiLT', 1.0)
+                    retval.append(lfCopy)
+        return retval
+
+def get_group_internal_forces(internalForcesValues, elementTags):
+    ''' Return the internal forces of the elements whose tags are passed
+        as argument.
+
+    :param internalForcesValues: dictionary containing the internal forces
+                                 of each element (see readIntForcesFile in
+                                 the limit_state_data module).
+    :param elementTags: tags of the elements of the group.
+    '''
+    retval= list()
+    for tag in elementTags:
+        retval.extend(internalForcesValues.get(tag, list()))
+    return retval
+
+class MemberSizer(object):
+    ''' Choose the lightest steel shape that satisfies the limit state
+        checks for each group of members.
+
+    :ivar candidates: list of ShapeCandidates objects (the shapes of all
+                      of them are sorted by weight).
+    :ivar controllers: limit state controllers (i.e. the biaxial bending
+                       and shear controllers of EC3 or AISC).
+    :ivar maxEfficiency: maximum efficiency allowed.
+    '''
+    def __init__(self, candidates, controllers, maxEfficiency= 1.0):
+        ''' Constructor.
+
+        :param candidates: list of ShapeCandidates objects.
+        :param controllers: limit state controllers.
+        :param maxEfficiency: maximum efficiency allowed.
+        '''
+        self.candidates= candidates
+        self.controllers= controllers
+        self.maxEfficiency= maxEfficiency
+
+    def getSortedCandidates(self, group):
+        ''' Return the candidates that satisfy the necessary conditions for
+            the group argument as (weight, candidates index, designation)
+            tuples sorted by weight.
+
+        :param group: group of members to size.
+        '''
+        maxN, maxMy, maxMz= group.getInternalForcesEnvelope()
+        retval= list()
+        for i, candidates in enumerate(self.candidates):
+            names= candidates.getNames()
+            weights= candidates.getPropertyValues(names, candidates.weightPropertyName)
+            feasible= candidates.getFeasible(names, maxN, maxMy, maxMz)
+            for j in numpy.flatnonzero(feasible):
+                weight= weights[j] if numpy.isfinite(weights[j]) else numpy.inf
+                retval.append((weight, i, names[j]))
+        retval.sort(key= lambda item: (item[0], item[1])) # stable: keeps the catalog order.
+        return retval
+
+    def getEfficiency(self, shape, group):
+        ''' Return the maximum efficiency of the shape argument under the
+            internal forces of the group.
+
+        :param shape: steel shape to check.
+        :param group: group of members.
+        '''
+        internalForces= group.getInternalForces(shape)
+        retval= 0.0
+        for controller in self.controllers:
+            CFs= controller.getShapeEfficiencies(shape, internalForces)
+            if(CFs is None): # can't be checked.
+                return numpy.inf
+            if(len(CFs)>0):
+                retval= max(retval, float(numpy.max(CFs)))
+        return retval
+
+    def sizeGroup(self, group):
+        ''' Choose the lightest candidate shape whose efficiency is not
+            greater than maxEfficiency under the internal forces of the
+            group. Return the chosen shape (None if no candidate passes).
+
+        :param group: group of members to size.
+        '''
+        group.shape= None
+        group.efficiency= None
+        group.numberOfChecks= 0
+        compression= group.hasCompression()
+        for weight, i, name in self.getSortedCandidates(group):
+            shape= self.candidates[i].createShape(name, compression)
+            if(shape is None): # section class not supported.
+                continue
+            CF= self.getEfficiency(shape, group)
+            group.numberOfChecks+= 1
+            if(CF<=self.maxEfficiency):
+                group.shape= shape
+                group.efficiency= CF
+                break
+        if(group.shape is None):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.warning(className+'.'+methodName+'; no candidate shape satisfies the checks for group: '+str(group.name))
+        else:
+            group.setShape(group.shape)
+        return group.shape
+
+    def sizeGroups(self, groups):
+        ''' Size each of the groups argument. Return a dictionary containing
+            the shape chosen for each group.
+
+        :param groups: groups of members to size.
+        '''
+        retval= dict()
+        for group in groups:
+            retval[group.name]= self.sizeGroup(group)
+        return retval
@@ -1172,6 +1172,16 @@ class PredefinedSpace(object):
         result= self.preprocessor.getNodeHandler.calculateNodalReactions(includeInertia, reactionCheckTolerance)
         return result
         
+    def getAnalysis(self):
+        ''' Return the analysis used by the analyze method (it is created
+            if needed using the solution procedure type of the model
+            space).'''
+        if(not self.analysis):
+            solProc= self.solutionProcedureType(self.getProblem())
+            solProc.setup()
+            self.analysis= solProc.analysis
+        return self.analysis
+
     def analyze(self, numSteps= 1, calculateNodalReactions= False, includeInertia= False, reactionCheckTolerance= 1e-7):
         ''' Triggers the analysis of the model with a simple static linear
             solution.
@@ -1188,13 +1198,7 @@ class PredefinedSpace(object):
             className= type(self).__name__
             methodName= sys._getframe(0).f_code.co_name
             lmsg.error(className+'.'+methodName+'; number of steps must be greater than zero. Setting numSteps= '+str(numSteps))
-        result= 0
-        problem= self.getProblem()
-        if(not self.analysis):
-            solProc= self.solutionProcedureType(problem)
-            solProc.setup()
-            self.analysis= solProc.analysis
-        result= self.analysis.analyze(numSteps)
+        result= self.getAnalysis().analyze(numSteps)
         if(result!=0):
             className= type(self).__name__
             methodName= sys._getframe(0).f_code.co_name
@@ -14,6 +14,7 @@ import geom
 import xc
 import math
 from misc_utils import log_messages as lmsg
+from model.sets import spatial_index
 
 def get_subset_inside(geomObj,fromSet,toSetName,tol=0.0):
     '''return a subset of fromSet composed by the entities inside the 
@@ -152,15 +153,10 @@ def set_included_in_orthoPrism(preprocessor,setInit,prismBase,prismAxis,setName)
     :param prismAxis:    axis of the prism (can be equal to 'X', 'Y', 'Z')
     :param setName:      name of the set to be generated                   
     '''
-    sElIni=setInit.elements
-    if prismAxis in ['X','x']:
-        elem_inside_prism=[e for e in sElIni if prismBase.In(geom.Pos2d(e.getPosCentroid(True).y,e.getPosCentroid(True).z),0)]
-    elif prismAxis in ['Y','y']:
-        elem_inside_prism=[e for e in sElIni if prismBase.In(geom.Pos2d(e.getPosCentroid(True).x,e.getPosCentroid(True).z),0)]
-    elif prismAxis in ['Z','z']:
-        elem_inside_prism=[e for e in sElIni if prismBase.In(geom.Pos2d(e.getPosCentroid(True).x,e.getPosCentroid(True).y),0)]
-    else:
-        lmsg.error("Wrong prisma axis. Available values: 'X', 'Y', 'Z' \n")
+    elem_inside_prism= list()
+    axis= spatial_index.get_axis_index(prismAxis)
+    if(axis is not None):
+        elem_inside_prism= spatial_index.get_spatial_index(setInit).getElementsInsideOrthoPrism(prismBase, axis)
     s=lstElem_to_set(preprocessor,elem_inside_prism,setName)
     s.fillDownwards()
     return s
@@ -314,19 +310,7 @@ def get_nodes_pos3D_wire(setBusq,lstPos3DWire,tol=0.01):
     the line defined by the successive points in list `lstPos3DWire`  
     (expressed as geom.Pos3d(x,y,z))
     '''
-    nodAux= setBusq.nodes
-    nodTags=set()
-    retval= list() 
-    for i in range(0,len(lstPos3DWire)-1):
-        segmAux= geom.Segment3d(lstPos3DWire[i],lstPos3DWire[i+1])
-        for n in nodAux:
-            p= n.getInitialPos3d
-            d= p.dist(segmAux)
-            if(d<tol):
-                if n.tag not in nodTags:
-                    nodTags.add(n.tag)
-                    retval.append(n)
-    return retval
+    return spatial_index.get_spatial_index(setBusq).getNodesNearPolyline(lstPos3DWire, tol)
 
 
 def get_set_nodes_plane_XY(setName,setBusq,zCoord,tol=1e-4):
@@ -339,8 +323,7 @@ def get_set_nodes_plane_XY(setName,setBusq,zCoord,tol=1e-4):
     :param tol: tolerance (defaults to 1e-4)
     '''
     prep=setBusq.getPreprocessor
-    sNodBusq=setBusq.nodes
-    nodInPlane=[n for n in sNodBusq if abs(n.getCurrentPos3d(0).z-zCoord)<=tol]
+    nodInPlane= spatial_index.get_spatial_index(setBusq).getNodesNearPlane(axis= 2, coord= zCoord, tol= tol)
     return lstNod_to_set(prep,nodInPlane,setName)
     
     
@@ -354,8 +337,7 @@ def get_set_nodes_plane_XZ(setName,setBusq,yCoord,tol=1e-4):
     :param tol: tolerance (defaults to 1e-4)
     '''
     prep=setBusq.getPreprocessor
-    sNodBusq=setBusq.nodes
-    nodInPlane=[n for n in sNodBusq if abs(n.getCurrentPos3d(0).y-yCoord)<=tol]
+    nodInPlane= spatial_index.get_spatial_index(setBusq).getNodesNearPlane(axis= 1, coord= yCoord, tol= tol)
     return lstNod_to_set(prep,nodInPlane,setName)
     
     
@@ -369,8 +351,7 @@ def get_set_nodes_plane_YZ(setName,setBusq,xCoord,tol=1e-4):
     :param tol: tolerance (defaults to 1e-4)
     '''
     prep=setBusq.getPreprocessor
-    sNodBusq=setBusq.nodes
-    nodInPlane=[n for n in sNodBusq if abs(n.getCurrentPos3d(0).x-xCoord)<=tol]
+    nodInPlane= spatial_index.get_spatial_index(setBusq).getNodesNearPlane(axis= 0, coord= xCoord, tol= tol)
     return lstNod_to_set(prep,nodInPlane,setName)
 
 def get_lstNod_from_lst3DPos(preprocessor,lst3DPos):
@@ -430,6 +411,7 @@ def rot_X(toSet,angle):
     xAxis= geom.Line3d(geom.Pos3d(0.0,0.0,0.0), geom.Pos3d(100.0,0.0,0.0))
     rot= xc.Rotation(geom.Rotation3d(xAxis,math.radians(angle)))
     toSet.transforms(rot)
+    spatial_index.notify_geometry_change()
 
 def rot_Y(toSet,angle):
     '''Apply a rotation around global Y axis to
@@ -441,6 +423,7 @@ def rot_Y(toSet,angle):
     yAxis= geom.Line3d(geom.Pos3d(0.0,0.0,0.0), geom.Pos3d(0.0,100.0,0.0))
     rot= xc.Rotation(geom.Rotation3d(yAxis,math.radians(angle)))
     toSet.transforms(rot)
+    spatial_index.notify_geometry_change()
 
 def rot_Z(toSet,angle):
     '''Apply a rotation around global Z axis to
@@ -452,6 +435,7 @@ def rot_Z(toSet,angle):
     zAxis= geom.Line3d(geom.Pos3d(0.0,0.0,0.0), geom.Pos3d(0.0,0.0,100.0))
     rot= xc.Rotation(geom.Rotation3d(zAxis,math.radians(angle)))
     toSet.transforms(rot)
+    spatial_index.notify_geometry_change()
 
 def translat(toSet,deltaXYZ):
     '''Apply a translation (dx,dy,dz) to  
@@ -462,4 +446,5 @@ def translat(toSet,deltaXYZ):
     '''
     transl=xc.Translation(geom.Translation3d(geom.Vector3d(deltaXYZ[0],deltaXYZ[1],deltaXYZ[2])))
     toSet.transforms(transl)
+    spatial_index.notify_geometry_change()
     
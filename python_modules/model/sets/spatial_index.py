@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+''' Spatial index of the nodes and elements of a set.
+
+    The coordinates of the nodes (initial position) and the centroids of
+    the elements (initial geometry) are extracted once and stored in numpy
+    arrays, so the geometric queries used to define sets (nodes near a
+    plane, near a polyline, inside a prism, nearest node,...) don't need
+    to evaluate each node or element through geom objects again and again.
+
+    The index is attached to the set as a property (see get_spatial_index),
+    so all the queries on the same set share it. The positions are
+    extracted again only when the number of objects in the set or the
+    geometry revision (see notify_geometry_change) changes; the objects
+    are not visited to detect the changes, so after moving the nodes
+    (i.e. Node.setPos) or after refilling the set with the same number
+    of objects, notify_geometry_change must be called (the
+    transformations of sets_mng do it). The same revision is used to
+    invalidate other caches of the set geometry (see
+    postprocess.xcVtk.FE_model.vtk_grid_cache).'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import sys
+import numpy as np
+from scipy.spatial import cKDTree
+import geom
+from misc_utils import log_messages as lmsg
+
+spatialIndexPropName= 'spatialIndex'
+
+# Incremented each time the positions of the nodes or the contents of
+# the sets change in a way that doesn't modify their sizes.
+geometryRevision= 0
+
+def notify_geometry_change():
+    ''' Discard the positions stored in all the spatial indexes (and in
+        the other caches keyed on the geometry revision). Must be
+        called after moving nodes or after replacing the objects of a
+        set by the same number of other objects.'''
+    global geometryRevision
+    geometryRevision+= 1
+
+def get_reference_arrays(reference):
+    ''' Return the origin and the unit vectors of the axes (rows) of the
+        2D reference system argument as numpy arrays.
+
+    :param reference: 2D reference system in 3D space (geom.Ref2d3d).
+    '''
+    org= reference.getOrg()
+    iVector= reference.getIVector()
+    jVector= reference.getJVector()
+    return np.array([org.x, org.y, org.z]), np.array([[iVector.x, iVector.y, iVector.z], [jVector.x, jVector.y, jVector.z]])
+
+def points_inside_polygon(points, vertices, tol= 0.0):
+    ''' Return a boolean array that is true for the points that are inside
+        the polygon or whose distance to its contour is not greater than
+        the tolerance.
+
+    :param points: array containing the 2D coordinates of the points (one
+                   row for each point).
+    :param vertices: array containing the 2D coordinates of the polygon
+                     vertices (one row for each vertex).
+    :param tol: tolerance.
+    '''
+    x= points[:,0:1]
+    y= points[:,1:2]
+    x0= vertices[:,0]
+    y0= vertices[:,1]
+    x1= np.roll(x0, -1)
+    y1= np.roll(y0, -1)
+    # Even-odd rule (ray in the positive X direction).
+    crosses= (y0>y)!=(y1>y)
+    with np.errstate(divide= 'ignore', invalid= 'ignore'):
+        xIntersection= x0+(y-y0)*(x1-x0)/(y1-y0)
+    inside= (np.count_nonzero(crosses & (x<xIntersection), axis= 1)%2)==1
+    # Distance to the sides.
+    if(tol>0.0):
+        dx= x1-x0
+        dy= y1-y0
+        length2= dx**2+dy**2
+        length2[length2==0.0]= 1.0
+        t= np.clip(((x-x0)*dx+(y-y0)*dy)/length2, 0.0, 1.0)
+        distance2= (x-x0-t*dx)**2+(y-y0-t*dy)**2
+        inside|= np.any(distance2<=tol**2, axis= 1)
+    return inside
+
+class PositionsIndex(object):
+    ''' Positions of a list of objects (nodes or element centroids) stored
+        in a numpy array.
+
+    :ivar objects: indexed objects.
+    :ivar key: number of objects and geometry revision when the positions
+               were extracted.
+    :ivar positions: array containing the position of each object (one
+                     row for each object).
+    :ivar tree: KD-tree of the positions (built when needed).
+    :ivar planTree: KD-tree of the XY projection of the positions (built
+                    when needed).
+    '''
+    def __init__(self, getPosition):
+        ''' Constructor.
+
+        :param getPosition: function that returns the position of an
+                            object.
+        '''
+        self.getPosition= getPosition
+        self.clear()
+
+    def clear(self):
+        ''' Remove all the objects from the index.'''
+        self.objects= list()
+        self.key= None
+        self.positions= np.zeros((0, 3))
+        self.tree= None
+        self.planTree= None
+
+    def update(self, container):
+        ''' Extract the positions of the objects of the container if its
+            size or the geometry revision have changed since the last
+            extraction. Return true if the index has changed.
+
+        :param container: iterable containing the objects to index.
+        '''
+        key= (len(container), geometryRevision)
+        retval= (key!=self.key)
+        if(retval):
+            self.objects= list(container)
+            positions= [self.getPosition(o) for o in self.objects]
+            self.positions= np.array([[pos.x, pos.y, pos.z] for pos in positions], dtype= float).reshape(-1, 3)
+            self.key= key
+            self.tree= None
+            self.planTree= None
+        return retval
+
+    def __len__(self):
+        ''' Return the number of indexed objects.'''
+        return len(self.objects)
+
+    def getKDTree(self):
+        ''' Return the KD-tree of the positions.'''
+        if(self.tree is None):
+            self.tree= cKDTree(self.positions)
+        return self.tree
+
+    def getPlanKDTree(self):
+        ''' Return the KD-tree of the XY projection of the positions.'''
+        if(self.planTree is None):
+            self.planTree= cKDTree(self.positions[:,0:2])
+        return self.planTree
+
+    def getObjects(self, indexes):
+        ''' Return the objects corresponding to the indexes argument.
+
+        :param indexes: indexes of the objects.
+        '''
+        return [self.objects[i] for i in indexes]
+
+    def getIndexesNearPlane(self, axis, coord, tol):
+        ''' Return the indexes of the objects whose distance to the plane
+            perpendicular to the given axis is not greater than the
+            tolerance.
+
+        :param axis: index of the axis perpendicular to the plane (0: X, 1: Y, 2: Z).
+        :param coord: coordinate of the plane.
+        :param tol: tolerance.
+        '''
+        return np.flatnonzero(np.abs(self.positions[:,axis]-coord)<=tol)
+
+    def getIndexesNearSegment(self, p0, p1, tol):
+        ''' Return the indexes of the objects whose distance to the segment
+            is smaller than the tolerance.
+
+        :param p0: segment origin (geom.Pos3d).
+        :param p1: segment end (geom.Pos3d).
+        :param tol: tolerance.
+        '''
+        a= np.array([p0.x, p0.y, p0.z])
+        b= np.array([p1.x, p1.y, p1.z])
+        ab= b-a
+        ab2= ab.dot(ab)
+        ap= self.positions-a
+        if(ab2>0.0):
+            t= np.clip(ap.dot(ab)/ab2, 0.0, 1.0)
+        else:
+            t= np.zeros(len(ap))
+        d= np.linalg.norm(ap-np.outer(t, ab), axis= 1)
+        return np.flatnonzero(d<tol)
+
+    def getIndexesInsideOrthoPrism(self, prismBase, axis, tol= 0.0):
+        ''' Return the indexes of the objects inside the orthogonal prism
+            defined by a 2D polygon and the direction of its axis.
+
+        :param prismBase: 2D polygon that defines the base of the prism (see
+                          sets_mng.set_included_in_orthoPrism).
+        :param axis: index of the axis of the prism (0: X, 1: Y, 2: Z).
+        :param tol: tolerance for the polygon In method.
+        '''
+        coo= [i for i in range(3) if i!=axis] # coordinates in the base plane.
+        xy= self.positions[:,coo]
+        # Discard the points outside the bounding box of the polygon.
+        vertices= np.array([[v.x, v.y] for v in prismBase.getVertexList()])
+        bbMin= vertices.min(axis= 0)-tol
+        bbMax= vertices.max(axis= 0)+tol
+        candidates= np.flatnonzero(np.all((xy>=bbMin) & (xy<=bbMax), axis= 1))
+        # Check the remaining points.
+        retval= [i for i in candidates.tolist() if prismBase.In(geom.Pos2d(float(xy[i,0]), float(xy[i,1])), tol)]
+        return np.array(retval, dtype= int)
+
+    def getIndexesInsideLocalPolygons(self, localPolygons, tol= 0.0):
+        ''' Return, for each polygon, the indexes of the objects whose
+            projection on the plane of the polygon falls inside it
+            (sorted by index). The candidates of all the polygons are
+            obtained from the XY KD-tree with a single query.
+
+        :param localPolygons: list of (reference, polygon) pairs, where
+                              reference is the 2D reference system
+                              (geom.Ref2d3d) in which the vertices of the
+                              2D polygon are expressed (see
+                              WheelLoad.getLoadedContour).
+        :param tol: tolerance for the point in polygon test.
+        '''
+        retval= list()
+        numPolygons= len(localPolygons)
+        if((numPolygons==0) or (len(self.positions)==0)):
+            retval= [np.zeros(0, dtype= int) for i in range(numPolygons)]
+        else:
+            origins= list()
+            axes= list()
+            vertices= list()
+            radii= list()
+            zMin= self.positions[:,2].min()
+            zMax= self.positions[:,2].max()
+            for reference, polygon in localPolygons:
+                origin, localAxes= get_reference_arrays(reference)
+                polygonVertices= np.array([[v.x, v.y] for v in polygon.getVertexList()], dtype= float)
+                # Radius of the polygon on its plane.
+                radius= np.sqrt((polygonVertices**2).sum(axis= 1)).max()+tol
+                # Radius of its projection on the XY plane, taking into
+                # account the distance of the objects to the polygon plane.
+                normal= np.cross(localAxes[0], localAxes[1])
+                cosTheta= abs(normal[2])
+                if(cosTheta>1e-3):
+                    tanTheta= np.sqrt(max(1.0-cosTheta**2, 0.0))/cosTheta
+                    dz= max(abs(zMax-origin[2]), abs(zMin-origin[2]))
+                    radius+= tanTheta*(dz+radius)
+                else: # vertical polygon, check all the objects.
+                    radius= np.inf
+                origins.append(origin)
+                axes.append(localAxes)
+                vertices.append(polygonVertices)
+                radii.append(radius)
+            centers= np.array(origins)[:,0:2]
+            radii= np.array(radii)
+            finite= np.isfinite(radii)
+            candidates= [None]*numPolygons
+            if(np.any(finite)):
+                finiteIndexes= np.flatnonzero(finite)
+                found= self.getPlanKDTree().query_ball_point(centers[finiteIndexes], r= radii[finiteIndexes])
+                for i, c in zip(finiteIndexes, found):
+                    candidates[i]= np.array(sorted(c), dtype= int)
+            for i in np.flatnonzero(~finite):
+                candidates[i]= np.arange(len(self.positions))
+            for origin, localAxes, polygonVertices, c in zip(origins, axes, vertices, candidates):
+                localPositions= (self.positions[c]-origin).dot(localAxes.T)
+                inside= points_inside_polygon(localPositions, polygonVertices, tol)
+                retval.append(c[inside])
+        return retval
+
+    def getIndexesInsideSphere(self, center, radius):
+        ''' Return the indexes of the objects whose distance to the center
+            is not greater than the radius (sorted by index).
+
+        :param center: center of the sphere (geom.Pos3d).
+        :param radius: radius of the sphere.
+        '''
+        retval= self.getKDTree().query_ball_point([center.x, center.y, center.z], r= radius)
+        return np.array(sorted(retval), dtype= int)
+
+    def getIndexNearest(self, pos):
+        ''' Return the index of the object nearest to the given position.
+
+        :param pos: position (geom.Pos3d).
+        '''
+        return int(self.getKDTree().query([pos.x, pos.y, pos.z])[1])
+
+class SpatialIndex(object):
+    ''' Spatial index of the nodes and elements of a set.
+
+    :ivar xcSet: indexed set.
+    :ivar nodeIndex: positions of the nodes (initial position).
+    :ivar elementIndex: positions of the element centroids (initial
+                        geometry).
+    :ivar regressionPlane: regression plane of the node positions
+                           (computed when needed).
+    '''
+    def __init__(self, xcSet):
+        ''' Constructor.
+
+        :param xcSet: set to index.
+        '''
+        self.xcSet= xcSet
+        self.nodeIndex= PositionsIndex(getPosition= lambda n: n.getInitialPos3d)
+        self.elementIndex= PositionsIndex(getPosition= lambda e: e.getPosCentroid(True))
+        self.regressionPlane= None
+
+    def invalidate(self):
+        ''' Discard the indexed positions.'''
+        self.nodeIndex.clear()
+        self.elementIndex.clear()
+        self.regressionPlane= None
+
+    def getNodeIndex(self):
+        ''' Return the index of the nodes, updated if the number of nodes
+            of the set or the geometry revision have changed.'''
+        if(self.nodeIndex.update(self.xcSet.nodes)):
+            self.regressionPlane= None
+        return self.nodeIndex
+
+    def getNodesRegressionPlane(self):
+        ''' Return the regression plane of the positions of the nodes
+            (i.e. the mid-plane of a deck). The plane is computed once
+            and reused until the node index is updated.'''
+        self.getNodeIndex() # discard the plane if the nodes have changed.
+        if(self.regressionPlane is None):
+            self.regressionPlane= self.xcSet.nodes.getRegressionPlane(0.0)
+        return self.regressionPlane
+
+    def getElementIndex(self):
+        ''' Return the index of the elements, updated if the number of
+            elements of the set or the geometry revision have changed.'''
+        self.elementIndex.update(self.xcSet.elements)
+        return self.elementIndex
+
+    def getNodesNearPlane(self, axis, coord, tol= 1e-4):
+        ''' Return the nodes whose distance to the plane perpendicular to
+            the given axis is not greater than the tolerance.
+
+        :param axis: index of the axis perpendicular to the plane (0: X, 1: Y, 2: Z).
+        :param coord: coordinate of the plane.
+        :param tol: tolerance.
+        '''
+        index= self.getNodeIndex()
+        return index.getObjects(index.getIndexesNearPlane(axis, coord, tol))
+
+    def getNodesNearPolyline(self, vertices, tol= 0.01):
+        ''' Return the nodes whose distance to any of the segments of the
+            polyline is smaller than the tolerance. The nodes are sorted
+            by segment (and by its position in the set for each segment).
+
+        :param vertices: polyline vertices (list of geom.Pos3d).
+        :param tol: tolerance.
+        '''
+        index= self.getNodeIndex()
+        retval= list()
+        found= set()
+        for p0, p1 in zip(vertices[:-1], vertices[1:]):
+            for i in index.getIndexesNearSegment(p0, p1, tol).tolist():
+                if(i not in found):
+                    found.add(i)
+                    retval.append(index.objects[i])
+        return retval
+
+    def getNodesInsideSphere(self, center, radius):
+        ''' Return the nodes whose distance to the center is not greater
+            than the radius.
+
+        :param center: center of the sphere (geom.Pos3d).
+        :param radius: radius of the sphere.
+        '''
+        index= self.getNodeIndex()
+        return index.getObjects(index.getIndexesInsideSphere(center, radius))
+
+    def getNodesInsideLocalPolygons(self, localPolygons, tol= 0.0):
+        ''' Return, for each polygon, the list of nodes whose projection on
+            the plane of the polygon falls inside it (i.e. the nodes
+            loaded by each of the wheels of a vehicle).
+
+        :param localPolygons: list of (reference, polygon) pairs, where
+                              reference is the 2D reference system
+                              (geom.Ref2d3d) in which the vertices of the
+                              2D polygon are expressed.
+        :param tol: tolerance for the point in polygon test.
+        '''
+        index= self.getNodeIndex()
+        return [index.getObjects(indexes) for indexes in index.getIndexesInsideLocalPolygons(localPolygons, tol)]
+
+    def getNearestNode(self, pos):
+        ''' Return the node nearest to the given position.
+
+        :param pos: position (geom.Pos3d).
+        '''
+        retval= None
+        index= self.getNodeIndex()
+        if(len(index)>0):
+            retval= index.objects[index.getIndexNearest(pos)]
+        return retval
+
+    def getElementsInsideOrthoPrism(self, prismBase, axis, tol= 0.0):
+        ''' Return the elements whose centroid is inside the orthogonal
+            prism defined by a 2D polygon and the direction of its axis.
+
+        :param prismBase: 2D polygon that defines the base of the prism (see
+                          sets_mng.set_included_in_orthoPrism).
+        :param axis: index of the axis of the prism (0: X, 1: Y, 2: Z).
+        :param tol: tolerance for the polygon In method.
+        '''
+        index= self.getElementIndex()
+        return index.getObjects(index.getIndexesInsideOrthoPrism(prismBase, axis, tol))
+
+    def getElementsInsideSphere(self, center, radius):
+        ''' Return the elements whose centroid distance to the center is
+            not greater than the radius.
+
+        :param center: center of the sphere (geom.Pos3d).
+        :param radius: radius of the sphere.
+        '''
+        index= self.getElementIndex()
+        return index.getObjects(index.getIndexesInsideSphere(center, radius))
+
+    def getNearestElement(self, pos):
+        ''' Return the element whose centroid is the nearest to the given
+            position.
+
+        :param pos: position (geom.Pos3d).
+        '''
+        retval= None
+        index= self.getElementIndex()
+        if(len(index)>0):
+            retval= index.objects[index.getIndexNearest(pos)]
+        return retval
+
+def get_axis_index(axis):
+    ''' Return the index of the axis argument (0 for 'X', 1 for 'Y' and 2
+        for 'Z').
+
+    :param axis: axis name (can be equal to 'X', 'Y', 'Z').
+    '''
+    retval= None
+    if axis in ['X','x']:
+        retval= 0
+    elif axis in ['Y','y']:
+        retval= 1
+    elif axis in ['Z','z']:
+        retval= 2
+    else:
+        functionName= sys._getframe(0).f_code.co_name
+        lmsg.error(functionName+"; wrong axis. Available values: 'X', 'Y', 'Z' \n")
+    return retval
+
+def get_spatial_index(xcSet):
+    ''' Return the spatial index attached to the set (it is created if
+        it doesn't exist yet).
+
+    :param xcSet: set to get the index for.
+    '''
+    retval= None
+    if(xcSet.hasProp(spatialIndexPropName)):
+        retval= xcSet.getProp(spatialIndexPropName)
+    if(retval is None):
+        retval= SpatialIndex(xcSet)
+        xcSet.setProp(spatialIndexPropName, retval)
+    return retval
@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+''' Automatic design of the main reinforcement of the reinforced concrete
+    sections of a material distribution (see RC_material_distribution
+    module).
+
+    The design variables are the reinforcement faces of the sections: the
+    rows of bars in the positive and negative faces of each section family
+    (i.e. the dir1PositvRebarRows, dir1NegatvRebarRows,... of a
+    RCSlabBeamSection). The diameter and the spacing of the bars of each
+    face are chosen from a list of rebar families (see the
+    define_rebar_families functions of the EC2 and EHE limit state checking
+    modules) so the weight of the reinforcement is minimized while the
+    efficiency of the sections is not greater than the allowed value for
+    all the limit states checked (normal stresses, crack control,...). The
+    shear reinforcement is not designed, so the shear limit states are not
+    checked.
+
+    The search starts with the lightest family on all the faces. At each
+    iteration the limit states are checked and the faces of the sections
+    whose efficiency is too high are replaced by the lightest family whose
+    area is not smaller than the current area multiplied by the efficiency
+    (the tension face is deduced from the sign of the bending moment of the
+    governing combination). The checks are incremental, so only the
+    elements whose sections have changed are checked again, and the
+    interaction diagrams are stored in a cache folder, so the diagram of
+    each candidate section is computed only once.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es" "ana.Ortega@ciccp.es"
+
+import sys
+import tempfile
+from misc_utils import log_messages as lmsg
+from materials.sections.fiber_section import def_simple_RC_section
+from postprocess import control_vars as cv
+
+# Density of the reinforcing steel (kg/m3).
+steelDensity= 7850.0
+
+# Control variables of the shear limit states (they don't concern the
+# main reinforcement).
+shearControlVarsTypes= (cv.ShVy, cv.RCShearControlVars)
+
+def get_rebar_family_name(rebarFamily):
+    ''' Return the name of the rebar family argument using the same
+        convention as the define_rebar_families functions (i.e. A16_15
+        for 16 mm bars spaced 15 cm).
+
+    :param rebarFamily: rebar family.
+    '''
+    return 'A'+str(int(round(rebarFamily.diam*1e3)))+'_'+str(int(round(rebarFamily.spacing*1e2)))
+
+def get_sorted_rebar_families(rebarFamilies):
+    ''' Return a list of (name, rebarFamily) pairs sorted by the area of
+        reinforcement per unit width (and by decreasing spacing if the areas
+        are equal).
+
+    :param rebarFamilies: dictionary containing the candidate rebar families
+                          (see define_rebar_families) or list of rebar
+                          families.
+    '''
+    if(isinstance(rebarFamilies, dict)):
+        retval= list(rebarFamilies.items())
+    else:
+        retval= [(get_rebar_family_name(rf), rf) for rf in rebarFamilies]
+    retval.sort(key= lambda item: (item[1].getAs(), -item[1].spacing))
+    return retval
+
+def get_face_efficiencies(controlVar, swapReinforcementAxes= False):
+    ''' Return a dictionary containing the efficiency of the control var
+        argument for the faces of the section that are concerned by it:
+        'pos' for the positive face and 'neg' for the negative one (none
+        for the shear control vars).
+
+    :param controlVar: control variables of a section for a limit state.
+    :param swapReinforcementAxes: true if the reinforcement axes of the
+                                  section are swapped (see
+                                  RCRectangularSection).
+    '''
+    if(isinstance(controlVar, shearControlVarsTypes)):
+        retval= dict()
+    elif(hasattr(controlVar, 'crackControlVarsPos')):
+        retval= {'pos': controlVar.crackControlVarsPos.getCF(), 'neg': controlVar.crackControlVarsNeg.getCF()}
+    else:
+        # The positive face is on the tension side when the bending
+        # moment is positive.
+        if(swapReinforcementAxes):
+            moment= getattr(controlVar, 'Mz', 0.0)
+        else:
+            moment= getattr(controlVar, 'My', 0.0)
+        if(moment>=0.0):
+            retval= {'pos': controlVar.getCF()}
+        else:
+            retval= {'neg': controlVar.getCF()}
+    return retval
+
+class ReinforcementFace(object):
+    ''' Rows of main reinforcement in one face of a section family, whose
+        first row is designed.
+
+    :ivar name: name of the face (name of the first section that contains
+                it followed by '+' or '-').
+    :ivar layers: reinforcement layers of the face (LongReinfLayers object
+                  shared by the sections of the family).
+    :ivar width: width of the section occupied by the rows.
+    :ivar nominalCover: nominal cover of the designed row (if None use
+                        the cover of the rebar family).
+    :ivar sectionNames: names of the sections that contain the face.
+    :ivar candidateIndex: index of the current rebar family in the list of
+                          candidates (None if not assigned yet).
+    :ivar efficiency: maximum efficiency of the sections that contain the
+                      face for the current rebar family.
+    '''
+    def __init__(self, name, layers, width):
+        ''' Constructor.
+
+        :param name: name of the face.
+        :param layers: reinforcement layers of the face.
+        :param width: width of the section occupied by the rows.
+        '''
+        self.name= name
+        self.layers= layers
+        self.width= width
+        self.nominalCover= None
+        if(len(layers.rebarRows)>0):
+            self.nominalCover= layers.rebarRows[0].getNominalCover()
+        self.sectionNames= list()
+        self.candidateIndex= None
+        self.efficiency= 0.0
+
+    def getRowArea(self, rebarFamily):
+        ''' Return the area of the row that corresponds to the given rebar
+            family.
+
+        :param rebarFamily: rebar family.
+        '''
+        return self.getRow(rebarFamily).getAs()
+
+    def getRow(self, rebarFamily):
+        ''' Return the reinforcement row that corresponds to the given rebar
+            family.
+
+        :param rebarFamily: rebar family.
+        '''
+        nominalCover= self.nominalCover
+        if(nominalCover is None):
+            nominalCover= rebarFamily.concreteCover
+        return def_simple_RC_section.ReinfRow(rebarsDiam= rebarFamily.diam, rebarsSpacing= rebarFamily.spacing, width= self.width, nominalCover= nominalCover)
+
+    def setRebarFamily(self, index, rebarFamily):
+        ''' Replace the first row of the face with a row of the given rebar
+            family (the row object is replaced, not modified, because it can
+            be shared with other faces).
+
+        :param index: index of the rebar family in the list of candidates.
+        :param rebarFamily: rebar family.
+        '''
+        row= self.getRow(rebarFamily)
+        if(len(self.layers.rebarRows)>0):
+            self.layers.rebarRows[0]= row
+        else:
+            self.layers.rebarRows.append(row)
+        self.candidateIndex= index
+
+    def getAs(self):
+        ''' Return the area of reinforcement of the face.'''
+        return self.layers.getAs()
+
+    def getFixedAs(self):
+        ''' Return the area of the rows that are not designed.'''
+        return sum(self.layers.getAsRows()[1:])
+
+class RCReinforcementDesigner(object):
+    ''' Choose the rebar family of each face of the sections of a
+        reinforced concrete material distribution.
+
+    :ivar materialDistribution: reinforced concrete material distribution
+                                (see RC_material_distribution module); its
+                                sections are modified in place.
+    :ivar rebarFamilies: list of (name, rebarFamily) pairs sorted by area.
+    :ivar limitStates: list of (limitStateData, controller) pairs to check.
+    :ivar maxEfficiency: maximum allowed efficiency.
+    :ivar maxIterations: maximum number of iterations.
+    :ivar threeDim: true if it's 3D (Fx,Fy,Fz,Mx,My,Mz)
+                    false if it's 2D (Fx,Fy,Mz).
+    :ivar screeningMethod: method used to discard the combinations that
+                           cannot govern the checking (see
+                           combination_screening module).
+    :ivar interactionDiagramsCacheFolder: folder where the interaction
+                                          diagrams are stored (if None
+                                          use the folder of the section
+                                          container or a temporary one).
+    :ivar faces: faces of the sections to design.
+    :ivar history: number of faces changed and weight of the reinforcement
+                   (kg per unit length of the faces) on each iteration.
+    :ivar diagramStatistics: number of interaction diagrams found in memory,
+                             read from the cache folder and computed.
+    '''
+    def __init__(self, materialDistribution, rebarFamilies, limitStates, maxEfficiency= 1.0, maxIterations= 20, threeDim= True, screeningMethod= None, interactionDiagramsCacheFolder= None):
+        ''' Constructor.
+
+        :param materialDistribution: reinforced concrete material
+                                     distribution.
+        :param rebarFamilies: dictionary containing the candidate rebar
+                              families (see define_rebar_families) or list
+                              of rebar families.
+        :param limitStates: list of (limitStateData, controller) pairs to
+                            check (the shear limit states are ignored).
+        :param maxEfficiency: maximum allowed efficiency.
+        :param maxIterations: maximum number of iterations.
+        :param threeDim: true if it's 3D (Fx,Fy,Fz,Mx,My,Mz)
+                         false if it's 2D (Fx,Fy,Mz).
+        :param screeningMethod: method used to discard the combinations
+                                that cannot govern the checking.
+        :param interactionDiagramsCacheFolder: folder where the interaction
+                                               diagrams are stored.
+        '''
+        self.materialDistribution= materialDistribution
+        self.rebarFamilies= get_sorted_rebar_families(rebarFamilies)
+        self.limitStates= list()
+        for limitStateData, controller in limitStates:
+            controlVarsType= getattr(controller, 'ControlVars', None)
+            if((controlVarsType is not None) and issubclass(controlVarsType, shearControlVarsTypes)):
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.warning(className+'.'+methodName+'; the shear reinforcement is not designed, limit state: '+str(controller.limitStateLabel)+' ignored.')
+            else:
+                self.limitStates.append((limitStateData, controller))
+        self.maxEfficiency= maxEfficiency
+        self.maxIterations= maxIterations
+        self.threeDim= threeDim
+        self.screeningMethod= screeningMethod
+        self.interactionDiagramsCacheFolder= interactionDiagramsCacheFolder
+        self.faces= self.getFaces()
+        self.history= list()
+        self.diagramStatistics= {'hits': 0, 'diskHits': 0, 'misses': 0}
+
+    def getFaces(self):
+        ''' Return the faces of the sections to design. The sections that
+            share the same reinforcement layers (i.e. the sections of the
+            different integration points of a RCMemberSection) share the
+            same face.'''
+        retval= list()
+        facesByLayers= dict()
+        sectionsWithoutFaces= list()
+        for sectionFamily in self.materialDistribution.sectionDefinition.sections:
+            for rcs in sectionFamily.lstRCSects:
+                if(hasattr(rcs, 'positvRebarRows') and hasattr(rcs, 'negatvRebarRows')):
+                    for suffix, layers in [('+', rcs.positvRebarRows), ('-', rcs.negatvRebarRows)]:
+                        face= facesByLayers.get(id(layers), None)
+                        if(face is None):
+                            face= ReinforcementFace(name= rcs.name+suffix, layers= layers, width= rcs.getWidth())
+                            facesByLayers[id(layers)]= face
+                            retval.append(face)
+                        face.sectionNames.append(rcs.name)
+                else:
+                    sectionsWithoutFaces.append(rcs.name)
+        if(sectionsWithoutFaces):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.warning(className+'.'+methodName+'; the reinforcement of the sections: '+str(sectionsWithoutFaces)+' will not be designed (positive and negative faces not defined).')
+        return retval
+
+    def getSectionFaces(self):
+        ''' Return a dictionary containing the positive and negative faces
+            of each section.'''
+        retval= dict()
+        for face in self.faces:
+            faceKey= 'pos' if face.name.endswith('+') else 'neg'
+            for sectionName in face.sectionNames:
+                retval.setdefault(sectionName, dict())[faceKey]= face
+        return retval
+
+    def initialize(self):
+        ''' Assign the lightest rebar family to all the faces.'''
+        name, rebarFamily= self.rebarFamilies[0]
+        for face in self.faces:
+            face.setRebarFamily(0, rebarFamily)
+
+    def resetReinforcementLayers(self):
+        ''' Remove the reinforcement layers created in the previous
+            checks, so they don't change the contents of the sections.'''
+        for sectionFamily in self.materialDistribution.sectionDefinition.sections:
+            for rcs in sectionFamily.lstRCSects:
+                for layers in [getattr(rcs, 'positvRebarRows', None), getattr(rcs, 'negatvRebarRows', None)]:
+                    if(layers is not None):
+                        layers.reinfLayers= list()
+
+    def checkLimitState(self, limitStateData, controller):
+        ''' Check the limit state and return the control vars of each
+            section as a list of (sectionName, controlVar) pairs.
+
+        :param limitStateData: limit state data.
+        :param controller: limit state controller.
+        '''
+        sectionContainer= self.materialDistribution.sectionDefinition
+        concreteTypes= list()
+        for sectionFamily in sectionContainer.sections:
+            for rcs in sectionFamily.lstRCSects:
+                concrete= rcs.getConcreteType()
+                if(concrete not in concreteTypes):
+                    concreteTypes.append(concrete)
+        initTensStiff= [getattr(c, 'initTensStiff', False) for c in concreteTypes]
+        self.resetReinforcementLayers()
+        limitStateData.check(setCalc= None, crossSections= self.materialDistribution, controller= controller, threeDim= self.threeDim, screeningMethod= self.screeningMethod, incremental= True)
+        # Restore the concrete behaviour (the crack control checks use
+        # tension stiffening models).
+        for c, value in zip(concreteTypes, initTensStiff):
+            c.initTensStiff= value
+        if(sectionContainer.interactionDiagramCache):
+            statistics= sectionContainer.interactionDiagramCache.getStatistics()
+            for key in statistics:
+                self.diagramStatistics[key]+= statistics[key]
+        sectionDistribution= self.materialDistribution.sectionDistribution
+        controlVars= cv.readPhantomElementControlVars(limitStateData.getOutputDataBaseFileName(), controller.limitStateLabel, set(sectionDistribution.keys()))
+        retval= list()
+        for eTag, sectionIndex, controlVar in controlVars:
+            sectionName= sectionDistribution[eTag][sectionIndex-1]
+            retval.append((sectionName, controlVar))
+        return retval
+
+    def getFaceEfficiencies(self):
+        ''' Check all the limit states and return a dictionary containing
+            the maximum efficiency of each face.'''
+        retval= dict()
+        for face in self.faces:
+            retval[face]= 0.0
+        sectionFaces= self.getSectionFaces()
+        mapSections= self.materialDistribution.sectionDefinition.mapSections
+        for limitStateData, controller in self.limitStates:
+            for sectionName, controlVar in self.checkLimitState(limitStateData, controller):
+                faces= sectionFaces.get(sectionName, None)
+                if(faces):
+                    swapAxes= getattr(mapSections[sectionName], 'swapReinforcementAxes', False)
+                    faceEfficiencies= get_face_efficiencies(controlVar, swapAxes)
+                    for faceKey in faceEfficiencies:
+                        face= faces[faceKey]
+                        retval[face]= max(retval[face], faceEfficiencies[faceKey])
+        for face in retval:
+            face.efficiency= retval[face]
+        return retval
+
+    def getNextRebarFamilyIndex(self, face, efficiency):
+        ''' Return the index of the lightest rebar family whose area is not
+            smaller than the one required by the given efficiency (or None
+            if the face has already the heaviest family).
+
+        :param face: reinforcement face.
+        :param efficiency: efficiency of the face.
+        '''
+        retval= None
+        requiredAs= face.getAs()*efficiency-face.getFixedAs()
+        minAs= None
+        for i in range(face.candidateIndex+1, len(self.rebarFamilies)):
+            rowAs= face.getRowArea(self.rebarFamilies[i][1])
+            if(rowAs>=requiredAs):
+                if((minAs is None) or (rowAs<minAs)):
+                    retval= i
+                    minAs= rowAs
+            elif(minAs is None): # heaviest family if none is enough.
+                retval= i
+        return retval
+
+    def getSteelWeight(self):
+        ''' Return the weight of the reinforcement of all the faces per unit
+            length of the faces.'''
+        return sum([face.getAs() for face in self.faces])*steelDensity
+
+    def run(self):
+        ''' Design the reinforcement of the faces. Return true if the
+            efficiency of all the faces is not greater than the maximum
+            allowed efficiency.'''
+        sectionContainer= self.materialDistribution.sectionDefinition
+        previousCacheFolder= sectionContainer.interactionDiagramsCacheFolder
+        tmpFolder= None
+        cacheFolder= self.interactionDiagramsCacheFolder
+        if(cacheFolder is None):
+            cacheFolder= previousCacheFolder
+        if(cacheFolder is None):
+            tmpFolder= tempfile.TemporaryDirectory()
+            cacheFolder= tmpFolder.name
+        sectionContainer.interactionDiagramsCacheFolder= cacheFolder
+        self.initialize()
+        self.history= list()
+        retval= False
+        failedFaces= list()
+        for iteration in range(0, self.maxIterations):
+            efficiencies= self.getFaceEfficiencies()
+            changedFaces= 0
+            failedFaces= list()
+            for face in self.faces:
+                efficiency= efficiencies[face]
+                if(efficiency>self.maxEfficiency):
+                    index= self.getNextRebarFamilyIndex(face, efficiency/self.maxEfficiency)
+                    if(index is None):
+                        failedFaces.append(face.name)
+                    else:
+                        face.setRebarFamily(index, self.rebarFamilies[index][1])
+                        changedFaces+= 1
+            self.history.append({'iteration': iteration, 'changedFaces': changedFaces, 'steelWeight': self.getSteelWeight()})
+            if(changedFaces==0):
+                retval= (len(failedFaces)==0)
+                break
+        else:
+            # Last change not checked yet.
+            self.getFaceEfficiencies()
+            failedFaces= [face.name for face in self.faces if face.efficiency>self.maxEfficiency]
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.warning(className+'.'+methodName+'; maximum number of iterations reached.')
+            retval= (len(failedFaces)==0)
+        if(failedFaces):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.warning(className+'.'+methodName+'; the heaviest rebar family is not enough for the faces: '+str(failedFaces))
+        sectionContainer.interactionDiagramsCacheFolder= previousCacheFolder
+        if(tmpFolder):
+            tmpFolder.cleanup()
+        return retval
+
+    def getSectionContainer(self):
+        ''' Return the container of the designed sections (it can be
+            written with the writeToJSON method of the material
+            distribution).'''
+        return self.materialDistribution.sectionDefinition
+
+    def getDict(self):
+        ''' Return a dictionary containing the rebar family and the
+            efficiency of each face.'''
+        retval= dict()
+        for face in self.faces:
+            familyName= None
+            if(face.candidateIndex is not None):
+                familyName= self.rebarFamilies[face.candidateIndex][0]
+            retval[face.name]= {'rebarFamily': familyName, 'As': face.getAs(), 'efficiency': face.efficiency, 'sections': face.sectionNames}
+        return retval
+
+    def report(self, os= sys.stdout, indentation= ''):
+        ''' Write the rebar family and the efficiency of each face.'''
+        for faceName, data in self.getDict().items():
+            os.write(indentation+faceName+': '+str(data['rebarFamily'])+' As= '+str(data['As']*1e4)+' cm2 efficiency= '+str(data['efficiency'])+'\n')
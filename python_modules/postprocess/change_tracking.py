@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+''' Change tracking for the incremental computation and verification of
+    the limit states.
+
+    A content hash (digest) is computed for each load combination (from
+    its expression, the loads of its load patterns and the geometry and
+    constraints of the model) and for each element to check (from its
+    internal forces, the definition of its sections and the parameters of
+    the controller). The digests are stored in a manifest next to the
+    result files, so a new run can reuse the results of the combinations
+    and elements whose digests have not changed and compute only the
+    remaining ones (see the incremental arguments of
+    LimitStateData.saveAll and of the check methods of the reinforced
+    concrete limit states).
+
+    The properties of the materials and sections of the structural model
+    are taken into account through the stiffness and mass matrices of the
+    elements (see get_elements_digest). The loads that can't be fully
+    digested (see get_elemental_load_data) make the combinations that
+    contain them to be computed again.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022,LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import json
+import math
+import hashlib
+import numpy
+
+# Increase this number when the hashed contents change, so the digests
+# stored by previous versions are not used.
+manifestFormatVersion= 2
+
+# Methods and attributes used to obtain the values of the mechanical loads.
+mechanicalLoadValueNames= ['getLocalForce', 'getLocalMoment']
+# Methods and attributes that define each type of elemental load. The
+# loads whose type is not in this dictionary can't be digested, so the
+# combinations that contain them are always computed again.
+elementalLoadValueNames= {'Beam2dUniformLoad': mechanicalLoadValueNames,
+                          'Beam3dUniformLoad': mechanicalLoadValueNames,
+                          'Beam2dPointLoad': mechanicalLoadValueNames+['x'],
+                          'Beam3dPointLoad': mechanicalLoadValueNames+['x'],
+                          'ShellUniformLoad': mechanicalLoadValueNames+['Wx', 'Wy', 'Wz'],
+                          'ShellRawLoad': ['getLocalForces', 'getLocalMoments'],
+                          'TrussStrainLoad': ['eps1', 'eps2'],
+                          'BeamStrainLoad': ['backEndDeformationPlane', 'frontEndDeformationPlane'],
+                          'BidimStrainLoad': ['getStrains'],
+                          'QuadStrainLoad': ['getStrains'],
+                          'ShellStrainLoad': ['getStrains'],
+                          'SurfaceLoad': ['pressure'],
+                          'BrickSelfWeight': list()} # depends only on the element mass.
+
+def is_extension_object(value):
+    ''' Return true if the argument is an object defined in a C++
+        extension module (node, element, vector...).
+
+    :param value: object to check.
+    '''
+    return (type(type(value)).__module__=='Boost.Python')
+
+def get_plain_data(value, depth= 0, maxDepth= 8):
+    ''' Return a representation of the argument made of plain Python
+        values (numbers, strings, lists and dictionaries) that can be
+        written in JSON format. The attributes of the objects are
+        included recursively (up to maxDepth levels) except those whose
+        name starts with an underscore or with 'matTag' (the tags of the
+        materials depend on the order of definition). The objects defined
+        in C++ extension modules are represented by their class name.
+
+    :param value: value to convert.
+    :param depth: current recursion level.
+    :param maxDepth: maximum recursion level.
+    '''
+    if((value is None) or isinstance(value, (bool, int, str))):
+        retval= value
+    elif(isinstance(value, float)):
+        retval= value
+        if(not math.isfinite(value)):
+            retval= str(value)
+    elif(isinstance(value, numpy.generic)):
+        retval= get_plain_data(value.item(), depth, maxDepth)
+    elif(isinstance(value, numpy.ndarray)):
+        retval= get_plain_data(value.tolist(), depth, maxDepth)
+    elif(isinstance(value, type) or callable(value)):
+        retval= getattr(value, '__module__', '')+'.'+getattr(value, '__qualname__', type(value).__name__)
+    elif(depth>=maxDepth or is_extension_object(value)):
+        retval= type(value).__name__
+    elif(isinstance(value, (list, tuple))):
+        retval= [get_plain_data(v, depth+1, maxDepth) for v in value]
+    elif(isinstance(value, (set, frozenset))):
+        retval= sorted([get_plain_data(v, depth+1, maxDepth) for v in value], key= repr)
+    elif(isinstance(value, dict)):
+        retval= dict()
+        for key in value:
+            retval[str(key)]= get_plain_data(value[key], depth+1, maxDepth)
+    elif(hasattr(value, '__dict__')):
+        retval= {'className': type(value).__name__}
+        for key, v in vars(value).items():
+            if(not (key.startswith('_') or key.startswith('matTag'))):
+                retval[key]= get_plain_data(v, depth+1, maxDepth)
+    else:
+        retval= repr(value)
+    return retval
+
+def get_digest(value):
+    ''' Return the content hash of the argument (see get_plain_data).
+
+    :param value: value to hash.
+    '''
+    contents= json.dumps(get_plain_data(value), sort_keys= True).encode('utf-8')
+    return hashlib.sha256(contents).hexdigest()
+
+def get_vector_data(v):
+    ''' Return a list with the components of the vector argument
+        (xc.Vector, geom.Vector3d,...).
+
+    :param v: vector.
+    '''
+    if(hasattr(v, 'x') and hasattr(v, 'y')):
+        retval= [v.x, v.y]
+        if(hasattr(v, 'z')):
+            retval.append(v.z)
+    else:
+        retval= [float(v[i]) for i in range(0, len(v))]
+    return retval
+
+def get_matrix_data(m):
+    ''' Return a list with the rows of the matrix argument (xc.Matrix).
+
+    :param m: matrix.
+    '''
+    return [[m(i,j) for j in range(0, m.noCols)] for i in range(0, m.noRows)]
+
+def get_load_value_data(value):
+    ''' Return a representation of the value argument (number, vector,
+        matrix, deformation plane or list of them) made of numbers. Raise
+        ValueError if the value can't be represented.
+
+    :param value: value to represent.
+    '''
+    if(isinstance(value, (int, float))):
+        retval= value
+    elif(hasattr(value, 'getStrains')): # deformation plane.
+        retval= get_vector_data(value.getStrains())
+    elif(hasattr(value, 'noRows') and hasattr(value, 'noCols')):
+        retval= get_matrix_data(value)
+    elif(hasattr(value, 'x') and hasattr(value, 'y')):
+        retval= get_vector_data(value)
+    elif(hasattr(value, '__len__') and hasattr(value, '__getitem__')):
+        retval= [get_load_value_data(value[i]) for i in range(0, len(value))]
+    else:
+        raise ValueError("can't represent value: "+repr(value))
+    return retval
+
+def get_model_digest(xcSet):
+    ''' Return the content hash of the geometry, the element connectivity
+        and the single point constraints of the set argument.
+
+    :param xcSet: set containing the structural model (usually the total
+                  set).
+    '''
+    digest= hashlib.sha256()
+    nodeData= list()
+    for n in xcSet.nodes:
+        pos= n.getInitialPos3d
+        nodeData.append((n.tag, pos.x, pos.y, pos.z))
+    nodeData.sort()
+    digest.update(numpy.array(nodeData, dtype= float).tobytes())
+    elementData= list()
+    for e in xcSet.elements:
+        nodeTags= e.getNodes.getExternalNodes
+        elementData.append([e.tag, e.type()]+[nodeTags[i] for i in range(0, len(nodeTags))])
+    elementData.sort(key= lambda row: row[0])
+    digest.update(json.dumps(elementData).encode('utf-8'))
+    constraintData= list()
+    for c in xcSet.getConstraints:
+        row= [c.tag, type(c).__name__]
+        for name in ['getNodeTag', 'getDOFNumber', 'getValue']:
+            if(hasattr(c, name)):
+                row.append(getattr(c, name))
+        constraintData.append(row)
+    constraintData.sort(key= lambda row: row[0])
+    digest.update(json.dumps(get_plain_data(constraintData)).encode('utf-8'))
+    return digest.hexdigest()
+
+def get_elements_digest(xcSet):
+    ''' Return the content hash of the initial stiffness and mass
+        matrices of the elements of the set argument, so the changes in
+        the properties of their materials and sections are detected.
+
+    :param xcSet: set containing the structural model (usually the total
+                  set).
+    '''
+    elementData= list()
+    for e in xcSet.elements:
+        elementData.append([e.tag, get_matrix_data(e.getInitialStiff()), get_matrix_data(e.mass)])
+    elementData.sort(key= lambda row: row[0])
+    return get_digest(elementData)
+
+def get_elemental_load_data(load):
+    ''' Return a list with the data that define the elemental load
+        argument or None if the load type is unknown or some of its data
+        can't be obtained (in that case the load can't be digested).
+
+    :param load: elemental load.
+    '''
+    loadType= type(load).__name__
+    valueNames= elementalLoadValueNames.get(loadType, None)
+    if(valueNames is None):
+        return None
+    tags= load.elementTags
+    retval= [loadType, getattr(load, 'category', None), [tags[i] for i in range(0, len(tags))]]
+    for name in valueNames:
+        try:
+            value= getattr(load, name)
+            if(callable(value)):
+                value= value()
+            retval.append(get_load_value_data(value))
+        except Exception:
+            return None
+    return retval
+
+def get_load_pattern_digest(loadPattern):
+    ''' Return the content hash of the loads of the load pattern argument
+        or None if some of its loads can't be digested.
+
+    :param loadPattern: load pattern.
+    '''
+    nodalLoads= list()
+    lIter= loadPattern.loads.getNodalLoadIter
+    nl= lIter.next()
+    while(nl):
+        nodalLoads.append([nl.getNodeTag, get_vector_data(nl.getForce), get_vector_data(nl.getMoment)])
+        nl= lIter.next()
+    elementalLoads= list()
+    eIter= loadPattern.loads.getElementalLoadIter
+    el= eIter.next()
+    while(el):
+        loadData= get_elemental_load_data(el)
+        if(loadData is None): # can't be digested.
+            return None
+        elementalLoads.append(loadData)
+        el= eIter.next()
+    return get_digest({'gammaF': loadPattern.gammaF, 'nodalLoads': nodalLoads, 'elementalLoads': elementalLoads})
+
+def get_combination_digests(loadCombinations, loadPatterns, combNames):
+    ''' Return a dictionary containing the content hash of each of the
+        given combinations: its expression and the digests of its load
+        patterns. The digest is None if some of the loads of the
+        combination can't be digested.
+
+    :param loadCombinations: load combination handler inside the XC solver.
+    :param loadPatterns: load pattern container inside the XC solver.
+    :param combNames: names of the combinations.
+    '''
+    loadPatternDigests= dict()
+    retval= dict()
+    for combName in combNames:
+        expr= loadCombinations[combName].getComponents('')
+        combData= {'expr': expr, 'loadPatterns': dict()}
+        for addend in expr.split('+'):
+            addend= addend.strip()
+            if(len(addend)>0):
+                lpName= addend.split('*')[1].strip()
+                if(lpName not in loadPatternDigests):
+                    loadPatternDigests[lpName]= get_load_pattern_digest(loadPatterns[lpName])
+                combData['loadPatterns'][lpName]= loadPatternDigests[lpName]
+        if(None in combData['loadPatterns'].values()):
+            retval[combName]= None # always computed again.
+        else:
+            retval[combName]= get_digest(combData)
+    return retval
+
+def get_element_digests(internalForcesValues, sectionsDistribution, controller, extraData= None):
+    ''' Return a dictionary containing the content hash of the data used
+        to check each element: its internal forces, the definition of its
+        sections and the parameters of the controller.
+
+    :param internalForcesValues: dictionary containing the internal forces
+                                 of each element (see readIntForcesFile
+                                 in the limit_state_data module).
+    :param sectionsDistribution: RC material distribution (see
+                                 RC_material_distribution module).
+    :param controller: object that controls the limit state checking.
+    :param extraData: other data that affects the checking of all the
+                      elements.
+    '''
+    controllerDigest= get_digest({'controller': controller, 'extraData': extraData})
+    sectionDigests= dict()
+    retval= dict()
+    for tagElem in internalForcesValues:
+        forces= [(str(f.idComb), f.idSection, f.getComponents()) for f in internalForcesValues[tagElem]]
+        forces.sort(key= lambda row: (row[0], row[1]))
+        sections= list()
+        sectionNames= sectionsDistribution.sectionDistribution.get(tagElem, None)
+        if(sectionNames):
+            for sectionName in sectionNames:
+                if(sectionName not in sectionDigests):
+                    sectionDigests[sectionName]= get_digest(sectionsDistribution.getSectionDefinition(sectionName))
+                sections.append(sectionDigests[sectionName])
+        retval[tagElem]= get_digest({'forces': forces, 'sections': sections, 'controller': controllerDigest})
+    return retval
+
+class ChangeManifest(object):
+    ''' Digests of the items (combinations, elements,...) whose results
+        are stored in a file.
+
+    :ivar fileName: name of the manifest file.
+    :ivar header: data that must be equal in both runs to reuse any
+                  result (i.e. the set of elements or the storage type).
+    :ivar digests: digests of the items written in the previous run.
+    '''
+    def __init__(self, fileName, header= None):
+        ''' Constructor.
+
+        :param fileName: name of the manifest file.
+        :param header: data that must be equal in both runs to reuse any
+                       result.
+        '''
+        self.fileName= fileName
+        self.header= get_plain_data(header)
+        self.digests= dict()
+
+    def read(self):
+        ''' Read the digests of the previous run. Return false if they
+            can't be used (the manifest doesn't exist or its header is
+            different).'''
+        self.digests= dict()
+        retval= False
+        if(os.path.exists(self.fileName)):
+            try:
+                with open(self.fileName) as f:
+                    data= json.load(f)
+            except ValueError:
+                data= dict()
+            if((data.get('version', None)==manifestFormatVersion) and (data.get('header', None)==self.header)):
+                self.digests= data['digests']
+                retval= True
+        return retval
+
+    def getUnchangedItems(self, digests):
+        ''' Return the keys of the items whose digests are equal to those
+            of the previous run (the items whose digest is None are
+            always considered changed).
+
+        :param digests: dictionary containing the current digests.
+        '''
+        retval= list()
+        for key in digests:
+            digest= digests[key]
+            if((digest is not None) and (self.digests.get(str(key), None)==digest)):
+                retval.append(key)
+        return retval
+
+    def write(self, digests):
+        ''' Write the digests of the current run.
+
+        :param digests: dictionary containing the digest of each item.
+        '''
+        self.digests= dict()
+        for key in digests:
+            self.digests[str(key)]= digests[key]
+        tmpFileName= self.fileName+'.tmp'
+        with open(tmpFileName, 'w') as f:
+            json.dump({'version': manifestFormatVersion, 'header': self.header, 'digests': self.digests}, f)
+        os.replace(tmpFileName, self.fileName) # atomic.
+
+    def remove(self):
+        ''' Remove the manifest file.'''
+        if(os.path.exists(self.fileName)):
+            os.remove(self.fileName)
+
+def get_change_statistics_message(statistics):
+    ''' Return a string describing the results of an incremental run.
+
+    :param statistics: dictionary with the number of items reused and
+                       computed.
+    '''
+    return str(statistics['computed'])+' items computed, '+str(statistics['reused'])+' reused from the previous run.'
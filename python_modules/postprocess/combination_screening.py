@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+''' Screening of the load combinations before the limit state checking
+    on a phantom model (see phantom_model.PhantomModel).
+
+    The internal forces (N, Vy, Vz, T, My, Mz) obtained for each section
+    under the different combinations are read from the results file. The
+    combinations that cannot govern the checking of a section are
+    discarded, so only the remaining ones (candidates) go through the
+    (costly) fiber-section checking. Available methods:
+
+    - 'exact': no screening, all the combinations are checked.
+    - 'convexHull': only the combinations whose internal forces are
+      vertices of the convex hull of the internal forces of the section
+      are checked. The result is the same that the exact one if the
+      efficiency is a convex function of the internal forces (i.e. the
+      capacity factor obtained from a convex interaction diagram).
+    - 'pareto': a combination is discarded when there is another one
+      with internal forces of the same sign and greater or equal absolute
+      values. The result is the same that the exact one if the efficiency
+      doesn't decrease when the absolute value of any component increases.
+
+    The efficiency computed by the shear and crack controllers of
+    fiber sections fulfills those conditions only approximately (i.e.
+    the axial compression increases the shear strength), so use the
+    'exact' method for audits and to verify the screening on a given
+    model.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import sys
+import numpy as np
+from scipy.spatial import ConvexHull
+from scipy.spatial import QhullError
+from collections import defaultdict
+from misc_utils import log_messages as lmsg
+
+screeningMethods= ['exact', 'convexHull', 'pareto']
+
+def is_exact(method):
+    ''' Return true if the method argument means that all the combinations
+        must be checked.
+
+    :param method: screening method (None or one of screeningMethods).
+    '''
+    return (method is None) or (method=='exact')
+
+def get_convex_hull_candidates(points, tol= 1e-9):
+    ''' Return the indexes of the points that are vertices of their
+        convex hull (all the repeated points are returned).
+
+    :param points: matrix containing the internal forces of each
+                   combination (rows).
+    :param tol: relative tolerance used to compute the dimension of the
+                space spanned by the points.
+    '''
+    points= np.asarray(points, dtype= float)
+    numPoints= len(points)
+    retval= np.arange(numPoints)
+    if(numPoints>2):
+        # Scale the components (the hull vertices don't change).
+        scale= np.abs(points).max(axis= 0)
+        scale[scale==0.0]= 1.0
+        scaledPoints= points/scale
+        uniquePoints, inverse= np.unique(scaledPoints, axis= 0, return_inverse= True)
+        inverse= np.ravel(inverse)
+        numUnique= len(uniquePoints)
+        # Coordinates on the affine subspace spanned by the points.
+        centered= uniquePoints-uniquePoints.mean(axis= 0)
+        u, s, vt= np.linalg.svd(centered, full_matrices= False)
+        rank= int(np.count_nonzero(s>tol*s[0])) if (s[0]>0.0) else 0
+        vertices= None
+        if(rank==1):
+            coord= centered.dot(vt[0])
+            vertices= [int(np.argmin(coord)), int(np.argmax(coord))]
+        elif((rank>1) and (numUnique>rank+1)):
+            try:
+                vertices= ConvexHull(centered.dot(vt[:rank].T)).vertices
+            except QhullError as err:
+                functionName= sys._getframe(0).f_code.co_name
+                lmsg.warning(functionName+'; convex hull computation failed ('+str(err).splitlines()[0]+'), all the combinations will be checked.')
+        if(vertices is not None):
+            retval= np.flatnonzero(np.isin(inverse, vertices))
+    return retval
+
+def get_pareto_candidates(points):
+    ''' Return the indexes of the points that are not dominated by other
+        point. Point q dominates p when, for each component, p is zero or
+        q has the same sign and greater or equal absolute value (and they
+        are not equal). All the repeated points are returned.
+
+    :param points: matrix containing the internal forces of each
+                   combination (rows).
+    '''
+    points= np.asarray(points, dtype= float)
+    signs= np.sign(points)
+    absValues= np.abs(points)
+    candidates= np.ones(len(points), dtype= bool)
+    for i, p in enumerate(points):
+        covers= (signs==signs[i]) | (signs[i]==0.0)
+        covers&= absValues>=absValues[i]
+        dominating= np.all(covers, axis= 1) & np.any(points!=p, axis= 1)
+        candidates[i]= not np.any(dominating)
+    return np.flatnonzero(candidates)
+
+def get_candidates(points, method):
+    ''' Return the indexes of the combinations that can govern the
+        checking.
+
+    :param points: matrix containing the internal forces of each
+                   combination (rows).
+    :param method: screening method (None or one of screeningMethods).
+    '''
+    if(is_exact(method)):
+        retval= np.arange(len(points))
+    elif(method=='convexHull'):
+        retval= get_convex_hull_candidates(points)
+    elif(method=='pareto'):
+        retval= get_pareto_candidates(points)
+    else:
+        functionName= sys._getframe(0).f_code.co_name
+        lmsg.error(functionName+"; unknown screening method: '"+str(method)+"'. Available values: "+str(screeningMethods))
+        retval= np.arange(len(points))
+    return retval
+
+def screen_internal_forces(internalForcesValues, method):
+    ''' Return the internal forces of the combinations that can govern
+        the checking of each section and the screening statistics.
+
+    :param internalForcesValues: dictionary containing the list of the
+                                 internal forces (CrossSectionInternalForces
+                                 objects) of each element (see
+                                 limit_state_data.readIntForcesFile).
+    :param method: screening method (None or one of screeningMethods).
+    '''
+    retval= defaultdict(list)
+    numSections= 0
+    numInternalForces= 0
+    allCombs= set()
+    candidateCombs= set()
+    for key in internalForcesValues:
+        sectionInternalForces= defaultdict(list)
+        for iforce in internalForcesValues[key]:
+            sectionInternalForces[iforce.idSection].append(iforce)
+        for idSection in sectionInternalForces:
+            iforces= sectionInternalForces[idSection]
+            points= np.array([iforce.getComponents() for iforce in iforces], dtype= float)
+            candidates= get_candidates(points, method)
+            for i in candidates:
+                retval[key].append(iforces[i])
+                candidateCombs.add(iforces[i].idComb)
+            numSections+= 1
+            numInternalForces+= len(iforces)
+            allCombs.update([iforce.idComb for iforce in iforces])
+    numCandidates= sum([len(retval[key]) for key in retval])
+    statistics= {'method':method, 'numSections':numSections, 'numInternalForces':numInternalForces, 'numCandidates':numCandidates, 'numCombinations':len(allCombs), 'numCandidateCombinations':len(candidateCombs)}
+    return retval, statistics
+
+def get_statistics_message(statistics):
+    ''' Return a message with the results of the screening.
+
+    :param statistics: screening statistics (see screen_internal_forces).
+    '''
+    return 'screening method: '+str(statistics['method'])+'; '+str(statistics['numCandidates'])+' of '+str(statistics['numInternalForces'])+' section internal forces checked ('+str(statistics['numSections'])+' sections), '+str(statistics['numCandidateCombinations'])+' of '+str(statistics['numCombinations'])+' combinations checked.'
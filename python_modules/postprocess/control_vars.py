@@ -17,13 +17,17 @@ __email__= "l.pereztato@ciccp.es, ana.Ortega@ciccp.es"
 
 import os
 import sys
+import ast
 import json
+import importlib
+import collections
+import numpy
 import scipy
 from misc_utils import log_messages as lmsg
 from postprocess.reports import common_formats as fmt
 from postprocess import extrapolate_elem_attr as ext
 
-__all__= ['AxialForceControlVars', 'BiaxialBendingControlVars', 'BiaxialBendingStrengthControlVars', 'CFN', 'CFNMy', 'CFNMyMz', 'CFVy', 'ControlVarsBase', 'CrackControlBaseVars', 'CrackControlVars', 'FatigueControlBaseVars', 'FatigueControlVars', 'N', 'NMy', 'NMyMz', 'RCCrackControlVars', 'RCCrackStraightControlVars', 'RCShearControlVars', 'SIATypeRCShearControlVars', 'ShVy', 'ShearYControlVars', 'SteelShapeBiaxialBendingControlVars', 'UniaxialBendingControlVars', 'VonMisesControlVars', 'extrapolate_control_var', 'getControlVarImportModuleStr', 'getDiagramDirection', 'getElementInternalForceComponentData', 'writeControlVarsFromElements', 'writeControlVarsFromElementsForAnsys', 'writeControlVarsFromPhantomElements']
+__all__= ['AxialForceControlVars', 'BiaxialBendingControlVars', 'BiaxialBendingStrengthControlVars', 'CFN', 'CFNMy', 'CFNMyMz', 'CFVy', 'ControlVarsBase', 'ControlVarsTable', 'CrackControlBaseVars', 'CrackControlVars', 'FatigueControlBaseVars', 'FatigueControlVars', 'N', 'NMy', 'NMyMz', 'RCCrackControlVars', 'RCCrackStraightControlVars', 'RCShearControlVars', 'SIATypeRCShearControlVars', 'ShVy', 'ShearYControlVars', 'SteelShapeBiaxialBendingControlVars', 'UniaxialBendingControlVars', 'VonMisesControlVars', 'extrapolate_control_var', 'getControlVarImportModuleStr', 'getControlVarsRecordType', 'getControlVarsTables', 'getDiagramDirection', 'getElementInternalForceComponentData', 'parseStrConstructor', 'readControlVars', 'readControlVarsArrays', 'readControlVarsRecords', 'writeControlVarsFromElements', 'writeControlVarsFromElementsForAnsys', 'writeControlVarsFromPhantomElements']
 
 def getDiagramDirection(elem, component, defaultDirection):
     '''Return the direction vector to represent the diagram over the element
@@ -196,6 +200,12 @@ class ControlVarsBase(object):
         retval= retval.strip(',')
         return retval
 
+    def getConstructorArguments(self):
+        ''' Return a dictionary with the arguments needed to construct
+            a clone of this object (the values can be other control var
+            objects).'''
+        return self.getDict()
+
     def getModuleImportString(self):
         ''' Return the string to import the module where the control 
             var is defined.'''
@@ -936,6 +946,11 @@ class CrackControlVars(ControlVarsBase):
         retval+= ', crackControlBaseVarsNeg= ' + self.crackControlVarsNeg.getStrConstructor()
         return retval
     
+    def getConstructorArguments(self):
+        ''' Return a dictionary with the arguments needed to construct
+            a clone of this object.'''
+        return {'idSection': self.idSection, 'crackControlBaseVarsPos': self.crackControlVarsPos, 'crackControlBaseVarsNeg': self.crackControlVarsNeg}
+    
     def getDict(self):
         ''' Return a dictionary containing the object data.'''
         retval= dict()
@@ -950,8 +965,8 @@ class CrackControlVars(ControlVarsBase):
         :param dct: dictionary containing the values of the object members.
         '''
         self.idSection= dct['idSection']
-        self.crackControlVarsPos= eval(dct['crackControlBaseVarsPos'])
-        self.crackControlVarsNeg= eval(dct['crackControlBaseVarsNeg'])
+        self.crackControlVarsPos= parseStrConstructor(dct['crackControlBaseVarsPos'])
+        self.crackControlVarsNeg= parseStrConstructor(dct['crackControlBaseVarsNeg'])
         
 
 class RCCrackControlVars(CFNMyMz):
@@ -1175,6 +1190,13 @@ class FatigueControlVars(ControlVarsBase):
         sgc1= abs(min(self.state1.concreteStress,0.0))
         return max(sgc0,sgc1)
 
+    def getConstructorArguments(self):
+        ''' Return a dictionary with the arguments needed to construct
+            a clone of this object.'''
+        retval= self.getDict()
+        retval.update({'controlBaseVars0': self.state0, 'controlBaseVars1': self.state1})
+        return retval
+
     def getDict(self):
         ''' Return a dictionary containing the object data.'''
         retval= dict()
@@ -1190,8 +1212,8 @@ class FatigueControlVars(ControlVarsBase):
         :param dct: dictionary containing the values of the object members.
         '''
         self.idSection= dct['idSection']
-        self.controlBaseVars0= eval(dct['controlBaseVars0'])
-        self.controlBaseVars1= eval(dct['controlBaseVars1'])
+        self.controlBaseVars0= parseStrConstructor(dct['controlBaseVars0'])
+        self.controlBaseVars1= parseStrConstructor(dct['controlBaseVars1'])
         self.concreteLimitStress= dct['concreteLimitStress']
         self.concreteBendingCF= dct['concreteBendingCF']
         self.shearLimit= dct['shearLimit']
@@ -1234,6 +1256,422 @@ class VonMisesControlVars(ControlVarsBase):
         ''' Return the capacity factor.'''
         return self.CF
 
+controlVarsFormatVersion= 2 # version of the format written by writeControlVarsFromElements.
+
+_controlVarsRecordTypes= dict() # record types already created.
+
+def getControlVarsRecordType(className, fields, leadingNames= None):
+    ''' Return the record type (namedtuple) corresponding to the given
+        layout. The names of the record fields are the keys of the
+        getConstructorArguments dictionary of the control vars; the nested
+        control vars are also returned as records. The same type is
+        returned for the same layout.
+
+    :param className: name of the control vars class.
+    :param fields: list of fields (see ControlVarsTable.getLayout).
+    :param leadingNames: names of the fields that precede the control
+                         vars fields (i. e. elementTag and propName).
+    '''
+    if(leadingNames is None):
+        leadingNames= list()
+    key= json.dumps([className, fields, leadingNames])
+    retval= _controlVarsRecordTypes.get(key, None)
+    if(retval is None):
+        fieldNames= list(leadingNames)+[field['name'] for field in fields]
+        retval= collections.namedtuple(className+'Record', fieldNames, rename= True)
+        _controlVarsRecordTypes[key]= retval
+    return retval
+
+def getControlVarsClass(moduleName, className):
+    ''' Return the control vars class from its module and class names.
+
+    :param moduleName: name of the module where the class is defined.
+    :param className: name of the class.
+    '''
+    module= importlib.import_module(moduleName)
+    return getattr(module, className)
+
+def newControlVarsObject(cls, arguments):
+    ''' Return a new control vars object of the given class.
+
+    :param cls: class of the object.
+    :param arguments: dictionary containing the constructor arguments
+                      (see getConstructorArguments).
+    '''
+    try:
+        retval= cls(**arguments)
+    except TypeError: # dictionary keys don't match the constructor arguments.
+        retval= cls()
+        retval.setFromDict(arguments)
+    return retval
+
+def getColumnType(values):
+    ''' Return the type of the values of a column: 'bool', 'int', 'float',
+        'str' or 'object' (mixed values).
+
+    :param values: values of the column.
+    '''
+    types= set(type(v) for v in values)
+    if(types<= {bool}):
+        retval= 'bool'
+    elif(types<= {int}):
+        retval= 'int'
+    elif(types<= {int, float}):
+        retval= 'float'
+    elif(types<= {str}):
+        retval= 'str'
+    else:
+        retval= 'object'
+    return retval
+
+class ControlVarsTable(object):
+    ''' Store the control vars objects of a given class (one record per
+        element and section) as typed columns. The column names are the
+        keys of the getConstructorArguments dictionary of the objects (the
+        columns of nested control vars are named parentField.childField).
+
+    :ivar moduleName: name of the module where the class is defined.
+    :ivar className: name of the class of the control vars.
+    :ivar fields: list of fields; each one of them is a dictionary with
+                  the field name and the column type or, for nested
+                  control vars, the module, class and fields of the nested
+                  object.
+    :ivar elementTags: identifiers of the elements.
+    :ivar propNames: names of the element properties.
+    :ivar columns: dictionary containing the values of each field.
+    '''
+    def __init__(self, moduleName= None, className= None, fields= None):
+        ''' Constructor.
+
+        :param moduleName: name of the module where the class is defined.
+        :param className: name of the class of the control vars.
+        :param fields: list of fields (see getLayout).
+        '''
+        self.moduleName= moduleName
+        self.className= className
+        self.fields= fields
+        self.elementTags= list()
+        self.propNames= list()
+        self.columns= dict()
+
+    @staticmethod
+    def getLayout(controlVar):
+        ''' Return the fields of the control var argument.
+
+        :param controlVar: control vars object.
+        '''
+        retval= list()
+        arguments= controlVar.getConstructorArguments()
+        for key in arguments:
+            value= arguments[key]
+            if(isinstance(value, ControlVarsBase)):
+                retval.append({'name': key, 'module': value.__module__, 'className': type(value).__name__, 'fields': ControlVarsTable.getLayout(value)})
+            else:
+                retval.append({'name': key})
+        return retval
+
+    @staticmethod
+    def getSignature(controlVar):
+        ''' Return a string that identifies the record type of the control
+            var argument.
+
+        :param controlVar: control vars object.
+        '''
+        return json.dumps([controlVar.__module__, type(controlVar).__name__, ControlVarsTable.getLayout(controlVar)])
+
+    @classmethod
+    def newFromControlVar(cls, controlVar):
+        ''' Create a table for the objects with the same type and layout
+            of the argument.
+
+        :param controlVar: control vars object.
+        '''
+        return cls(moduleName= controlVar.__module__, className= type(controlVar).__name__, fields= cls.getLayout(controlVar))
+
+    def _appendValues(self, fields, controlVar, prefix= ''):
+        ''' Append the values of the control var to the columns.'''
+        arguments= controlVar.getConstructorArguments()
+        for field in fields:
+            name= field['name']
+            value= arguments[name]
+            if('fields' in field):
+                self._appendValues(field['fields'], value, prefix+name+'.')
+            else:
+                if(isinstance(value, numpy.generic)): # store Python scalars.
+                    value= value.item()
+                self.columns.setdefault(prefix+name, list()).append(value)
+
+    def append(self, elementTag, propName, controlVar):
+        ''' Append a record.
+
+        :param elementTag: identifier of the element.
+        :param propName: name of the element property.
+        :param controlVar: control vars object.
+        '''
+        self.elementTags.append(elementTag)
+        self.propNames.append(propName)
+        self._appendValues(self.fields, controlVar)
+
+    def getNumberOfRecords(self):
+        ''' Return the number of records in the table.'''
+        return len(self.elementTags)
+
+    def _getArguments(self, fields, i, prefix= ''):
+        ''' Return the constructor arguments of the i-th record.'''
+        retval= dict()
+        for field in fields:
+            name= field['name']
+            if('fields' in field):
+                cls= getControlVarsClass(field['module'], field['className'])
+                retval[name]= newControlVarsObject(cls, self._getArguments(field['fields'], i, prefix+name+'.'))
+            else:
+                retval[name]= self.columns[prefix+name][i]
+        return retval
+
+    def getObject(self, i):
+        ''' Return the control vars object corresponding to the i-th record.
+
+        :param i: index of the record.
+        '''
+        cls= getControlVarsClass(self.moduleName, self.className)
+        return newControlVarsObject(cls, self._getArguments(self.fields, i))
+
+    def getRecordType(self):
+        ''' Return the record type (namedtuple) of the rows of the table:
+            elementTag, propName and the fields of the control vars (see
+            getControlVarsRecordType).'''
+        return getControlVarsRecordType(self.className, self.fields, leadingNames= ['elementTag', 'propName'])
+
+    def _getRecordValues(self, fields, i, prefix= ''):
+        ''' Return the values of the fields of the i-th record.'''
+        retval= list()
+        for field in fields:
+            name= field['name']
+            if('fields' in field):
+                recordType= getControlVarsRecordType(field['className'], field['fields'])
+                retval.append(recordType(*self._getRecordValues(field['fields'], i, prefix+name+'.')))
+            else:
+                retval.append(self.columns[prefix+name][i])
+        return retval
+
+    def getRecord(self, i):
+        ''' Return the i-th record (see getRecordType) without creating
+            the control vars object.
+
+        :param i: index of the record.
+        '''
+        recordType= self.getRecordType()
+        return recordType(self.elementTags[i], self.propNames[i], *self._getRecordValues(self.fields, i))
+
+    def getRecords(self):
+        ''' Return the list of records stored in the table.'''
+        return [self.getRecord(i) for i in range(0, self.getNumberOfRecords())]
+
+    def getArray(self, fieldName):
+        ''' Return a NumPy array containing the values of the field
+            argument (None if the field doesn't exist).
+
+        :param fieldName: name of the field (parentField.childField for
+                          nested control vars).
+        '''
+        retval= None
+        if(fieldName in self.columns):
+            values= self.columns[fieldName]
+            columnType= getColumnType(values)
+            if(columnType=='object'):
+                retval= numpy.array(values, dtype= object)
+            else:
+                retval= numpy.array(values, dtype= columnType)
+        elif((fieldName=='CF') and (self.getNumberOfRecords()>0)): # computed by the object.
+            retval= numpy.array([self.getObject(i).getCF() for i in range(0, self.getNumberOfRecords())], dtype= float)
+        return retval
+
+    def getDict(self):
+        ''' Return a dictionary containing the object data.'''
+        columnTypes= dict()
+        for key in self.columns:
+            columnTypes[key]= getColumnType(self.columns[key])
+        return {'module': self.moduleName, 'className': self.className, 'fields': self.fields, 'elementTags': self.elementTags, 'propNames': self.propNames, 'columnTypes': columnTypes, 'columns': self.columns}
+
+    def setFromDict(self, dct):
+        ''' Set the data values from the dictionary argument.
+
+        :param dct: dictionary containing the values of the object members.
+        '''
+        self.moduleName= dct['module']
+        self.className= dct['className']
+        self.fields= dct['fields']
+        self.elementTags= dct['elementTags']
+        self.propNames= dct['propNames']
+        self.columns= dct['columns']
+
+def getControlVarsTables(elementControlVars):
+    ''' Return a list of tables (ControlVarsTable objects), one for each
+        type of record, containing the given control vars.
+
+    :param elementControlVars: iterable of (elementTag, propName, controlVar)
+                               tuples.
+    '''
+    tables= dict()
+    for elementTag, propName, controlVar in elementControlVars:
+        signature= ControlVarsTable.getSignature(controlVar)
+        table= tables.get(signature, None)
+        if(table is None):
+            table= ControlVarsTable.newFromControlVar(controlVar)
+            tables[signature]= table
+        table.append(elementTag, propName, controlVar)
+    return list(tables.values())
+
+def getControlVarsTablesFromDict(dataDict):
+    ''' Return the control var tables stored in the dictionary argument
+        (see writeControlVarsFromElements).
+
+    :param dataDict: dictionary read from the output file.
+    '''
+    retval= list()
+    for tableDict in dataDict.get('elementRecords', list()):
+        table= ControlVarsTable()
+        table.setFromDict(tableDict)
+        retval.append(table)
+    return retval
+
+def getLegacyNamespace(importString= None):
+    ''' Return a dictionary with the classes that can appear in the
+        constructor strings written in the legacy format.
+
+    :param importString: import sentence written in the output file.
+    '''
+    retval= dict(globals())
+    if(importString):
+        for sentence in importString.split(';'):
+            words= sentence.split()
+            if((len(words)==4) and (words[0]=='from') and (words[2]=='import')):
+                try:
+                    retval[words[3]]= getControlVarsClass(words[1], words[3])
+                except (ImportError, AttributeError):
+                    lmsg.warning("can't import: '"+sentence+"'.")
+    return retval
+
+def _parseLegacyValue(node, namespace):
+    ''' Return the value of the node argument (see parseStrConstructor).'''
+    if(isinstance(node, ast.Call)):
+        return _parseLegacyCall(node, namespace)
+    elif(isinstance(node, ast.Name) and (node.id in ['nan', 'inf'])):
+        return float(node.id)
+    else:
+        return ast.literal_eval(node)
+
+def _parseLegacyCall(node, namespace):
+    ''' Return the object constructed by the call node (see
+        parseStrConstructor).'''
+    if((not isinstance(node.func, ast.Name)) or (len(node.args)>0)):
+        raise ValueError("unexpected constructor: '"+ast.dump(node)+"'.")
+    className= node.func.id
+    cls= namespace.get(className, None)
+    if((cls is None) or (not isinstance(cls, type)) or (not issubclass(cls, ControlVarsBase))):
+        raise ValueError("unknown control vars class: '"+className+"'.")
+    arguments= dict()
+    for keyword in node.keywords:
+        arguments[keyword.arg]= _parseLegacyValue(keyword.value, namespace)
+    return newControlVarsObject(cls, arguments)
+
+def parseStrConstructor(strConstructor, namespace= None):
+    ''' Return the control vars object corresponding to the constructor
+        string argument (see ControlVarsBase.getStrConstructor) written
+        in the legacy format. The string is parsed (not evaluated), so
+        only control vars constructors with literal arguments are
+        accepted.
+
+    :param strConstructor: constructor string.
+    :param namespace: dictionary containing the control var classes
+                      (see getLegacyNamespace).
+    '''
+    if(namespace is None):
+        namespace= getLegacyNamespace()
+    try:
+        tree= ast.parse(strConstructor.strip(), mode= 'eval')
+    except SyntaxError:
+        raise ValueError("can't parse: '"+strConstructor+"'.")
+    return _parseLegacyValue(tree.body, namespace)
+
+def getLegacyElementControlVars(dataDict):
+    ''' Return a list of (elementTag, propName, controlVar) tuples
+        containing the control vars stored in the dictionary argument
+        using the legacy format (constructor strings).
+
+    :param dataDict: dictionary read from the output file.
+    '''
+    retval= list()
+    namespace= getLegacyNamespace(dataDict.get('importString', None))
+    elementData= dataDict.get('elementData', dict())
+    for eKey in elementData:
+        elementControlVars= elementData[eKey]
+        for propName in elementControlVars:
+            try:
+                controlVar= parseStrConstructor(elementControlVars[propName], namespace)
+            except ValueError as err:
+                lmsg.error('element: '+eKey+', property: '+propName+'; '+str(err))
+                continue
+            retval.append((int(eKey), propName, controlVar))
+    return retval
+
+def readControlVarsRecords(inputFileName):
+    ''' Read the control vars from the input file and return them as
+        records (see getControlVarsRecordType) without creating the
+        control var objects (when possible). Return a dictionary whose
+        keys are the property names (i. e. 'ULS_normalStressesResistanceSect1')
+        and whose values are the lists of records for that property.
+
+    :param inputFileName: name of the input file containing the data.
+    '''
+    with open(inputFileName) as f:
+        dataDict= json.load(f)
+    if('elementRecords' in dataDict):
+        tables= getControlVarsTablesFromDict(dataDict)
+    else: # legacy format.
+        tables= getControlVarsTables(getLegacyElementControlVars(dataDict))
+    retval= dict()
+    for table in tables:
+        for record in table.getRecords():
+            retval.setdefault(record.propName, list()).append(record)
+    return retval
+
+def readControlVarsArrays(inputFileName, fieldName= 'CF'):
+    ''' Read the values of a field of the control vars from the input file
+        and return them as NumPy arrays without creating the control var
+        objects (when possible). Return a dictionary whose keys are the
+        property names (i. e. 'ULS_normalStressesResistanceSect1') and
+        whose values are pairs (elementTags, values).
+
+    :param inputFileName: name of the input file containing the data.
+    :param fieldName: name of the field to read (parentField.childField
+                      for nested control vars).
+    '''
+    with open(inputFileName) as f:
+        dataDict= json.load(f)
+    tags= dict()
+    values= dict()
+    if('elementRecords' in dataDict):
+        for table in getControlVarsTablesFromDict(dataDict):
+            array= table.getArray(fieldName)
+            if(array is None):
+                array= numpy.full(table.getNumberOfRecords(), numpy.nan)
+            for tag, propName, value in zip(table.elementTags, table.propNames, array):
+                tags.setdefault(propName, list()).append(tag)
+                values.setdefault(propName, list()).append(value)
+    elif('elementData' in dataDict): # legacy format.
+        for tag, propName, controlVar in getLegacyElementControlVars(dataDict):
+            if(fieldName=='CF'):
+                value= controlVar.getCF()
+            else:
+                value= controlVar(fieldName)
+            tags.setdefault(propName, list()).append(tag)
+            values.setdefault(propName, list()).append(value)
+    retval= dict()
+    for propName in tags:
+        retval[propName]= (numpy.array(tags[propName], dtype= int), numpy.array(values[propName]))
+    return retval
+
 def readControlVars(preprocessor, inputFileName):
     ''' Read control var data from the input file an put them as properties
         of the model elements and/or nodes.
@@ -1247,15 +1685,25 @@ def readControlVars(preprocessor, inputFileName):
     except IOError:
         lmsg.error("can't read from file: "+str(inputFileName))
         return
-    if 'elementData' in dataDict: # Control variables on elements.
+    elementHandler= preprocessor.getElementHandler
+    if 'elementRecords' in dataDict: # Control variables on elements.
+        for table in getControlVarsTablesFromDict(dataDict):
+            for i, (elementTag, propKey) in enumerate(zip(table.elementTags, table.propNames)):
+                element= elementHandler.getElement(int(elementTag))
+                element.setProp(propKey, table.getObject(i))
+    namespace= getLegacyNamespace(dataDict.get('importString', None))
+    if 'elementData' in dataDict: # Control variables on elements (legacy format).
         elementData= dataDict['elementData']
-        elementHandler= preprocessor.getElementHandler
         for eKey in elementData: # iterate on elements.
             elementTag= int(eKey)
             element= elementHandler.getElement(elementTag)
             elementControlVars= elementData[eKey]
             for propKey in elementControlVars: # iterate on element control vars.
-                propValue= eval(elementControlVars[propKey])
+                try:
+                    propValue= parseStrConstructor(elementControlVars[propKey], namespace)
+                except ValueError as err:
+                    lmsg.error('element: '+eKey+', property: '+propKey+'; '+str(err))
+                    continue
                 element.setProp(propKey, propValue)
     if 'nodeData' in dataDict: # Control variables on nodes.
         nodeData= dataDict['nodeData']
@@ -1265,10 +1713,36 @@ def readControlVars(preprocessor, inputFileName):
             node= nodeHandler.getNode(nodeTag)
             nodeControlVars= nodeData[eKey]
             for propKey in nodeControlVars: # iterate on node control vars.
-                propValue= eval(nodeControlVars[propKey])
+                try:
+                    propValue= parseStrConstructor(nodeControlVars[propKey], namespace)
+                except ValueError as err:
+                    lmsg.error('node: '+eKey+', property: '+propKey+'; '+str(err))
+                    continue
                 node.setProp(propKey, propValue)
 
-def writeControlVarsFromPhantomElements(preprocessor,outputFileName,outputCfg):
+def readPhantomElementControlVars(outputFileName, controlVarName, elementTags):
+    '''Return the control vars written in a previous run (see
+     writeControlVarsFromPhantomElements) for the given elements as a list
+     of (elementTag, sectionIndex, controlVar) tuples.
+
+    :param outputFileName: name to the files (.json and .tex)
+    :param controlVarName: name of the control var (limit state label).
+    :param elementTags: identifiers of the elements to read.
+    '''
+    retval= list()
+    jsonFileName= outputFileName+'.json'
+    if(elementTags and os.path.exists(jsonFileName)):
+        with open(jsonFileName) as f:
+            dataDict= json.load(f)
+        sectionPrefix= controlVarName+'Sect'
+        for table in getControlVarsTablesFromDict(dataDict):
+            for i, (eTag, propName) in enumerate(zip(table.elementTags, table.propNames)):
+                if((eTag in elementTags) and propName.startswith(sectionPrefix)):
+                    sectionIndex= int(propName[len(sectionPrefix):])
+                    retval.append((eTag, sectionIndex, table.getObject(i)))
+    return retval
+
+def writeControlVarsFromPhantomElements(preprocessor,outputFileName,outputCfg, previousControlVars= None):
     '''Writes in file 'outputFileName' the control-variable values calculated for
      the RC elements in the phantom model.
 
@@ -1277,9 +1751,16 @@ def writeControlVarsFromPhantomElements(preprocessor,outputFileName,outputCfg):
     :param outputCfg: instance of class 'VerifOutVars' which defines the 
            variables that control the output of the checking (append or not
            the results to a file, generation or not of lists, ...)
+    :param previousControlVars: control vars of the elements that have not
+           been checked again (see readPhantomElementControlVars and the
+           incremental argument of VerifOutVars).
     '''
     elems= preprocessor.getSets['total'].elements # This total set belongs to the phantom model and contains all the calculated elements
     controlVarName= outputCfg.controller.limitStateLabel
+    # (element tag, section index, control var) for each checked section.
+    sectionControlVars= [(e.getProp("idElem"), e.getProp('dir'), e.getProp(controlVarName)) for e in elems]
+    if(previousControlVars):
+        sectionControlVars.extend(previousControlVars)
     dataDict= None
     jsonFileName= outputFileName+'.json'
     if outputCfg.appendToResFile.lower()[0]=='y':
@@ -1290,17 +1771,15 @@ def writeControlVarsFromPhantomElements(preprocessor,outputFileName,outputCfg):
             lmsg.error("can't read from file: "+str(inputFileName))
     else:
         dataDict= dict()
-    elementDataDict= dict()
-    dataDict['elementData']= elementDataDict
-    for e in elems:
-        eTag= e.getProp("idElem")
-        if not eTag in elementDataDict:
-            elementDataDict[eTag]= dict()
-        controlVar= e.getProp(controlVarName)
+    elementControlVars= list()
+    for eTag, sectionIndex, controlVar in sectionControlVars:
         #outStr= controlVar.getLaTeXString(eTag,1e-3)
-        sectionName= 'Sect'+str(e.getProp('dir'))
+        sectionName= 'Sect'+str(sectionIndex)
         propName= controlVarName+sectionName
-        elementDataDict[eTag][propName]= controlVar.getStrConstructor()
+        elementControlVars.append((eTag, propName, controlVar))
+    dataDict.pop('elementData', None) # remove legacy data.
+    dataDict['formatVersion']= controlVarsFormatVersion
+    dataDict['elementRecords']= [table.getDict() for table in getControlVarsTables(elementControlVars)]
     with open(jsonFileName, 'w') as f:
         json.dump(dataDict, f)       
 
@@ -1310,18 +1789,13 @@ def writeControlVarsFromPhantomElements(preprocessor,outputFileName,outputCfg):
         else:
             texOutput= open(outputFileName+".tex","w+")
         texOutput.write("Section 1\n")
-        for e in elems:
-            if(e.getProp("dir")==1):
-                eTag= e.getProp("idElem") 
-                controlVar= e.getProp(controlVarName)
+        for eTag, sectionIndex, controlVar in sectionControlVars:
+            if(sectionIndex==1):
                 outStr= controlVar.getLaTeXString(eTag,1e-3)
                 texOutput.write(outStr)
         texOutput.write("Section 2\n")
-        for e in elems:
-            if(e.getProp("dir")==2):
-                eTag= e.getProp("idElem") 
-                #idSection= e.getProp("idSection")  
-                controlVar= e.getProp(controlVarName)
+        for eTag, sectionIndex, controlVar in sectionControlVars:
+            if(sectionIndex==2):
                 outStr= controlVar.getLaTeXString(eTag,1e-3)
                 texOutput.write(outStr)
         texOutput.close()
@@ -1329,12 +1803,10 @@ def writeControlVarsFromPhantomElements(preprocessor,outputFileName,outputCfg):
     if outputCfg.calcMeanCF.lower()[0]=='y':
         fcs1= [] #Capacity factors at section 1.
         fcs2= [] #Capacity factors at section 2.
-        for e in elems:
-            if(e.getProp("dir")==1):
-                controlVar= e.getProp(controlVarName)
+        for eTag, sectionIndex, controlVar in sectionControlVars:
+            if(sectionIndex==1):
                 fcs1.append(controlVar.getCF())
-            if(e.getProp("dir")==2):
-                controlVar= e.getProp(controlVarName)
+            if(sectionIndex==2):
                 fcs2.append(controlVar.getCF())
         retval= [scipy.mean(fcs1),scipy.mean(fcs2)]
     return retval
@@ -1391,14 +1863,14 @@ def writeControlVarsFromElements(preprocessor, outputFileName, outputCfg, sectio
     # Write report in JSON format.
     importString= getControlVarImportModuleStr(preprocessor, outputCfg, sections)
     dataDict['importString']= importString
-    elementDataDict= dict()
-    dataDict['elementData']= elementDataDict
+    elementControlVars= list()
     for e in elems:
-        elementDataDict[e.tag]= dict()
         for s in sections:
             propName= controlVarName+s
-            controlVar= e.getProp(propName)
-            elementDataDict[e.tag][propName]= controlVar.getStrConstructor()
+            elementControlVars.append((e.tag, propName, e.getProp(propName)))
+    dataDict.pop('elementData', None) # remove legacy data.
+    dataDict['formatVersion']= controlVarsFormatVersion
+    dataDict['elementRecords']= [table.getDict() for table in getControlVarsTables(elementControlVars)]
     with open(jsonFileName, 'w') as f:
         json.dump(dataDict, f)
     
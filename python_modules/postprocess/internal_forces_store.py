@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+''' Columnar storage for the internal forces computed for each load
+    combination. Instead of a nested JSON dictionary
+    {comb: {elemTag: {'internalForces': {i: dict}}}} the values are stored
+    in a folder that contains an index (combination names, element tags
+    and section identifiers) and one binary NumPy array (.npy) for each
+    internal force component. Each array has one row per combination and
+    one column per element section, so any subset of combinations or
+    elements can be read lazily through memory mapping.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022,LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import json
+import numpy
+from numpy.lib import format as npy_format
+from collections import defaultdict
+from materials.sections import internal_forces
+
+indexFileName= 'index.json'
+storeSuffix= '.ifstore'
+
+def isInternalForcesStore(path):
+    ''' Return true if the path argument corresponds to a columnar internal
+        forces store.
+
+    :param path: path to check.
+    '''
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, indexFileName))
+
+def getLayoutFromDict(internalForcesDict):
+    ''' Return the element sections (element tag, element type and
+        number of sections) and the names of the internal force components
+        that appear in the dictionary argument.
+
+    :param internalForcesDict: dictionary containing the internal forces
+                               {comb: {elemTag: {'internalForces': {i: dict}}}}.
+    '''
+    elements= dict()
+    components= list()
+    for combName in internalForcesDict:
+        combDict= internalForcesDict[combName]
+        for elemTag in combDict:
+            elemDict= combDict[elemTag]
+            elemInternalForces= elemDict['internalForces']
+            tag= int(elemTag)
+            numSections= len(elemInternalForces)
+            if(tag in elements):
+                numSections= max(numSections, elements[tag][1])
+            elements[tag]= (elemDict['type'], numSections)
+            for sectionId in elemInternalForces:
+                for key in elemInternalForces[sectionId]:
+                    if(key not in components):
+                        components.append(key)
+    elementTags= list(elements.keys())
+    elementTypes= [elements[tag][0] for tag in elementTags]
+    numSections= [elements[tag][1] for tag in elementTags]
+    return elementTags, elementTypes, numSections, components
+
+class InternalForcesStoreWriter(object):
+    ''' Write the internal forces of each combination in a columnar
+        store. The arrays are allocated on disk (memory mapped) so the
+        combinations can be written one by one.
+
+    :ivar path: folder that contains the store.
+    :ivar combNames: names of the combinations.
+    :ivar elementTags: identifiers of the elements.
+    :ivar elementTypes: types of the elements.
+    :ivar numSections: number of sections of each element.
+    :ivar components: names of the internal force components.
+    :ivar resume: if true, reuse the arrays already written in the store
+                  (used to resume an interrupted computation).
+    '''
+    def __init__(self, path, combNames, elementTags, elementTypes, numSections, components, resume= False):
+        ''' Constructor.
+
+        :param path: folder that will contain the store.
+        :param combNames: names of the combinations.
+        :param elementTags: identifiers of the elements.
+        :param elementTypes: types of the elements.
+        :param numSections: number of sections of each element.
+        :param components: names of the internal force components.
+        :param resume: if true, reuse the arrays already written in the
+                       store (used to resume an interrupted computation).
+        '''
+        self.path= path
+        self.resume= resume
+        self.combNames= list(combNames)
+        self.elementTags= list(elementTags)
+        self.elementTypes= list(elementTypes)
+        self.numSections= list(numSections)
+        self.components= list(components)
+        self.combIndex= {name: i for i, name in enumerate(self.combNames)}
+        self.elementOffsets= dict()
+        offset= 0
+        for tag, n in zip(self.elementTags, self.numSections):
+            self.elementOffsets[tag]= offset
+            offset+= n
+        self.numColumns= offset
+        if(not os.path.exists(self.path)):
+            os.makedirs(self.path)
+        self.arrays= dict()
+        for component in self.components:
+            self.arrays[component]= self._newArray(component)
+        self.writeIndex()
+
+    def _newArray(self, component):
+        ''' Create a memory mapped array for the component argument.
+
+        :param component: name of the internal force component.
+        '''
+        fName= os.path.join(self.path, component+'.npy')
+        if(self.resume and os.path.exists(fName)):
+            retval= npy_format.open_memmap(fName, mode= 'r+')
+        else:
+            retval= npy_format.open_memmap(fName, mode= 'w+', dtype= numpy.float64, shape= (len(self.combNames), self.numColumns))
+            retval[:]= numpy.nan
+        return retval
+
+    def writeIndex(self):
+        ''' Write the index of the store.'''
+        index= {'combinations': self.combNames, 'elementTags': self.elementTags, 'elementTypes': self.elementTypes, 'numSections': self.numSections, 'components': self.components}
+        with open(os.path.join(self.path, indexFileName), 'w') as outfile:
+            json.dump(index, outfile)
+
+    def writeCombination(self, combInternalForcesDict):
+        ''' Write the internal forces of a combination.
+
+        :param combInternalForcesDict: dictionary containing the internal
+                                       forces of a combination
+                                       {comb: {elemTag: {'internalForces': {i: dict}}}}.
+        '''
+        for combName in combInternalForcesDict:
+            row= self.combIndex[combName]
+            combDict= combInternalForcesDict[combName]
+            for elemTag in combDict:
+                offset= self.elementOffsets[int(elemTag)]
+                elemInternalForces= combDict[elemTag]['internalForces']
+                for sectionId in elemInternalForces:
+                    column= offset+int(sectionId)
+                    forces= elemInternalForces[sectionId]
+                    for key in forces:
+                        if(key not in self.arrays):
+                            self.components.append(key)
+                            self.arrays[key]= self._newArray(key)
+                            self.writeIndex()
+                        self.arrays[key][row, column]= forces[key]
+
+    def flush(self):
+        ''' Flush the arrays to disk.'''
+        for key in self.arrays:
+            self.arrays[key].flush()
+
+    def close(self):
+        ''' Flush the arrays to disk and release them.'''
+        self.flush()
+        self.arrays= dict()
+
+def writeInternalForcesStore(path, internalForcesDict):
+    ''' Write the internal forces dictionary argument into a columnar store.
+
+    :param path: folder that will contain the store.
+    :param internalForcesDict: dictionary containing the internal forces
+                               {comb: {elemTag: {'internalForces': {i: dict}}}}.
+    '''
+    elementTags, elementTypes, numSections, components= getLayoutFromDict(internalForcesDict)
+    writer= InternalForcesStoreWriter(path= path, combNames= list(internalForcesDict.keys()), elementTags= elementTags, elementTypes= elementTypes, numSections= numSections, components= components)
+    for combName in internalForcesDict:
+        writer.writeCombination({combName: internalForcesDict[combName]})
+    writer.close()
+
+class InternalForcesStore(object):
+    ''' Read access to a columnar internal forces store. The component
+        arrays are memory mapped, so only the requested values are
+        actually read from disk.
+
+    :ivar path: folder that contains the store.
+    :ivar combNames: names of the combinations.
+    :ivar elementTags: identifiers of the elements.
+    :ivar elementTypes: types of the elements.
+    :ivar numSections: number of sections of each element.
+    :ivar components: names of the internal force components.
+    '''
+    def __init__(self, path):
+        ''' Constructor.
+
+        :param path: folder that contains the store.
+        '''
+        self.path= path
+        with open(os.path.join(self.path, indexFileName)) as json_file:
+            index= json.load(json_file)
+        self.combNames= index['combinations']
+        self.elementTags= index['elementTags']
+        self.elementTypes= index['elementTypes']
+        self.numSections= index['numSections']
+        self.components= index['components']
+        self.combIndex= {name: i for i, name in enumerate(self.combNames)}
+        self.elementIndex= {tag: i for i, tag in enumerate(self.elementTags)}
+        self.elementOffsets= dict()
+        offset= 0
+        for tag, n in zip(self.elementTags, self.numSections):
+            self.elementOffsets[tag]= offset
+            offset+= n
+        self.numColumns= offset
+        self.arrays= dict()
+
+    def getComponentArray(self, component):
+        ''' Return the (memory mapped) array of the component argument.
+
+        :param component: name of the internal force component.
+        '''
+        retval= self.arrays.get(component, None)
+        if(retval is None):
+            fName= os.path.join(self.path, component+'.npy')
+            retval= numpy.load(fName, mmap_mode= 'r')
+            self.arrays[component]= retval
+        return retval
+
+    def getCombinationRows(self, combNames= None):
+        ''' Return the rows corresponding to the given combinations.
+
+        :param combNames: names of the combinations (if None return all).
+        '''
+        if(combNames is None):
+            retval= numpy.arange(len(self.combNames))
+        else:
+            retval= numpy.array([self.combIndex[name] for name in combNames], dtype= int)
+        return retval
+
+    def getElementColumns(self, elementTags= None):
+        ''' Return the element tags and the columns corresponding to the
+            sections of the given elements (tags not found in the store
+            are ignored).
+
+        :param elementTags: identifiers of the elements (if None return all).
+        '''
+        if(elementTags is None):
+            return list(self.elementTags), numpy.arange(self.numColumns)
+        tags= list()
+        columns= list()
+        for tag in elementTags:
+            offset= self.elementOffsets.get(int(tag), None)
+            if(offset is not None):
+                tags.append(int(tag))
+                columns.extend(range(offset, offset+self.getNumSections(tag)))
+        return tags, numpy.array(columns, dtype= int)
+
+    def getNumSections(self, elementTag):
+        ''' Return the number of sections of the given element.
+
+        :param elementTag: identifier of the element.
+        '''
+        return self.numSections[self.elementIndex[int(elementTag)]]
+
+    def getValues(self, component, combNames= None, elementTags= None):
+        ''' Return an array with the values of the component for the given
+            combinations (rows) and element sections (columns).
+
+        :param component: name of the internal force component.
+        :param combNames: names of the combinations (if None return all).
+        :param elementTags: identifiers of the elements (if None return all).
+        '''
+        rows= self.getCombinationRows(combNames)
+        tags, columns= self.getElementColumns(elementTags)
+        array= self.getComponentArray(component)
+        return array[numpy.ix_(rows, columns)]
+
+    def getInternalForcesDict(self, combNames= None, elementTags= None, stringKeys= False):
+        ''' Return a dictionary with the same format of the one written in
+            the JSON internal forces files for the given combinations and
+            elements {comb: {elemTag: {'internalForces': {i: dict}}}}.
+
+        :param combNames: names of the combinations (if None return all).
+        :param elementTags: identifiers of the elements (if None return all).
+        :param stringKeys: if true, element tags and section indexes are
+                           converted to strings (as in the dictionaries
+                           read from JSON files).
+        '''
+        if(combNames is None):
+            combNames= self.combNames
+        tags, columns= self.getElementColumns(elementTags)
+        rows= self.getCombinationRows(combNames)
+        values= dict()
+        for component in self.components:
+            values[component]= self.getComponentArray(component)[numpy.ix_(rows, columns)]
+        retval= dict()
+        for i, combName in enumerate(combNames):
+            combDict= dict()
+            j= 0
+            for tag in tags:
+                idx= self.elementIndex[tag]
+                numSections= self.numSections[idx]
+                elemInternalForces= dict()
+                for k in range(0, numSections):
+                    forces= dict()
+                    for component in self.components:
+                        value= values[component][i, j+k]
+                        if(not numpy.isnan(value)):
+                            forces[component]= float(value)
+                    if(len(forces)>0):
+                        if(stringKeys):
+                            elemInternalForces[str(k)]= forces
+                        else:
+                            elemInternalForces[k]= forces
+                j+= numSections
+                elemDict= {'type': self.elementTypes[idx], 'internalForces': elemInternalForces}
+                if(stringKeys):
+                    combDict[str(tag)]= elemDict
+                else:
+                    combDict[tag]= elemDict
+            retval[combName]= combDict
+        return retval
+
+    def exportToJSON(self, fileName, combNames= None, elementTags= None):
+        ''' Write the internal forces in a JSON file with the legacy
+            format.
+
+        :param fileName: name of the output file.
+        :param combNames: names of the combinations (if None export all).
+        :param elementTags: identifiers of the elements (if None export all).
+        '''
+        with open(fileName, 'w') as outfile:
+            json.dump(self.getInternalForcesDict(combNames= combNames, elementTags= elementTags), outfile)
+
+    def readIntForces(self, setCalc= None, vonMisesStressId= 'max_von_mises_stress'):
+        '''Return elementTags, idCombs and internal-forces values with the
+           same format of readIntForcesDict (see limit_state_data module).
+
+        :param setCalc: set of elements to be analyzed (defaults to None which
+                        means that all the elements in the store are
+                        analyzed)
+        :param vonMisesStressId: identifier of the Von Mises stress to read
+                                (see NDMaterial and MembranePlateFiberSection).
+        '''
+        elementTagsOfInterest= None
+        if(setCalc):
+            elementTagsOfInterest= setCalc.getElementTags()
+        tags, columns= self.getElementColumns(elementTagsOfInterest)
+        values= dict()
+        for component in self.components:
+            values[component]= numpy.asarray(self.getComponentArray(component)[:, columns])
+        elementTags= set()
+        internalForcesValues= defaultdict(list)
+        for i, idComb in enumerate(self.combNames):
+            j= 0
+            for tag in tags:
+                numSections= self.getNumSections(tag)
+                for k in range(0, numSections):
+                    forces= dict()
+                    for component in self.components:
+                        value= values[component][i, j+k]
+                        if(not numpy.isnan(value)):
+                            forces[component]= float(value)
+                    if(len(forces)>0):
+                        elementTags.add(tag)
+                        crossSectionInternalForces= internal_forces.CrossSectionInternalForces()
+                        crossSectionInternalForces.setFromDict(forces)
+                        crossSectionInternalForces.idComb= idComb
+                        crossSectionInternalForces.tagElem= tag
+                        crossSectionInternalForces.idSection= k
+                        if(vonMisesStressId in forces):
+                            crossSectionInternalForces.vonMisesStress= forces[vonMisesStressId]
+                        internalForcesValues[tag].append(crossSectionInternalForces)
+                j+= numSections
+        return (elementTags, set(self.combNames), internalForcesValues)
@@ -13,9 +13,16 @@ __email__= "l.pereztato@ciccp.es, ana.Ortega@ciccp.es"
 import pickle
 import os
 import sys
+import shutil
 from solution import predefined_solutions
 from postprocess.reports import export_internal_forces as eif
 from postprocess.reports import export_reactions as er
+from postprocess import load_superposition as ls
+from postprocess import internal_forces_store as ifs
+from postprocess import results_sink as rs
+from postprocess import change_tracking as ct
+from solution import parallel_combinations as pc
+from solution import combination_ordering as co
 from misc_utils import log_messages as lmsg
 from materials.sections import internal_forces
 from collections import defaultdict
@@ -38,8 +45,25 @@ class VerifOutVars(object):
     :ivar calcMeanCF: 'Yes','Y','y',.., if average capacity factor is
            meant to be calculated (defaults to 'N')
     :ivar controller: object that controls the limit state checking.
+    :ivar screeningMethod: method used to discard the combinations that
+           cannot govern the checking of each section on the phantom model
+           (see combination_screening module); if None or 'exact' all the
+           combinations are checked.
+    :ivar screeningStatistics: results of the screening (None if all the
+           combinations have been checked).
+    :ivar sectionSolver: if true, the state of the phantom model elements
+           is computed section by section instead of solving the global 
+           model (see PhantomModel.checkSections).
+    :ivar numProcesses: number of worker processes used by the section 
+           level solver (if None use the value of the XC_NUM_PROCESSES
+           environment variable, see parallel_combinations module).
+    :ivar incremental: if true, check only the elements whose digests
+           have changed since the previous run (see change_tracking
+           module) and reuse the results of the remaining ones.
+    :ivar changeStatistics: number of elements checked and reused (None 
+           if the checking is not incremental).
     '''
-    def __init__(self, setCalc=None, appendToResFile='N', listFile='N', calcMeanCF='N', controller= None):
+    def __init__(self, setCalc=None, appendToResFile='N', listFile='N', calcMeanCF='N', controller= None, screeningMethod= None, sectionSolver= False, numProcesses= None, incremental= False):
         ''' Constructor.
 
         :param setCalc: set of elements to be checked (defaults to 'None' which 
@@ -52,12 +76,33 @@ class VerifOutVars(object):
         :param calcMeanCF: 'Yes','Y','y',.., if average capacity factor is
                meant to be calculated (defaults to 'N')
         :param controller: object that controls the limit state checking.
+        :param screeningMethod: method used to discard the combinations that
+               cannot govern the checking of each section on the phantom
+               model (see combination_screening module); if None or 'exact'
+               all the combinations are checked.
+        :param sectionSolver: if true, the state of the phantom model 
+               elements is computed section by section instead of solving
+               the global model (see PhantomModel.checkSections).
+        :param numProcesses: number of worker processes used by the section
+               level solver (if None use the value of the XC_NUM_PROCESSES
+               environment variable).
+        :param incremental: if true, check only the elements whose digests
+               have changed since the previous run and reuse the results
+               of the remaining ones.
         '''
         self.setCalc= setCalc
         self.appendToResFile= appendToResFile
         self.listFile= listFile
         self.calcMeanCF= calcMeanCF
         self.controller= controller
+        self.screeningMethod= screeningMethod
+        self.screeningStatistics= None
+        self.sectionSolver= sectionSolver
+        if(numProcesses is None):
+            numProcesses= pc.getDefaultNumProcesses()
+        self.numProcesses= numProcesses
+        self.incremental= incremental
+        self.changeStatistics= None
 
     def getCalcSetElements(self, preprocessor):
         ''' Return the set of elements to be analyzed.
@@ -113,6 +158,23 @@ class LimitStateData(object):
                                        both axial and bending internal
                                        forces otherwise, use it only for 
                                        bending moments.
+    :ivar columnarStorage: if true, store the internal forces in a columnar
+                           binary store (see internal_forces_store module)
+                           instead of a JSON file.
+    :ivar solutionStatistics: dictionary containing, for each combination
+                              solved by the last call to saveAll, the
+                              number of iterations of the last analysis
+                              step and if it started from the state of the
+                              previous combination (see warmStart argument
+                              of saveAll).
+    :ivar screeningStatistics: results of the screening of the combinations
+                               in the last check on a phantom model (see
+                               screeningMethod argument of check).
+    :ivar changeStatistics: number of combinations computed and reused
+                            from the previous run in the last call to
+                            saveAll (see incremental argument).
+    :ivar failedCombinations: names of the combinations that could not be
+                              solved in the last call to saveAll.
     '''
     envConfig= None # configuration of XC environment variables.
     def __init__(self, limitStateLabel, outputDataBaseFileName, designSituation, woodArmerAlsoForAxialForces= False, cfg= None):
@@ -135,6 +197,11 @@ class LimitStateData(object):
         self.outputDataBaseFileName= outputDataBaseFileName
         self.designSituation= designSituation
         self.woodArmerAlsoForAxialForces= woodArmerAlsoForAxialForces
+        self.columnarStorage= False
+        self.solutionStatistics= dict()
+        self.screeningStatistics= None
+        self.changeStatistics= None
+        self.failedCombinations= list()
         LimitStateData.envConfig= cfg
 
     @staticmethod
@@ -146,7 +213,18 @@ class LimitStateData(object):
         LimitStateData.envConfig= cfg
         
     def getInternalForcesFileName(self):
-        '''Return the name of the file where internal forces are stored.'''
+        '''Return the name of the file where internal forces are stored
+           (a folder if the columnar storage is used).'''
+        retval= self.envConfig.projectDirTree.getInternalForcesResultsPath()+'intForce_'+ self.label
+        if(self.columnarStorage):
+            retval+= ifs.storeSuffix
+        else:
+            retval+= '.json'
+        return retval
+
+    def getInternalForcesJSONFileName(self):
+        '''Return the name of the JSON file where internal forces are
+           exported when the columnar storage is used.'''
         return self.envConfig.projectDirTree.getInternalForcesResultsPath()+'intForce_'+ self.label +'.json'
     
     def getReactionsFileName(self):
@@ -182,6 +260,9 @@ class LimitStateData(object):
         :param elementsOfInterestTags: identifiers of the elements of interest.
         '''
         fName= self.getInternalForcesFileName()
+        if(ifs.isInternalForcesStore(fName)): # read only what is needed.
+            store= ifs.InternalForcesStore(fName)
+            return store.getInternalForcesDict(elementTags= elementsOfInterestTags, stringKeys= True)
         with open(fName) as json_data:
             dct= json.load(json_data)
         retval= dict()
@@ -201,6 +282,17 @@ class LimitStateData(object):
         '''
         return er.getReactionsDict(nmbComb, constrainedNodes)
     
+    def getCheckpointFileName(self):
+        '''Return the name of the file where the checkpoint data of
+           saveAll is written.'''
+        return self.envConfig.projectDirTree.getInternalForcesResultsPath()+'checkpoint_'+ self.label +'.json'
+
+    def getChangeManifestFileName(self):
+        '''Return the name of the file where the digests of the
+           combinations written by saveAll are stored (see incremental
+           argument of saveAll).'''
+        return self.envConfig.projectDirTree.getInternalForcesResultsPath()+'digests_'+ self.label +'.json'
+
     def getDisplacementsFileName(self):
         '''Return the file name to read: combination name, node number and 
         displacements (ux,uy,uz,rotX,rotY,rotZ).'''
@@ -263,7 +355,7 @@ class LimitStateData(object):
         self.fNameIntForc= self.getInternalForcesFileName()
         self.fNameReactions= self.getReactionsFileName()
         self.fNameDispl= self.getDisplacementsFileName()
-        os.system("rm -f " + self.fNameIntForc) #Clear obsolete files.
+        os.system("rm -f -r " + self.fNameIntForc) #Clear obsolete files.
         os.system("rm -f " + self.fNameReactions)
         os.system("rm -f " + self.fNameDispl)
         fDisp= open(self.fNameDispl,"w")
@@ -278,19 +370,64 @@ class LimitStateData(object):
         :param nodSet: set of nodes
         '''
         fDisp= open(self.fNameDispl,"a")
-        for n in nodSet:
-            strDisp= str(n.getDisp).rstrip().replace(' ',', ') #displacement vector [ux,uy,uz,rotx,roty,rotz]
-            fDisp.write(combNm+", "+str(n.tag)+", " + strDisp+'\n')
+        fDisp.writelines(rs.getDisplacementLines(combNm, nodSet))
         fDisp.close()
 
+    def openResultsSink(self, combNames, resume= False, checkpointInterval= 10):
+        ''' Return a results sink that writes the results of each
+            combination as soon as they are computed (see results_sink
+            module) and the names of the combinations already written.
+
+        :param combNames: names of the combinations to compute.
+        :param resume: if true, resume the computation from the last
+                       checkpoint (if any).
+        :param checkpointInterval: number of combinations computed between
+                                   two consecutive checkpoints.
+        '''
+        self.envConfig.projectDirTree.createTree()
+        retval= rs.ResultsSink(fNameIntForc= self.getInternalForcesFileName(), fNameReactions= self.getReactionsFileName(), fNameDispl= self.getDisplacementsFileName(), checkpointFileName= self.getCheckpointFileName(), checkpointInterval= checkpointInterval, columnarStorage= self.columnarStorage)
+        checkpoint= None
+        if(resume):
+            checkpoint= retval.readCheckpoint(combNames)
+        if(checkpoint):
+            self.fNameIntForc= retval.fNameIntForc
+            self.fNameReactions= retval.fNameReactions
+            self.fNameDispl= retval.fNameDispl
+        else:
+            self.createOutputFiles()
+        writtenCombinations= retval.open(combNames, checkpoint)
+        return retval, writtenCombinations
+
     def writeInternalForces(self, internalForcesDict):
         '''Write the internal forces results.
 
         :param internalForcesDict: dictionary containing the internal forces.
         '''
-        with open(self.fNameIntForc, 'w') as outfile:
-            json.dump(internalForcesDict, outfile)
-        outfile.close()
+        if(self.columnarStorage):
+            ifs.writeInternalForcesStore(self.fNameIntForc, internalForcesDict)
+        else:
+            with open(self.fNameIntForc, 'w') as outfile:
+                json.dump(internalForcesDict, outfile)
+            outfile.close()
+
+    def exportInternalForcesToJSON(self, fileName= None):
+        '''Export the internal forces stored in the columnar store to a
+           JSON file with the legacy format.
+
+        :param fileName: name of the output file (defaults to the value
+                         returned by getInternalForcesJSONFileName).
+        '''
+        if(fileName is None):
+            fileName= self.getInternalForcesJSONFileName()
+        fName= self.getInternalForcesFileName()
+        if(ifs.isInternalForcesStore(fName)):
+            store= ifs.InternalForcesStore(fName)
+            store.exportToJSON(fileName)
+        else:
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.error(className+'.'+methodName+"; internal forces store: '"+fName+"' not found.")
+        return fileName
         
     def writeReactions(self, reactionsDict):
         '''Write the reactions.
@@ -301,12 +438,83 @@ class LimitStateData(object):
             json.dump(reactionsDict, outfile)
         outfile.close()
         
-    def saveAll(self, combContainer, setCalc, solutionProcedureType= defaultSolutionProcedureType, constrainedNodeSet= None, bucklingMembers= None):
-        '''Write internal forces, displacements, .., for each combination
+    def getCombinationsManifest(self, setCalc, solutionProcedureType, constrainedNodeSet= None, bucklingMembers= None):
+        '''Return the manifest that stores the digests of the combinations
+           written by saveAll (see change_tracking module). Its header
+           contains the digest of the model (geometry, constraints and
+           material and section data of the elements) and the parameters
+           of the computation, so the results of the previous run are not
+           reused if any of them changes.
+
+        :param setCalc: set of entities for which the verification is
+                          going to be performed
+        :param solutionProcedureType: type of the solution strategy to solve
+                                      the finite element problem.
+        :param constrainedNodeSet: constrained nodes (defaults to None)
+        :param bucklingMembers: list of members whose buckling reduction
+                                factors need to be updated after each
+                                commit (defaults to None)
+        '''
+        preprocessor= setCalc.getPreprocessor
+        totalSet= preprocessor.getSets.getSet('total')
+        constrainedNodeTags= None
+        if(constrainedNodeSet):
+            constrainedNodeTags= sorted([n.tag for n in constrainedNodeSet])
+        numBucklingMembers= 0
+        if(bucklingMembers):
+            numBucklingMembers= len(bucklingMembers)
+        header= {'label': self.label,
+                 'model': ct.get_model_digest(totalSet),
+                 'materials': ct.get_elements_digest(totalSet),
+                 'elements': ct.get_digest(sorted(setCalc.getElementTags())),
+                 'nodes': ct.get_digest(sorted([n.tag for n in setCalc.nodes])),
+                 'constrainedNodes': ct.get_digest(constrainedNodeTags),
+                 'bucklingMembers': numBucklingMembers,
+                 'solutionProcedureType': solutionProcedureType,
+                 'columnarStorage': self.columnarStorage,
+                 'woodArmerAlsoForAxialForces': self.woodArmerAlsoForAxialForces}
+        return ct.ChangeManifest(self.getChangeManifestFileName(), header)
+
+    def getStashedResultsFileNames(self):
+        '''Return the names of the result files of the previous run while
+           they are being reused (see stashPreviousResults).'''
+        return [fName+'.prev' for fName in [self.getInternalForcesFileName(), self.getReactionsFileName(), self.getDisplacementsFileName()]]
+
+    def stashPreviousResults(self):
+        '''Rename the result files (internal forces, reactions and
+           displacements) of the previous run, so they can be read while
+           the new ones are written. Return an object that gives access 
+           to them (None if they don't exist).'''
+        retval= None
+        fileNames= [self.getInternalForcesFileName(), self.getReactionsFileName(), self.getDisplacementsFileName()]
+        if(all([os.path.exists(fName) for fName in fileNames])):
+            self.removeStashedResults()
+            stashedFileNames= self.getStashedResultsFileNames()
+            for fName, stashedFileName in zip(fileNames, stashedFileNames):
+                os.replace(fName, stashedFileName)
+            retval= rs.StoredResults(*stashedFileNames)
+        return retval
+
+    def removeStashedResults(self):
+        '''Remove the result files of the previous run renamed by
+           stashPreviousResults.'''
+        for fName in self.getStashedResultsFileNames():
+            if(os.path.isdir(fName)):
+                shutil.rmtree(fName)
+            elif(os.path.exists(fName)):
+                os.remove(fName)
+
+    def saveAll(self, combContainer, setCalc, solutionProcedureType= defaultSolutionProcedureType, constrainedNodeSet= None, bucklingMembers= None, superposition= False, resume= False, checkpointInterval= 10, numProcesses= None, warmStart= False, incremental= False):
+        '''Write internal forces, displacements, .., for each combination.
+           The results of each combination are written to disk as soon as
+           they are computed (see results_sink module). Return 0 if all
+           the combinations have been solved, -1 otherwise (the names of
+           the combinations that could not be solved are stored in the
+           failedCombinations attribute).
 
 
         :param combContainer: load combination container.
-        :param setCalc: set of entities for which the verification is 
+        :param setCalc: set of entities for which the verification is
                           going to be performed
         :param solutionProcedureType: type of the solution strategy to solve
                                       the finite element problem.
@@ -314,7 +522,41 @@ class LimitStateData(object):
         :param bucklingMembers: list of members whose buckling reduction
                                 factors need to be updated after each
                                 commit (defaults to None)
+        :param superposition: if true, solve each load pattern only once
+                              and obtain the results for the combinations
+                              by linear superposition (only for linear
+                              problems, see saveAllBySuperposition).
+        :param resume: if true, resume an interrupted computation from
+                       its last checkpoint (the combinations already
+                       written are not computed again).
+        :param checkpointInterval: number of combinations computed between
+                                   two consecutive checkpoints.
+        :param numProcesses: number of worker processes used to solve the
+                             combinations (if None use the value of the
+                             XC_NUM_PROCESSES environment variable, see
+                             parallel_combinations module).
+        :param warmStart: if true, sort the combinations so each one of
+                          them starts from the converged state of the
+                          nearest one (see combination_ordering module).
+                          Use it only with non-linear problems whose
+                          solution doesn't depend on the loading path
+                          and with constant time series.
+        :param incremental: if true, reuse the results of the previous run
+                            for the combinations whose expression and load
+                            patterns have not changed (see change_tracking
+                            module). The results of the previous run are
+                            not reused if the model geometry, the material
+                            and section properties (stiffness and mass of
+                            the elements), the sets or the computation
+                            parameters have changed. Not available with
+                            superposition.
         '''
+        if(superposition):
+            if(incremental):
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.warning(className+'.'+methodName+"; incremental computation not available with superposition. Computing all the combinations.")
+            return self.saveAllBySuperposition(combContainer= combContainer, setCalc= setCalc, solutionProcedureType= solutionProcedureType, constrainedNodeSet= constrainedNodeSet, bucklingMembers= bucklingMembers, resume= resume, checkpointInterval= checkpointInterval)
         preprocessor= setCalc.getPreprocessor
         feProblem= preprocessor.getProblem
         solutionProcedure= solutionProcedureType(feProblem)
@@ -323,30 +565,319 @@ class LimitStateData(object):
         #Putting combinations inside XC.
         loadCombinations= self.dumpCombinations(combContainer,loadCombinations)
         
-        self.createOutputFiles()
-        internalForcesDict= dict()
-        reactionsDict= dict()
-        for key in loadCombinations.getKeys():
+        combNames= list(loadCombinations.getKeys())
+        manifest= None
+        storedResults= None
+        if(incremental):
+            manifest= self.getCombinationsManifest(setCalc= setCalc, solutionProcedureType= solutionProcedureType, constrainedNodeSet= constrainedNodeSet, bucklingMembers= bucklingMembers)
+            combDigests= ct.get_combination_digests(loadCombinations, preprocessor.getLoadHandler.getLoadPatterns, combNames)
+            if(manifest.read() and not resume):
+                storedResults= self.stashPreviousResults()
+            manifest.remove() # written again when the computation ends.
+        sink, writtenCombinations= self.openResultsSink(combNames, resume= resume, checkpointInterval= checkpointInterval)
+        if(storedResults):
+            # Copy the results of the combinations that have not changed.
+            reusableCombinations= set(manifest.getUnchangedItems(combDigests)).intersection(storedResults.getCombinationNames())
+            for combName in combNames:
+                if(combName in reusableCombinations):
+                    storedResults.writeCombination(sink, combName)
+            writtenCombinations= set(sink.writtenCombinations)
+            storedResults= None
+            self.removeStashedResults()
+        pendingCombinations= [key for key in combNames if key not in writtenCombinations]
+        if(incremental):
+            self.changeStatistics= {'computed': len(pendingCombinations), 'reused': len(combNames)-len(pendingCombinations)}
+            lmsg.log(self.label+': '+ct.get_change_statistics_message(self.changeStatistics))
+        warmStartFlags= None
+        if(warmStart):
+            pendingCombinations, warmStartFlags= co.get_warm_start_order(loadCombinations, pendingCombinations)
+        if(numProcesses is None):
+            numProcesses= pc.getDefaultNumProcesses()
+        if((numProcesses>1) and (len(pendingCombinations)>1)):
+            if(pc.forkIsAvailable()):
+                retval= self.solveCombinationsInParallel(sink= sink, loadCombinations= loadCombinations, combNames= pendingCombinations, solutionProcedure= solutionProcedure, setCalc= setCalc, constrainedNodeSet= constrainedNodeSet, bucklingMembers= bucklingMembers, numProcesses= numProcesses, warmStart= warmStart)
+                if(manifest and (retval==0)):
+                    manifest.write(combDigests)
+                return retval
+            else:
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.warning(className+'.'+methodName+"; worker processes can't be forked in this platform. Solving combinations serially.")
+        self.solveCombinations(sink= sink, loadCombinations= loadCombinations, combNames= pendingCombinations, solutionProcedure= solutionProcedure, setCalc= setCalc, constrainedNodeSet= constrainedNodeSet, bucklingMembers= bucklingMembers, warmStartFlags= warmStartFlags)
+        sink.close()
+        retval= 0
+        if(len(self.failedCombinations)>0):
+            retval= -1
+        if(manifest and (retval==0)):
+            manifest.write(combDigests)
+        return retval
+
+    def solveCombinations(self, sink, loadCombinations, combNames, solutionProcedure, setCalc, constrainedNodeSet= None, bucklingMembers= None, warmStartFlags= None):
+        '''Solve the given combinations and write the results using the
+           sink argument. Return the number of combinations that could not
+           be solved.
+
+        :param sink: object used to write the results (see results_sink
+                     module).
+        :param loadCombinations: load combination handler inside the XC
+                                 solver.
+        :param combNames: names of the combinations to solve.
+        :param solutionProcedure: solution procedure to use.
+        :param setCalc: set of entities for which the verification is
+                          going to be performed
+        :param constrainedNodeSet: constrained nodes (defaults to None)
+        :param bucklingMembers: list of members whose buckling reduction
+                                factors need to be updated after each
+                                commit (defaults to None)
+        :param warmStartFlags: for each combination, true if its solution
+                               must start from the converged state of the
+                               previous one (if None, all the combinations
+                               start from the initial state). The pseudo-time
+                               is reset to zero so the loads are applied
+                               with the same factors as in a cold start. If
+                               the previous combination could not be solved
+                               or the solution fails, the combination is
+                               solved from the initial state.
+        '''
+        retval= 0
+        preprocessor= setCalc.getPreprocessor
+        self.solutionStatistics= dict()
+        self.failedCombinations= list()
+        previousSolved= False
+        for i, key in enumerate(combNames):
             comb= loadCombinations[key]
-            preprocessor.resetLoadCase()
-            preprocessor.getDomain.revertToStart()
-            comb.addToDomain() #Combination to analyze.
-            #Solution
-            result= solutionProcedure.solve()
+            warmStart= (warmStartFlags is not None) and warmStartFlags[i] and previousSolved
+            if(warmStart): # Start from the state of the previous combination.
+                preprocessor.getDomain.setTime(0.0) # Don't accumulate the load factors.
+                comb.addToDomain() #Combination to analyze.
+                if(not solutionProcedure.analysis):
+                    solutionProcedure.setup()
+                result= solutionProcedure.analysis.analyze(solutionProcedure.numSteps)
+                if(result!=0):
+                    className= type(self).__name__
+                    methodName= sys._getframe(0).f_code.co_name
+                    lmsg.warning(className+'.'+methodName+"; can't solve combination: "+key+" starting from the previous one. Starting from the initial state.")
+                    comb.removeFromDomain()
+                    warmStart= False
+            if(not warmStart):
+                preprocessor.resetLoadCase()
+                preprocessor.getDomain.revertToStart()
+                comb.addToDomain() #Combination to analyze.
+                #Solution
+                result= solutionProcedure.solve()
             if(result!=0):
                 className= type(self).__name__
                 methodName= sys._getframe(0).f_code.co_name
                 lmsg.error(className+'.'+methodName+"; can't solve.")
+                retval+= 1
+                self.failedCombinations.append(key)
+            previousSolved= (result==0)
+            self.solutionStatistics[key]= {'iterations': co.get_iteration_count(solutionProcedure), 'warmStart': warmStart}
             if(bucklingMembers): # Update reduction factors for buckling members
                 for bm in bucklingMembers:
                     bm.updateReductionFactors()
             #Writing results.
-            internalForcesDict.update(self.getInternalForcesDict(comb.getName,setCalc.elements))
-            reactionsDict.update(self.getReactionsDict(comb.getName,constrainedNodeSet))
-            self.writeDisplacements(comb.getName,setCalc.nodes)
+            sink.writeCombination(comb.getName, self.getInternalForcesDict(comb.getName,setCalc.elements), self.getReactionsDict(comb.getName,constrainedNodeSet), rs.getDisplacementLines(comb.getName,setCalc.nodes))
             comb.removeFromDomain() #Remove combination from the model.
-        self.writeInternalForces(internalForcesDict)
-        self.writeReactions(reactionsDict)
+        if(warmStartFlags is not None):
+            self.solutionStatisticsMessage()
+        return retval
+
+    def getTotalIterations(self):
+        ''' Return the total number of iterations performed in the last
+            analysis step of each combination solved by the last call to
+            saveAll (see solutionStatistics).'''
+        return sum([value['iterations'] for value in self.solutionStatistics.values() if value['iterations'] is not None])
+
+    def solutionStatisticsMessage(self):
+        ''' Writes a message with the number of iterations and the number
+            of combinations that started from the state of the previous one.'''
+        numWarmStarts= len([value for value in self.solutionStatistics.values() if value['warmStart']])
+        lmsg.log(self.label+': '+str(len(self.solutionStatistics))+' combinations solved ('+str(numWarmStarts)+' starting from the previous one) in '+str(self.getTotalIterations())+' iterations.')
+
+    def getPartialResultsFileNames(self, workerId):
+        '''Return the names of the files where a worker process writes
+           its results (internal forces, reactions, displacements and
+           status of the solution).
+
+        :param workerId: identifier of the worker process.
+        '''
+        prefix= self.envConfig.projectDirTree.getInternalForcesResultsPath()+'partial_'+ self.label +'_'+str(workerId)
+        return prefix+'_intForce.json', prefix+'_reactions.json', prefix+'_displ.csv', prefix+'_status.json'
+
+    def solveCombinationsInParallel(self, sink, loadCombinations, combNames, solutionProcedure, setCalc, constrainedNodeSet= None, bucklingMembers= None, numProcesses= 2, warmStart= False):
+        '''Solve the given combinations using several worker processes
+           (see parallel_combinations module), merge their results in
+           the original order and write them using the sink argument.
+           The output is the same obtained solving the combinations 
+           serially: the combinations that can't be solved are reported
+           by the workers (see failedCombinations) and the results of all
+           the blocks are merged anyway. The merge is stopped only if a
+           worker process crashes. Return 0 if all the combinations have
+           been solved, -1 otherwise. The solution statistics of the
+           workers are merged too (see solutionStatistics).
+
+        :param sink: object used to write the results (see results_sink
+                     module).
+        :param loadCombinations: load combination handler inside the XC
+                                 solver.
+        :param combNames: names of the combinations to solve.
+        :param solutionProcedure: solution procedure to use.
+        :param setCalc: set of entities for which the verification is
+                          going to be performed
+        :param constrainedNodeSet: constrained nodes (defaults to None)
+        :param bucklingMembers: list of members whose buckling reduction
+                                factors need to be updated after each
+                                commit (defaults to None)
+        :param numProcesses: number of worker processes.
+        :param warmStart: if true, the combinations are sorted so each
+                          one of them can start from the converged state
+                          of the previous one (each worker walks its own
+                          block of combinations).
+        '''
+        def worker(workerId, workerCombNames):
+            fNameIntForc, fNameReactions, fNameDispl, fNameStatus= self.getPartialResultsFileNames(workerId)
+            workerSink= rs.ResultsSink(fNameIntForc= fNameIntForc, fNameReactions= fNameReactions, fNameDispl= fNameDispl)
+            workerSink.open(workerCombNames)
+            warmStartFlags= None
+            if(warmStart):
+                workerCombNames, warmStartFlags= co.get_warm_start_order(loadCombinations, workerCombNames)
+            self.solveCombinations(sink= workerSink, loadCombinations= loadCombinations, combNames= workerCombNames, solutionProcedure= solutionProcedure, setCalc= setCalc, constrainedNodeSet= constrainedNodeSet, bucklingMembers= bucklingMembers, warmStartFlags= warmStartFlags)
+            workerSink.close()
+            # The combinations that could not be solved are reported
+            # through the status file (written last, so its presence
+            # means that the worker has finished).
+            with open(fNameStatus, 'w') as outfile:
+                json.dump({'failedCombinations': self.failedCombinations, 'solutionStatistics': self.solutionStatistics}, outfile)
+            return 0
+        for workerId in range(0, numProcesses): # Remove obsolete files.
+            for fName in self.getPartialResultsFileNames(workerId):
+                if(os.path.exists(fName)):
+                    os.remove(fName)
+        chunks, exitCodes= pc.runForked(worker, combNames, numProcesses)
+        # Merge the results.
+        retval= 0
+        self.failedCombinations= list()
+        self.solutionStatistics= dict()
+        for workerId, (chunk, exitCode) in enumerate(zip(chunks, exitCodes)):
+            fileNames= self.getPartialResultsFileNames(workerId)
+            if((exitCode!=0) or not all([os.path.exists(fName) for fName in fileNames])):
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.error(className+'.'+methodName+"; worker process: "+str(workerId)+" crashed while solving the combinations: "+str(chunk))
+                retval= -1
+                break
+            fNameIntForc, fNameReactions, fNameDispl, fNameStatus= fileNames
+            with open(fNameStatus) as json_file:
+                status= json.load(json_file)
+            self.failedCombinations.extend(status['failedCombinations'])
+            self.solutionStatistics.update(status['solutionStatistics'])
+            with open(fNameIntForc) as json_file:
+                internalForcesDict= json.load(json_file)
+            with open(fNameReactions) as json_file:
+                reactionsDict= json.load(json_file)
+            displacementLines= defaultdict(list)
+            with open(fNameDispl) as displ_file:
+                for line in displ_file:
+                    displacementLines[line.split(',', 1)[0]].append(line)
+            for combName in chunk:
+                sink.writeCombination(combName, {combName: internalForcesDict[combName]}, {combName: reactionsDict[combName]}, displacementLines[combName])
+            for fName in fileNames:
+                os.remove(fName)
+        if(warmStart):
+            self.solutionStatisticsMessage()
+        if(retval==0):
+            sink.close()
+            if(len(self.failedCombinations)>0):
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.error(className+'.'+methodName+"; can't solve the combinations: "+str(self.failedCombinations))
+                retval= -1
+        else: # keep the results already merged (see saveAll resume argument).
+            sink.suspend()
+        return retval
+
+    def checkSuperpositionIsApplicable(self, solutionProcedure, bucklingMembers= None):
+        ''' Return true if the results for the combinations can be obtained
+            by linear superposition of the load pattern results.
+
+        :param solutionProcedure: solution procedure to use.
+        :param bucklingMembers: list of members whose buckling reduction
+                                factors need to be updated after each
+                                commit (defaults to None)
+        '''
+        retval= True
+        className= type(self).__name__
+        methodName= sys._getframe(0).f_code.co_name
+        if(not solutionProcedure.linearSolutionAlgorithm()):
+            lmsg.error(className+'.'+methodName+"; the solution procedure: '"+type(solutionProcedure).__name__+"' is not linear, superposition not applicable.")
+            retval= False
+        if(bucklingMembers):
+            lmsg.error(className+'.'+methodName+"; buckling reduction factors must be updated for each combination, superposition not applicable.")
+            retval= False
+        return retval
+
+    def saveAllBySuperposition(self, combContainer, setCalc, solutionProcedureType= defaultSolutionProcedureType, constrainedNodeSet= None, bucklingMembers= None, chunkSize= 100, resume= False, checkpointInterval= 10):
+        '''Write internal forces, displacements, .., for each combination
+           solving each load pattern only once and computing the results
+           of the combinations by linear superposition. Results are written
+           in the same files and with the same format than saveAll. Return
+           -1 without writing anything if superposition is not applicable
+           or any of the load patterns of the combinations is not defined,
+           and the result of the solution without writing anything if any
+           of the load patterns can't be solved.
+
+        :param combContainer: load combination container.
+        :param setCalc: set of entities for which the verification is
+                          going to be performed
+        :param solutionProcedureType: type of the solution strategy to solve
+                                      the finite element problem (must be
+                                      linear).
+        :param constrainedNodeSet: constrained nodes (defaults to None)
+        :param bucklingMembers: list of members whose buckling reduction
+                                factors need to be updated after each
+                                commit (superposition is not applicable
+                                if not None).
+        :param chunkSize: number of combinations computed at once.
+        :param resume: if true, resume an interrupted computation from
+                       its last checkpoint.
+        :param checkpointInterval: number of combinations computed between
+                                   two consecutive checkpoints.
+        '''
+        preprocessor= setCalc.getPreprocessor
+        feProblem= preprocessor.getProblem
+        solutionProcedure= solutionProcedureType(feProblem)
+        if(not self.checkSuperpositionIsApplicable(solutionProcedure, bucklingMembers)):
+            return -1
+        combinations= list(self.getCorrespondingLoadCombinations(combContainer).values())
+        loadPatternNames= ls.getLoadPatternNames(combinations)
+        missingLoadPatterns= ls.getMissingLoadPatterns(preprocessor, loadPatternNames)
+        if(missingLoadPatterns):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.error(className+'.'+methodName+"; load patterns: "+str(missingLoadPatterns)+" not found.")
+            return -1
+        # Solve each load pattern.
+        patternResults= ls.LoadPatternResults(elements= setCalc.elements, nodes= setCalc.nodes, constrainedNodes= constrainedNodeSet, woodArmerAlsoForAxialForces= self.woodArmerAlsoForAxialForces)
+        result= patternResults.solveLoadPatterns(solutionProcedure, loadPatternNames)
+        preprocessor.resetLoadCase()
+        preprocessor.getDomain.revertToStart()
+        if(result!=0):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.error(className+'.'+methodName+"; can't solve.")
+            return result
+        # Compute the combinations.
+        combNames, factors= patternResults.getFactorMatrix(combinations)
+        sink, writtenCombinations= self.openResultsSink(combNames, resume= resume, checkpointInterval= checkpointInterval)
+        for i in range(0, len(combNames), chunkSize):
+            intForces, displacements, reactions= patternResults.combine(factors[i:i+chunkSize])
+            for j, combName in enumerate(combNames[i:i+chunkSize]):
+                if(combName not in writtenCombinations):
+                    sink.writeCombination(combName, patternResults.getInternalForcesDict(combName, intForces[j]), patternResults.getReactionsDict(combName, reactions[j]), patternResults.getDisplacementLines(combName, displacements[j]))
+        sink.close()
+        return result
+
 #20181117
     def runChecking(self, outputCfg, sections= ['Sect1', 'Sect2']):
         '''This method reads, for the elements in setCalc,  the internal 
@@ -406,9 +937,12 @@ class ULS_LimitStateData(LimitStateData):
                false if it's 2D (Fx,Fy,Mz).
         '''
         if(threeDim):
-            return crossSections.internalForcesVerification3D(limitStateData= self, matDiagType= "d", outputCfg= outputCfg)
+            retval= crossSections.internalForcesVerification3D(limitStateData= self, matDiagType= "d", outputCfg= outputCfg)
         else:
-            return crossSections.internalForcesVerification2D(limitStateData= self, matDiagType= "d", outputCfg= outputCfg)
+            retval= crossSections.internalForcesVerification2D(limitStateData= self, matDiagType= "d", outputCfg= outputCfg)
+        self.screeningStatistics= outputCfg.screeningStatistics
+        self.changeStatistics= outputCfg.changeStatistics
+        return retval
     
 class NormalStressesRCLimitStateData(ULS_LimitStateData):
     ''' Reinforced concrete normal stresses data for limit state checking.'''
@@ -423,7 +957,7 @@ class NormalStressesRCLimitStateData(ULS_LimitStateData):
         '''
         modelSpace.readControlVars(inputFileName= self.envConfig.projectDirTree.getVerifNormStrFile())
 
-    def check(self, setCalc, crossSections, controller, appendToResFile='N', listFile='N', calcMeanCF='N', threeDim= True):
+    def check(self, setCalc, crossSections, controller, appendToResFile='N', listFile='N', calcMeanCF='N', threeDim= True, screeningMethod= None, sectionSolver= False, numProcesses= None, incremental= False):
         ''' Perform limit state checking.
 
         :param setCalc: set of elements to be checked (defaults to 'None' which 
@@ -439,8 +973,21 @@ class NormalStressesRCLimitStateData(ULS_LimitStateData):
                meant to be calculated (defaults to 'N')
         :param threeDim: true if it's 3D (Fx,Fy,Fz,Mx,My,Mz) 
                false if it's 2D (Fx,Fy,Mz).
+        :param screeningMethod: method used to discard the combinations 
+               that cannot govern the checking (see combination_screening
+               module); if None or 'exact' all the combinations are checked.
+        :param sectionSolver: if true, compute the state of the phantom 
+               model elements section by section instead of solving the
+               global model.
+        :param numProcesses: number of worker processes used by the
+               section level solver (if None use the value of the
+               XC_NUM_PROCESSES environment variable).
+        :param incremental: if true, check only the elements whose
+               internal forces, sections or controller have changed since
+               the previous run and reuse the results of the remaining
+               ones.
         '''
-        outputCfg= VerifOutVars(setCalc= setCalc, controller= controller, appendToResFile= appendToResFile, listFile= listFile, calcMeanCF= calcMeanCF)
+        outputCfg= VerifOutVars(setCalc= setCalc, controller= controller, appendToResFile= appendToResFile, listFile= listFile, calcMeanCF= calcMeanCF, screeningMethod= screeningMethod, sectionSolver= sectionSolver, numProcesses= numProcesses, incremental= incremental)
         return super().check(crossSections= crossSections, outputCfg= outputCfg, threeDim= threeDim)
         
         
@@ -487,7 +1034,7 @@ class ShearResistanceRCLimitStateData(ULS_LimitStateData):
         '''
         modelSpace.readControlVars(inputFileName= self.envConfig.projectDirTree.getVerifShearFile())
         
-    def check(self, setCalc, crossSections, controller, appendToResFile='N', listFile='N', calcMeanCF='N', threeDim= True):
+    def check(self, setCalc, crossSections, controller, appendToResFile='N', listFile='N', calcMeanCF='N', threeDim= True, screeningMethod= None, sectionSolver= False, numProcesses= None, incremental= False):
         ''' Perform limit state checking.
 
         :param setCalc: set of elements to be checked (defaults to 'None' which 
@@ -503,8 +1050,21 @@ class ShearResistanceRCLimitStateData(ULS_LimitStateData):
                meant to be calculated (defaults to 'N')
         :param threeDim: true if it's 3D (Fx,Fy,Fz,Mx,My,Mz) 
                false if it's 2D (Fx,Fy,Mz).
+        :param screeningMethod: method used to discard the combinations 
+               that cannot govern the checking (see combination_screening
+               module); if None or 'exact' all the combinations are checked.
+        :param sectionSolver: if true, compute the state of the phantom 
+               model elements section by section instead of solving the
+               global model.
+        :param numProcesses: number of worker processes used by the
+               section level solver (if None use the value of the
+               XC_NUM_PROCESSES environment variable).
+        :param incremental: if true, check only the elements whose
+               internal forces, sections or controller have changed since
+               the previous run and reuse the results of the remaining
+               ones.
         '''
-        outputCfg= VerifOutVars(setCalc= setCalc, controller= controller, appendToResFile= appendToResFile, listFile= listFile, calcMeanCF= calcMeanCF)
+        outputCfg= VerifOutVars(setCalc= setCalc, controller= controller, appendToResFile= appendToResFile, listFile= listFile, calcMeanCF= calcMeanCF, screeningMethod= screeningMethod, sectionSolver= sectionSolver, numProcesses= numProcesses, incremental= incremental)
         return super().check(crossSections= crossSections, outputCfg= outputCfg, threeDim= threeDim)
         
 class ShearResistanceSteelLimitStateData(ULS_LimitStateData):
@@ -551,7 +1111,7 @@ class TorsionResistanceRCLimitStateData(ULS_LimitStateData):
         '''
         modelSpace.readControlVars(inputFileName= self.envConfig.projectDirTree.getVerifTorsionFile())
         
-    def check(self, setCalc, crossSections, controller, appendToResFile='N', listFile='N', calcMeanCF='N', threeDim= True):
+    def check(self, setCalc, crossSections, controller, appendToResFile='N', listFile='N', calcMeanCF='N', threeDim= True, screeningMethod= None, sectionSolver= False, numProcesses= None, incremental= False):
         ''' Perform limit state checking.
 
         :param setCalc: set of elements to be checked (defaults to 'None' which 
@@ -567,8 +1127,21 @@ class TorsionResistanceRCLimitStateData(ULS_LimitStateData):
                meant to be calculated (defaults to 'N')
         :param threeDim: true if it's 3D (Fx,Fy,Fz,Mx,My,Mz) 
                false if it's 2D (Fx,Fy,Mz).
+        :param screeningMethod: method used to discard the combinations 
+               that cannot govern the checking (see combination_screening
+               module); if None or 'exact' all the combinations are checked.
+        :param sectionSolver: if true, compute the state of the phantom 
+               model elements section by section instead of solving the
+               global model.
+        :param numProcesses: number of worker processes used by the
+               section level solver (if None use the value of the
+               XC_NUM_PROCESSES environment variable).
+        :param incremental: if true, check only the elements whose
+               internal forces, sections or controller have changed since
+               the previous run and reuse the results of the remaining
+               ones.
         '''
-        outputCfg= VerifOutVars(setCalc= setCalc, controller= controller, appendToResFile= appendToResFile, listFile= listFile, calcMeanCF= calcMeanCF)
+        outputCfg= VerifOutVars(setCalc= setCalc, controller= controller, appendToResFile= appendToResFile, listFile= listFile, calcMeanCF= calcMeanCF, screeningMethod= screeningMethod, sectionSolver= sectionSolver, numProcesses= numProcesses, incremental= incremental)
         return super().check(crossSections= crossSections, outputCfg= outputCfg, threeDim= threeDim)
 
 class SLS_LimitStateData(LimitStateData):
@@ -599,14 +1172,17 @@ class SLS_LimitStateData(LimitStateData):
                false if it's 2D (Fx,Fy,Mz).
         '''
         if(threeDim):
-            return crossSections.internalForcesVerification3D(limitStateData= self, matDiagType= "k", outputCfg= outputCfg)
+            retval= crossSections.internalForcesVerification3D(limitStateData= self, matDiagType= "k", outputCfg= outputCfg)
         else:
-            return crossSections.internalForcesVerification2D(limitStateData= self, matDiagType= "k", outputCfg= outputCfg)
+            retval= crossSections.internalForcesVerification2D(limitStateData= self, matDiagType= "k", outputCfg= outputCfg)
+        self.screeningStatistics= outputCfg.screeningStatistics
+        self.changeStatistics= outputCfg.changeStatistics
+        return retval
 
 class CrackControlRCLimitStateData(SLS_LimitStateData):
     ''' Reinforced concrete crack control limit state data base class.'''
         
-    def check(self, setCalc, crossSections, controller, appendToResFile='N', listFile='N', calcMeanCF='N', threeDim= True):
+    def check(self, setCalc, crossSections, controller, appendToResFile='N', listFile='N', calcMeanCF='N', threeDim= True, screeningMethod= None, sectionSolver= False, numProcesses= None, incremental= False):
         ''' Perform limit state checking.
 
         :param setCalc: set of elements to be checked (defaults to 'None' which 
@@ -622,8 +1198,21 @@ class CrackControlRCLimitStateData(SLS_LimitStateData):
                meant to be calculated (defaults to 'N')
         :param threeDim: true if it's 3D (Fx,Fy,Fz,Mx,My,Mz) 
                false if it's 2D (Fx,Fy,Mz).
+        :param screeningMethod: method used to discard the combinations 
+               that cannot govern the checking (see combination_screening
+               module); if None or 'exact' all the combinations are checked.
+        :param sectionSolver: if true, compute the state of the phantom 
+               model elements section by section instead of solving the
+               global model.
+        :param numProcesses: number of worker processes used by the
+               section level solver (if None use the value of the
+               XC_NUM_PROCESSES environment variable).
+        :param incremental: if true, check only the elements whose
+               internal forces, sections or controller have changed since
+               the previous run and reuse the results of the remaining
+               ones.
         '''
-        outputCfg= VerifOutVars(setCalc= setCalc, controller= controller, appendToResFile= appendToResFile, listFile= listFile, calcMeanCF= calcMeanCF)
+        outputCfg= VerifOutVars(setCalc= setCalc, controller= controller, appendToResFile= appendToResFile, listFile= listFile, calcMeanCF= calcMeanCF, screeningMethod= screeningMethod, sectionSolver= sectionSolver, numProcesses= numProcesses, incremental= incremental)
         return super().check(crossSections= crossSections, outputCfg= outputCfg, threeDim= threeDim)
         
 class RareLoadsCrackControlRCLimitStateData(CrackControlRCLimitStateData):
@@ -698,7 +1287,20 @@ class VonMisesStressLimitStateData(ULS_LimitStateData):
         :param elems: element set.
         '''
         return eif.getInternalForcesDict(nmbComb,elems, vonMisesStressId= self.vonMisesStressId, woodArmerAlsoForAxialForces= False) # Wood-Armer has no sense here.
-    
+
+    def checkSuperpositionIsApplicable(self, solutionProcedure, bucklingMembers= None):
+        ''' Von Mises stresses can't be obtained by linear superposition.
+
+        :param solutionProcedure: solution procedure to use.
+        :param bucklingMembers: list of members whose buckling reduction
+                                factors need to be updated after each
+                                commit (defaults to None)
+        '''
+        className= type(self).__name__
+        methodName= sys._getframe(0).f_code.co_name
+        lmsg.error(className+'.'+methodName+"; Von Mises stresses can't be obtained by superposition.")
+        return False
+
     def readInternalForces(self, setCalc):
         ''' Read the internal forces for the elements in the set argument.
 
@@ -912,6 +1514,9 @@ def readIntForcesFile(intForcCombFileName, setCalc=None, vonMisesStressId= 'max_
     :param vonMisesStressId: identifier of the Von Mises stress to read
                             (see NDMaterial and MembranePlateFiberSection).
     '''
+    if(ifs.isInternalForcesStore(intForcCombFileName)):
+        store= ifs.InternalForcesStore(intForcCombFileName)
+        return store.readIntForces(setCalc, vonMisesStressId)
     f= open(intForcCombFileName,"r")
     c= f.read(1)
     if(c=='{'):
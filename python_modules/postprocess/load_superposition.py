@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+''' Linear superposition of load pattern results. Each elementary load
+    pattern is solved only once; the results for the load combinations
+    (displacements, internal forces and reactions) are then obtained as
+    weighted sums of the elementary results.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022,LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import sys
+import numpy
+from materials.sections import internal_forces
+from model import model_inquiry
+from actions.load_combination_utils import utils
+from misc_utils import log_messages as lmsg
+
+extendedPropertyNames= ['chiLT', 'chiN', 'FcE', 'FbE']
+
+# Internal force component of each of the values returned by
+# getElementRawInternalForces for each kind of element.
+rawInternalForcesComponents= {'Shell': ['n1', 'n2', 'n12', 'm1', 'm2', 'm12', 'q13', 'q23'],
+                              'Beam2d': ['N', 'Mz', 'Vy', 'N', 'Mz', 'Vy'],
+                              'Beam': ['N', 'My', 'Mz', 'Vy', 'Vz', 'T', 'N', 'My', 'Mz', 'Vy', 'Vz', 'T'],
+                              'Truss': ['N', 'N'],
+                              'ZeroLength': ['N', 'Vy', 'Vz', 'T', 'My', 'Mz', 'N', 'Vy', 'Vz', 'T', 'My', 'Mz']}
+
+def getMissingLoadPatterns(preprocessor, loadPatternNames):
+    ''' Return the names of the load patterns passed as parameter that
+        are not defined in the model.
+
+    :param preprocessor: pre-processor of the finite element problem.
+    :param loadPatternNames: names of the load patterns to check.
+    '''
+    loadPatterns= preprocessor.getLoadHandler.getLoadPatterns
+    return [lpName for lpName in loadPatternNames if loadPatterns[lpName] is None]
+
+def getElementKind(elementType:str):
+    ''' Return the kind of internal forces that correspond to the element
+        type argument (same classification that is used in the
+        export_internal_forces module).
+
+    :param elementType: element type as returned by element.type().
+    '''
+    retval= None
+    if('Shell' in elementType):
+        retval= 'Shell'
+    elif('Beam2d' in elementType):
+        retval= 'Beam2d'
+    elif('Beam' in elementType):
+        retval= 'Beam'
+    elif('Truss' in elementType):
+        retval= 'Truss'
+    elif('ZeroLength' in elementType):
+        retval= 'ZeroLength'
+    return retval
+
+def getElementRawInternalForces(element, elementKind):
+    ''' Return the internal forces of the element in a list of values
+        that can be linearly combined. For shell elements the values
+        are the average generalized stresses (before applying the
+        Wood-Armer method, which is not linear).
+
+    :param element: element to obtain the internal forces from.
+    :param elementKind: kind of the element (see getElementKind).
+    '''
+    retval= list()
+    if(elementKind=='Shell'):
+        shellForces= internal_forces.ShellMaterialInternalForces()
+        shellForces.setFromAverageInShellElement(element)
+        retval= [shellForces.n1, shellForces.n2, shellForces.n12, shellForces.m1, shellForces.m2, shellForces.m12, shellForces.q13, shellForces.q23]
+    elif(elementKind=='Beam2d'):
+        element.getResistingForce()
+        [[N1, M1, V1], [N2, M2, V2]]= model_inquiry.getValuesAtNodes(element, ['N', 'M', 'V'], False)
+        retval= [N1, M1, V1, N2, M2, V2]
+    elif(elementKind=='Beam'):
+        element.getResistingForce()
+        [[N1, My1, Mz1, Vy1, Vz1, T1], [N2, My2, Mz2, Vy2, Vz2, T2]]= model_inquiry.getValuesAtNodes(element, ['N', 'My', 'Mz', 'Vy', 'Vz', 'T'], False)
+        retval= [N1, My1, Mz1, Vy1, Vz1, T1, N2, My2, Mz2, Vy2, Vz2, T2]
+    elif(elementKind=='Truss'):
+        element.getResistingForce()
+        [[N1], [N2]]= model_inquiry.getValuesAtNodes(element,['N'], False)
+        retval= [N1, N2]
+    elif(elementKind=='ZeroLength'):
+        element.getResistingForce()
+        F= element.getValuesAtNodes("stress", False)
+        nDOFs= len(F[0]) # Number of degrees of freedom.
+        if(nDOFs!= 6):
+            lmsg.warning('exportInternalForces for '+str(nDOFs)+ " DOFs in element type: '"+element.type()+"' not implemented.")
+        else:
+            retval= list(F[0])+list(F[1])
+    return retval
+
+def getElementExtendedProperties(element, elementKind):
+    ''' Return a dictionary containing the properties that are copied
+        (not combined) in the internal forces dictionary (lateral
+        buckling reduction factor, axial load reduction factor,...). The
+        values are taken using the same criteria that the
+        getInternalForcesDict function in export_internal_forces module.
+
+    :param element: element to get the properties from.
+    :param elementKind: kind of the element (see getElementKind).
+    '''
+    retval= dict()
+    if(elementKind in ['Beam2d', 'Beam']):
+        for propName in extendedPropertyNames:
+            if element.hasProp(propName):
+                value= element.getProp(propName)
+                if(propName in ['chiLT', 'chiN']):
+                    if(value): # same criteria as getInternalForcesDict.
+                        retval[propName]= value
+                elif(value is not None):
+                    retval[propName]= value
+    elif(elementKind=='Truss'):
+        for propName in extendedPropertyNames:
+            if element.hasProp(propName):
+                retval[propName]= element.getProp(propName)
+    return retval
+
+class LoadPatternResults(object):
+    ''' Results obtained for each of the elementary load patterns stored
+        in arrays (one row for each load pattern), so the results for any
+        combination can be obtained as a product of the vector of
+        combination factors by those arrays.
+
+    :ivar elements: elements to obtain internal forces for.
+    :ivar nodes: nodes to obtain the displacements for.
+    :ivar constrainedNodes: nodes to obtain the reactions for.
+    :ivar woodArmerAlsoForAxialForces: if true, use Wood-Armer method for
+                                       both axial and bending internal
+                                       forces otherwise, use it only for
+                                       bending moments.
+    :ivar loadPatternNames: names of the load patterns already solved.
+    '''
+    def __init__(self, elements, nodes, constrainedNodes= None, woodArmerAlsoForAxialForces= False):
+        ''' Constructor.
+
+        :param elements: elements to obtain internal forces for.
+        :param nodes: nodes to obtain the displacements for.
+        :param constrainedNodes: nodes to obtain the reactions for.
+        :param woodArmerAlsoForAxialForces: if true, use Wood-Armer method
+                                            for both axial and bending
+                                            internal forces otherwise, use
+                                            it only for bending moments.
+        '''
+        self.elements= elements
+        self.nodes= nodes
+        self.constrainedNodes= constrainedNodes
+        self.woodArmerAlsoForAxialForces= woodArmerAlsoForAxialForces
+        self.loadPatternNames= list()
+        self.elementRecords= None # (tag, type, kind, offset, size, extendedProperties)
+        self.nodeRecords= None # (tag, offset, size)
+        self.constrainedNodeRecords= None # (tag, dictionary with constant data)
+        self.internalForcesRows= list()
+        self.displacementRows= list()
+        self.reactionRows= list()
+        self.internalForces= None
+        self.displacements= None
+        self.reactions= None
+
+    def _appendInternalForces(self):
+        ''' Append the internal forces of the current solution.'''
+        row= list()
+        firstRow= (self.elementRecords is None)
+        if(firstRow):
+            self.elementRecords= list()
+        for e in self.elements:
+            elementType= e.type()
+            kind= getElementKind(elementType)
+            if(kind is None):
+                lmsg.error("exportInternalForces error; element type: '"+elementType+"' unknown.")
+            values= getElementRawInternalForces(e, kind)
+            if(firstRow):
+                extendedProperties= getElementExtendedProperties(e, kind)
+                self.elementRecords.append((e.tag, elementType, kind, len(row), len(values), extendedProperties))
+            row.extend(values)
+        self.internalForcesRows.append(row)
+
+    def _appendDisplacements(self):
+        ''' Append the nodal displacements of the current solution.'''
+        row= list()
+        firstRow= (self.nodeRecords is None)
+        if(firstRow):
+            self.nodeRecords= list()
+        for n in self.nodes:
+            disp= list(n.getDisp)
+            if(firstRow):
+                self.nodeRecords.append((n.tag, len(row), len(disp)))
+            row.extend(disp)
+        self.displacementRows.append(row)
+
+    def _appendReactions(self):
+        ''' Append the reactions of the current solution.'''
+        row= list()
+        firstRow= (self.constrainedNodeRecords is None)
+        if(firstRow):
+            self.constrainedNodeRecords= list()
+        if(self.constrainedNodes):
+            for n in self.constrainedNodes:
+                if(firstRow):
+                    nodeDict= dict()
+                    if(n.hasProp('restrainedNodeId')):
+                        nodeDict['restrainedNodeId']= n.getProp('restrainedNodeId')
+                    nodeDict['nDOF']= n.getNumberDOF
+                    nPosition= n.getInitialPos3d
+                    nodeDict['position']= {'x':nPosition.x,'y':nPosition.y,'z':nPosition.z}
+                    self.constrainedNodeRecords.append((n.tag, nodeDict))
+                nReactionForce= n.getReactionForce3d
+                nReactionMoment= n.getReactionMoment3d
+                row.extend([nReactionForce.x, nReactionForce.y, nReactionForce.z, nReactionMoment.x, nReactionMoment.y, nReactionMoment.z])
+        self.reactionRows.append(row)
+
+    def solveLoadPatterns(self, solutionProcedure, loadPatternNames):
+        ''' Solve each of the load patterns whose names are passed as
+            parameter and store the results. If any of the load patterns
+            is not defined nothing is solved and -1 is returned.
+
+        :param solutionProcedure: linear solution procedure.
+        :param loadPatternNames: names of the load patterns to solve.
+        '''
+        preprocessor= solutionProcedure.feProblem.getPreprocessor
+        loadHandler= preprocessor.getLoadHandler
+        loadPatterns= loadHandler.getLoadPatterns
+        retval= 0
+        missingLoadPatterns= getMissingLoadPatterns(preprocessor, loadPatternNames)
+        if(missingLoadPatterns):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.error(className+'.'+methodName+"; load patterns: "+str(missingLoadPatterns)+" not found.")
+            return -1
+        for lpName in loadPatternNames:
+            lp= loadPatterns[lpName]
+            preprocessor.resetLoadCase()
+            preprocessor.getDomain.revertToStart()
+            gammaF= lp.gammaF
+            lp.gammaF= 1.0 # elementary results.
+            loadHandler.addToDomain(lpName)
+            result= solutionProcedure.solve()
+            if(result!=0):
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.error(className+'.'+methodName+"; can't solve load pattern: '"+str(lpName)+"'.")
+                retval= result
+            self._appendInternalForces()
+            self._appendDisplacements()
+            self._appendReactions()
+            loadHandler.removeFromDomain(lpName)
+            lp.gammaF= gammaF
+            self.loadPatternNames.append(lpName)
+        self.internalForces= numpy.array(self.internalForcesRows, dtype= float)
+        self.displacements= numpy.array(self.displacementRows, dtype= float)
+        self.reactions= numpy.array(self.reactionRows, dtype= float)
+        return retval
+
+    def getFactorMatrix(self, combinations):
+        ''' Return the names of the combinations and the matrix of
+            combination factors (one row for each combination, one column
+            for each load pattern).
+
+        :param combinations: list of combination records (name and expression).
+        '''
+        combNames= list()
+        lpIndex= dict()
+        for i, lpName in enumerate(self.loadPatternNames):
+            lpIndex[lpName]= i
+        retval= numpy.zeros((len(combinations), len(self.loadPatternNames)))
+        for i, comb in enumerate(combinations):
+            combNames.append(comb.name)
+            factors= utils.getCombinationDict(comb.expr)
+            for lpName in factors:
+                retval[i, lpIndex[lpName]]= factors[lpName]
+        return combNames, retval
+
+    def combine(self, factors):
+        ''' Return the internal forces, the displacements and the
+            reactions corresponding to the combination factors argument.
+
+        :param factors: matrix of combination factors (one row for each
+                        combination, one column for each load pattern).
+        '''
+        return factors @ self.internalForces, factors @ self.displacements, factors @ self.reactions
+
+    def getInternalForcesComponents(self):
+        ''' Return the name of the internal force component (see
+            rawInternalForcesComponents) of each of the values of the
+            internal forces rows.'''
+        retval= list()
+        for (tag, elementType, kind, offset, sz, extendedProperties) in self.elementRecords:
+            retval.extend(rawInternalForcesComponents.get(kind, list())[:sz])
+        return retval
+
+    def getInternalForcesDict(self, combName, values):
+        ''' Return a dictionary with the element's internal forces with the
+            same format that the one returned by the getInternalForcesDict
+            function of the export_internal_forces module.
+
+        :param combName: combination name.
+        :param values: combined internal forces row.
+        '''
+        outDict= dict()
+        for (tag, elementType, kind, offset, sz, extendedProperties) in self.elementRecords:
+            v= numpy.asarray(values[offset:offset+sz]).tolist()
+            internalForcesDict= dict()
+            if(kind=='Shell'):
+                shellForces= internal_forces.ShellMaterialInternalForces(*v)
+                forces= shellForces.getWoodArmer(alsoForAxialForces= self.woodArmerAlsoForAxialForces)
+                for i, force in enumerate(forces):
+                    internalForcesDict[i]= force.getDict()
+            elif(kind=='Beam2d'):
+                [N1, M1, V1, N2, M2, V2]= v
+                internalForcesDict[0]= internal_forces.CrossSectionInternalForces(N1,V1,0.0,0.0,0.0,M1).getDict()
+                internalForcesDict[1]= internal_forces.CrossSectionInternalForces(N2,V2,0.0,0.0,0.0,M2).getDict()
+            elif(kind=='Beam'):
+                [N1, My1, Mz1, Vy1, Vz1, T1, N2, My2, Mz2, Vy2, Vz2, T2]= v
+                internalForcesDict[0]= internal_forces.CrossSectionInternalForces(N1,Vy1,Vz1,T1,My1,Mz1).getDict()
+                internalForcesDict[1]= internal_forces.CrossSectionInternalForces(N2,Vy2,Vz2,T2,My2,Mz2).getDict()
+            elif(kind=='Truss'):
+                [N1, N2]= v
+                internalForcesDict[0]= internal_forces.CrossSectionInternalForces(N1).getDict()
+                internalForcesDict[1]= internal_forces.CrossSectionInternalForces(N2).getDict()
+            elif((kind=='ZeroLength') and (sz==12)):
+                internalForcesDict[0]= internal_forces.CrossSectionInternalForces(N= v[0], Vy= v[1], Vz= v[2], T= v[3], My= v[4], Mz= v[5]).getDict()
+                internalForcesDict[1]= internal_forces.CrossSectionInternalForces(N= v[6], Vy= v[7], Vz= v[8], T= v[9], My= v[10], Mz= v[11]).getDict()
+            if(len(extendedProperties)>0):
+                for key in internalForcesDict:
+                    internalForcesDict[key].update(extendedProperties)
+            outDict[tag]= {'type':elementType, 'internalForces':internalForcesDict}
+        return {combName: outDict}
+
+    def getReactionsDict(self, combName, values):
+        ''' Return a dictionary with the reactions with the same format
+            that the one returned by the getReactionsDict function of the
+            export_reactions module.
+
+        :param combName: combination name.
+        :param values: combined reactions row.
+        '''
+        outDict= dict()
+        for i, (tag, nodeData) in enumerate(self.constrainedNodeRecords):
+            nodeDict= dict(nodeData)
+            [Fx, Fy, Fz, Mx, My, Mz]= numpy.asarray(values[6*i:6*i+6]).tolist()
+            nodeDict['reactions']= {'Fx':Fx,'Fy':Fy,'Fz':Fz,'Mx':Mx,'My':My,'Mz':Mz}
+            outDict[tag]= nodeDict
+        return {combName: outDict}
+
+    def getDisplacementLines(self, combName, values):
+        ''' Return the lines of the displacement file (see
+            LimitStateData.writeDisplacements) for the given combination.
+
+        :param combName: combination name.
+        :param values: combined displacements row.
+        '''
+        retval= list()
+        for (tag, offset, sz) in self.nodeRecords:
+            strDisp= ', '.join(str(u) for u in numpy.asarray(values[offset:offset+sz]).tolist())
+            retval.append(combName+", "+str(tag)+", " + strDisp+'\n')
+        return retval
+
+def getLoadPatternNames(combinations):
+    ''' Return the names of the load patterns that appear in the
+        expressions of the combinations argument.
+
+    :param combinations: list of combination records (name and expression).
+    '''
+    retval= list()
+    for comb in combinations:
+        for lpName in utils.getCombinationDict(comb.expr):
+            if(lpName not in retval):
+                retval.append(lpName)
+    return retval
@@ -9,7 +9,11 @@ __license__= "GPL"
 __version__= "3.0"
 __email__= "l.pereztato@gmail.com  ana.ortega@ciccp.es"
 
+import os
 import sys
+import shutil
+import pickle
+import tempfile
 import xc
 from model import predefined_spaces
 from materials import typical_materials
@@ -18,6 +22,10 @@ from postprocess import control_vars as cv
 from misc_utils import log_messages as lmsg
 from collections import defaultdict
 from postprocess import limit_state_data as lsd
+from postprocess import combination_screening as cs
+from postprocess import change_tracking as ct
+from solution import section_solver as ss
+from solution import parallel_combinations as pc
 
 # Fake section (elements must have a stiffness)
 sccFICT= section_properties.RectangularSection("rectang",b=.40,h=40)
@@ -46,9 +54,38 @@ class PhantomModel(object):
         :ivar sectionsDistribution:  file containing the section definition for
                                      each element (this section will be 
                                      be employed in verifications).
+        :ivar combinationElements: phantom elements to check for each
+                                   combination (None if all the elements
+                                   are checked for all the combinations).
+        :ivar screeningStatistics: results of the screening of the
+                                   combinations (see combination_screening).
+        :ivar combinationLoads: internal forces applied to each phantom
+                                element (dictionary of dictionaries indexed
+                                by combination name and element tag).
+        :ivar sectionSolverStatistics: number of iterations and sections
+                                       not converged when the section 
+                                       level solver is used (see 
+                                       checkSections).
+        :ivar changeManifest: digests of the elements checked in the
+                              previous run (None if the checking is not
+                              incremental, see change_tracking module).
+        :ivar outputFileName: base name of the output file of the previous
+                              run (used only if the checking is
+                              incremental).
+        :ivar elementDigests: digests of the elements to check.
+        :ivar previousControlVars: results of the previous run for the
+                                   elements that have not changed.
         '''
         self.preprocessor= preprocessor
         self.sectionsDistribution= sectionDistribution
+        self.combinationElements= None
+        self.screeningStatistics= None
+        self.combinationLoads= None
+        self.sectionSolverStatistics= None
+        self.changeManifest= None
+        self.outputFileName= None
+        self.elementDigests= None
+        self.previousControlVars= None
 
     def setupForElementsAndCombinations(self,intForcCombFileName,setCalc=None):
         '''Extracts element and combination identifiers from the internal
@@ -73,6 +110,29 @@ class PhantomModel(object):
             lmsg.error(className+'.'+methodName+'; no elements to check in internal forces file.')
             exit(1)
 
+    def removeUnchangedElements(self, outputFileName, outputCfg):
+        '''Remove the elements whose data (internal forces, sections and
+           controller) have not changed since the previous run and whose
+           results can be read from the output file (see change_tracking 
+           module).
+
+        :param outputFileName: base name of the output file of the
+                               previous run.
+        :param outputCfg: instance of class 'VerifOutVars' which defines the 
+                   variables that control the output of the checking.
+        '''
+        extraData= {'screeningMethod': outputCfg.screeningMethod, 'sectionSolver': outputCfg.sectionSolver}
+        self.elementDigests= ct.get_element_digests(self.internalForcesValues, self.sectionsDistribution, outputCfg.controller, extraData)
+        self.previousControlVars= list()
+        if(self.changeManifest.read()):
+            unchangedElements= set(self.changeManifest.getUnchangedItems(self.elementDigests))
+            self.previousControlVars= cv.readPhantomElementControlVars(outputFileName, outputCfg.controller.limitStateLabel, unchangedElements)
+        reusedElements= set([eTag for eTag, sectionIndex, controlVar in self.previousControlVars])
+        self.elementTags= [eTag for eTag in self.elementTags if eTag not in reusedElements]
+        for eTag in reusedElements:
+            self.internalForcesValues.pop(eTag, None)
+        outputCfg.changeStatistics= {'computed': len(self.elementTags), 'reused': len(reusedElements)}
+
     def createPhantomElement(self, masterElementId, masterElementDimension, sectionName, sectionDefinition, sectionIndex, interactionDiagram, fakeSection):
         '''Creates a phantom element (that represents a section to check) 
 
@@ -119,6 +179,8 @@ class PhantomModel(object):
                    generation or not of lists, ...)
         '''
         self.setupForElementsAndCombinations(intForcCombFileName, outputCfg.setCalc)
+        if(self.changeManifest):
+            self.removeUnchangedElements(self.outputFileName, outputCfg)
 
         retval= []
         nodes= self.preprocessor.getNodeHandler
@@ -131,6 +193,7 @@ class PhantomModel(object):
                 AssertionError('Can\'t define material.')
         elements.dimElem= 1
         self.tagsNodesToLoad= defaultdict(list)
+        self.phantomElements= defaultdict(list)
         if(outputCfg.controller.fakeSection):
             elements.defaultMaterial= sccFICT.name
         elementsWithoutSection= set()
@@ -146,6 +209,7 @@ class PhantomModel(object):
                         diagInt= mapInteractionDiagrams[sectionName]
                     phantomElem= self.createPhantomElement(masterElementId= tagElem, masterElementDimension= masterElementDimension, sectionName= sectionName, sectionDefinition= elementSectionDefinitions[i], sectionIndex= i+1, interactionDiagram= diagInt, fakeSection= outputCfg.controller.fakeSection)
                     retval.append(phantomElem)
+                    self.phantomElements[tagElem].append(phantomElem)
                     self.tagsNodesToLoad[tagElem].append(phantomElem.getNodes[1].tag) #Node to load
                                                                                       #for this element
             else:
@@ -157,13 +221,26 @@ class PhantomModel(object):
         outputCfg.controller.initControlVars(retval)
         return retval
 
-    def createLoads(self,intForcCombFileName):
+    def createLoads(self,intForcCombFileName, screeningMethod= None):
         '''Creates the loads from the data read from the file.
 
            :param intForcCombFileName: name of the file containing the forces and 
                                bending moments obtained for each element for all 
                                the combinations analyzed.
+           :param screeningMethod: method used to discard the combinations
+                               that cannot govern the checking of each 
+                               section (see combination_screening module);
+                               if None or 'exact' all the combinations are
+                               checked.
         '''
+        internalForcesValues= self.internalForcesValues
+        self.combinationElements= None
+        self.screeningStatistics= None
+        self.combinationLoads= defaultdict(dict)
+        self.sectionSolverStatistics= None
+        if(not cs.is_exact(screeningMethod)):
+            internalForcesValues, self.screeningStatistics= cs.screen_internal_forces(self.internalForcesValues, screeningMethod)
+            self.combinationElements= defaultdict(list)
         cargas= self.preprocessor.getLoadHandler
         casos= cargas.getLoadPatterns
         #Load modulation.
@@ -175,14 +252,19 @@ class PhantomModel(object):
             mapCombs[comb]= casos.newLoadPattern("default",str(comb))
 
         elementsWithoutLoadedNodes= set()
-        for key in self.internalForcesValues:
-            internalForcesElem= self.internalForcesValues[key]
+        for key in internalForcesValues:
+            internalForcesElem= internalForcesValues[key]
             for iforce in internalForcesElem:
                 lp= mapCombs[iforce.idComb]
                 tagsNodesToLoad=  self.tagsNodesToLoad[iforce.tagElem]
                 if(tagsNodesToLoad):
                     nodeTag= tagsNodesToLoad[iforce.idSection]
-                    lp.newNodalLoad(nodeTag,xc.Vector(iforce.getComponents()))
+                    components= iforce.getComponents()
+                    lp.newNodalLoad(nodeTag,xc.Vector(components))
+                    phantomElement= self.phantomElements[iforce.tagElem][iforce.idSection]
+                    self.combinationLoads[iforce.idComb][phantomElement.tag]= components
+                    if(self.combinationElements is not None):
+                        self.combinationElements[iforce.idComb].append(phantomElement)
                 else:
                     elementsWithoutLoadedNodes.add(iforce.tagElem)
         if(elementsWithoutLoadedNodes):
@@ -202,23 +284,118 @@ class PhantomModel(object):
                    generation or not of lists, ...)
         '''
         retval= self.createElements(intForcCombFileName,outputCfg)
-        self.createLoads(intForcCombFileName)
+        self.createLoads(intForcCombFileName, outputCfg.screeningMethod)
+        outputCfg.screeningStatistics= self.screeningStatistics
         return retval
 
-    def check(self, controller):
-        '''Runs the analysis (linear) and checking of combinations passed as
-        parameters
+    def checkCombinations(self, controller, elements, sectionProcedure= None):
+        '''Solve and check the combinations on the given elements.
 
         :param controller: object that controls limit state in elements.
+        :param elements: elements to check.
+        :param sectionProcedure: if not None, section solution procedure
+                                 used to compute the state of the elements
+                                 (see solution/section_solver.py).
         '''
         combs= self.preprocessor.getLoadHandler.getLoadPatterns #Here each load pattern represents a combination.
-        elements= self.preprocessor.getSets.getSet("total").elements
-        controller.checkSolverAdequacy()
+        elementTags= None
+        if(sectionProcedure):
+            elementTags= set([e.tag for e in elements])
         for key in combs.getKeys():
             #comb= combs[key]
-            controller.solutionProcedure.solveComb(key)
-            controller.preprocessor= self.preprocessor
-            controller.check(elements, key)
+            elementsToCheck= elements
+            if(self.combinationElements is not None): # screened combinations.
+                # None if it can't govern the checking of any section.
+                elementsToCheck= self.combinationElements.get(key, None)
+                if(elementsToCheck and (elementTags is not None)):
+                    elementsToCheck= [e for e in elementsToCheck if e.tag in elementTags]
+            if(elementsToCheck):
+                if(sectionProcedure):
+                    sectionProcedure.elements= elementsToCheck
+                controller.solutionProcedure.solveComb(key)
+                controller.preprocessor= self.preprocessor
+                controller.check(elementsToCheck, key)
+
+    def checkSections(self, controller, numProcesses= 1):
+        '''Checking of the combinations computing the state of each phantom
+        element by means of a section level solution procedure (no global
+        system of equations is solved). The elements can be distributed
+        among several worker processes; the elements of a worker that
+        fails are checked again in this process, so none of them keeps
+        its initial control vars.
+
+        :param controller: object that controls limit state in elements.
+        :param numProcesses: number of worker processes.
+        '''
+        elements= list(self.preprocessor.getSets.getSet("total").elements)
+        controlVarName= controller.limitStateLabel
+        sectionProcedure= ss.SectionSolutionProcedure(self.combinationLoads)
+        globalProcedure= controller.solutionProcedure
+        controller.solutionProcedure= sectionProcedure
+        try:
+            controller.checkSolverAdequacy()
+            if((numProcesses>1) and (not pc.forkIsAvailable())):
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.warning(className+'.'+methodName+"; worker processes can't be forked in this platform. Checking sections serially.")
+                numProcesses= 1
+            if(numProcesses>1):
+                tmpDir= tempfile.mkdtemp(prefix= 'xc_phantom_')
+                def worker(workerId, elementIndexes):
+                    workerElements= [elements[i] for i in elementIndexes]
+                    self.checkCombinations(controller, workerElements, sectionProcedure)
+                    results= {'controlVars':[(e.tag, e.getProp(controlVarName)) for e in workerElements], 'numIterations': sectionProcedure.numIterations, 'failedSections': sectionProcedure.failedSections}
+                    with open(os.path.join(tmpDir, str(workerId)+'.pkl'), 'wb') as f:
+                        pickle.dump(results, f)
+                    return 0
+                chunks, exitCodes= pc.runForked(worker, list(range(0, len(elements))), numProcesses)
+                elementsByTag= {e.tag:e for e in elements}
+                uncheckedElements= list()
+                for workerId, (chunk, exitCode) in enumerate(zip(chunks, exitCodes)):
+                    fName= os.path.join(tmpDir, str(workerId)+'.pkl')
+                    if((exitCode!=0) or (not os.path.exists(fName))):
+                        uncheckedElements.extend([elements[i] for i in chunk])
+                        continue
+                    with open(fName, 'rb') as f:
+                        results= pickle.load(f)
+                    for tag, controlVars in results['controlVars']:
+                        elementsByTag[tag].setProp(controlVarName, controlVars)
+                    sectionProcedure.numIterations+= results['numIterations']
+                    sectionProcedure.failedSections.extend(results['failedSections'])
+                shutil.rmtree(tmpDir, ignore_errors= True)
+                if(uncheckedElements): # check them here, otherwise they would keep their initial control vars.
+                    className= type(self).__name__
+                    methodName= sys._getframe(0).f_code.co_name
+                    lmsg.warning(className+'.'+methodName+'; some worker processes failed, checking their '+str(len(uncheckedElements))+' elements serially.')
+                    self.checkCombinations(controller, uncheckedElements, sectionProcedure)
+            else:
+                self.checkCombinations(controller, elements, sectionProcedure)
+        finally:
+            controller.solutionProcedure= globalProcedure
+        self.sectionSolverStatistics= {'numIterations': sectionProcedure.numIterations, 'failedSections': sectionProcedure.failedSections}
+
+    def check(self, controller, sectionSolver= False, numProcesses= 1):
+        '''Runs the analysis (linear) and checking of combinations passed as
+        parameters
+
+        :param controller: object that controls limit state in elements.
+        :param sectionSolver: if true, compute the state of each phantom 
+                              element by means of a section level solution
+                              procedure instead of solving the global model
+                              (see checkSections).
+        :param numProcesses: number of worker processes (used only if 
+                             sectionSolver is true).
+        '''
+        if(sectionSolver):
+            self.checkSections(controller, numProcesses)
+        else:
+            controller.checkSolverAdequacy()
+            elements= self.preprocessor.getSets.getSet("total").elements
+            self.checkCombinations(controller, elements)
+        if(self.screeningStatistics and controller.verbose):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.log(className+'.'+methodName+'; '+cs.get_statistics_message(self.screeningStatistics))
 
     def write(self,outputFileName,outputCfg):
         '''Writes results into the output file
@@ -229,7 +406,7 @@ class PhantomModel(object):
                variables that control the output of the checking (append or not
                the results to a file, generation or not of lists, ...)
         '''
-        return cv.writeControlVarsFromPhantomElements(self.preprocessor, outputFileName, outputCfg)
+        return cv.writeControlVarsFromPhantomElements(self.preprocessor, outputFileName, outputCfg, previousControlVars= self.previousControlVars)
 
     def runChecking(self, limitStateData, outputCfg):
         '''Run the analysis, check the results and write them into a file
@@ -246,11 +423,22 @@ class PhantomModel(object):
         '''
         retval=None
         intForcCombFileName= limitStateData.getInternalForcesFileName()
+        outputFileName= limitStateData.getOutputDataBaseFileName()
         controller= outputCfg.controller
         if(controller):
+            self.changeManifest= None
+            self.previousControlVars= None
+            if(outputCfg.incremental):
+                self.changeManifest= ct.ChangeManifest(outputFileName+'_digests.json', header= {'limitStateLabel': controller.limitStateLabel, 'appendToResFile': outputCfg.appendToResFile})
+                self.outputFileName= outputFileName
             self.build(intForcCombFileName= intForcCombFileName, outputCfg= outputCfg)
-            self.check(controller)
-            retval= self.write(limitStateData.getOutputDataBaseFileName(),outputCfg)
+            if(len(self.elementTags)>0):
+                self.check(controller, sectionSolver= outputCfg.sectionSolver, numProcesses= outputCfg.numProcesses)
+            retval= self.write(outputFileName,outputCfg)
+            if(self.changeManifest):
+                self.changeManifest.write(self.elementDigests)
+                if(controller.verbose):
+                    lmsg.log('PhantomModel::runChecking; '+ct.get_change_statistics_message(outputCfg.changeStatistics))
         else:
             lmsg.error('PhantomModel::runChecking controller not defined.')
         return retval
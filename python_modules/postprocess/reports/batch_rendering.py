@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+''' Batch generation of the graphic files of a report.
+
+    The figures of the report (load case x set x component) are declared
+    first (see FigureBatch.addFigure and
+    graphical_reports.LoadCaseDispParameters.addSimpleLoadCaseFigures)
+    and then rendered off-screen in a single pass:
+
+    - the figures are grouped by load case, so each load case is solved
+      only once.
+    - the figures of the same set share the camera parameters and the
+      VTK grid topology (see xcVtk.FE_model.vtk_grid_cache), so only the
+      data arrays change from one figure to the next.
+    - the load cases can be distributed among several worker processes
+      (see solution.parallel_combinations).
+    - a digest of the inputs of each figure (results of the set under the
+      load case, loads of the load case and display parameters) is stored
+      in a manifest file next to the graphic files; the figures whose
+      digest hasn't changed since the last build are not rendered again.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import os
+import sys
+import copy
+import json
+import shutil
+import hashlib
+import tempfile
+from collections import OrderedDict
+import numpy as np
+from postprocess import output_handler
+from postprocess import output_styles
+from postprocess import change_tracking as ct
+from actions.load_combination_utils import utils
+from solution import parallel_combinations as pc
+from misc_utils import log_messages as lmsg
+
+figureKinds= ['dispRot', 'intForc', 'beamIntForc', 'loads']
+
+def get_plain_value(value, depth= 0, maxDepth= 6):
+    ''' Return a representation of the value argument made of dictionaries,
+        lists and strings or numbers (objects are represented by their
+        attributes).
+
+    :param value: value to represent.
+    :param depth: current nesting level.
+    :param maxDepth: maximum nesting level (deeper objects are represented
+                     by their string representation).
+    '''
+    retval= None
+    if((value is None) or isinstance(value, (bool, int, float, str))):
+        retval= value
+    elif(depth>=maxDepth):
+        retval= str(value)
+    elif(isinstance(value, dict)):
+        retval= dict()
+        for key in value:
+            retval[str(key)]= get_plain_value(value[key], depth+1, maxDepth)
+    elif(isinstance(value, (list, tuple))):
+        retval= [get_plain_value(v, depth+1, maxDepth) for v in value]
+    elif(hasattr(value, '__dict__')):
+        retval= {'class':type(value).__name__, 'attributes':get_plain_value(vars(value), depth+1, maxDepth)}
+    else:
+        retval= str(value)
+    return retval
+
+def get_parameters_digest(parameters):
+    ''' Return a hexadecimal digest of the parameters argument (nested
+        objects are represented by their attributes).
+
+    :param parameters: display parameters (dictionary).
+    '''
+    text= json.dumps(get_plain_value(parameters), sort_keys= True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def get_results_digest(xcSet):
+    ''' Return a hexadecimal digest of the results (nodal displacements
+        and element internal forces) of the set argument.
+
+    :param xcSet: set to get the results for.
+    '''
+    digest= hashlib.sha256()
+    for n in xcSet.nodes:
+        values= [n.tag]+list(n.getDisp)
+        digest.update(np.array(values, dtype= float).tobytes())
+    for e in xcSet.elements:
+        values= [e.tag]+list(e.getResistingForce())
+        digest.update(np.array(values, dtype= float).tobytes())
+    return digest.hexdigest()
+
+def get_loads_digest(preprocessor, loadCaseExpr):
+    ''' Return a hexadecimal digest of the loads of the load patterns that
+        appear in the load case expression (see
+        change_tracking.get_load_pattern_digest) or None if some of them
+        can't be digested.
+
+    :param preprocessor: pre-processor of the finite element problem.
+    :param loadCaseExpr: expression that defines the load case (i.e.
+                         '1.0*G+1.0*Q').
+    '''
+    loadPatterns= preprocessor.getLoadHandler.getLoadPatterns
+    loadPatternDigests= dict()
+    for lpName in utils.getCombinationDict(loadCaseExpr):
+        loadPatternDigests[lpName]= ct.get_load_pattern_digest(loadPatterns[lpName])
+    retval= None
+    if(None not in loadPatternDigests.values()):
+        retval= get_parameters_digest(loadPatternDigests)
+    return retval
+
+class FigureRequest(object):
+    ''' Graphic file to generate.
+
+    :ivar kind: type of figure (one of figureKinds).
+    :ivar loadCaseName: name of the load case.
+    :ivar loadCaseExpr: expression that defines the load case (i.e.
+                        '1.0*G+1.0*Q').
+    :ivar xcSet: set to display.
+    :ivar itemToDisp: component to display (i.e. 'uX', 'N1', 'Mz'...).
+    :ivar fileName: name of the graphic file.
+    :ivar defFScale: factor to apply to current displacement of nodes.
+    :ivar parameters: additional keyword arguments for the output handler
+                      method.
+    '''
+    def __init__(self, kind, loadCaseName, loadCaseExpr, xcSet, fileName, itemToDisp= None, defFScale= 0.0, parameters= None):
+        ''' Constructor.
+
+        :param kind: type of figure (one of figureKinds).
+        :param loadCaseName: name of the load case.
+        :param loadCaseExpr: expression that defines the load case.
+        :param xcSet: set to display.
+        :param fileName: name of the graphic file.
+        :param itemToDisp: component to display.
+        :param defFScale: factor to apply to current displacement of nodes.
+        :param parameters: additional keyword arguments for the output
+                           handler method.
+        '''
+        if(kind not in figureKinds):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.error(className+'.'+methodName+"; unknown figure type: '"+str(kind)+"'. Available values: "+str(figureKinds))
+        self.kind= kind
+        self.loadCaseName= loadCaseName
+        self.loadCaseExpr= loadCaseExpr
+        self.xcSet= xcSet
+        self.fileName= fileName
+        self.itemToDisp= itemToDisp
+        self.defFScale= defFScale
+        if(parameters):
+            self.parameters= parameters
+        else:
+            self.parameters= dict()
+
+    def getDisplayParameters(self, outputStyle):
+        ''' Return a dictionary with the parameters that define the
+            figure (apart from the results).
+
+        :param outputStyle: output style used to render the figure.
+        '''
+        return {'kind':self.kind, 'loadCaseExpr':self.loadCaseExpr, 'set':self.xcSet.name, 'itemToDisp':self.itemToDisp, 'fileName':self.fileName, 'defFScale':self.defFScale, 'parameters':self.parameters, 'outputStyle':outputStyle}
+
+    def render(self, outputHandler):
+        ''' Write the graphic file.
+
+        :param outputHandler: output handler to use.
+        '''
+        if(self.kind=='dispRot'):
+            outputHandler.displayDispRot(itemToDisp= self.itemToDisp, setToDisplay= self.xcSet, fileName= self.fileName, defFScale= self.defFScale, **self.parameters)
+        elif(self.kind=='intForc'):
+            outputHandler.displayIntForc(itemToDisp= self.itemToDisp, setToDisplay= self.xcSet, fileName= self.fileName, defFScale= self.defFScale, **self.parameters)
+        elif(self.kind=='beamIntForc'):
+            outputHandler.displayIntForcDiag(itemToDisp= self.itemToDisp, setToDisplay= self.xcSet, fileName= self.fileName, defFScale= self.defFScale, **self.parameters)
+        elif(self.kind=='loads'):
+            outputHandler.displayLoads(setToDisplay= self.xcSet, fileName= self.fileName, defFScale= self.defFScale, **self.parameters)
+
+class FigureBatch(object):
+    ''' List of figures to render off-screen in a single pass.
+
+    :ivar modelSpace: model space object (see predefined_spaces.py).
+    :ivar outputStyle: style of the output.
+    :ivar manifestFileName: name of the file that stores the digest of each
+                            figure (if None, all the figures are rendered).
+    :ivar cameraParameters: dictionary containing the camera parameters to
+                            use for each set (by set name); the output
+                            style ones are used for the remaining sets.
+    :ivar figures: list of FigureRequest objects.
+    :ivar statistics: number of figures rendered, skipped and failed in
+                      the last call to render.
+    '''
+    def __init__(self, modelSpace, outputStyle= output_styles.defaultOutputStyle, manifestFileName= None):
+        ''' Constructor.
+
+        :param modelSpace: model space object (see predefined_spaces.py).
+        :param outputStyle: style of the output.
+        :param manifestFileName: name of the file that stores the digest of
+                                 each figure.
+        '''
+        self.modelSpace= modelSpace
+        self.outputStyle= outputStyle
+        self.manifestFileName= manifestFileName
+        self.cameraParameters= dict()
+        self.figures= list()
+        self.statistics= None
+
+    def addFigure(self, kind, loadCaseName, loadCaseExpr, xcSet, fileName, itemToDisp= None, defFScale= 0.0, parameters= None):
+        ''' Append a figure to the batch and return it.
+
+        :param kind: type of figure (one of figureKinds).
+        :param loadCaseName: name of the load case.
+        :param loadCaseExpr: expression that defines the load case.
+        :param xcSet: set to display.
+        :param fileName: name of the graphic file.
+        :param itemToDisp: component to display.
+        :param defFScale: factor to apply to current displacement of nodes.
+        :param parameters: additional keyword arguments for the output
+                           handler method.
+        '''
+        retval= FigureRequest(kind= kind, loadCaseName= loadCaseName, loadCaseExpr= loadCaseExpr, xcSet= xcSet, fileName= fileName, itemToDisp= itemToDisp, defFScale= defFScale, parameters= parameters)
+        self.figures.append(retval)
+        return retval
+
+    def setCameraParameters(self, xcSet, cameraParameters):
+        ''' Set the camera parameters for all the figures of the set.
+
+        :param xcSet: set to display.
+        :param cameraParameters: camera parameters.
+        '''
+        self.cameraParameters[xcSet.name]= cameraParameters
+
+    def getLoadCases(self):
+        ''' Return an ordered dictionary containing the figures of each
+            load case.'''
+        retval= OrderedDict()
+        for figure in self.figures:
+            key= (figure.loadCaseName, figure.loadCaseExpr)
+            if(key not in retval):
+                retval[key]= list()
+            retval[key].append(figure)
+        return retval
+
+    def readManifest(self):
+        ''' Return the digests stored in the manifest file.'''
+        retval= dict()
+        if(self.manifestFileName and os.path.exists(self.manifestFileName)):
+            with open(self.manifestFileName, 'r') as f:
+                retval= json.load(f)
+        return retval
+
+    def writeManifest(self, digests):
+        ''' Write the digests in the manifest file.
+
+        :param digests: dictionary containing the digest of each graphic file.
+        '''
+        if(self.manifestFileName):
+            with open(self.manifestFileName, 'w') as f:
+                json.dump(digests, f, sort_keys= True, indent= 1)
+
+    def solveLoadCase(self, loadCaseName, loadCaseExpr):
+        ''' Solve the load case (see LoadCaseDispParameters.solveLC).
+
+        :param loadCaseName: name of the load case.
+        :param loadCaseExpr: expression that defines the load case.
+        '''
+        self.modelSpace.removeAllLoadPatternsFromDomain()
+        self.modelSpace.revertToStart()
+        self.modelSpace.addNewLoadCaseToDomain(loadCaseName, loadCaseExpr)
+        return self.modelSpace.analyze()
+
+    def renderLoadCases(self, loadCases, previousDigests):
+        ''' Render the figures of the given load cases. Return a dictionary
+            with the digest of each figure and the number of figures
+            rendered, skipped and failed.
+
+        :param loadCases: list of (key, figures) pairs (see getLoadCases).
+        :param previousDigests: digests read from the manifest file.
+        '''
+        digests= dict()
+        numRendered= 0
+        numSkipped= 0
+        numFailed= 0
+        outputStyle= copy.copy(self.outputStyle)
+        outputHandler= output_handler.OutputHandler(self.modelSpace, outputStyle)
+        for (loadCaseName, loadCaseExpr), figures in loadCases:
+            result= self.solveLoadCase(loadCaseName, loadCaseExpr)
+            if(result!=0):
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.error(className+'.'+methodName+"; can't solve load case: '"+str(loadCaseName)+"', its figures are not rendered.")
+                numFailed+= len(figures)
+                continue
+            loadsDigest= get_loads_digest(self.modelSpace.preprocessor, loadCaseExpr)
+            resultsDigests= dict()
+            for figure in figures:
+                setName= figure.xcSet.name
+                if(setName not in resultsDigests):
+                    resultsDigests[setName]= get_results_digest(figure.xcSet)
+                outputStyle.cameraParameters= self.cameraParameters.get(setName, self.outputStyle.cameraParameters)
+                digest= None # loads that can't be digested: always rendered.
+                if(loadsDigest is not None):
+                    digest= get_parameters_digest({'results':resultsDigests[setName], 'loads':loadsDigest, 'display':figure.getDisplayParameters(outputStyle)})
+                digests[figure.fileName]= digest
+                if((digest is not None) and (previousDigests.get(figure.fileName, None)==digest) and os.path.exists(figure.fileName)):
+                    numSkipped+= 1
+                else:
+                    figure.render(outputHandler)
+                    numRendered+= 1
+        return digests, numRendered, numSkipped, numFailed
+
+    def render(self, numProcesses= 1):
+        ''' Render the figures that have changed since the last build.
+            Return the number of figures rendered.
+
+        :param numProcesses: number of worker processes (the load cases are
+                             distributed among them).
+        '''
+        previousDigests= self.readManifest()
+        loadCases= list(self.getLoadCases().items())
+        digests= dict(previousDigests)
+        numRendered= 0
+        numSkipped= 0
+        numFailed= 0
+        if((numProcesses>1) and (len(loadCases)>1) and pc.forkIsAvailable()):
+            tmpDir= tempfile.mkdtemp(prefix= 'xc_batch_rendering_')
+            def worker(workerId, chunk):
+                retval= self.renderLoadCases(chunk, previousDigests)
+                with open(os.path.join(tmpDir, str(workerId)+'.json'), 'w') as f:
+                    json.dump(retval, f)
+            chunks, exitCodes= pc.runForked(worker, loadCases, numProcesses)
+            for workerId, exitCode in enumerate(exitCodes):
+                workerFileName= os.path.join(tmpDir, str(workerId)+'.json')
+                if((exitCode==0) and os.path.exists(workerFileName)):
+                    with open(workerFileName, 'r') as f:
+                        workerDigests, workerRendered, workerSkipped, workerFailed= json.load(f)
+                    digests.update(workerDigests)
+                    numRendered+= workerRendered
+                    numSkipped+= workerSkipped
+                    numFailed+= workerFailed
+                else:
+                    className= type(self).__name__
+                    methodName= sys._getframe(0).f_code.co_name
+                    lmsg.error(className+'.'+methodName+'; worker '+str(workerId)+' failed (exit code: '+str(exitCode)+').')
+                    for key, figures in chunks[workerId]:
+                        numFailed+= len(figures)
+                        for figure in figures: # render them again next time.
+                            digests.pop(figure.fileName, None)
+            shutil.rmtree(tmpDir, ignore_errors= True)
+        else:
+            workerDigests, numRendered, numSkipped, numFailed= self.renderLoadCases(loadCases, previousDigests)
+            digests.update(workerDigests)
+        self.writeManifest(digests)
+        self.statistics= {'numFigures':len(self.figures), 'numRendered':numRendered, 'numSkipped':numSkipped, 'numFailed':numFailed}
+        return numRendered
@@ -10,13 +10,97 @@ __license__= "GPL"
 __version__= "3.0"
 __email__= "l.pereztato@gmail.com"
 
+import numpy
+from collections import defaultdict
 from materials.sections import internal_forces
 from misc_utils import log_messages as lmsg
 from model import model_inquiry
 
+# Extended properties of the bar elements (chiLT: lateral buckling
+# reduction factor, chiN: axial load reduction factor, FcE and FbE:
+# AWC NDS-2018 critical buckling design values for compression and
+# bending).
+extendedPropertyNames= ['chiLT', 'chiN', 'FcE', 'FbE']
+
+def getElementGroup(elementType):
+    '''Return the name of the group used to extract the internal forces
+       of the elements of the given type ('Shell', 'Beam2d', 'Beam', 
+       'Truss' or 'ZeroLength'; None if the type is unknown).
+
+    :param elementType: element type (returned by the type() method of
+                        the element).
+    '''
+    retval= None
+    for groupName in ['Shell', 'Beam2d', 'Beam', 'Truss', 'ZeroLength']:
+        if(groupName in elementType):
+            retval= groupName
+            break
+    return retval
+
+def getElementGroups(elems):
+    '''Return a dictionary containing the elements of each group (see
+       getElementGroup) and a dictionary with the type of each element.
+
+    :param elems: element set.
+    '''
+    groups= defaultdict(list)
+    elementTypes= dict()
+    for e in elems:
+        elementType= e.type()
+        elementTypes[e.tag]= elementType
+        groups[getElementGroup(elementType)].append(e)
+    return groups, elementTypes
+
+def getShellInternalForcesArray(elements):
+    '''Return an array containing the average internal forces of each
+       shell element (one row for each element whose columns are those of 
+       internal_forces.shellInternalForcesComponents). If the element has
+       the property 'theta' the internal forces are referred to the
+       system rotated that angle (see 
+       ShellMaterialInternalForces.setFromAverageInShellElement).
+
+    :param elements: shell elements.
+    '''
+    retval= numpy.zeros((len(elements), 8))
+    theta= numpy.zeros(len(elements))
+    rotated= numpy.zeros(len(elements), dtype= bool)
+    for i, e in enumerate(elements):
+        e.getResistingForce()
+        getMeanGeneralizedStress= e.physicalProperties.getMeanGeneralizedStressByName
+        retval[i]= [getMeanGeneralizedStress(name) for name in internal_forces.shellInternalForcesComponents]
+        if(e.hasProp('theta')):
+            theta[i]= e.getProp('theta')
+            rotated[i]= True
+    if(rotated.any()):
+        retval[rotated]= internal_forces.transformShellInternalForcesArray(retval[rotated], theta[rotated])
+    return retval
+
+def getBarInternalForcesArray(elements, components):
+    '''Return an array of shape (number of elements, 2, number of
+       components) containing the values of the given components at the 
+       origin and at the end of each element (zero if the component is 
+       not defined for the element).
+
+    :param elements: bar elements (beams, trusses,...).
+    :param components: names of the components (i.e. ['N', 'My', 'Mz']).
+    '''
+    retval= numpy.zeros((len(elements), 2, len(components)))
+    for i, e in enumerate(elements):
+        e.getResistingForce()
+        for j, c in enumerate(components):
+            nValues= e.getValuesAtNodes(c, False)
+            if(len(nValues)>0):
+                retval[i,0,j]= nValues[0]
+                retval[i,1,j]= nValues[1]
+    return retval
+
 def getInternalForcesDict(nmbComb, elems, vonMisesStressId= 'max_von_mises_stress', woodArmerAlsoForAxialForces= False):
     '''Creates a dictionary with the element's internal forces.
 
+       The elements are grouped by type and the internal forces of each 
+       group are obtained in a single pass and processed as NumPy arrays
+       (i.e. the Wood-Armer internal forces of the shell elements).
+
     :param nmbComb: combination name.
     :param elems: element set.
     :param vonMisesStressId: identifier of the Von Mises stress to read
@@ -33,35 +117,39 @@ def getInternalForcesDict(nmbComb, elems, vonMisesStressId= 'max_von_mises_stres
 
         :param element: element to get the properties from.
         '''
-        chiLT= None
-        if e.hasProp('chiLT'): # lateral buckling reduction factor.
-            chiLT= e.getProp('chiLT')
-        chiN= None
-        if e.hasProp('chiN'): # axial load reduction reduction factor.
-            chiN= e.getProp('chiN')
-        FcE= None
-        if e.hasProp('FcE'): # AWC NDS-2018 critical buckling design values for compression.
-            FcE= e.getProp('FcE')
-        FbE= None
-        if e.hasProp('FbE'): # AWC NDS-2018 critical buckling design value for bending.
-            FbE= e.getProp('FbE')
-        return chiLT, chiN, FcE, FbE
+        retval= dict()
+        for extProp in extendedPropertyNames:
+            if element.hasProp(extProp):
+                retval[extProp]= element.getProp(extProp)
+        return retval
+
+    def getSectionsDict(values, components):
+        '''Return the dictionaries of the internal forces of each section
+           of an element.
+
+        :param values: rows of internal forces (one for each section).
+        :param components: names of the columns.
+        '''
+        retval= dict()
+        for i, row in enumerate(values):
+            retval[i]= dict(zip(components, row))
+        return retval
            
     combInternalForcesDict= dict()
     outDict= dict()
     combInternalForcesDict[nmbComb]= outDict
-    for e in elems:
-        elemDict= dict()
-        outDict[e.tag]= elemDict
-        elementType= e.type()
-        elemDict['type']= elementType
-        if('Shell' in elementType):
-            internalForces= internal_forces.ShellMaterialInternalForces()
-            internalForces.setFromAverageInShellElement(e)
-            internalForces= internalForces.getWoodArmer(alsoForAxialForces= woodArmerAlsoForAxialForces)
+    groups, elementTypes= getElementGroups(elems)
+    # Keep the order of the elements in the set.
+    for eTag in elementTypes:
+        outDict[eTag]= {'type': elementTypes[eTag]}
+    components= internal_forces.crossSectionInternalForcesComponents
+    shellElements= groups.get('Shell', list())
+    if(shellElements):
+        woodArmer= internal_forces.getWoodArmerArray(getShellInternalForcesArray(shellElements), alsoForAxialForces= woodArmerAlsoForAxialForces).tolist()
+        for e, values in zip(shellElements, woodArmer):
+            internalForcesDict= getSectionsDict(values, components)
             # Silently ask about maximum Von-Mises stress.
             maxVonMisesAtNodes= e.getValuesAtNodes(vonMisesStressId, True)
-            avgMaxVM= None
             if(len(maxVonMisesAtNodes)>1): # vonMisesStressId found.
                 avgMaxVM= 0.0
                 avgMaxVM+= maxVonMisesAtNodes[0][0] # at node 1
@@ -69,91 +157,55 @@ def getInternalForcesDict(nmbComb, elems, vonMisesStressId= 'max_von_mises_stres
                 avgMaxVM+= maxVonMisesAtNodes[2][0] # at node 3
                 avgMaxVM+= maxVonMisesAtNodes[3][0] # at node 4
                 avgMaxVM/= 4.0 # average of the max. value at nodes.
-            sz= len(internalForces)
-            internalForcesDict= dict()
-            for i in range(0,sz):
-                force= internalForces[i]
-                internalForcesDict[i]= force.getDict()
                 if(avgMaxVM):
-                    internalForcesDict[i].update({vonMisesStressId:avgMaxVM})
-            elemDict['internalForces']= internalForcesDict
-        elif('Beam2d' in elementType):
-            e.getResistingForce()
-            internalForcesDict= dict()
-            # Internal forces of the bar. 
-            [[N1, M1, V1], [N2, M2, V2]]= model_inquiry.getValuesAtNodes(e, ['N', 'M', 'V'], False)
-            internalForces= internal_forces.CrossSectionInternalForces(N1,V1,0.0,0.0,0.0,M1) 
-            internalForcesDict[0]= internalForces.getDict()
-            internalForces= internal_forces.CrossSectionInternalForces(N2,V2,0.0,0.0,0.0,M2) # Internal forces at the end of the bar.
-            internalForcesDict[1]= internalForces.getDict()
-            chiLT, chiN, FcE, FbE = getExtendedProperties(e)
-            if(chiLT): # lateral buckling reduction factor.
-                internalForcesDict[0]['chiLT']= chiLT
-                internalForcesDict[1]['chiLT']= chiLT
-            if(chiN): # axial load reduction reduction factor.
-                internalForcesDict[0]['chiN']= chiN
-                internalForcesDict[1]['chiN']= chiN
-            if(FcE!=None): # AWC NDS 2018 critical buckling design values for compression.
-                internalForcesDict[0]['FcE']= FcE
-                internalForcesDict[1]['FcE']= FcE
-            if(FbE!=None): # AWC NDS 2018 critical buckling design values for bending.
-                internalForcesDict[0]['FbE']= FbE
-                internalForcesDict[1]['FbE']= FbE
-            elemDict['internalForces']= internalForcesDict
-        elif('Beam' in elementType):
-            e.getResistingForce()
-            internalForcesDict= dict()
-            [[N1, My1, Mz1, Vy1, Vz1, T1], [N2, My2, Mz2, Vy2, Vz2, T2]]= model_inquiry.getValuesAtNodes(e, ['N', 'My', 'Mz', 'Vy', 'Vz', 'T'], False)
-            internalForces= internal_forces.CrossSectionInternalForces(N1,Vy1,Vz1,T1,My1,Mz1) # Internal forces at the origin of the bar.
-            internalForcesDict[0]= internalForces.getDict()
-            internalForces= internal_forces.CrossSectionInternalForces(N2,Vy2,Vz2,T2,My2,Mz2) # Internal forces at the end of the bar.
-            internalForcesDict[1]= internalForces.getDict()
-            chiLT, chiN, FcE, FbE= getExtendedProperties(e)
-            if(chiLT): # ateral buckling reduction factor.
-                internalForcesDict[0]['chiLT']= chiLT
-                internalForcesDict[1]['chiLT']= chiLT
-            if(chiN): # axial load reduction reduction factor.
-                internalForcesDict[0]['chiN']= chiN
-                internalForcesDict[1]['chiN']= chiN
-            if(FcE!=None): # AWC NDS 2018 critical buckling design values for compression.
-                internalForcesDict[0]['FcE']= FcE
-                internalForcesDict[1]['FcE']= FcE
-            if(FbE!=None): # AWC NDS 2018 critical buckling design values for bending.
-                internalForcesDict[0]['FbE']= FbE
-                internalForcesDict[1]['FbE']= FbE
-            elemDict['internalForces']= internalForcesDict
-        elif('Truss' in elementType):
-            e.getResistingForce()
-            internalForcesDict= dict()
-            [[N1], [N2]]= model_inquiry.getValuesAtNodes(e,['N'], False)
-            internalForces= internal_forces.CrossSectionInternalForces(N1) # Internal forces at the origin of the bar.
-            internalForcesDict[0]= internalForces.getDict()
-            for extProp in ['chiLT', 'chiN', 'FcE', 'FbE']: # Origin extended properties.
-                if e.hasProp(extProp):
-                    internalForcesDict[0][extProp]= e.getProp(extProp)
-            internalForces= internal_forces.CrossSectionInternalForces(N2) # Internal forces at the end of the bar.
-            internalForcesDict[1]= internalForces.getDict()
-            for extProp in ['chiLT', 'chiN', 'FcE', 'FbE']: # End extended properties.
-                if e.hasProp(extProp):
-                    internalForcesDict[1][extProp]= e.getProp(extProp)
-            elemDict['internalForces']= internalForcesDict
-        elif('ZeroLength' in elementType):
-            e.getResistingForce()
-            F= e.getValuesAtNodes("stress", False)
-            internalForcesDict= dict()
-            nDOFs= len(F[0]) # Number of degrees of freedom.
-            if(nDOFs!= 6):
-                lmsg.warning('exportInternalForces for '+str(nDOFs)+ " DOFs in element type: '"+elementType+"' not implemented.")
-            else:
-                F0= F[0]
-                internalForces= internal_forces.CrossSectionInternalForces(N= F0[0],Vy= F0[1], Vz= F0[2],T= F0[3],My= F0[4], Mz= F0[5]) # Internal forces at the origin node.
-                internalForcesDict[0]= internalForces.getDict()
-                F1= F[1]
-                internalForces= internal_forces.CrossSectionInternalForces(N= F1[0],Vy= F1[1], Vz= F1[2],T= F1[3],My= F1[4], Mz= F1[5]) # Internal forces at the end node.
-                internalForcesDict[1]= internalForces.getDict()
-            elemDict['internalForces']= internalForcesDict
+                    for sectionDict in internalForcesDict.values():
+                        sectionDict[vonMisesStressId]= avgMaxVM
+            outDict[e.tag]['internalForces']= internalForcesDict
+    beam2dElements= groups.get('Beam2d', list())
+    if(beam2dElements):
+        values= getBarInternalForcesArray(beam2dElements, ['N', 'V', 'M'])
+        forces= numpy.zeros((len(beam2dElements), 2, 6))
+        forces[:,:,0]= values[:,:,0] # N
+        forces[:,:,1]= values[:,:,1] # Vy
+        forces[:,:,5]= values[:,:,2] # Mz
+        for e, values in zip(beam2dElements, forces.tolist()):
+            outDict[e.tag]['internalForces']= getSectionsDict(values, components)
+    beamElements= groups.get('Beam', list())
+    if(beamElements):
+        forces= getBarInternalForcesArray(beamElements, components)
+        for e, values in zip(beamElements, forces.tolist()):
+            outDict[e.tag]['internalForces']= getSectionsDict(values, components)
+    # Extended properties of the beams.
+    for e in beam2dElements+beamElements:
+        # Reduction factors only if not zero, critical buckling design
+        # values only if not None.
+        extendedProperties= {key:value for key, value in getExtendedProperties(e).items() if (value if key in ['chiLT', 'chiN'] else (value is not None))}
+        if(extendedProperties):
+            for sectionDict in outDict[e.tag]['internalForces'].values():
+                sectionDict.update(extendedProperties)
+    trussElements= groups.get('Truss', list())
+    if(trussElements):
+        forces= numpy.zeros((len(trussElements), 2, 6))
+        forces[:,:,0:1]= getBarInternalForcesArray(trussElements, ['N'])
+        for e, values in zip(trussElements, forces.tolist()):
+            internalForcesDict= getSectionsDict(values, components)
+            extendedProperties= getExtendedProperties(e)
+            if(extendedProperties):
+                for sectionDict in internalForcesDict.values():
+                    sectionDict.update(extendedProperties)
+            outDict[e.tag]['internalForces']= internalForcesDict
+    for e in groups.get('ZeroLength', list()):
+        e.getResistingForce()
+        F= e.getValuesAtNodes("stress", False)
+        internalForcesDict= dict()
+        nDOFs= len(F[0]) # Number of degrees of freedom.
+        if(nDOFs!= 6):
+            lmsg.warning('exportInternalForces for '+str(nDOFs)+ " DOFs in element type: '"+elementTypes[e.tag]+"' not implemented.")
         else:
-            lmsg.error("exportInternalForces error; element type: '"+elementType+"' unknown.")
+            internalForcesDict= getSectionsDict([[F[0][j] for j in range(0,6)], [F[1][j] for j in range(0,6)]], components)
+        outDict[e.tag]['internalForces']= internalForcesDict
+    for e in groups.get(None, list()):
+        lmsg.error("exportInternalForces error; element type: '"+elementTypes[e.tag]+"' unknown.")
     return combInternalForcesDict
 
 def exportInternalForces(nmbComb, elems, fDesc, woodArmerAlsoForAxialForces= False):
@@ -15,6 +15,7 @@ from model import predefined_spaces
 ## Graphics.
 from postprocess.xcVtk import vtk_graphic_base
 from postprocess import output_handler
+from postprocess.reports import batch_rendering
 from misc_utils import log_messages as lmsg
 
 class OuputUnits(object):
@@ -422,6 +423,46 @@ class LoadCaseDispParameters(RecordDisp):
                 output_handler.insertGrInTex(texFile=texFile,grFileNm=rltvgrfname,grWdt=cfg.grWidth,capText=capt)
         texFile.write('\\cleardoublepage\n')
         
+    def addSimpleLoadCaseFigures(self, figureBatch, texFile, cfg):
+        '''Declare the graphics files of displacements and internal forces 
+         calculated for a simple load case (the same that
+         writeSimpleLoadCaseReport creates) in the figure batch argument
+         and insert them in a LaTex file. The figures are written when the
+         render method of the batch is called.
+
+        :param figureBatch: batch of figures to render (see
+                            batch_rendering.FigureBatch).
+        :param texFile:    laTex file where to include the graphics 
+                           (e.g.:'text/report_loads.tex')
+        :param cfg:        instance of EnvConfig class with config parameters
+        '''
+        fullPath= cfg.projectDirTree.getReportSimplLCGrPath()
+        cfg.makedirs(fullPath) # Create directory if needed.
+        rltvPath= cfg.projectDirTree.getRltvReportSimplLCGrPath()
+        figures= list()
+        #Displacements and rotations displays
+        for st in self.setsToDispDspRot:
+            for arg in self.listDspRot:
+                unitConversionFactor, unDesc= cfg.getUnitParameters(arg)
+                capt= self.getCaptionText(setDescr= st.description, captTexts= cfg.capTexts[arg], unitsDescr= unDesc)
+                figures.append(('dispRot', st, arg, dict(), capt))
+        #Internal forces displays on sets of «shell» elements
+        for st in self.setsToDispIntForc:
+            for arg in self.listIntForc:
+                capt= self.getCaptionText(setDescr= st.description, captTexts= cfg.capTexts[arg], unitsDescr= cfg.getForceUnitsDescription())
+                figures.append(('intForc', st, arg, dict(), capt))
+        #Internal forces displays on sets of «beam» elements
+        for st in self.setsToDispBeamIntForc:
+            for arg in self.listBeamIntForc:
+                capt= self.getCaptionText(setDescr= st.description, captTexts= cfg.capTexts[arg], unitsDescr= cfg.getForceUnitsDescription())
+                figures.append(('beamIntForc', st, arg, {'orientScbar':1, 'titleScbar':None}, capt))
+        for kind, st, arg, parameters, capt in figures:
+            grFileName= fullPath+self.loadCaseName+st.name+arg+'.png'
+            rltvgrfname= rltvPath+self.loadCaseName+st.name+arg
+            figureBatch.addFigure(kind= kind, loadCaseName= self.loadCaseName, loadCaseExpr= self.loadCaseExpr, xcSet= st, fileName= grFileName, itemToDisp= arg, parameters= parameters)
+            output_handler.insertGrInTex(texFile=texFile,grFileNm=rltvgrfname,grWdt=cfg.grWidth,capText=capt)
+        texFile.write('\\cleardoublepage\n')
+        
     def simplLCReports(self,FEproblem,texFile,cfg):
         '''Creates the graphics files of displacements and internal forces 
          calculated for a simple load case and insert them in a LaTex file
@@ -437,6 +478,35 @@ class LoadCaseDispParameters(RecordDisp):
         self.writeSimpleLoadCaseReport(modelSpace, texFile,cfg)
 
 
+def write_simple_load_case_reports(modelSpace, loadCasesDispParameters, texFile, cfg, numProcesses= 1, skipUnchanged= True):
+    '''Creates the graphics files of displacements and internal forces 
+     calculated for each of the load cases and insert them in a LaTex
+     file. All the figures are rendered off-screen in a single batch (see
+     batch_rendering module); return the batch to give access to its
+     statistics.
+
+    :param modelSpace: model space object (see predefined_spaces.py).
+    :param loadCasesDispParameters: list of LoadCaseDispParameters objects.
+    :param texFile:    laTex file where to include the graphics 
+                       (e.g.:'text/report_loads.tex')
+    :param cfg:        instance of EnvConfig class with config parameters
+    :param numProcesses: number of worker processes used to render the
+                         figures.
+    :param skipUnchanged: if true, don't render again the figures whose
+                          results and display parameters have not changed
+                          since the last build.
+    '''
+    manifestFileName= None
+    if(skipUnchanged):
+        fullPath= cfg.projectDirTree.getReportSimplLCGrPath()
+        cfg.makedirs(fullPath) # Create directory if needed.
+        manifestFileName= fullPath+'figure_digests.json'
+    retval= batch_rendering.FigureBatch(modelSpace, manifestFileName= manifestFileName)
+    for lcParameters in loadCasesDispParameters:
+        lcParameters.addSimpleLoadCaseFigures(retval, texFile, cfg)
+    retval.render(numProcesses= numProcesses)
+    return retval
+
 def getLabelText(caption):
     ''' Return the text to label the figures removing
         spaces and strange chars from the input.'''
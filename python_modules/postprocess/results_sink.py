@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+''' Incremental writing of the results (internal forces, reactions and
+    displacements) obtained for each load combination. The results of
+    each combination are written to disk as soon as they are computed,
+    so the memory needed does not depend on the number of combinations.
+    From time to time a checkpoint is written, so an interrupted
+    computation can be resumed without solving again the combinations
+    already written.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022,LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import sys
+import json
+import shutil
+from postprocess import internal_forces_store as ifs
+from misc_utils import log_messages as lmsg
+
+class JSONDictWriter(object):
+    ''' Write a dictionary into a JSON file entry by entry.
+
+    :ivar fileName: name of the output file.
+    :ivar bufferSize: size of the output buffer.
+    '''
+    def __init__(self, fileName, bufferSize= 1<<16):
+        ''' Constructor.
+
+        :param fileName: name of the output file.
+        :param bufferSize: size of the output buffer.
+        '''
+        self.fileName= fileName
+        self.bufferSize= bufferSize
+        self.outputFile= None
+        self.numEntries= 0
+
+    def open(self, offset= None, numEntries= 0):
+        ''' Open the output file.
+
+        :param offset: if not None, position where the last checkpoint was
+                       written (the contents written after it are
+                       discarded).
+        :param numEntries: number of entries already written before the
+                           offset.
+        '''
+        if(offset is None):
+            self.outputFile= open(self.fileName, 'wb', self.bufferSize)
+            self.outputFile.write(b'{')
+            self.numEntries= 0
+        else:
+            with open(self.fileName, 'r+b') as f:
+                f.truncate(offset)
+            self.outputFile= open(self.fileName, 'ab', self.bufferSize)
+            self.numEntries= numEntries
+
+    def write(self, dct):
+        ''' Write the entries of the dictionary argument.
+
+        :param dct: dictionary to write.
+        '''
+        for key in dct:
+            entry= json.dumps(str(key))+': '+json.dumps(dct[key])
+            if(self.numEntries>0):
+                entry= ', '+entry
+            self.outputFile.write(entry.encode('utf-8'))
+            self.numEntries+= 1
+
+    def flush(self):
+        ''' Flush the output buffer and return the current position in
+            the file.'''
+        self.outputFile.flush()
+        return self.outputFile.tell()
+
+    def close(self):
+        ''' Close the dictionary and the output file.'''
+        self.outputFile.write(b'}')
+        self.outputFile.close()
+        self.outputFile= None
+
+class ResultsSink(object):
+    ''' Write the results of each load combination as soon as they are
+        computed.
+
+    :ivar fNameIntForc: name of the internal forces file (or folder if
+                        the columnar storage is used).
+    :ivar fNameReactions: name of the reactions file.
+    :ivar fNameDispl: name of the displacements file.
+    :ivar checkpointFileName: name of the file where the checkpoint data
+                              is written (if None no checkpoints are
+                              written).
+    :ivar checkpointInterval: number of combinations written between two
+                              consecutive checkpoints.
+    :ivar columnarStorage: if true, store the internal forces in a
+                           columnar binary store (see
+                           internal_forces_store module).
+    :ivar bufferSize: size of the output buffers.
+    '''
+    def __init__(self, fNameIntForc, fNameReactions, fNameDispl, checkpointFileName= None, checkpointInterval= 10, columnarStorage= False, bufferSize= 1<<16):
+        ''' Constructor.
+
+        :param fNameIntForc: name of the internal forces file (or folder if
+                             the columnar storage is used).
+        :param fNameReactions: name of the reactions file.
+        :param fNameDispl: name of the displacements file.
+        :param checkpointFileName: name of the file where the checkpoint
+                                   data is written (if None no checkpoints
+                                   are written).
+        :param checkpointInterval: number of combinations written between
+                                   two consecutive checkpoints.
+        :param columnarStorage: if true, store the internal forces in a
+                                columnar binary store (see
+                                internal_forces_store module).
+        :param bufferSize: size of the output buffers.
+        '''
+        self.fNameIntForc= fNameIntForc
+        self.fNameReactions= fNameReactions
+        self.fNameDispl= fNameDispl
+        self.checkpointFileName= checkpointFileName
+        self.checkpointInterval= checkpointInterval
+        self.columnarStorage= columnarStorage
+        self.bufferSize= bufferSize
+        self.combNames= None
+        self.writtenCombinations= list()
+        self.internalForcesWriter= None
+        self.reactionsWriter= None
+        self.displacementsFile= None
+
+    def readCheckpoint(self, combNames):
+        ''' Return the checkpoint data if it exists and corresponds to the
+            given combinations, otherwise return None.
+
+        :param combNames: names of all the combinations to compute.
+        '''
+        retval= None
+        if(self.checkpointFileName and os.path.exists(self.checkpointFileName)):
+            with open(self.checkpointFileName) as json_file:
+                checkpoint= json.load(json_file)
+            if((checkpoint['combinations']==list(combNames)) and (checkpoint['columnarStorage']==self.columnarStorage)):
+                retval= checkpoint
+            else:
+                className= type(self).__name__
+                methodName= sys._getframe(0).f_code.co_name
+                lmsg.warning(className+'.'+methodName+"; checkpoint: '"+self.checkpointFileName+"' doesn't correspond to the current computation. Starting from scratch.")
+        return retval
+
+    def writeCheckpoint(self):
+        ''' Flush the output buffers and write the checkpoint data.'''
+        checkpoint= {'combinations': self.combNames, 'columnarStorage': self.columnarStorage, 'written': self.writtenCombinations}
+        if(self.columnarStorage):
+            if(self.internalForcesWriter): # created with the first combination.
+                self.internalForcesWriter.flush()
+            checkpoint['internalForcesOffset']= None
+        else:
+            checkpoint['internalForcesOffset']= self.internalForcesWriter.flush()
+        checkpoint['reactionsOffset']= self.reactionsWriter.flush()
+        self.displacementsFile.flush()
+        checkpoint['displacementsOffset']= self.displacementsFile.tell()
+        if(self.checkpointFileName):
+            tmpFileName= self.checkpointFileName+'.tmp'
+            with open(tmpFileName, 'w') as outfile:
+                json.dump(checkpoint, outfile)
+            os.replace(tmpFileName, self.checkpointFileName) # atomic.
+
+    def open(self, combNames, checkpoint= None):
+        ''' Open the output files and return the names of the combinations
+            already written.
+
+        :param combNames: names of all the combinations to compute.
+        :param checkpoint: checkpoint data to resume from (see
+                           readCheckpoint) if None start from scratch
+                           (the displacements file is supposed to contain
+                           only the header).
+        '''
+        self.combNames= list(combNames)
+        if(checkpoint):
+            self.writtenCombinations= list(checkpoint['written'])
+        else:
+            self.writtenCombinations= list()
+        numWritten= len(self.writtenCombinations)
+        # Internal forces.
+        if(self.columnarStorage):
+            if(checkpoint and ifs.isInternalForcesStore(self.fNameIntForc)):
+                store= ifs.InternalForcesStore(self.fNameIntForc)
+                self.internalForcesWriter= ifs.InternalForcesStoreWriter(path= self.fNameIntForc, combNames= store.combNames, elementTags= store.elementTags, elementTypes= store.elementTypes, numSections= store.numSections, components= store.components, resume= True)
+            else:
+                if(os.path.exists(self.fNameIntForc)):
+                    shutil.rmtree(self.fNameIntForc)
+                self.internalForcesWriter= None # created with the first combination.
+        else:
+            self.internalForcesWriter= JSONDictWriter(self.fNameIntForc, self.bufferSize)
+            offset= None
+            if(checkpoint):
+                offset= checkpoint['internalForcesOffset']
+            self.internalForcesWriter.open(offset, numWritten)
+        # Reactions.
+        self.reactionsWriter= JSONDictWriter(self.fNameReactions, self.bufferSize)
+        offset= None
+        if(checkpoint):
+            offset= checkpoint['reactionsOffset']
+        self.reactionsWriter.open(offset, numWritten)
+        # Displacements.
+        if(checkpoint):
+            with open(self.fNameDispl, 'r+b') as f:
+                f.truncate(checkpoint['displacementsOffset'])
+        self.displacementsFile= open(self.fNameDispl, 'ab', self.bufferSize)
+        return set(self.writtenCombinations)
+
+    def writeCombination(self, combName, internalForcesDict, reactionsDict, displacementLines):
+        ''' Write the results of a combination.
+
+        :param combName: name of the combination.
+        :param internalForcesDict: dictionary containing the internal forces
+                                   of the combination.
+        :param reactionsDict: dictionary containing the reactions of the
+                              combination.
+        :param displacementLines: lines to write in the displacements file.
+        '''
+        if(self.columnarStorage):
+            if(self.internalForcesWriter is None):
+                elementTags, elementTypes, numSections, components= ifs.getLayoutFromDict(internalForcesDict)
+                self.internalForcesWriter= ifs.InternalForcesStoreWriter(path= self.fNameIntForc, combNames= self.combNames, elementTags= elementTags, elementTypes= elementTypes, numSections= numSections, components= components)
+            self.internalForcesWriter.writeCombination(internalForcesDict)
+        else:
+            self.internalForcesWriter.write(internalForcesDict)
+        self.reactionsWriter.write(reactionsDict)
+        self.displacementsFile.write(''.join(displacementLines).encode('utf-8'))
+        self.writtenCombinations.append(combName)
+        if(self.checkpointFileName and (len(self.writtenCombinations)%self.checkpointInterval==0)):
+            self.writeCheckpoint()
+
+    def suspend(self):
+        ''' Write a checkpoint and close the output files without finishing
+            them, so the computation can be resumed later.'''
+        self.writeCheckpoint()
+        if(self.internalForcesWriter):
+            if(self.columnarStorage):
+                self.internalForcesWriter.close()
+            else:
+                self.internalForcesWriter.outputFile.close()
+        self.reactionsWriter.outputFile.close()
+        self.displacementsFile.close()
+
+    def close(self):
+        ''' Close the output files and remove the checkpoint data.'''
+        if(self.internalForcesWriter):
+            self.internalForcesWriter.close()
+        self.reactionsWriter.close()
+        self.displacementsFile.close()
+        if(self.checkpointFileName and os.path.exists(self.checkpointFileName)):
+            os.remove(self.checkpointFileName)
+
+class StoredResults(object):
+    ''' Read access to the results written by a ResultsSink, used to copy
+        the results of some of the combinations to a new sink (see the
+        incremental argument of LimitStateData.saveAll).
+
+    :ivar internalForcesStore: columnar internal forces store (None if the
+                               internal forces are stored in a JSON file).
+    :ivar internalForcesDict: internal forces read from the JSON file.
+    :ivar reactionsDict: reactions of each combination.
+    :ivar displacementLines: lines of the displacements file of each
+                             combination.
+    '''
+    def __init__(self, fNameIntForc, fNameReactions, fNameDispl):
+        ''' Constructor.
+
+        :param fNameIntForc: name of the internal forces file (or folder if
+                             the columnar storage is used).
+        :param fNameReactions: name of the reactions file.
+        :param fNameDispl: name of the displacements file.
+        '''
+        self.internalForcesStore= None
+        self.internalForcesDict= dict()
+        if(ifs.isInternalForcesStore(fNameIntForc)):
+            self.internalForcesStore= ifs.InternalForcesStore(fNameIntForc)
+        else:
+            with open(fNameIntForc) as json_file:
+                self.internalForcesDict= json.load(json_file)
+        with open(fNameReactions) as json_file:
+            self.reactionsDict= json.load(json_file)
+        self.displacementLines= dict()
+        with open(fNameDispl) as displ_file:
+            next(displ_file) # skip header.
+            for line in displ_file:
+                self.displacementLines.setdefault(line.split(',', 1)[0], list()).append(line)
+
+    def getCombinationNames(self):
+        ''' Return the names of the combinations whose results are
+            available.'''
+        if(self.internalForcesStore):
+            retval= set(self.internalForcesStore.combNames)
+        else:
+            retval= set(self.internalForcesDict.keys())
+        return retval.intersection(self.reactionsDict.keys())
+
+    def writeCombination(self, sink, combName):
+        ''' Write the stored results of the combination using the sink
+            argument.
+
+        :param sink: results sink.
+        :param combName: name of the combination.
+        '''
+        if(self.internalForcesStore):
+            internalForcesDict= self.internalForcesStore.getInternalForcesDict(combNames= [combName], stringKeys= True)
+        else:
+            internalForcesDict= {combName: self.internalForcesDict[combName]}
+        sink.writeCombination(combName, internalForcesDict, {combName: self.reactionsDict[combName]}, self.displacementLines.get(combName, list()))
+
+def getDisplacementLines(combName, nodes):
+    ''' Return the lines to write in the displacements file (see
+        LimitStateData.writeDisplacements) for the given combination.
+
+    :param combName: name of the combination.
+    :param nodes: nodes to write the displacements for.
+    '''
+    retval= list()
+    for n in nodes:
+        strDisp= str(n.getDisp).rstrip().replace(' ',', ') #displacement vector [ux,uy,uz,rotx,roty,rotz]
+        retval.append(combName+", "+str(n.tag)+", " + strDisp+'\n')
+    return retval
@@ -20,6 +20,7 @@ from postprocess.xcVtk import vtk_graphic_base
 from postprocess.xcVtk.fields import fields
 from postprocess.xcVtk.fields import local_axes_vector_field as lavf
 from postprocess.xcVtk.CAD_model import create_array_set_data
+from postprocess.xcVtk.FE_model import vtk_grid_cache
 import random as rd 
 import xc
 
@@ -105,16 +106,13 @@ class DisplaySettingsFE(vtk_graphic_base.DisplaySettings):
                           analysis has been carried out. 
                           Defaults to None: no modal analysis.
         '''
-        # Define grid
-        self.nodes= vtk.vtkPoints()
-        self.gridRecord.uGrid= vtk.vtkUnstructuredGrid()
-        self.gridRecord.uGrid.SetPoints(self.nodes)
+        # Define grid (the topology is computed once for each set, see
+        # vtk_grid_cache).
         eSet= self.gridRecord.xcSet
-        eSet.numerate()
-        self.gridRecord.uGrid.name= eSet.name+'_grid'
+        topology= vtk_grid_cache.get_grid_topology(eSet)
         # Scalar values.
         nodeSet= eSet.nodes
-        numNodes= len(nodeSet)
+        numNodes= topology.getNumberOfNodes()
         if(numNodes>0):
             if(field):
                 arr= field.fillArray(nodeSet)
@@ -122,35 +120,16 @@ class DisplaySettingsFE(vtk_graphic_base.DisplaySettings):
                     if(not arr):
                         AssertionError('Can\'t create the array.')
                 field.creaLookUpTable()      
-            # Load nodes in vtk
-            if eigenMode is None:
-                for n in nodeSet:
-                    pos= n.getCurrentPos3d(defFScale)
-                    self.nodes.InsertPoint(n.getIdx,pos.x,pos.y,pos.z)
-            else:
-                for n in nodeSet:
-                    pos= n.getEigenPos3d(defFScale,eigenMode)
-                    self.nodes.InsertPoint(n.getIdx,pos.x,pos.y,pos.z)
-             # Load elements in vtk
-            setElems= eSet.elements
-            for e in setElems:
-                vertices= xc_base.vector_int_to_py_list(e.getIdxNodes)
-                vtx= vtk.vtkIdList()
-                for vIndex in vertices:
-                    vtx.InsertNextId(vIndex)
-                if(e.getVtkCellType!= vtk.VTK_VERTEX):
-                    self.gridRecord.uGrid.InsertNextCell(e.getVtkCellType,vtx)
-            setConstraints= eSet.getConstraints
-            for c in setConstraints:
-                if(hasattr(c,'getIdxNodes')):
-                    vertices= xc_base.vector_int_to_py_list(c.getIdxNodes)
-                    vtx= vtk.vtkIdList()
-                    for vIndex in vertices:
-                        vtx.InsertNextId(vIndex)
-                    if(c.getVtkCellType!= vtk.VTK_VERTEX):
-                        self.gridRecord.uGrid.InsertNextCell(c.getVtkCellType,vtx)
+            # Load nodes and elements in vtk.
+            self.nodes= topology.getPoints(defFScale= defFScale, eigenMode= eigenMode)
+            self.gridRecord.uGrid= topology.getGrid(self.nodes)
+            self.gridRecord.uGrid.name= eSet.name+'_grid'
             return True
         else:
+            self.nodes= vtk.vtkPoints()
+            self.gridRecord.uGrid= vtk.vtkUnstructuredGrid()
+            self.gridRecord.uGrid.SetPoints(self.nodes)
+            self.gridRecord.uGrid.name= eSet.name+'_grid'
             className= type(self).__name__
             methodName= sys._getframe(0).f_code.co_name
             lmsg.warning(className+'.'+methodName+"; error when drawing set: '"+eSet.name+"', it has no nodes so I can't get set geometry (use fillDownwards?)")
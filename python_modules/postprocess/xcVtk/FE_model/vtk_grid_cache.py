@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+''' Cached topology of the VTK unstructured grids used to display the
+    finite element mesh of a set.
+
+    The cells (element and constraint connectivity) and the initial
+    positions of the nodes of a set are extracted once and stored in
+    numpy arrays wrapped as VTK arrays (see vtk.util.numpy_support). The
+    figures of the same set (i.e. the different fields and combinations
+    of a report) share them, so only the point coordinates (deformed
+    shape) and the scalar arrays are computed again for each figure.
+
+    The topology is attached to the set as a property (see
+    get_grid_topology). It is rebuilt when the number of nodes, elements
+    or constraints of the set or the geometry revision changes (see
+    model.sets.spatial_index.notify_geometry_change).'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import numpy as np
+import vtk
+from vtk.util import numpy_support
+import xc_base
+from model.sets import spatial_index
+
+gridTopologyPropName= 'vtkGridTopology'
+
+class GridTopology(object):
+    ''' Topology and reference coordinates of the VTK grid of a set.
+
+    :ivar xcSet: set to display.
+    :ivar nodes: nodes of the set (in the order of their VTK indexes).
+    :ivar referencePositions: initial positions of the nodes (one row for
+                              each node).
+    :ivar cellTypes: VTK cell types (vtkUnsignedCharArray).
+    :ivar cells: VTK cell connectivity (vtkCellArray).
+    :ivar key: numbers of nodes, elements and constraints of the set and
+               geometry revision when the topology was computed.
+    '''
+    def __init__(self, xcSet):
+        ''' Constructor.
+
+        :param xcSet: set to display.
+        '''
+        self.xcSet= xcSet
+        self.invalidate()
+
+    def invalidate(self):
+        ''' Discard the stored topology.'''
+        self.nodes= list()
+        self.referencePositions= np.zeros((0,3))
+        self.cellTypes= None
+        self.cells= None
+        self.key= None
+
+    def getKey(self):
+        ''' Return the numbers of nodes, elements and constraints of the set
+            and the current geometry revision.'''
+        return (len(self.xcSet.nodes), len(self.xcSet.elements), len(self.xcSet.getConstraints), spatial_index.geometryRevision)
+
+    def update(self):
+        ''' Number the nodes of the set (VTK indexes) and compute the
+            topology again if the set has changed.'''
+        self.xcSet.numerate()
+        key= self.getKey()
+        if(key!=self.key):
+            self.compute()
+            self.key= key
+
+    def compute(self):
+        ''' Extract the node positions and the cells of the set.'''
+        nodeSet= self.xcSet.nodes
+        self.nodes= [None]*len(nodeSet)
+        positions= np.zeros((len(nodeSet),3))
+        for n in nodeSet:
+            idx= n.getIdx
+            pos= n.getInitialPos3d
+            self.nodes[idx]= n
+            positions[idx]= [pos.x, pos.y, pos.z]
+        self.referencePositions= positions
+        # Cells in the legacy VTK format [n, id0, id1,..., n, id0,...].
+        cellTypes= list()
+        connectivity= list()
+        for e in self.xcSet.elements:
+            cellType= e.getVtkCellType
+            if(cellType!= vtk.VTK_VERTEX):
+                vertices= xc_base.vector_int_to_py_list(e.getIdxNodes)
+                cellTypes.append(cellType)
+                connectivity.append(len(vertices))
+                connectivity.extend(vertices)
+        for c in self.xcSet.getConstraints:
+            if(hasattr(c,'getIdxNodes')):
+                cellType= c.getVtkCellType
+                if(cellType!= vtk.VTK_VERTEX):
+                    vertices= xc_base.vector_int_to_py_list(c.getIdxNodes)
+                    cellTypes.append(cellType)
+                    connectivity.append(len(vertices))
+                    connectivity.extend(vertices)
+        self.cells= vtk.vtkCellArray()
+        if(cellTypes):
+            self.cellTypes= numpy_support.numpy_to_vtk(np.array(cellTypes, dtype= np.uint8), deep= True, array_type= vtk.VTK_UNSIGNED_CHAR)
+            self.cells.SetCells(len(cellTypes), numpy_support.numpy_to_vtkIdTypeArray(np.array(connectivity, dtype= numpy_support.ID_TYPE_CODE), deep= True))
+        else:
+            self.cellTypes= vtk.vtkUnsignedCharArray()
+
+    def getNumberOfNodes(self):
+        ''' Return the number of nodes of the grid.'''
+        return len(self.nodes)
+
+    def getPositions(self, defFScale= 0.0, eigenMode= None):
+        ''' Return the positions of the nodes to display (one row for each
+            node).
+
+        :param defFScale: factor to apply to current displacement of nodes
+                  so that the display position of each node equals to
+                  the initial position plus its displacement multiplied
+                  by this factor. In case of modal analysis, the displayed
+                  position of each node equals to the initial position plus
+                  its eigenVector multiplied by this factor.
+        :param eigenMode: eigenvibration mode if we want to display the
+                          deformed shape associated with it.
+        '''
+        retval= self.referencePositions
+        if(eigenMode is not None):
+            retval= np.array([[p.x, p.y, p.z] for p in [n.getEigenPos3d(defFScale,eigenMode) for n in self.nodes]], dtype= float).reshape(-1,3)
+        elif(defFScale!=0.0):
+            retval= np.array([[p.x, p.y, p.z] for p in [n.getCurrentPos3d(defFScale) for n in self.nodes]], dtype= float).reshape(-1,3)
+        return retval
+
+    def getPoints(self, defFScale= 0.0, eigenMode= None):
+        ''' Return the VTK points of the grid.
+
+        :param defFScale: factor to apply to current displacement of nodes.
+        :param eigenMode: eigenvibration mode if we want to display the
+                          deformed shape associated with it.
+        '''
+        retval= vtk.vtkPoints()
+        retval.SetData(numpy_support.numpy_to_vtk(np.ascontiguousarray(self.getPositions(defFScale, eigenMode)), deep= True))
+        return retval
+
+    def getGrid(self, points):
+        ''' Return a new unstructured grid with the given points that shares
+            the cells of this topology.
+
+        :param points: VTK points of the grid (see getPoints).
+        '''
+        retval= vtk.vtkUnstructuredGrid()
+        retval.SetPoints(points)
+        retval.SetCells(self.cellTypes, self.cells)
+        return retval
+
+def get_grid_topology(xcSet):
+    ''' Return the grid topology attached to the set (it is created if it
+        doesn't exist yet) updated with the current state of the set.
+
+    :param xcSet: set to display.
+    '''
+    retval= None
+    if(xcSet.hasProp(gridTopologyPropName)):
+        retval= xcSet.getProp(gridTopologyPropName)
+    if(retval is None):
+        retval= GridTopology(xcSet)
+        xcSet.setProp(gridTopologyPropName, retval)
+    retval.update()
+    return retval
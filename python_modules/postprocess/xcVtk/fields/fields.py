@@ -11,7 +11,9 @@ __version__= "3.0"
 __email__= "l.pereztato@ciccp.es, ana.ortega@ciccp.es "
 
 
+import numpy as np
 import vtk
+from vtk.util import numpy_support
 from postprocess.xcVtk.fields import field_base as fb
 from postprocess import extrapolate_elem_attr
 from postprocess import control_vars as cv
@@ -49,37 +51,46 @@ class ScalarField(fb.FieldBase):
             self.rgMinMax= None
         self.arr= None
 
+    def getNodeValue(self, n):
+        ''' Return the value of the field at the node argument.
+
+        :param n: node.
+        '''
+        attr= getattr(n,self.attrName)
+        retval= None
+        if hasattr(attr,"__getitem__"):
+            retval= attr[self.attrComponent]
+        elif callable(attr):
+            if(attr.__name__!='getProp'):
+                retval= attr(self.name)
+            elif(n.hasProp(self.name)):
+                retval= attr(self.name)
+            else:
+                retval= 0.0
+        else:
+            retval= attr
+        if(hasattr(retval,"__getitem__")):
+            retval= retval[self.attrComponent]
+        return retval*self.fUnitConv
+
     def fillArray(self, nodeSet):
         '''Creates an vtkDoubleArray filled with the proper values.
 
+        :param nodeSet: nodes of the grid (numbered, see numerate).
         '''
-        # Scalar values.
-        self.arr= vtk.vtkDoubleArray()
-        self.arr.SetName(self.name)
-        self.arr.SetNumberOfTuples(len(nodeSet))
-        self.arr.SetNumberOfComponents(1)
+        # Scalar values (sorted by node index).
+        values= np.zeros(len(nodeSet))
         for n in nodeSet:
-            attr= getattr(n,self.attrName)
-            tmp= None
-            if hasattr(attr,"__getitem__"):
-                tmp= attr[self.attrComponent]
-            elif callable(attr):
-                if(attr.__name__!='getProp'):
-                    tmp= attr(self.name)
-                elif(n.hasProp(self.name)):
-                    tmp= attr(self.name)
-                else:
-                    tmp= 0.0
-            else:
-                tmp= attr
-            if(hasattr(tmp,"__getitem__")):
-                tmp= tmp[self.attrComponent]
-            tmp*= self.fUnitConv
+            values[n.getIdx]= self.getNodeValue(n)
+        if(len(values)>0):
             if not(self.rgMinMax):
-                self.updateMinMax(tmp)
+                self.updateMinMax(values.min())
+                self.updateMinMax(values.max())
             else:
-                self.updateMinMaxWithinRange(tmp,self.rgMinMax)
-            self.arr.SetTuple1(n.getIdx,tmp)
+                self.updateMinMaxWithinRange(values.min(),self.rgMinMax)
+                self.updateMinMaxWithinRange(values.max(),self.rgMinMax)
+        self.arr= numpy_support.numpy_to_vtk(values, deep= True, array_type= vtk.VTK_DOUBLE)
+        self.arr.SetName(self.name)
         return self.arr
 
     def setupOnGrid(self,uGrid):
@@ -52,7 +52,7 @@ print('path to libs: '+pth_to_libs)
 
 pth_to_steel_shape_data= pth_to_libs+'/materials/sections/structural_shapes/aux/'
 print('path to steel shape data: '+pth_to_steel_shape_data)
-steel_shape_data= ['materials/sections/structural_shapes/aux/arcelor_r_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_au_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_l_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_chs_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_rhs_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_he_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_hl_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_shs_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_ipe_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_uc_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_ub_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_ipn_profiles.json', 'materials/sections/structural_shapes/aux/arcelor_upn_profiles.json', 'materials/sections/structural_shapes/aux/bs_en_10210_hfshs_profiles.json', 'materials/sections/structural_shapes/aux/bs_en_10219_profiles.json', 'materials/sections/structural_shapes/aux/common_micropile_tubes.json']
+steel_shape_data= ['materials/sections/structural_shapes/aux/aisc_c_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_chss_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_hp_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_hss_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_l_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_m_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_mc_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_mt_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_pipe_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_s_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_st_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_twol_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_w_shapes.npy', 'materials/sections/structural_shapes/aux/aisc_wt_shapes.npy', 'materials/sections/structural_shapes/aux/arcelor_au_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_chs_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_he_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_hl_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_ipe_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_ipn_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_l_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_r_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_rhs_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_shs_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_ub_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_uc_profiles.npy', 'materials/sections/structural_shapes/aux/arcelor_upn_profiles.npy', 'materials/sections/structural_shapes/aux/bs_en_10210_hfshs_profiles.npy', 'materials/sections/structural_shapes/aux/bs_en_10219_profiles_cfchs.npy', 'materials/sections/structural_shapes/aux/bs_en_10219_profiles_cfshs.npy', 'materials/sections/structural_shapes/aux/bs_en_10219_profiles_rhs.npy', 'materials/sections/structural_shapes/aux/common_micropile_tubes_mp.npy']
 
 pth_to_awc_nds_section_data= pth_to_libs+'/materials/awc_nds/aux/'
 print('path to awc_nds shape data: '+pth_to_awc_nds_section_data)
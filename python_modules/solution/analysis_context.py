@@ -13,6 +13,9 @@ __license__= "GPL"
 __version__= "3.0"
 __email__= "l.pereztato@gmail.com, ana.ortega.ort@gmail.com"
 
+import os
+import shutil
+import tempfile
 from postprocess.reports import export_internal_forces as eif
 from postprocess.reports import export_reactions as er
 from colorama import Fore
@@ -39,6 +42,28 @@ class AnalysisContextBase(object):
                                during the preload phase (normally self weight 
                                and dead loads).
         :ivar silent: if true print only error messages.
+        :ivar reusePreloadStates: if true, the converged state of the model
+                                  after the preload phase is stored in a
+                                  database and restored (instead of solved
+                                  again) for the combinations that share
+                                  the same factors for the preload patterns.
+        :ivar preloadStatesDbType: type of the database used to store the
+                                   preloaded states.
+        :ivar preloadStatesDatabase: database used to store the preloaded
+                                     states (it replaces the database of
+                                     the problem, see
+                                     getPreloadStatesDatabase).
+        :ivar preloadStatesDirectory: temporary directory containing the
+                                      files of the preloaded states
+                                      database.
+        :ivar preloadStates: dictionary containing the identifier of the
+                             stored state for each set of preload factors.
+        :ivar preloadStateHits: number of preload phases that have been
+                                restored from the database.
+        :ivar preloadStateMisses: number of preload phases that have been
+                                  solved.
+        :ivar preloadStatesStored: number of preloaded states that have
+                                   been stored in the database.
     '''
     def __init__(self, modelSpace, calcSet, reactionNodeSet, reactionCheckTolerance, deactivationCandidates, silent= False):
         ''' Constructor.
@@ -59,6 +84,14 @@ class AnalysisContextBase(object):
         self.deactivationCandidates= deactivationCandidates
         self.preloadPatterns= None
         self.silent= silent
+        self.reusePreloadStates= False
+        self.preloadStatesDbType= 'BerkeleyDB'
+        self.preloadStatesDatabase= None
+        self.preloadStatesDirectory= None
+        self.preloadStates= dict()
+        self.preloadStateHits= 0
+        self.preloadStateMisses= 0
+        self.preloadStatesStored= 0
 
     def solutionStep(self, currentCombination, calculateNodalReactions= False, combinationActive= False):
         ''' Perform a solution step.
@@ -74,20 +107,93 @@ class AnalysisContextBase(object):
             exit(-1)
         return retval
 
+    def getPreloadKey(self, comb):
+        ''' Return the factors of the pre-load patterns in the combination
+            argument (the combinations with the same factors share the
+            same preloaded state).
+
+        :param comb: combination to analyze.
+        '''
+        retval= list()
+        for component in comb.getComponents('').split('+'):
+            factor, loadPatternName= component.split('*',1)
+            if(loadPatternName in self.preloadPatterns):
+                retval.append((loadPatternName, float(factor)))
+        return tuple(sorted(retval))
+
+    def getPreloadStatesDatabase(self):
+        ''' Return the database used to store the preloaded states
+            (create it if needed). The problem has only one database, so
+            the database previously defined by the user (if any, see
+            getNewDatabase in predefined_spaces) is replaced and closed;
+            define it again after the analysis if needed.'''
+        if(self.preloadStatesDatabase is None):
+            self.preloadStatesDirectory= tempfile.mkdtemp(prefix= 'xc_preload_states_')
+            fileName= os.path.join(self.preloadStatesDirectory, 'preload_states.db')
+            self.preloadStatesDatabase= self.modelSpace.getNewDatabase(fileName, dbType= self.preloadStatesDbType)
+        return self.preloadStatesDatabase
+
+    def clearPreloadStates(self):
+        ''' Discard the stored preloaded states and remove the files of
+            their database (it's called at the end of the analysis by
+            the calcInternalForces and calcDisplacements methods of the
+            derived classes; call it too when the model has changed).'''
+        self.preloadStates= dict()
+        self.preloadStatesDatabase= None
+        if(self.preloadStatesDirectory is not None):
+            shutil.rmtree(self.preloadStatesDirectory, ignore_errors= True)
+            self.preloadStatesDirectory= None
+        
     def preloadPhase(self, comb):
         ''' Introduces the pre-load patterns (usually self weight and dead
             load) and computes the corresponding solution.
 
+        If reusePreloadStates is true and the state corresponding to
+        the preload factors of the combination has been already computed,
+        the state is restored from the database instead of solving it
+        again.
+
         :param comb: combination to analyze.
         '''
         retval= 0
         if(self.preloadPatterns):
-            if(not self.silent): lmsg.log('preload phase for: '+comb.name)
-            comb.addToDomain(self.preloadPatterns) # Add the first part of the combination.
-            retval= self.solutionStep(currentCombination= comb)
+            preloadKey= None
+            if(self.reusePreloadStates):
+                preloadKey= self.getPreloadKey(comb)
+            if(preloadKey in self.preloadStates): # already computed.
+                if(not self.silent): lmsg.log('restoring preloaded state for: '+comb.name)
+                self.getPreloadStatesDatabase().restore(self.preloadStates[preloadKey])
+                # Make sure the first part of the combination is active (the
+                # patterns already in the domain are not added again).
+                comb.addToDomain(self.preloadPatterns)
+                self.preloadStateHits+= 1
+            else:
+                if(not self.silent): lmsg.log('preload phase for: '+comb.name)
+                comb.addToDomain(self.preloadPatterns) # Add the first part of the combination.
+                retval= self.solutionStep(currentCombination= comb)
+                if(preloadKey is not None):
+                    self.preloadStateMisses+= 1
+                    if(retval==0): # store the converged state.
+                        stateId= 100*(len(self.preloadStates)+1)
+                        self.getPreloadStatesDatabase().save(stateId)
+                        self.preloadStates[preloadKey]= stateId
+                        self.preloadStatesStored+= 1
         else:
             if(not self.silent): lmsg.warning('no pre-load patterns specified.')
         return retval
+
+    def getPreloadStatesStatistics(self):
+        ''' Return a dictionary containing the number of preloaded states
+            restored from the database (hits), the number of preload phases
+            solved (misses) and the number of stored states.'''
+        return {'hits':self.preloadStateHits, 'misses':self.preloadStateMisses, 'storedStates':self.preloadStatesStored}
+
+    def preloadStatesMessage(self):
+        ''' Writes a message with the statistics of the reuse of the
+            preloaded states.'''
+        if(self.reusePreloadStates and not self.silent):
+            stats= self.getPreloadStatesStatistics()
+            lmsg.log('preloaded states: '+str(stats['hits'])+' restored, '+str(stats['misses'])+' solved, '+str(stats['storedStates'])+' stored.')
     
     def loadPhase(self, comb):
         ''' Introduces the rest of the loads (in addition to the pre-load 
@@ -151,6 +257,7 @@ class AnalysisContextBase(object):
             lmsg.error('Analysis failed in the following combinations: '+str(self.failedCombinations))
         else:
             if(not self.silent): lmsg.log(Fore.GREEN+'Analysis for combinations for '+str(limitState.label)+': '+str(loadCombinations.getKeys())+' finished.\n'+Style.RESET_ALL)
+        self.preloadStatesMessage()
         
     def updateULSResults(self, comb, limitState):
         ''' Store internal forces and displacements.
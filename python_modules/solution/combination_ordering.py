@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+''' Ordering of the load combinations so each one of them can start
+    from the converged state of the previous one (warm start). The
+    combinations are sorted by a nearest-neighbour walk in the space of
+    the load pattern factors, starting from the combination closest to
+    the unloaded state. When the previous combination is farther than the
+    unloaded state, the combination starts from scratch.
+
+    The warm start is useful to reduce the number of iterations of the
+    non-linear solution procedures when the non-linearity doesn't depend
+    on the loading path (geometric non-linearity, non-linear elastic
+    materials, no-tension supports...). It must not be used with
+    path-dependent materials (plasticity, damage,...) because the results
+    for each combination would depend on the previous one.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022,LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import numpy
+from actions.load_combination_utils import utils
+
+def get_factor_matrix(combExprs):
+    ''' Return the names of the load patterns and a matrix containing
+        the factors of each load pattern (columns) in each combination
+        (rows).
+
+    :param combExprs: combination expressions (i.e. "1.35*G1+1.5*Q1").
+    '''
+    combFactors= [utils.getCombinationDict(expr) for expr in combExprs]
+    loadPatternNames= sorted(set().union(*combFactors))
+    columns= {name:j for j, name in enumerate(loadPatternNames)}
+    retval= numpy.zeros((len(combFactors), len(loadPatternNames)))
+    for i, factors in enumerate(combFactors):
+        for name, factor in factors.items():
+            retval[i, columns[name]]= factor
+    return loadPatternNames, retval
+
+def get_nearest_neighbour_order(factors):
+    ''' Return the order in which the combinations must be solved and,
+        for each of them, a flag that is true if it's worth to start
+        from the state of the previous one (its factors are closer to
+        them than to the unloaded state).
+
+    :param factors: matrix containing the factors of each load pattern
+                    (columns) in each combination (rows).
+    '''
+    factors= numpy.asarray(factors, dtype= float)
+    numCombs= len(factors)
+    order= list()
+    warmStart= list()
+    if(numCombs>0):
+        norms= numpy.linalg.norm(factors, axis= 1)
+        pending= numpy.ones(numCombs, dtype= bool)
+        current= int(numpy.argmin(norms)) # closest to the unloaded state.
+        order.append(current)
+        warmStart.append(False)
+        pending[current]= False
+        for k in range(1, numCombs):
+            distances= numpy.linalg.norm(factors-factors[current], axis= 1)
+            distances[~pending]= numpy.inf
+            nearest= int(numpy.argmin(distances))
+            order.append(nearest)
+            warmStart.append(bool(distances[nearest]<norms[nearest]))
+            pending[nearest]= False
+            current= nearest
+    return order, warmStart
+
+def get_warm_start_order(loadCombinations, combNames):
+    ''' Return the names of the combinations sorted so each one of them
+        can start from the converged state of the previous one and,
+        for each of them, a flag that is true if that state must be
+        used (see get_nearest_neighbour_order).
+
+    :param loadCombinations: load combination handler inside the XC solver.
+    :param combNames: names of the combinations to sort.
+    '''
+    combExprs= [loadCombinations[name].getComponents('') for name in combNames]
+    loadPatternNames, factors= get_factor_matrix(combExprs)
+    order, warmStart= get_nearest_neighbour_order(factors)
+    return [combNames[i] for i in order], warmStart
+
+def get_iteration_count(solutionProcedure):
+    ''' Return the number of iterations performed by the convergence
+        test in the last step of the analysis (None if the solution
+        procedure has no convergence test).
+
+    :param solutionProcedure: solution procedure.
+    '''
+    retval= None
+    if(solutionProcedure.solutionStrategy):
+        ctest= solutionProcedure.getConvergenceTest()
+        if(ctest):
+            retval= ctest.currentIter
+    return retval
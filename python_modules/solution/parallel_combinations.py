@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+''' Run the analysis of a list of load combinations in several worker
+    processes. The workers are created by forking the current process, so
+    each one of them starts with its own copy of the finite element model
+    (no need to rebuild or pickle it). Each worker solves a contiguous
+    block of the combination list and writes its partial results to disk;
+    the caller is responsible of merging them in the original order.
+
+    The number of processes used by default can be set through the
+    XC_NUM_PROCESSES environment variable, so project scripts don't need
+    to be modified to run in parallel. The variable is honoured by the
+    entry points that loop over several combinations or elements:
+    LimitStateData.saveAll (computation of the results of the load
+    combinations) and the limit state checks that use the section level
+    solver (check methods of the limit state data with
+    sectionSolver= True). SolutionProcedure.solveComb solves a single
+    combination, so it always runs in the current process.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022,LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import sys
+import traceback
+import multiprocessing
+from misc_utils import log_messages as lmsg
+
+numProcessesEnvVar= 'XC_NUM_PROCESSES'
+
+def getDefaultNumProcesses():
+    ''' Return the number of processes to use by default (value of the
+        XC_NUM_PROCESSES environment variable or 1 if not defined).'''
+    retval= 1
+    value= os.environ.get(numProcessesEnvVar, None)
+    if(value):
+        try:
+            retval= int(value)
+        except ValueError:
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.warning(methodName+"; wrong value: '"+value+"' for environment variable: "+numProcessesEnvVar+". Using one process.")
+        if(retval<1): # Use all the available CPUs.
+            retval= os.cpu_count()
+    return retval
+
+def forkIsAvailable():
+    ''' Return true if the worker processes can be created by forking the
+        current process.'''
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+def splitCombinations(combNames, numChunks):
+    ''' Split the list of combinations in contiguous blocks of (nearly)
+        the same size.
+
+    :param combNames: names of the combinations.
+    :param numChunks: number of blocks.
+    '''
+    retval= list()
+    numCombs= len(combNames)
+    numChunks= max(1, min(numChunks, numCombs))
+    chunkSize, remainder= divmod(numCombs, numChunks)
+    start= 0
+    for i in range(0, numChunks):
+        end= start+chunkSize
+        if(i<remainder):
+            end+= 1
+        retval.append(list(combNames[start:end]))
+        start= end
+    return retval
+
+def _workerMain(workerFunction, workerId, combNames):
+    ''' Entry point of the worker processes.
+
+    :param workerFunction: function to call with the worker identifier and
+                           the names of the combinations as arguments.
+    :param workerId: identifier of the worker.
+    :param combNames: combinations to analyze in this worker.
+    '''
+    exitCode= 0
+    try:
+        result= workerFunction(workerId, combNames)
+        if(result):
+            exitCode= 1
+    except Exception:
+        traceback.print_exc()
+        exitCode= 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    # Don't run the cleanup handlers inherited from the parent process.
+    os._exit(exitCode)
+
+def runForked(workerFunction, combNames, numProcesses):
+    ''' Split the combinations and call the worker function for each block
+        in a forked process. Return the blocks of combinations and the exit
+        code of the corresponding worker (0 if success).
+
+    :param workerFunction: function to call with the worker identifier and
+                           the names of the combinations as arguments; it
+                           must return 0 (or None) if success.
+    :param combNames: names of the combinations.
+    :param numProcesses: number of worker processes.
+    '''
+    chunks= splitCombinations(combNames, numProcesses)
+    context= multiprocessing.get_context('fork')
+    sys.stdout.flush()
+    sys.stderr.flush()
+    processes= list()
+    for i, chunk in enumerate(chunks):
+        p= context.Process(target= _workerMain, args= (workerFunction, i, chunk))
+        p.start()
+        processes.append(p)
+    exitCodes= list()
+    for p in processes:
+        p.join()
+        exitCodes.append(p.exitcode)
+    return chunks, exitCodes
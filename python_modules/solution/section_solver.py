@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+''' Solution of the phantom model (see postprocess/phantom_model.py)
+    section by section.
+
+    The phantom model is made of independent ZeroLengthSection elements,
+    each one of them with a fixed node and a loaded node. Instead of
+    assembling and solving the global system of equations, the
+    deformation of each section under the internal forces of the
+    combination is obtained directly by means of a Newton-Raphson
+    iteration on the section itself (section tangent stiffness). After
+    that the elements are in the same state that they would be after
+    solving the model, so the controllers can check them as usual.
+
+    The sections are independent, so they can be distributed among
+    several worker processes (see PhantomModel.check).'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import sys
+import numpy as np
+import xc
+from misc_utils import log_messages as lmsg
+
+# Index of each section response in the internal forces vector
+# [N, Vy, Vz, T, My, Mz] (see ResponseId.h).
+responseIndexes= {2:0, 3:1, 5:2, 6:3, 4:4, 1:5} # P, Vy, Vz, T, My, Mz.
+
+def get_response_indexes(section):
+    ''' Return the index of each component of the section stress resultant
+        in the internal forces vector [N, Vy, Vz, T, My, Mz].
+
+    :param section: section of the phantom element.
+    '''
+    return [responseIndexes[code] for code in section.getResponseType]
+
+def get_tangent_matrix(section):
+    ''' Return the tangent stiffness of the section as a numpy array.
+
+    :param section: section of the phantom element.
+    '''
+    tangent= section.getTangentStiffness()
+    return np.array([[tangent(i,j) for j in range(tangent.noCols)] for i in range(tangent.noRows)])
+
+def solve_section(section, internalForces, tol= 1e-9, maxNumIter= 50):
+    ''' Compute the deformation of the section for the given internal
+        forces starting from the initial state. Return true if the
+        iteration converges and the number of iterations.
+
+    :param section: section of the phantom element.
+    :param internalForces: internal forces [N, Vy, Vz, T, My, Mz].
+    :param tol: tolerance for the norm of the unbalanced forces (relative
+                to the norm of the internal forces).
+    :param maxNumIter: maximum number of iterations.
+    '''
+    target= np.array([internalForces[i] for i in get_response_indexes(section)], dtype= float)
+    section.revertToStart()
+    deformation= np.zeros(len(target))
+    tolerance= tol*np.linalg.norm(target)
+    converged= False
+    numIter= 0
+    while(True):
+        residual= target-np.array(list(section.getStressResultant()))
+        converged= (np.linalg.norm(residual)<=tolerance)
+        if(converged or (numIter>=maxNumIter)):
+            break
+        # Least squares solution: the tangent can be singular (i.e. cracked
+        # sections).
+        delta= np.linalg.lstsq(get_tangent_matrix(section), residual, rcond= None)[0]
+        deformation+= delta
+        section.sectionDeformation= xc.Vector(deformation.tolist())
+        numIter+= 1
+    section.commitState()
+    return converged, numIter
+
+class SectionSolutionProcedure(object):
+    ''' Solution procedure that computes the state of the phantom
+        elements section by section. It can be used as the solution
+        procedure of the limit state controllers (it provides the
+        solveComb method).
+
+    :ivar combinationLoads: dictionary containing, for each combination, a
+                            dictionary with the internal forces
+                            [N, Vy, Vz, T, My, Mz] of each phantom element
+                            (the elements not included are not loaded).
+    :ivar elements: phantom elements to solve.
+    :ivar tol: tolerance for the norm of the unbalanced forces (relative
+               to the norm of the internal forces).
+    :ivar maxNumIter: maximum number of iterations.
+    :ivar numIterations: total number of iterations.
+    :ivar failedSections: list of (combination, element tag) pairs for
+                          which the iteration doesn't converge.
+    '''
+    def __init__(self, combinationLoads, elements= None, tol= 1e-9, maxNumIter= 50):
+        ''' Constructor.
+
+        :param combinationLoads: dictionary containing, for each combination,
+                                 a dictionary with the internal forces of
+                                 each phantom element.
+        :param elements: phantom elements to solve.
+        :param tol: tolerance for the norm of the unbalanced forces.
+        :param maxNumIter: maximum number of iterations.
+        '''
+        self.combinationLoads= combinationLoads
+        self.elements= elements
+        self.tol= tol
+        self.maxNumIter= maxNumIter
+        self.numIterations= 0
+        self.failedSections= list()
+
+    def linearSolutionAlgorithm(self):
+        ''' Return false, the Newton-Raphson iteration is used also for
+            linear sections (see checkSolverAdequacy).'''
+        return False
+
+    def solveComb(self, combName):
+        ''' Compute the state of the elements under the given combination.
+            Return the number of sections for which the iteration doesn't
+            converge.
+
+        :param combName: name of the combination.
+        '''
+        retval= 0
+        loads= self.combinationLoads.get(combName, dict())
+        zero= [0.0]*6
+        for e in self.elements:
+            converged, numIter= solve_section(e.getSection(), loads.get(e.tag, zero), tol= self.tol, maxNumIter= self.maxNumIter)
+            self.numIterations+= numIter
+            if(not converged):
+                self.failedSections.append((combName, e.tag))
+                retval+= 1
+        if(retval>0):
+            className= type(self).__name__
+            methodName= sys._getframe(0).f_code.co_name
+            lmsg.warning(className+'.'+methodName+'; iteration not converged for '+str(retval)+' sections under combination: '+str(combName))
+        return retval
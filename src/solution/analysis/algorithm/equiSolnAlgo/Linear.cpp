@@ -74,7 +74,7 @@
 
 //! @brief Constructor
 XC::Linear::Linear(SolutionStrategy *owr)
-  :EquiSolnAlgo(owr,EquiALGORITHM_TAGS_Linear) {}
+  :EquiSolnAlgo(owr,EquiALGORITHM_TAGS_Linear), factorOnce(false), tangentFormed(false) {}
 
 XC::SolutionAlgorithm *XC::Linear::getCopy(void) const
   { return new Linear(*this); }
@@ -95,13 +95,17 @@ int XC::Linear::resuelve(void)
         return -5;
       }
 
-    if(theIncIntegrator->formTangent()<0) //Builds tangent stiffness matrix.
+    if(!(factorOnce && tangentFormed)) // otherwise reuse the factored matrix.
       {
-        std::cerr << Color::red << getClassName() << "::" << __FUNCTION__
-                  << "; WARNING the XC::Integrator"
-                  << " failed in formTangent()."
-	          << Color::def << std::endl;
-        return -1;
+        if(theIncIntegrator->formTangent()<0) //Builds tangent stiffness matrix.
+          {
+            std::cerr << Color::red << getClassName() << "::" << __FUNCTION__
+                      << "; WARNING the XC::Integrator"
+                      << " failed in formTangent()."
+                      << Color::def << std::endl;
+            return -1;
+          }
+        tangentFormed= true;
       }
 
     if(theIncIntegrator->formUnbalance()<0) //Builds load vector.
@@ -163,6 +167,22 @@ int XC::Linear::solveCurrentStep(void)
 int XC::Linear::setConvergenceTest(ConvergenceTest *theNewTest)
   { return 0; }
 
+//! @brief The tangent must be formed again after the domain changes.
+int XC::Linear::domainChanged(void)
+  {
+    tangentFormed= false;
+    return EquiSolnAlgo::domainChanged();
+  }
+
+//! @brief If the argument is true the tangent is formed (and factored)
+//! only once, so the next steps reuse the factored matrix (the model
+//! must be linear).
+void XC::Linear::setFactorOnce(const bool &b)
+  {
+    factorOnce= b;
+    tangentFormed= false;
+  }
+
 //! Does  nothing. Returns 0.
 int XC::Linear::sendSelf(Communicator &comm)
   { return 0; }
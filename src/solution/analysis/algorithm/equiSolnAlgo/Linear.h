@@ -93,8 +93,15 @@ namespace XC {
 //! \f$U = U_{a} + \Delta U\f$.
 //! To start the iteration \f$U_a = U_{trial}\f$, i.e. the current trial
 //! response quantities are chosen as approximate solution quantities.
+//!
+//! If factorOnce is true the tangent is formed (and factored) only in
+//! the first step after the domain changes; the next steps only form
+//! the unbalance vector and solve using the factored matrix (useful
+//! to solve many load cases on the same linear model).
 class Linear: public EquiSolnAlgo
   {
+    bool factorOnce; //!< if true form the tangent only once.
+    bool tangentFormed; //!< true if the tangent has been already formed.
     int resuelve();
   protected:
     friend class SolutionStrategy;
@@ -105,6 +112,11 @@ class Linear: public EquiSolnAlgo
 
     int solveCurrentStep(void);
     int setConvergenceTest(ConvergenceTest *theNewTest);
+    int domainChanged(void);
+
+    inline bool getFactorOnce(void) const
+      { return factorOnce; }
+    void setFactorOnce(const bool &);
     
     virtual int sendSelf(Communicator &);
     virtual int recvSelf(const Communicator &);
@@ -35,7 +35,9 @@ class_<XC::KrylovNewton, bases<XC::EquiSolnAlgo>, boost::noncopyable >("KrylovNe
   .add_property("maxDimension", &XC::KrylovNewton::getMaxDimension, &XC::KrylovNewton::setMaxDimension,"max number of iterations until the tangent is reformed and the acceleration restarts (default = 3)")
   ;
 
-class_<XC::Linear, bases<XC::EquiSolnAlgo>, boost::noncopyable >("Linear", no_init);
+class_<XC::Linear, bases<XC::EquiSolnAlgo>, boost::noncopyable >("Linear", no_init)
+  .add_property("factorOnce", &XC::Linear::getFactorOnce, &XC::Linear::setFactorOnce,"if true the tangent is formed and factored only once (until the domain changes), so the next steps reuse the factored matrix (linear models only).")
+  ;
 
 class_<XC::NewtonBased, bases<XC::EquiSolnAlgo>, boost::noncopyable >("NewtonBased", no_init);
 
@@ -267,6 +267,7 @@ python tests/actions/traffic_loads/test_ec1_notional_lane_computation_01.py
 python tests/actions/traffic_loads/test_ec1_notional_lane_computation_02.py
 python tests/actions/traffic_loads/test_ec1_lm1_tandem_position_01.py
 python tests/actions/traffic_loads/test_ec1_lm1_tandem_position_02.py
+python tests/actions/traffic_loads/test_influence_surfaces_01.py
 echo "$BLEU" "    Traffic loads tests. Railway traffic." "$NORMAL"
 python tests/actions/traffic_loads/railway_traffic/test_derailment_SIA.py
 python tests/actions/traffic_loads/railway_traffic/test_ec1_slipstream_effect.py
@@ -286,6 +287,7 @@ python tests/actions/load_combinations/test_iap11_01.py
 python tests/actions/load_combinations/test_iap11_02.py
 python tests/actions/load_combinations/test_combination_dict.py
 python tests/actions/load_combinations/test_split_combination.py
+python tests/actions/load_combinations/test_combination_pruning_01.py
 python tests/actions/load_combinations/test_sia_pont_ferroviaire.py
 python tests/actions/load_combinations/test_ec0_road_bridge_context.py
 python tests/actions/load_combinations/test_ec0_traffic_groups.py
@@ -510,6 +512,7 @@ python tests/solution/constraint_handler/lagrange_handler_test_01.py
 echo "$BLEU" "  Eigenvalue solution tests." "$NORMAL"
 python tests/solution/eigenvalues/test_string_under_tension.py
 python tests/solution/eigenvalues/test_cqc_01.py
+python tests/solution/eigenvalues/test_response_spectrum_analysis_01.py
 python tests/solution/eigenvalues/test_band_arpackpp_solver_01.py
 python tests/solution/eigenvalues/test_ordinary_eigenvalues.py
 echo "$BLEU" "    Eigenmode computation." "$NORMAL"
@@ -676,6 +679,8 @@ python tests/preprocessor/sets/geometric_queries/test_set_transformation_02.py
 python tests/preprocessor/sets/geometric_queries/test_pick_node_on_point.py
 python tests/preprocessor/sets/geometric_queries/test_pick_entities.py
 python tests/preprocessor/sets/geometric_queries/test_pick_elements_in_zone.py
+python tests/preprocessor/sets/geometric_queries/test_spatial_index_01.py
+python tests/preprocessor/sets/geometric_queries/test_spatial_index_02.py
 python tests/preprocessor/sets/geometric_queries/test_get_regression_plane.py
 
 echo "$BLEU" "  Preprocessor grid model tests." "$NORMAL"
@@ -689,6 +694,7 @@ python tests/preprocessor/import_export/dxf/test_dxf_import_01.py
 python tests/preprocessor/import_export/dxf/test_dxf_groups.py
 python tests/preprocessor/import_export/dxf/test_dxf_surfaces.py
 python tests/preprocessor/import_export/dxf/test_dxf_export_01.py
+python tests/preprocessor/import_export/dxf/test_weld_points_01.py
 echo "$BLEU" "    FreeCAD tests." "$NORMAL"
 python tests/preprocessor/import_export/freecad/test_freecad_groups.py
 python tests/preprocessor/import_export/freecad/test_ifc_points.py
@@ -793,6 +799,7 @@ python tests/loads/load_distribution/test_sliding_vector_load_02.py
 python tests/loads/load_distribution/test_surf_unif_load_distributed.py
 python tests/loads/load_distribution/test_wheel_load_distribution_01.py
 python tests/loads/load_distribution/test_notional_lane_load_distribution.py
+python tests/loads/load_distribution/test_wheel_load_node_picking.py
 echo "$BLEU" "    Load distribution. Railway traffic." "$NORMAL"
 python tests/loads/load_distribution/railway_traffic/test_load_distribution_due_to_cant.py
 python tests/loads/load_distribution/railway_traffic/test_uniform_rail_load_01.py
@@ -1074,6 +1081,7 @@ python tests/materials/xc_materials/sections/fiber_section/interaction_diagram/t
 python tests/materials/xc_materials/sections/fiber_section/interaction_diagram/test_interaction_diagram04.py
 python tests/materials/xc_materials/sections/fiber_section/interaction_diagram/test_interaction_diagram05.py
 python tests/materials/xc_materials/sections/fiber_section/interaction_diagram/test_interaction_diagram06.py
+python tests/materials/xc_materials/sections/fiber_section/interaction_diagram/test_interaction_diagram_cache_01.py
 python tests/materials/xc_materials/sections/fiber_section/plastic_hinge_on_IPE200.py
 echo "$BLEU" "        Membrane plate fiber section tests." "$NORMAL"
 python tests/materials/xc_materials/sections/fiber_section/membrane_plate/test_membrane_plate_fiber_material_01.py
@@ -1212,6 +1220,9 @@ python tests/materials/steel_shapes/test_steel_shape_01.py
 python tests/materials/steel_shapes/test_steel_shape_02.py
 python tests/materials/steel_shapes/test_arcelor_metric_shapes_01.py
 python tests/materials/steel_shapes/test_arcelor_metric_shapes_02.py
+python tests/materials/steel_shapes/test_shape_catalogs.py
+python tests/materials/steel_shapes/test_shape_catalogs_startup.py
+python tests/materials/steel_shapes/test_shape_derived_properties.py
 echo "$BLEU" "    EC3 tests." "$NORMAL"
 python tests/materials/ec3/compare_mech_properties.py
 python tests/materials/ec3/test_cross_section_verification.py
@@ -1221,6 +1232,7 @@ python tests/materials/ec3/test_biax_bend_coeff.py
 python tests/materials/ec3/test_section_classification_01.py
 python tests/materials/ec3/test_section_classification_02.py
 python tests/materials/ec3/test_section_classification_03.py
+python tests/materials/ec3/test_section_classification_04.py
 python tests/materials/ec3/test_beam_with_full_lateral_restraint.py
 python tests/materials/ec3/test_bolt_shear_01.py
 python tests/materials/ec3/compressed_section_test_01.py
@@ -1233,6 +1245,7 @@ python tests/materials/ec3/test_lateral_torsional_buckling00.py
 python tests/materials/ec3/test_lateral_torsional_buckling01.py
 python tests/materials/ec3/test_lateral_torsional_buckling02.py
 python tests/materials/ec3/test_lateral_torsional_buckling03.py
+python tests/materials/ec3/test_member_sizing_01.py
 echo "$BLEU" "      compression_lateral-torsional buckling tests." "$NORMAL"
 echo "$BLEU" "    EAE tests." "$NORMAL"
 python tests/materials/eae/test_steel_corbel_weld.py
@@ -1246,6 +1259,7 @@ python tests/materials/astm_aisc/create_self_weight_load_01.py
 python tests/materials/astm_aisc/create_self_weight_load_02.py
 python tests/materials/astm_aisc/combined_internal_forces_test_01.py
 python tests/materials/astm_aisc/combined_internal_forces_test_02.py
+python tests/materials/astm_aisc/combined_internal_forces_test_03.py
 echo "$BLEU" "      ASTM/AISC member design tests." "$NORMAL"
 python tests/materials/astm_aisc/member_design/hss12x8_test_01.py
 python tests/materials/astm_aisc/member_design/hss12x8_test_02.py
@@ -1353,6 +1367,7 @@ python tests/materials/eota_tr_29/test_shear_anchor.py
 
 echo "$BLEU" "  Other materials tests." "$NORMAL"
 python tests/materials/test_elastomeric_bearing_stiffness.py
+python tests/materials/test_wood_armer_array.py
 
 echo "$BLEU" "  Foundation design tests." "$NORMAL"
 python tests/geotechnics/foundations/test_skin_friction.py
@@ -1379,6 +1394,7 @@ python tests/geotechnics/soil_mechanics/test_boussinesq_settlement.py
 python tests/geotechnics/soil_mechanics/test_boussinesq_concentrated_load_01.py
 python tests/geotechnics/soil_mechanics/test_boussinesq_quad_loaded_area_01.py
 python tests/geotechnics/soil_mechanics/test_boussinesq_quad_loaded_area_02.py
+python tests/geotechnics/soil_mechanics/test_boussinesq_vectorized_01.py
 python tests/geotechnics/soil_mechanics/test_horizontal_surcharge3d_01.py
 python tests/geotechnics/soil_mechanics/test_horizontal_surcharge3d_02.py
 python tests/geotechnics/soil_mechanics/test_horizontal_surcharge3d_03.py
@@ -1480,6 +1496,15 @@ python tests/rough_calculations/reinforced_concrete/ng_rc_section_bending_with_c
 echo "$BLEU" "Verifiying routines for post processing." "$NORMAL"
 python tests/postprocess/test_export_shell_internal_forces.py
 python tests/postprocess/test_get_connected_constraints.py
+python tests/postprocess/superposition/test_load_superposition_01.py
+python tests/postprocess/test_internal_forces_store_01.py
+python tests/postprocess/test_results_sink_01.py
+python tests/postprocess/test_parallel_combinations_01.py
+python tests/postprocess/test_incremental_saveall_01.py
+python tests/postprocess/test_warm_start_combinations_01.py
+python tests/postprocess/test_combination_screening_01.py
+python tests/postprocess/test_batch_rendering_01.py
+python tests/postprocess/test_control_vars_records_01.py
 echo "$BLEU" "  limit state checking." "$NORMAL"
 echo "$BLEU" "    SIA 262 limit state checking." "$NORMAL"
 python tests/postprocess/limit_state_checking/sia262/test_shell_normal_stresses_uls_checking.py
@@ -1492,6 +1517,7 @@ echo "$BLEU" "      EC2 limit state checking: shear." "$NORMAL"
 python tests/postprocess/limit_state_checking/ec2/test_shear_uls_checking_01.py
 python tests/postprocess/limit_state_checking/ec2/test_shear_uls_checking_05.py
 python tests/postprocess/limit_state_checking/ec2/test_shear_uls_checking_06.py
+python tests/postprocess/limit_state_checking/ec2/test_shear_uls_checking_07.py
 echo "$BLEU" "      EC2 limit state checking: crack control." "$NORMAL"
 python tests/postprocess/limit_state_checking/ec2/test_crack_control_sls_checking_EC2_01.py
 python tests/postprocess/limit_state_checking/ec2/test_crack_control_sls_checking_EC2_02.py
@@ -1512,6 +1538,7 @@ python tests/postprocess/limit_state_checking/ehe08/test_shear_uls_checking_07.p
 python tests/postprocess/limit_state_checking/ehe08/test_shear_uls_checking_08.py
 echo "$BLEU" "      EHE limit state checking: normal stresses." "$NORMAL"
 python tests/postprocess/limit_state_checking/ehe08/test_shell_normal_stresses_uls_checking.py
+python tests/postprocess/limit_state_checking/ehe08/test_reinforcement_design_01.py
 echo "$BLEU" "      EHE limit state checking: crack control." "$NORMAL"
 python tests/postprocess/limit_state_checking/ehe08/test_crack_control_sls_checking_EHE_01.py
 python tests/postprocess/limit_state_checking/ehe08/test_crack_control_sls_checking_EHE_02.py
@@ -1529,6 +1556,7 @@ echo "$BLEU" "    AWC/NDS limit state checking." "$NORMAL"
 python tests/postprocess/limit_state_checking/awc_nds/test_uls_checking_nds_01.py
 python tests/postprocess/limit_state_checking/awc_nds/test_uls_checking_nds_02.py
 python tests/postprocess/limit_state_checking/awc_nds/test_uls_checking_nds_03.py
+python tests/postprocess/limit_state_checking/awc_nds/test_uls_checking_nds_04.py
 
 echo "$BLEU" "    serviceability limit state checking." "$NORMAL"
 python tests/postprocess/limit_state_checking/serviceability_limit_states/test_ibc2018_deflection.py
@@ -1538,6 +1566,7 @@ python tests/postprocess/limit_state_checking/serviceability_limit_states/test_i
 echo "$BLEU" "  Graphic output." "$NORMAL"
 python tests/postprocess/vtk/test_beam3d_bending_moment_belly_01.py
 python tests/postprocess/vtk/test_beam3d_bending_moment_belly_02.py
+python tests/postprocess/vtk/test_vtk_grid_cache_01.py
 
 END=$(date +%s.%N)
 DIFF=$(echo "$END - $START" | bc)
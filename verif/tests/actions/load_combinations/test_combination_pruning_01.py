@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+''' Pruning of the combinations that cannot give the maximum or the minimum
+    value of any of the results.'''
+
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import numpy
+from actions.load_combination_utils import iap11 # Spanish IAP-11
+from actions.load_combination_utils import utils
+
+lcg= iap11.CombGenerator()
+G1= lcg.newPermanentAction(actionName=  "G1", actionDescription= "Peso propio")
+G2= lcg.newPermanentAction(actionName=  "G2", actionDescription= "Carga muerta")
+G3= lcg.newPermanentAction(actionName=  "G3", actionDescription=  "Retracc.")
+Q1a_1= lcg.newHeavyVehicleAction(actionName=  "Q1a_1", actionDescription= "Tren cargas pos. 1a_1")
+Q1a_2= lcg.newHeavyVehicleAction(actionName=  "Q1a_2", actionDescription= "Tren cargas pos. 1a_2")
+lcg.computeCombinations()
+
+situation= 'ULSTransient'
+allCombinations= lcg.getNamedCombinations(situation)
+numCombinations= len(allCombinations)
+
+# All the actions push in the same direction: only the combinations
+# with the largest and the smallest factors remain.
+numRemoved1= lcg.pruneCombinations(situations= [situation], actionSigns= {'G1':1, 'G2':1, 'G3':1, 'Q1a_1':1, 'Q1a_2':1})
+remaining1= lcg.getNamedCombinations(situation)
+ok1= (numCombinations==40) and (numRemoved1==37) and (len(remaining1)==3) and (lcg.getNumberOfPrunedCombinations()==37)
+
+# Results of each action (i.e. bending moments at five sections).
+actionEffects= {'G1':[10.0, 20.0, -5.0, 3.0, 1.0],
+                'G2':[2.0, 4.0, -1.0, 0.5, 0.2],
+                'G3':[-1.0, 0.5, 2.0, -3.0, 0.0],
+                'Q1a_1':[8.0, -2.0, 4.0, 1.0, -6.0],
+                'Q1a_2':[-3.0, 6.0, 1.0, 2.0, 5.0]}
+numRemoved2= lcg.pruneCombinations(situations= [situation], actionEffects= actionEffects)
+remaining2= lcg.getNamedCombinations(situation)
+## The envelopes of the results don't change.
+def getResults(combinations):
+    retval= list()
+    for key in combinations:
+        combDict= utils.getCombinationDict(combinations[key].name)
+        values= numpy.zeros(5)
+        for action in combDict:
+            values+= combDict[action]*numpy.array(actionEffects[action])
+        retval.append(values)
+    return numpy.array(retval)
+allResults= getResults(allCombinations)
+remainingResults= getResults(remaining2)
+err= numpy.linalg.norm(allResults.max(axis= 0)-remainingResults.max(axis= 0))+numpy.linalg.norm(allResults.min(axis= 0)-remainingResults.min(axis= 0))
+ok2= (numRemoved2>0) and (len(remaining2)==numCombinations-numRemoved2) and (err<1e-10)
+
+# Signs of the effects of each action on each result component: the
+# combinations that can give the extreme value of any component remain.
+actionSigns= dict()
+for key in actionEffects:
+    actionSigns[key]= numpy.sign(actionEffects[key])
+numRemoved3= lcg.pruneCombinations(situations= [situation], actionSigns= actionSigns)
+remaining3= lcg.getNamedCombinations(situation)
+remainingResults= getResults(remaining3)
+err3= numpy.linalg.norm(allResults.max(axis= 0)-remainingResults.max(axis= 0))+numpy.linalg.norm(allResults.min(axis= 0)-remainingResults.min(axis= 0))
+ok3= (numRemoved3>0) and (numRemoved3<numRemoved1) and (len(remaining3)==numCombinations-numRemoved3) and (err3<1e-10)
+
+'''
+print(numCombinations, numRemoved1, list(remaining1.keys()))
+print(numRemoved2, err)
+print(numRemoved3, err3)
+print(ok1, ok2, ok3)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if (ok1 and ok2 and ok3):
+    print('test: '+fname+': ok.')
+else:
+    lmsg.error('test: '+fname+' ERROR.')
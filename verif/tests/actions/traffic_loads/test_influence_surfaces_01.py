@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+''' Search of the governing position of a tandem on a notional lane by
+    means of influence surfaces. The effects predicted from the influence
+    surfaces are compared with those obtained solving the model for the
+    governing positions.
+'''
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AOO)"
+__copyright__= "Copyright 2022, LCPT and AOO"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import geom
+import xc
+from model import predefined_spaces
+from materials import typical_materials
+from actions.roadway_traffic import load_model_base
+from actions.roadway_traffic import EC1_load_models
+from actions import influence_surfaces as inf
+
+# Problem type
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+
+# Define materials
+E= 30e9 # Concrete Young's modulus.
+nu= 0.2 # Poisson's ratio.
+h= 0.3 # thickness.
+dens= 2500*h # specific mass [kg/m2].
+deckSection= typical_materials.defElasticMembranePlateSection(preprocessor, "deckSection",E,nu,dens,h)
+
+# Problem geometry.
+span= 10
+
+## K-points.
+points= preprocessor.getMultiBlockTopology.getPoints
+pt1= points.newPoint(geom.Pos3d(0,0,0))
+pt2= points.newPoint(geom.Pos3d(span,0,0))
+pt3= points.newPoint(geom.Pos3d(span,span,0))
+pt4= points.newPoint(geom.Pos3d(0,span,0))
+corners= [pt1, pt2, pt3, pt4]
+## Surface.
+surfaces= preprocessor.getMultiBlockTopology.getSurfaces
+s= surfaces.newQuadSurfacePts(pt1.tag,pt2.tag,pt3.tag,pt4.tag)
+s.nDivI= 10
+s.nDivJ= 10
+
+# Generate mesh.
+seedElemHandler= preprocessor.getElementHandler.seedElemHandler
+seedElemHandler.defaultMaterial= deckSection.name
+elem= seedElemHandler.newElement("ShellMITC4",xc.ID([0,0,0,0]))
+s.genMesh(xc.meshDir.I)
+
+# Constraints.
+for pt in corners:
+    n= pt.getNode()
+    modelSpace.fixNode000_FFF(n.tag)
+supportNode= pt1.getNode()
+
+# Central node.
+deckSet= modelSpace.getTotalSet()
+centralNode= deckSet.getNearestNode(geom.Pos3d(span/2.0, span/2.0, 0.0))
+
+# Influence surfaces.
+quantities= [inf.node_displacement_quantity(centralNode, 2, name= 'uz'), inf.node_reaction_quantity(supportNode, 2, name= 'Rz')]
+influenceSurfaces= inf.InfluenceSurfaces(quantities)
+result= influenceSurfaces.compute(modelSpace, loadedNodes= deckSet.nodes)
+# The stiffness matrix was factored only once and the solution
+# algorithm is left as it was.
+computeOk= (result==0) and (len(influenceSurfaces.nodeTags)==len(deckSet.nodes)) and (not modelSpace.getAnalysis().analysisAggregation.getSolutionAlgorithm.factorOnce)
+
+# Notional lane and tandem.
+laneWidth= 3.0
+leftBorder= (span-laneWidth)/2.0
+rightBorder= leftBorder+laneWidth
+notionalLane= load_model_base.NotionalLane(name= 'test', contour= geom.Polygon3d([geom.Pos3d(0,leftBorder,0), geom.Pos3d(0,rightBorder,0), geom.Pos3d(span,rightBorder,0), geom.Pos3d(span,leftBorder,0)]))
+notionalLanes= load_model_base.NotionalLanes()
+notionalLanes.lanes= [notionalLane]
+tandem= EC1_load_models.tandem300LM1
+movingLoads= [inf.MovingLoad(notionalLane, tandem)]
+
+# Search the governing positions.
+governingPositions= influenceSurfaces.getGoverningPositions(movingLoads)
+
+# Define the load patterns for those positions.
+spreadingLayers= [(0.5, 1)]
+def defLoads(tandems, relativePositions):
+    notionalLanes.defDeckPunctualLoadsThroughLayers(tandems= tandems, relativePositions= relativePositions, originSet= deckSet, spreadingLayers= spreadingLayers)
+loadPatterns= influenceSurfaces.defGoverningLoadPatterns(modelSpace, movingLoads, governingPositions, defLoads, quantityNames= ['uz', 'Rz'])
+
+def solve(loadPatternName):
+    ''' Solve the model for the given load pattern.'''
+    modelSpace.revertToStart()
+    modelSpace.addLoadCaseToDomain(loadPatternName)
+    result= modelSpace.analyze(1, calculateNodalReactions= True)
+    if(result!=0):
+        print('Can\'t solve.')
+        exit(1)
+    retval= (centralNode.getDisp[2], supportNode.getReaction[2])
+    modelSpace.removeLoadCaseFromDomain(loadPatternName)
+    return retval
+
+## Minimum (maximum downwards) displacement of the central node.
+uzMin= governingPositions['uz']['min']
+uz, R= solve('influence_uz_min')
+ratio1= abs(uz-uzMin['value'])/abs(uzMin['value'])
+ratio2= abs(uzMin['relativePositions'][0]-0.5)
+## Maximum reaction.
+RzMax= governingPositions['Rz']['max']
+uz, R= solve('influence_Rz_max')
+ratio3= abs(R-RzMax['value'])/abs(RzMax['value'])
+
+'''
+print('governing positions: ', governingPositions)
+print('ratio1= ', ratio1)
+print('ratio2= ', ratio2)
+print('ratio3= ', ratio3)
+print(computeOk)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if computeOk and (len(loadPatterns)==4) and (ratio1<0.1) and (ratio2<0.05) and (ratio3<0.1):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
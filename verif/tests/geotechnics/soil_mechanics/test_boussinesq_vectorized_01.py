@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+''' Check that the vectorized computation of the stresses due to a
+    distributed load gives the same results that the point by point
+    computation using BoussinesqStresses objects.'''
+
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AOO)"
+__copyright__= "Copyright 2022, LCPT and AOO"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import geom
+import math
+from geotechnics import boussinesq
+
+# Define loaded area
+loadedArea= boussinesq.QuadLoadedArea(p1= geom.Pos3d(0,0,0),
+                                      p2= geom.Pos3d(2,0,0),
+                                      p3= geom.Pos3d(2,1.5,0),
+                                      p4= geom.Pos3d(0,1,0),
+                                      q= -10e3,
+                                      eSize= 0.1)
+eta= 0.3
+
+# Test points and stress directions.
+testPoints= list()
+unitVectors= list()
+for i in range(0,10):
+    for j in range(0,5):
+        testPoints.append(geom.Pos3d(-1.0+0.4*i, 0.5, -0.2-0.5*j))
+        unitVectors.append(geom.Vector3d(1,1,1).normalized())
+
+# Vectorized computation (using small blocks).
+stressVectors= loadedArea.getStressIncrementArray(points= testPoints, unitVectorDirs= unitVectors, eta= eta, maxPairs= 1000)
+
+# Point by point computation.
+samplePoints= loadedArea.getSamplePoints()
+P= loadedArea.q*geom.Polygon3d(loadedArea.vertices).getArea()/len(samplePoints)
+err= 0.0
+for p, vDir, v in zip(testPoints, unitVectors, stressVectors):
+    refVector= geom.Vector3d(0.0,0.0,0.0)
+    for lp in samplePoints:
+        bs= boussinesq.BoussinesqStresses(P= P, x= p.x-lp.x, y= p.y-lp.y, z= p.z-lp.z, eta= eta)
+        refVector+= bs.getCartesianStressVector(unitVectorDir= vDir)
+    err+= (v[0]-refVector.x)**2+(v[1]-refVector.y)**2+(v[2]-refVector.z)**2
+err= math.sqrt(err)
+
+'''
+print(stressVectors)
+print(err)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if (err<1e-8):
+    print('test: '+fname+': ok.')
+else:
+    lmsg.error('test: '+fname+' ERROR.')
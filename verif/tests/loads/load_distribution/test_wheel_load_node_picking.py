@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+''' Check that the nodes picked for the wheel loads of several tandems
+    (all the loaded contours checked in a single batch against the node
+    positions stored in the spatial index of the set) are the same that
+    those obtained checking each node with the Polygon2d.In method.
+'''
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AOO)"
+__copyright__= "Copyright 2022, LCPT and AOO"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import geom
+import xc
+from model import predefined_spaces
+from materials import typical_materials
+from actions.roadway_traffic import load_model_base
+from actions.roadway_traffic import EC1_load_models
+
+# Problem type
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+
+# Define materials
+dummySection= typical_materials.defElasticMembranePlateSection(preprocessor, "memb1",2.1e6,0.3,1.33,0.1)
+
+# Problem geometry (slightly sloped deck).
+span= 10
+slope= 0.02
+points= preprocessor.getMultiBlockTopology.getPoints
+pt1= points.newPoint(geom.Pos3d(0,0,0))
+pt2= points.newPoint(geom.Pos3d(span,0,slope*span))
+pt3= points.newPoint(geom.Pos3d(span,span,slope*span))
+pt4= points.newPoint(geom.Pos3d(0,span,0))
+surfaces= preprocessor.getMultiBlockTopology.getSurfaces
+s= surfaces.newQuadSurfacePts(pt1.tag,pt2.tag,pt3.tag,pt4.tag)
+s.nDivI= 25
+s.nDivJ= 25
+
+# Generate mesh.
+seedElemHandler= preprocessor.getElementHandler.seedElemHandler
+seedElemHandler.defaultMaterial= dummySection.name
+elem= seedElemHandler.newElement("ShellMITC4",xc.ID([0,0,0,0]))
+s.genMesh(xc.meshDir.I)
+
+# Notional lanes (the second one is skewed).
+originSet= modelSpace.getTotalSet()
+lane1= load_model_base.NotionalLane(name= 'lane1', contour= geom.Polygon3d([geom.Pos3d(0,1,0), geom.Pos3d(0,4,0), geom.Pos3d(span,4,slope*span), geom.Pos3d(span,1,slope*span)]))
+lane2= load_model_base.NotionalLane(name= 'lane2', contour= geom.Polygon3d([geom.Pos3d(0,5,0), geom.Pos3d(0,8,0), geom.Pos3d(span,9,slope*span), geom.Pos3d(span,6,slope*span)]))
+notionalLanes= load_model_base.NotionalLanes()
+notionalLanes.lanes= [lane1, lane2]
+tandems= [EC1_load_models.tandem300LM1, EC1_load_models.tandem200LM1]
+spreadingLayers= [(0.1, 1), (0.15, 1)]
+
+def pickNodesOneByOne(wheelLoad):
+    ''' Return the tags of the nodes loaded by the wheel checking each
+        node of the set.'''
+    reference, loadedContour= wheelLoad.getLoadedContour(spreadingLayers= spreadingLayers)
+    retval= list()
+    for n in originSet.nodes:
+        nodePos2d= reference.getLocalPosition(n.getInitialPos3d)
+        if(loadedContour.In(nodePos2d, .01)):
+            retval.append(n.tag)
+    return retval
+
+numWheels= 0
+numLoadedNodes= 0
+err= 0
+for relativePosition in [0.15, 0.5, 0.85]:
+    wheelLoads= notionalLanes.getDeckWheelLoadsThroughLayers(tandems= tandems, relativePositions= [relativePosition, relativePosition], originSet= originSet, spreadingLayers= spreadingLayers)
+    for wl in wheelLoads:
+        pickedTags= [n.tag for n in wl.nodes]
+        refTags= pickNodesOneByOne(wl)
+        if(pickedTags!=refTags):
+            err+= 1
+        numWheels+= 1
+        numLoadedNodes+= len(pickedTags)
+
+'''
+print('number of wheels: ', numWheels)
+print('number of loaded nodes: ', numLoadedNodes)
+print('err= ', err)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if (err==0) and (numWheels==24) and (numLoadedNodes>=numWheels):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
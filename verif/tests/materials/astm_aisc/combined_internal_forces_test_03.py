@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+''' Check that the biaxial bending controllers that evaluate all the
+    combinations at once give the same results that the combination by
+    combination computation.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import math
+import xc
+from model import predefined_spaces
+from materials.astm_aisc import ASTM_materials
+from materials.astm_aisc import AISC_limit_state_checking as aisc
+from materials.ec3 import EC3_materials
+from materials.ec3 import EC3_limit_state_checking as EC3lsc
+from materials.sections import internal_forces
+
+# Internal forces (two sections, several combinations).
+elementInternalForces= list()
+for i in range(0,12):
+    for idSection in [0,1]:
+        lf= internal_forces.CrossSectionInternalForces(N= (-400e3+70e3*i)*(1-0.5*idSection), Vy= 10e3*(i%3), My= 3e3*(i%4)-5e3, Mz= (40e3-7e3*i)*(1+idSection))
+        lf.idComb= 'ULS'+str(i)
+        lf.idSection= idSection
+        lf.chiN= 0.8+0.01*i
+        lf.chiLT= 0.9
+        elementInternalForces.append(lf)
+
+def getMaxEfficiencies(shape):
+    ''' Return the maximum efficiency and the governing combination for
+        each section computed combination by combination.'''
+    retval= dict()
+    for lf in elementInternalForces:
+        CF= shape.getBiaxialBendingEfficiency(Nd= lf.N, Myd= lf.My, Mzd= lf.Mz, Vyd= lf.Vy, chiN= lf.chiN, chiLT= lf.chiLT)[0]
+        if((lf.idSection not in retval) or (CF>retval[lf.idSection][0])):
+            retval[lf.idSection]= (CF, lf.idComb)
+    return retval
+
+def checkController(shape, controller):
+    ''' Check the results of the controller on a beam element.'''
+    feProblem= xc.FEProblem()
+    preprocessor=  feProblem.getPreprocessor
+    nodes= preprocessor.getNodeHandler
+    modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+    n1= nodes.newNodeXYZ(0,0,0)
+    n2= nodes.newNodeXYZ(1,0,0)
+    lin= modelSpace.newLinearCrdTransf("lin",xc.Vector([0,1,0]))
+    xcSection= shape.defElasticShearSection3d(preprocessor)
+    elements= preprocessor.getElementHandler
+    elements.defaultTransformation= lin.name
+    elements.defaultMaterial= xcSection.name
+    elem= elements.newElement("ElasticBeam3d",xc.ID([n1.tag,n2.tag]))
+    elem.setProp('crossSection', shape)
+    controller.initControlVars(modelSpace.getTotalSet())
+    controller.updateEfficiency(elem, elementInternalForces)
+    refValues= getMaxEfficiencies(shape)
+    retval= True
+    for idSection, (refCF, refComb) in refValues.items():
+        cv= elem.getProp(controller.limitStateLabel+controller.getSectionLabel(idSection))
+        retval= retval and (abs(cv.CF-refCF)<=1e-10*refCF) and (cv.combName==refComb)
+    return retval
+
+# AISC.
+Wshape= ASTM_materials.WShape(ASTM_materials.A992,'W14X99')
+ok1= checkController(Wshape, aisc.BiaxialBendingNormalStressController('ULS_normStr'))
+## L shapes are evaluated combination by combination.
+Lshape= ASTM_materials.LShape(ASTM_materials.A36,'L4X4X1/4')
+ok2= checkController(Lshape, aisc.BiaxialBendingNormalStressController('ULS_normStr'))
+
+# EC3.
+S275JR= EC3_materials.S275JR
+S275JR.gammaM= 1.05
+for name in ['HE_300_A', 'RHS250x150x16', 'CHS_193.7_11.0']:
+    if(name.startswith('HE')):
+        shape= EC3_materials.HEShape(S275JR, name)
+    elif(name.startswith('RHS')):
+        shape= EC3_materials.RHSShape(S275JR, name)
+    else:
+        shape= EC3_materials.CHSShape(S275JR, name)
+    shape.sectionClass= 1
+    ok3= checkController(shape, EC3lsc.BiaxialBendingNormalStressController('ULS_normStr'))
+    if(not ok3):
+        break
+
+'''
+print(ok1, ok2, ok3)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(ok1 and ok2 and ok3):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
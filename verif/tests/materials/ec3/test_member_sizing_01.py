@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+''' Automatic sizing of steel members: check that the chosen shape is the
+    lightest one (among the IPE and HEA candidates) that satisfies the
+    Eurocode 3 biaxial bending and shear checks.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com ana.ortega@ciccp.es"
+
+from materials.sections import internal_forces
+from materials.sections.structural_shapes import arcelor_metric_shapes
+from materials.ec3 import EC3_materials
+from materials.ec3 import EC3_limit_state_checking as EC3lsc
+from materials import steel_member_sizing
+
+steel= EC3_materials.S275JR
+steel.gammaM= 1.05
+
+def get_internal_forces(tagElem, forces):
+    ''' Return the internal forces of the element sections for each
+        combination.'''
+    retval= list()
+    for idComb, (N, Vy, Mz, My) in enumerate(forces):
+        for idSection in [0, 1]:
+            lf= internal_forces.CrossSectionInternalForces(N= N, Vy= Vy, My= My, Mz= Mz)
+            lf.idComb= 'ULS'+str(idComb)
+            lf.tagElem= tagElem
+            lf.idSection= idSection
+            lf.chiN= 1.0
+            lf.chiLT= 1.0
+            retval.append(lf)
+    return retval
+
+# Two beams that must share the same shape.
+beamForces= get_internal_forces(1, [(0.0, 80e3, 150e3, 2e3), (20e3, 60e3, 110e3, 0.0)])+get_internal_forces(2, [(0.0, 95e3, 170e3, 1e3)])
+# Column (axial force and bending).
+columnForces= get_internal_forces(3, [(-900e3, 20e3, 40e3, 30e3), (-600e3, 30e3, 80e3, 15e3)])
+
+groups= [steel_member_sizing.SizingGroup('beams', beamForces), steel_member_sizing.SizingGroup('columns', columnForces)]
+candidates= [steel_member_sizing.ShapeCandidates(EC3_materials.IPEShape, steel, arcelor_metric_shapes.IPE, namePattern= '^IPE_[0-9]+$'), steel_member_sizing.ShapeCandidates(EC3_materials.HEShape, steel, arcelor_metric_shapes.HE, namePattern= '^HE_[0-9]+_A$', maxDepth= 0.3)]
+controllers= [EC3lsc.BiaxialBendingNormalStressController('ULS_normalStress'), EC3lsc.ShearController('ULS_shear')]
+sizer= steel_member_sizing.MemberSizer(candidates, controllers)
+result= sizer.sizeGroups(groups)
+
+# Brute force: check all the candidates.
+def get_lightest_shape(group):
+    ''' Return the name of the lightest candidate that passes the checks and
+        the number of candidates.'''
+    retval= None
+    weight= None
+    numberOfCandidates= 0
+    for c in candidates:
+        for name in c.getNames():
+            numberOfCandidates+= 1
+            shape= c.createShape(name, group.hasCompression())
+            if(shape and (sizer.getEfficiency(shape, group)<=1.0)):
+                if((weight is None) or (shape.get('P')<weight)):
+                    weight= shape.get('P')
+                    retval= name
+    return retval, numberOfCandidates
+
+ok= True
+for group in groups:
+    lightestName, numberOfCandidates= get_lightest_shape(group)
+    ok= ok and (result[group.name] is not None) and (result[group.name].name==lightestName)
+    ok= ok and (group.efficiency<=1.0) and (group.numberOfChecks<numberOfCandidates)
+    
+ok= ok and (result['beams'].name=='IPE_330') and (result['columns'].name=='HE_220_A')
+
+# Vectorized shear efficiencies.
+shape= result['beams']
+shearEfficiencies= controllers[1].getShapeEfficiencies(shape, beamForces)
+shearEfficienciesRef= [shape.getYShearEfficiency(Vyd= lf.Vy) for lf in beamForces]
+ok= ok and (len(shearEfficiencies)==len(beamForces)) and (max(abs(shearEfficiencies-shearEfficienciesRef))<1e-12)
+
+'''
+for group in groups:
+    print(group.name, group.shape.name, group.efficiency, group.numberOfChecks)
+print(ok)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(ok):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+'''Classification of steel cross-sections (clause 5.5 of EN 1993-1-1:2005).
+   Parts whose width-to-thickness ratio exceeds the class 3 limit are
+   class 4.'''
+
+from __future__ import print_function
+from __future__ import division
+
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+from materials.ec3 import EC3_materials
+
+steelMaterial= EC3_materials.S275JR # epsilon= 0.924
+
+steelShape= EC3_materials.IPEShape(steel=steelMaterial,name='IPE_400')
+# Internal part in compression (limits: 30.5, 35.1 and 38.8).
+c1_1= steelShape.getClassInternalPartInCompression(ratioCT= 36.0)
+c1_2= steelShape.getClassInternalPartInCompression(ratioCT= 50.0)
+# Internal part in bending (limits: 66.6, 76.7 and 114.6).
+c2_1= steelShape.getClassInternalPartInBending(ratioCT= 70.0)
+c2_2= steelShape.getClassInternalPartInBending(ratioCT= 130.0)
+# Outstand part in compression (limits: 8.3, 9.2 and 12.9).
+c3_1= steelShape.getClassOutstandPartInCompression(ratioCT= 12.0)
+c3_2= steelShape.getClassOutstandPartInCompression(ratioCT= 15.0)
+# Whole section.
+c4= steelShape.getClassInCompression(ratioCT= 50.0)
+c5= steelShape.getClassInBending(ratioCT= 130.0)
+
+ok= (c1_1==3) and (c1_2==4) and (c2_1==2) and (c2_2==4) and (c3_1==3) and (c3_2==4) and (c4==4) and (c5==4)
+
+'''
+print('Internal part in compression: ', c1_1, c1_2)
+print('Internal part in bending: ', c2_1, c2_2)
+print('Outstand part in compression: ', c3_1, c3_2)
+print('Class in compression: ', c4)
+print('Class in bending: ', c5)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if ok:
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
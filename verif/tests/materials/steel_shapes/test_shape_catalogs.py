@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+''' Check that the binary steel shape catalogs contain the same shapes,
+    with the same property values and types, as the sources they are
+    written from (the aisc_shapes_dictionaries module and the JSON files),
+    and that the catalogs are not read until a shape is looked up.'''
+
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AOO)"
+__copyright__= "Copyright 2022, LCPT and AOO"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import json
+from materials.sections.structural_shapes import shape_catalog
+from materials.sections.structural_shapes import aisc_shapes_catalogs
+from materials.sections.structural_shapes import aisc_shapes_dictionaries
+from materials.sections.structural_shapes.aux import write_shape_catalogs as wsc
+
+# Catalogs not read yet.
+ok0= (aisc_shapes_catalogs.W._table is None) and (len(aisc_shapes_catalogs.W._shapes)==0)
+
+def compare_shapes(catalog, shapes):
+    ''' Return the number of values of the catalog that are not equal to
+        those of the source dictionary (or whose type is different).'''
+    retval= 0
+    if(list(catalog.keys())!=list(shapes.keys())):
+        retval+= 1
+    for key in shapes:
+        shape= shapes[key]
+        catalogShape= catalog[key]
+        if(list(catalogShape.keys())!=list(shape.keys())):
+            retval+= 1
+        for name in shape:
+            value= catalogShape.get(name, None)
+            if((type(value) is not type(shape[name])) or (value!=shape[name])):
+                retval+= 1
+    return retval
+
+numberOfShapes= 0
+errors= 0
+# AISC shapes.
+for family in wsc.aiscFamilies:
+    shapes= getattr(aisc_shapes_dictionaries, family)
+    catalog= getattr(aisc_shapes_catalogs, family)
+    errors+= compare_shapes(catalog, shapes)
+    numberOfShapes+= len(catalog)
+# Arcelor, BS EN 10210, BS EN 10219 and micropile shapes.
+for jsonFileName in wsc.jsonFiles+wsc.multipleFamilyJsonFiles:
+    with open(shape_catalog.getCatalogFileName(jsonFileName)) as f:
+        shapes= json.load(f)
+    if(jsonFileName in wsc.multipleFamilyJsonFiles):
+        families= shapes
+    else:
+        families= {None: shapes}
+    for family in families:
+        fileName= shape_catalog.getCatalogFileName(wsc.get_json_catalog_file_name(jsonFileName, family))
+        catalog= shape_catalog.ShapeCatalog(fileName)
+        errors+= compare_shapes(catalog, families[family])
+        numberOfShapes+= len(catalog)
+
+# Only the looked up shapes are created.
+W= shape_catalog.ShapeCatalog(aisc_shapes_catalogs.W.fileName, setupFunctions= [lambda shape: shape.update({'hi': shape['h']-2*shape['tf']})])
+ok1= ('W14X90' in W) and (len(W._shapes)==0)
+W14X90= W['W14X90']
+ok2= (len(W._shapes)==1) and (W['W14X90'] is W14X90)
+ok3= (W14X90['hi']==W14X90['h']-2*W14X90['tf'])
+
+'''
+print('ok0= ', ok0)
+print('number of shapes: ', numberOfShapes)
+print('errors: ', errors)
+print(ok1, ok2, ok3)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(ok0 and (numberOfShapes>3000) and (errors==0) and ok1 and ok2 and ok3):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
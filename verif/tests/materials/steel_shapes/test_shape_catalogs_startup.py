@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+''' Compare the time needed to start a Python interpreter and look up an
+    AISC shape using the binary catalogs (aisc_shapes_catalogs module)
+    with the time needed to do the same thing with the modules imported
+    previously by aisc_metric_shapes (the dictionaries of all the AISC
+    shapes, the shape labels and the SciPy interpolation module).'''
+
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AOO)"
+__copyright__= "Copyright 2022, LCPT and AOO"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import sys
+import time
+import subprocess
+
+oldStartup= '''
+from materials.sections.structural_shapes import aisc_shapes_dictionaries as shapes
+from materials.sections.structural_shapes import aisc_shapes_labels as labels
+from scipy.interpolate import griddata
+A= shapes.W['W14X90']['A']
+'''
+
+newStartup= '''
+from materials.sections.structural_shapes import aisc_shapes_catalogs as shapes
+A= shapes.W['W14X90']['A']
+'''
+
+env= dict(os.environ)
+env['PYTHONPATH']= os.pathsep.join([p for p in sys.path if p])
+
+def get_startup_time(code, numberOfRuns= 3):
+    ''' Return the minimum time needed to run the code argument in a new
+        interpreter.'''
+    retval= None
+    for i in range(0, numberOfRuns):
+        start= time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], env= env, check= True)
+        elapsed= time.perf_counter()-start
+        if((retval is None) or (elapsed<retval)):
+            retval= elapsed
+    return retval
+
+oldTime= get_startup_time(oldStartup)
+newTime= get_startup_time(newStartup)
+
+'''
+print('old startup time: ', oldTime, 's')
+print('new startup time: ', newTime, 's')
+print('speedup: ', oldTime/newTime)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(newTime<oldTime):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+''' Check the properties computed by the setup functions of the shape
+    catalogs that used values left by the loop of a previous family
+    (AreaQz of the IPN, UC and UB shapes) and the ductility limits of the
+    AISC hollow structural sections.'''
+
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AOO)"
+__copyright__= "Copyright 2022, LCPT and AOO"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import math
+from materials.sections.structural_shapes import arcelor_metric_shapes
+from materials.astm_aisc import ASTM_materials
+
+# Shear area (z axis) of the IPN, UC and UB shapes: A-d*tw for the IPN
+# shapes and A-hw*tw for the UC and UB shapes, with the dimensions of
+# the shape itself.
+IPN200= arcelor_metric_shapes.IPN['IPN_200']
+AreaQzIPN= IPN200['AreaQz']
+AreaQzIPNRef= 0.00334-(0.2-2*0.0113-2*0.0075)*0.0075 # 21.22 cm2
+ratio1= abs(AreaQzIPN-AreaQzIPNRef)/AreaQzIPNRef
+
+UC203x203x46= arcelor_metric_shapes.UC['UC203x203x46']
+AreaQzUC= UC203x203x46['AreaQz']
+AreaQzUCRef= 0.00587-(0.2032-2*0.011)*0.0072 # 45.65 cm2
+ratio2= abs(AreaQzUC-AreaQzUCRef)/AreaQzUCRef
+
+UB356x127x33= arcelor_metric_shapes.UB['UB356x127x33']
+AreaQzUB= UB356x127x33['AreaQz']
+AreaQzUBRef= 0.00421-(0.349-2*0.0085)*0.006 # 22.18 cm2
+ratio3= abs(AreaQzUB-AreaQzUBRef)/AreaQzUBRef
+
+# Ductility limits of the AISC hollow structural sections (table D1.1
+# of AISC 341-16).
+steel= ASTM_materials.A500
+E= 210e9
+hss= ASTM_materials.HSSShape(steel,'HSS8X8X3/16')
+lambdaMD= hss.getLambdaMD()
+lambdaMDRef= 0.76*math.sqrt(E/steel.fy/steel.Ry) # 16.58
+ratio4= abs(lambdaMD-lambdaMDRef)/lambdaMDRef
+lambdaHD= hss.getLambdaHD()
+lambdaHDRef= 0.65*math.sqrt(E/steel.fy/steel.Ry) # 14.18
+ratio5= abs(lambdaHD-lambdaHDRef)/lambdaHDRef
+
+chss= ASTM_materials.CHSSShape(steel,'HSS16.000X0.375')
+lambdaMDCHSS= chss.getLambdaMD()
+lambdaMDCHSSRef= 0.062*E/steel.fy/steel.Ry # 29.52
+ratio6= abs(lambdaMDCHSS-lambdaMDCHSSRef)/lambdaMDCHSSRef
+FcrCHSS= chss.getCriticalStressF()
+FcrCHSSRef= 0.33*E/45.8 # 1513.1 MPa
+ratio7= abs(FcrCHSS-FcrCHSSRef)/FcrCHSSRef
+
+'''
+print('IPN_200 AreaQz= ', AreaQzIPN*1e4, 'cm2 (', AreaQzIPNRef*1e4, ') ratio1= ', ratio1)
+print('UC203x203x46 AreaQz= ', AreaQzUC*1e4, 'cm2 (', AreaQzUCRef*1e4, ') ratio2= ', ratio2)
+print('UB356x127x33 AreaQz= ', AreaQzUB*1e4, 'cm2 (', AreaQzUBRef*1e4, ') ratio3= ', ratio3)
+print('HSS lambdaMD= ', lambdaMD, '(', lambdaMDRef, ') ratio4= ', ratio4)
+print('HSS lambdaHD= ', lambdaHD, '(', lambdaHDRef, ') ratio5= ', ratio5)
+print('CHSS lambdaMD= ', lambdaMDCHSS, '(', lambdaMDCHSSRef, ') ratio6= ', ratio6)
+print('CHSS Fcr= ', FcrCHSS/1e6, 'MPa (', FcrCHSSRef/1e6, ') ratio7= ', ratio7)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if((ratio1<1e-12) and (ratio2<1e-12) and (ratio3<1e-12) and (ratio4<1e-12) and (ratio5<1e-12) and (ratio6<1e-12) and (ratio7<1e-12)):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+''' Check that the Wood-Armer internal forces computed for many shell 
+    material points at once (getWoodArmerArray) are equal to those
+    computed point by point (ShellMaterialInternalForces.getWoodArmer).'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022, LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import random
+import numpy
+from materials.sections import internal_forces
+
+random.seed(1)
+numPoints= 50
+theta= 0.3
+shellForces= list()
+for i in range(0,numPoints):
+    shellForces.append([random.uniform(-100.0,100.0) for j in range(0,8)])
+shellForces[0][3]= 0.0 # m1= 0
+shellForces[1][0]= 0.0 # n1= 0
+
+err= 0.0
+for alsoForAxialForces in [False, True]:
+    woodArmer= internal_forces.getWoodArmerArray(shellForces, alsoForAxialForces= alsoForAxialForces)
+    rotatedForces= internal_forces.transformShellInternalForcesArray(numpy.array(shellForces), theta)
+    rotatedWoodArmer= internal_forces.getWoodArmerArray(rotatedForces, alsoForAxialForces= alsoForAxialForces)
+    for i, row in enumerate(shellForces):
+        forces= internal_forces.ShellMaterialInternalForces(*row)
+        refValues= [f.getComponents() for f in forces.getWoodArmer(alsoForAxialForces= alsoForAxialForces)]
+        err+= numpy.linalg.norm(woodArmer[i]-numpy.array(refValues))**2
+        forces.transform(theta)
+        refValues= [f.getComponents() for f in forces.getWoodArmer(alsoForAxialForces= alsoForAxialForces)]
+        err+= numpy.linalg.norm(rotatedWoodArmer[i]-numpy.array(refValues))**2
+err= numpy.sqrt(err)
+
+'''
+print('err= ', err)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(err<1e-10):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
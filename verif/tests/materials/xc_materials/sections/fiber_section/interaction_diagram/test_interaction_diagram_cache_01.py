@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+''' Check the reuse of the interaction diagrams of identical sections
+    (inside the same run and across runs using a cache folder).
+   Home made test.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com ana.ortega@ciccp.es"
+
+import os
+import shutil
+import tempfile
+import geom
+import xc
+from materials.ehe import EHE_materials
+from materials.sections.fiber_section import def_simple_RC_section
+from materials.sections import RC_sections_container as sc
+from postprocess import element_section_map
+
+concrete= EHE_materials.HA30
+reinfSteel= EHE_materials.B500S
+areaFi12= 1.13e-4
+basicCover= 0.04
+sepT= 0.15
+
+def getSections():
+    ''' Return a section container with a slab section whose both
+        directions have the same reinforcement.'''
+    retval= sc.SectionContainer()
+    deckSections= element_section_map.RCSlabBeamSection("deck","RC deck.",concrete, reinfSteel,0.3)
+    rows= def_simple_RC_section.LongReinfLayers([def_simple_RC_section.ReinfRow(rebarsDiam=12e-3,areaRebar=areaFi12,rebarsSpacing=sepT,nominalCover=basicCover)])
+    deckSections.dir1PositvRebarRows= rows
+    deckSections.dir1NegatvRebarRows= rows
+    deckSections.dir2PositvRebarRows= rows
+    deckSections.dir2NegatvRebarRows= rows
+    retval.append(deckSections)
+    return retval
+
+def computeDiagrams(cacheFolder):
+    ''' Compute the interaction diagrams in a new problem and return the
+        cache statistics and the capacity factor for a given load.'''
+    feProblem= xc.FEProblem()
+    preprocessor= feProblem.getPreprocessor
+    sections= getSections()
+    sections.createRCsections(preprocessor= preprocessor, matDiagType= 'd')
+    sections.calcInteractionDiagrams(preprocessor, cacheFolder= cacheFolder)
+    diagrams= list(sections.mapInteractionDiagrams.values())
+    fc= diagrams[0].getCapacityFactor(geom.Pos3d(-500e3, 50e3, 0.0))
+    fcOther= diagrams[1].getCapacityFactor(geom.Pos3d(-500e3, 50e3, 0.0))
+    return sections.interactionDiagramCache.getStatistics(), fc, fcOther
+
+cacheFolder= tempfile.mkdtemp()
+stats1, fc1, fc1Other= computeDiagrams(cacheFolder)
+stats2, fc2, fc2Other= computeDiagrams(cacheFolder)
+numFiles= len(os.listdir(cacheFolder))
+shutil.rmtree(cacheFolder)
+
+# First run: the two directions have identical sections.
+ok1= ((stats1['misses']==1) and (stats1['hits']==1) and (stats1['diskHits']==0))
+# Second run: the diagram is read from disk.
+ok2= ((stats2['misses']==0) and (stats2['hits']==1) and (stats2['diskHits']==1))
+ratio1= abs(fc1-fc1Other)
+ratio2= abs(fc2-fc1)/fc1
+
+'''
+print(stats1, fc1, fc1Other)
+print(stats2, fc2, fc2Other)
+print(numFiles)
+print(ratio1, ratio2)
+'''
+
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(ok1 and ok2 and (numFiles==1) and (ratio1<1e-12) and (ratio2<1e-9)):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+''' Check that the reuse of the preloaded state when computing the
+    internal forces for each combination gives the same results that
+    the solution of the preload phase for each combination. The model
+    is the one of example E1.7 of the document NDS Structural Wood
+    Design Examples 2015/2018 Edition.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis Claudio Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022, LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import geom
+import xc
+from model import predefined_spaces
+from actions import load_cases
+from actions import combinations as combs
+from postprocess.config import default_config
+from postprocess import limit_state_data as lsd
+from materials.awc_nds import AWCNDS_limit_state_checking as nds
+from materials.awc_nds import AWCNDS_materials
+from materials.awc_nds import dimensional_lumber
+from materials.awc_nds import AWCNDS_analysis_context
+
+# Units
+inchToMeter= 2.54/100.0
+footToMeter= 0.3048
+poundToN= 4.44822
+psiToPa= 6894.76
+psfToPa= 47.88026
+
+def getLoadCombDurationFactor(loadComb):
+    components= loadComb.getComponents('')
+    dl= ('deadLoad' in components)
+    sl= ('snowLoad' in components)
+    wl= ('windLoad' in components)
+    return AWCNDS_materials.getLoadCombinationDurationFactor(deadLoad= dl, snowLoad= sl, windLoad= wl)
+
+# Problem type
+steelBeam= xc.FEProblem()
+steelBeam.title= 'Example 4.7 Structural Wood Design'
+preprocessor= steelBeam.getPreprocessor
+nodes= preprocessor.getNodeHandler
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+
+# Materials
+wood= dimensional_lumber.SouthernPineWood(name='SouthernPine', grade= 'no_1', sub_grade= '')
+columnSection= AWCNDS_materials.DimensionLumberSection(name= '2x6', woodMaterial= wood)
+xcSection= columnSection.defElasticShearSection3d(preprocessor)
+
+# Model geometry
+height= 9*footToMeter
+w_trib= 4.0*footToMeter
+
+## Points.
+pointHandler= preprocessor.getMultiBlockTopology.getPoints
+p0= pointHandler.newPoint(geom.Pos3d(0.0,0.0,0.0))
+p1= pointHandler.newPoint(geom.Pos3d(0.0,0.0,height))
+
+## Lines
+lineHandler= preprocessor.getMultiBlockTopology.getLines
+l1= lineHandler.newLine(p0.tag,p1.tag)
+l1.nDiv= 10
+
+# Mesh generation.
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+trfs= preprocessor.getTransfCooHandler
+lin= trfs.newLinearCrdTransf3d('lin')
+lin.xzVector= xc.Vector([0,1,0])
+seedElemHandler= preprocessor.getElementHandler.seedElemHandler
+seedElemHandler.defaultMaterial= xcSection.name
+seedElemHandler.defaultTransformation= lin.name
+elem= seedElemHandler.newElement("ElasticBeam3d",xc.ID([0,0]))
+
+xcTotalSet= modelSpace.getTotalSet()
+mesh= xcTotalSet.genMesh(xc.meshDir.I)
+
+# Constraints
+n0= p0.getNode()
+n1= p1.getNode()
+modelSpace.fixNode('000_FF0',n0.tag)
+modelSpace.fixNode('00F_FFF',n1.tag)
+
+# Actions
+loadCaseManager= load_cases.LoadCaseManager(preprocessor)
+loadCaseNames= ['deadLoad','snowLoad','windLoad','windLoadNeg']
+loadCaseManager.defineSimpleLoadCases(loadCaseNames)
+
+## Dead load.
+deadLoadVector= xc.Vector([0.0,0.0,-560*poundToN,0,0,0])
+cLC= loadCaseManager.setCurrentLoadCase('deadLoad')
+cLC.newNodalLoad(n1.tag,deadLoadVector)
+
+## Snow load.
+snowLoadVector= xc.Vector([0.0,0.0,-840*poundToN,0,0,0])
+cLC= loadCaseManager.setCurrentLoadCase('snowLoad')
+cLC.newNodalLoad(n1.tag,snowLoadVector)
+
+## Wind load.
+windLoadVector= xc.Vector([-25*psfToPa*w_trib,0.0,0.0])
+cLC= loadCaseManager.setCurrentLoadCase('windLoad')
+for e in xcTotalSet.elements:
+    e.vector3dUniformLoadGlobal(windLoadVector)
+    
+## Wind load.
+cLC= loadCaseManager.setCurrentLoadCase('windLoadNeg')
+for e in xcTotalSet.elements:
+    e.vector3dUniformLoadGlobal(-windLoadVector)
+    
+## Load combinations
+combContainer= combs.CombContainer()
+### Ultimate limit state.
+combContainer.ULS.perm.add('LC1','1.0*deadLoad+1.0*snowLoad+1.0*windLoad')
+combContainer.ULS.perm.add('LC2','1.0*deadLoad+1.0*snowLoad')
+combContainer.ULS.perm.add('LC3','1.0*deadLoad')
+combContainer.ULS.perm.add('LC4','1.0*deadLoad+1.0*snowLoad+1.0*windLoadNeg')
+combContainer.ULS.perm.add('LC5','1.2*deadLoad+1.0*snowLoad')
+combContainer.ULS.perm.add('LC6','1.2*deadLoad+1.0*windLoad')
+
+# Compute internal forces.
+
+## Setup working directory.
+cfg= default_config.get_temporary_env_config()
+lsd.LimitStateData.envConfig= cfg
+loadCombinations= preprocessor.getLoadHandler.getLoadCombinations
+
+## Limit state to calculate internal forces for.
+limitState= lsd.woodNormalStressesResistance
+loadCombinations= limitState.dumpCombinations(combContainer,loadCombinations)
+
+## Create NDS Member objects.
+ndsCalcSet= modelSpace.defSet('ndsCalcSet') # Elements to be checked as NDS members.
+ndsMembers= list() # NDS members list.
+for l in xcTotalSet.getLines:
+    Lx= .01*l.getLength() # continuously braced.
+    member= nds.Member(name= l.name, section= columnSection, unbracedLengthX= Lx, unbracedLengthZ= l.getLength(), lstLines= [l], memberRestraint= AWCNDS_materials.MemberRestraint.compressionEdgeSupport, loadCombDurationFactorFunction= getLoadCombDurationFactor)
+    member.installULSControlRecorder(recorderType="element_prop_recorder", calcSet= ndsCalcSet)
+    ndsMembers.append(member)
+
+def computeInternalForces(reusePreloadStates):
+    ''' Compute the internal forces for each combination.'''
+    analysisContext= AWCNDS_analysis_context.SimpleAnalysisContext(modelSpace= modelSpace, calcSet= ndsCalcSet, bucklingMembers= ndsMembers, silent= True)
+    analysisContext.preloadPatterns= ['deadLoad']
+    analysisContext.reusePreloadStates= reusePreloadStates
+    analysisContext.calcInternalForces(loadCombinations, limitState)
+    return analysisContext
+
+def getMaxDifference(a, b):
+    ''' Return the maximum difference between the numbers of the
+        dictionaries arguments.'''
+    retval= 0.0
+    if(isinstance(a, dict)):
+        if(set(a.keys())!=set(b.keys())):
+            retval= float('inf')
+        else:
+            for key in a:
+                retval= max(retval, getMaxDifference(a[key], b[key]))
+    elif(isinstance(a, float)):
+        retval= abs(a-b)
+    return retval
+
+refContext= computeInternalForces(reusePreloadStates= False)
+analysisContext= computeInternalForces(reusePreloadStates= True)
+stats= analysisContext.getPreloadStatesStatistics()
+err= getMaxDifference(refContext.internalForcesDict, analysisContext.internalForcesDict)
+# Two different preload factors (1.0 and 1.2).
+ok= (stats['misses']==2) and (stats['hits']==4) and (stats['storedStates']==2)
+# The files of the preloaded states are removed at the end of the analysis.
+ok= ok and (analysisContext.preloadStatesDirectory is None)
+
+# Restoring a preloaded state doesn't apply the preload patterns twice.
+checkContext= AWCNDS_analysis_context.SimpleAnalysisContext(modelSpace= modelSpace, calcSet= ndsCalcSet, bucklingMembers= ndsMembers, silent= True)
+checkContext.preloadPatterns= ['deadLoad']
+checkContext.reusePreloadStates= True
+comb= loadCombinations['LC3'] # 1.0*deadLoad
+checkContext.resetPhase(comb)
+checkContext.preloadPhase(comb) # solved and stored.
+solvedDisp= n1.getDisp[2]
+comb.removeFromDomain()
+checkContext.resetPhase(comb)
+checkContext.preloadPhase(comb) # restored.
+checkContext.solutionStep(currentCombination= comb) # solve again.
+restoredDisp= n1.getDisp[2]
+comb.removeFromDomain()
+checkContext.clearPreloadStates()
+preloadOk= (checkContext.getPreloadStatesStatistics()['hits']==1) and (abs(restoredDisp-solvedDisp)<=1e-9*abs(solvedDisp)) and (abs(solvedDisp)>0.0)
+
+'''
+print(stats)
+print(err)
+print(solvedDisp, restoredDisp)
+'''
+
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(ok and (err<1e-6) and preloadOk):
+    print("test "+fname+": ok.")
+else:
+    lmsg.error("test "+fname+": ERROR.")
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+'''Check that the results of the shear checking obtained solving the
+   phantom model section by section (serially and using two worker
+   processes) are the same that those obtained solving the whole phantom
+   model. Home made test.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com ana.ortega@ciccp.es"
+
+import math
+import xc
+from solution import predefined_solutions
+from model import predefined_spaces
+from materials.ec2 import EC2_materials
+from materials.ec2 import EC2_limit_state_checking
+from materials.sections import section_properties
+from actions import combinations as combs
+from postprocess import limit_state_data as lsd
+from postprocess import RC_material_distribution
+from materials.sections.fiber_section import def_simple_RC_section
+from postprocess import element_section_map
+from postprocess.config import default_config
+import os
+import logging
+
+from misc_utils import log_messages as lmsg
+
+#Hide INFO messages from modules.
+rootLogger = logging.getLogger()
+rootLogger.setLevel(logging.ERROR)
+
+
+# Geometry
+L= 1.0 # Bar length (m)
+
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+
+# Materials
+sectionGeometry= section_properties.RectangularSection("test",b=.3,h=.4)
+concr= EC2_materials.C25
+concr.alfacc=1    #f_maxd= 0.85*fcd concrete long term compressive strength factor (normally alfacc=1)
+section= concr.defElasticShearSection3d(preprocessor, sectionGeometry)
+
+# Problem type
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+
+#Mesh.
+numDiv= 4
+beamNodes= [nodes.newNodeXYZ(L*i/numDiv,0.0,0.0) for i in range(0,numDiv+1)]
+
+lin= modelSpace.newLinearCrdTransf("lin",xc.Vector([0,1,0]))
+
+elements= preprocessor.getElementHandler
+elements.defaultTransformation= lin.name
+elements.defaultMaterial= section.name
+for nA, nB in zip(beamNodes[:-1], beamNodes[1:]):
+    elements.newElement("ElasticBeam3d",xc.ID([nA.tag,nB.tag]))
+
+#Constraints.
+modelSpace.fixNode000_000(beamNodes[0].tag)
+
+#Loads.
+Fx= -400e3 # Axial force for shear checking.
+Fz= 1e3 # Bending moment force for shear checking.
+Fy= 1e5 # Bending moment force for shear checking.
+loadHandler= preprocessor.getLoadHandler
+lPatterns= loadHandler.getLoadPatterns
+#Load modulation.
+ts= lPatterns.newTimeSeries("constant_ts","ts")
+lPatterns.currentTimeSeries= "ts"
+#Load case definition
+lp0= lPatterns.newLoadPattern("default","lp0")
+lp0.newNodalLoad(beamNodes[-1].tag,xc.Vector([Fx,Fy,Fz,0,0,0]))
+lp1= lPatterns.newLoadPattern("default","lp1")
+lp1.newNodalLoad(beamNodes[-1].tag,xc.Vector([0.0,-0.5*Fy,2*Fz,0,0,0]))
+lp2= lPatterns.newLoadPattern("default","lp2")
+lp2.newNodalLoad(beamNodes[2].tag,xc.Vector([0.5*Fx,0.0,0.0,0,0,0]))
+
+# Load combinations
+combContainer= combs.CombContainer()
+combContainer.ULS.perm.add('ULS01', '1.0*lp0')
+combContainer.ULS.perm.add('ULS02', '1.35*lp0+1.5*lp1')
+combContainer.ULS.perm.add('ULS03', '1.0*lp0+1.5*lp2')
+combContainer.ULS.perm.add('ULS04', '1.35*lp0+1.5*lp1+0.9*lp2')
+totalSet= preprocessor.getSets.getSet('total')
+## Compute internal forces.
+cfg= default_config.get_temporary_env_config()
+lsd.LimitStateData.envConfig= cfg
+lsd.shearResistance.saveAll(combContainer,totalSet) 
+
+# Define available sections for the elements (spatial distribution of RC sections).
+# It refers to the reinforced concrete sections associated with the element
+# (i.e. for shell elements we typically define two RC sections, one for each
+# main direction; in the case of beam elements the most common way is to define
+# RC sections in the front and back ends of the elements)
+reinfConcreteSectionDistribution= RC_material_distribution.RCMaterialDistribution()
+sections= reinfConcreteSectionDistribution.sectionDefinition # get the sections container
+
+#Generic layers (rows of rebars). Other instance variables that we can define
+#for ReinfRows are coverLat and nRebars. If we define nRebars that
+#value overrides the rebarsSpacing
+barArea= 4e-4
+
+reinfLayer= def_simple_RC_section.ReinfRow(areaRebar= barArea,rebarsSpacing=0.075,width=0.25,nominalCover=0.050)
+
+#instances of element_section_map.RCSlabBeamSection that defines the
+#variables that make up THE TWO reinforced concrete sections in the two
+#reinforcement directions of a slab or the front and back ending sections
+#of a beam element
+reinfSteel= EC2_materials.S500B
+beamRCsect= element_section_map.RCSlabBeamSection(name='beamRCsect',sectionDescr='beam section',concrType=concr, reinfSteelType=reinfSteel,width= sectionGeometry.b,depth= sectionGeometry.h)
+beamRCsect.dir1PositvRebarRows= def_simple_RC_section.LongReinfLayers([reinfLayer])
+beamRCsect.dir1NegatvRebarRows= def_simple_RC_section.LongReinfLayers([reinfLayer])
+beamRCsect.dir2PositvRebarRows= def_simple_RC_section.LongReinfLayers([reinfLayer])
+beamRCsect.dir2NegatvRebarRows= def_simple_RC_section.LongReinfLayers([reinfLayer])
+sections.append(beamRCsect)
+
+# Spatial distribution of reinforced concrete
+# sections (assign RC sections to elements).
+reinfConcreteSectionDistribution.assign(elemSet=totalSet.getElements,setRCSects=beamRCsect)
+
+# Checking shear.
+## Limit state to check.
+limitState= lsd.shearResistance
+## Build controller.
+controller= EC2_limit_state_checking.ShearController(limitStateLabel= limitState.label)
+controller.analysisToPerform= predefined_solutions.plain_newton_raphson
+## Perform checking.
+### Solving the whole phantom model.
+refMeanFCs= limitState.check(setCalc= None, crossSections= reinfConcreteSectionDistribution, listFile='N',calcMeanCF='Y', threeDim= True, controller= controller)
+### Section by section.
+meanFCs1= limitState.check(setCalc= None, crossSections= reinfConcreteSectionDistribution, listFile='N',calcMeanCF='Y', threeDim= True, controller= controller, sectionSolver= True)
+### Section by section using two processes.
+meanFCs2= limitState.check(setCalc= None, crossSections= reinfConcreteSectionDistribution, listFile='N',calcMeanCF='Y', threeDim= True, controller= controller, sectionSolver= True, numProcesses= 2)
+
+# Check results.
+err= 0.0
+for meanFCs in [meanFCs1, meanFCs2]:
+    for meanFC, refMeanFC in zip(meanFCs, refMeanFCs):
+        err= max(err, abs(meanFC-refMeanFC)/refMeanFC)
+
+'''
+print("reference mean FCs: ", refMeanFCs)
+print("mean FCs (one process): ", meanFCs1)
+print("mean FCs (two processes): ", meanFCs2)
+print("err= ", err)
+'''
+
+cfg.cleandirs()  # Clean after yourself.
+fname= os.path.basename(__file__)
+if((len(meanFCs1)==2) and (len(meanFCs2)==2) and (err<1e-4)):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
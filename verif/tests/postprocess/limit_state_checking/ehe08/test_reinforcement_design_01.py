@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+''' Automatic design of the reinforcement of a deck from the results of
+    the normal stresses limit state checking.'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com ana.ortega@ciccp.es"
+
+import os
+import json
+import shutil
+import xc
+from materials.ehe import EHE_materials
+from postprocess import element_section_map
+from postprocess import RC_material_distribution
+from postprocess import RC_reinforcement_design
+from materials.sections.fiber_section import def_simple_RC_section
+from materials.ehe import EHE_limit_state_checking
+from postprocess import limit_state_data as lsd
+from postprocess.config import default_config
+
+import logging
+
+#Hide INFO messages from modules.
+rootLogger = logging.getLogger()
+rootLogger.setLevel(logging.ERROR)
+
+feProblem= xc.FEProblem()
+
+elementTags= [2524,2527]
+#Reinforced concrete sections on each element.
+reinfConcreteSections= RC_material_distribution.RCMaterialDistribution()
+
+# Set-up material distribution and element dimensions.
+for eTag in elementTags:
+    reinfConcreteSections.sectionDistribution[eTag]= ["deck2","deck1"]
+    reinfConcreteSections.sectionDistribution.elementDimension[eTag]= 2
+
+# deck (the reinforcement will be designed).
+concrete= EHE_materials.HA30
+concrete.alfacc= 0.85  #f_maxd= 0.85*fcd concrete long term compressive strength factor (normally alfacc=1)
+reinfSteel= EHE_materials.B500S
+basicCover= 0.06
+
+sections= reinfConcreteSections.sectionDefinition # Get the sections container.
+deckSections= element_section_map.RCSlabBeamSection("deck","RC deck.",concrete, reinfSteel,0.3)
+sections.append(deckSections)
+
+# Candidate rebar families.
+rebarFamilies= EHE_limit_state_checking.define_rebar_families(steel= reinfSteel, cover= basicCover, diameters= [10e-3, 12e-3, 16e-3, 20e-3, 25e-3], spacings= [0.1, 0.15, 0.2])
+
+pth= os.path.dirname(__file__)
+#print("pth= ", pth)
+if(not pth):
+    pth= "."
+
+cfg= default_config.get_temporary_env_config()
+cfg.projectDirTree.createTree() # To allow copying existing internal force data into.
+lsd.LimitStateData.envConfig= cfg
+internalForcesFName= pth+"/../../../aux/internal_forces/intForce_ULS_normalStressesResistance.csv"
+shutil.copy(internalForcesFName, lsd.normalStressesResistance.getInternalForcesFileName())
+
+## Limit states to check.
+limitState= lsd.normalStressesResistance
+controller= EHE_limit_state_checking.BiaxialBendingNormalStressController(limitState.label)
+## The shear reinforcement is not designed: the shear limit state
+## is ignored.
+shearController= EHE_limit_state_checking.ShearController(lsd.shearResistance.label)
+
+# Design the reinforcement.
+feProblem.errFileName= "/tmp/erase.err" # Ignore warning messagess about maximum error in computation of the interaction diagram.
+designer= RC_reinforcement_design.RCReinforcementDesigner(materialDistribution= reinfConcreteSections, rebarFamilies= rebarFamilies, limitStates= [(limitState, controller), (lsd.shearResistance, shearController)])
+limitStatesOk= (len(designer.limitStates)==1) and (designer.limitStates[0][1] is controller)
+ok= designer.run()
+
+# Check the design: all the faces have been checked and no efficiency
+# is greater than one.
+faces= designer.getDict()
+efficiencies= [faces[faceName]['efficiency'] for faceName in faces]
+maxEfficiency= max(efficiencies)
+# The bending moment is negative for all the combinations, so the
+# positive faces keep the lightest family (10 mm bars spaced 20 cm) and
+# the negative faces need more reinforcement.
+positiveFaces= [faceName for faceName in faces if faceName.endswith('+')]
+negativeFaces= [faceName for faceName in faces if faceName.endswith('-')]
+familiesOk= (len(positiveFaces)==2) and (len(negativeFaces)==2)
+for faceName in positiveFaces:
+    familiesOk= familiesOk and (faces[faceName]['rebarFamily']=='A10_20')
+familiesOk= familiesOk and (max([faces[faceName]['As'] for faceName in negativeFaces])>faces[positiveFaces[0]]['As'])
+feProblem.errFileName= "cerr" # From now on display errors if any.
+
+# The designed sections can be serialized.
+outputFileName= cfg.projectDirTree.getFullVerifPath()+'designed_sections.json'
+reinfConcreteSections.writeToJSON(outputFileName)
+with open(outputFileName) as f:
+    sectionsData= json.load(f)
+designedSections= sectionsData['sectionDefinition']['sections'][0]['lstRCSects']
+designedRows= designedSections[0]['positvRebarRows']['rebarRows']
+serializationOk= (abs(designedRows[0]['rebarsDiam']-deckSections.lstRCSects[0].positvRebarRows.rebarRows[0].rebarsDiam)<1e-6)
+## Read the designed reinforcement back.
+for designedSection, rcs in zip(designedSections, deckSections.lstRCSects):
+    readSection= def_simple_RC_section.RCRectangularSection(concrType= concrete, reinfSteelType= reinfSteel)
+    readSection.setFromDict(designedSection)
+    serializationOk= serializationOk and (readSection.positvRebarRows==rcs.positvRebarRows) and (readSection.negatvRebarRows==rcs.negatvRebarRows)
+
+'''
+designer.report()
+print('history: ', designer.history)
+print('interaction diagrams: ', designer.diagramStatistics)
+print('maxEfficiency= ', maxEfficiency)
+print('serializationOk= ', serializationOk)
+print('limitStatesOk= ', limitStatesOk)
+print('familiesOk= ', familiesOk)
+'''
+
+cfg.cleandirs() # Clean after yourself.
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if ok and (maxEfficiency<=1.0) and (maxEfficiency>0.0) and serializationOk and limitStatesOk and familiesOk:
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
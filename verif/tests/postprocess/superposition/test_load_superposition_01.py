@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+''' Check that the results obtained by linear superposition of the load
+    pattern results (LimitStateData.saveAll with superposition= True) are
+    the same that those obtained solving each combination.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022, LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import math
+import os
+import json
+import logging
+import xc
+from model import predefined_spaces
+from materials import typical_materials
+from actions import combinations as combs
+from solution import predefined_solutions
+from postprocess import limit_state_data as lsd
+from postprocess.config import default_config
+from misc_utils import log_messages as lmsg
+
+L= 2.0 # Length of the cantilever.
+F= 1e3 # Force magnitude.
+q= 2e3 # Uniform load.
+
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+modelSpace= predefined_spaces.StructuralMechanics2D(nodes)
+
+# Problem geometry
+n0= nodes.newNodeXY(0.0,0.0)
+n1= nodes.newNodeXY(L,0.0)
+
+# Geometric transformation and material.
+lin= modelSpace.newLinearCrdTransf("lin")
+scc= typical_materials.defElasticSection2d(preprocessor, "scc", A= 0.125, E= 30e9, I= 2.6e-3)
+
+# Elements definition
+elements= preprocessor.getElementHandler
+elements.defaultTransformation= lin.name
+elements.defaultMaterial= scc.name
+beam2d= elements.newElement("ElasticBeam2d",xc.ID([n0.tag,n1.tag]))
+
+# Constraints
+modelSpace.fixNode000(n0.tag)
+
+# Loads definition
+lp0= modelSpace.newLoadPattern(name= 'lp0')
+eleLoad= lp0.newElementalLoad("beam2d_uniform_load")
+eleLoad.elementTags= xc.ID([beam2d.tag])
+eleLoad.transComponent= -q
+lp1= modelSpace.newLoadPattern(name= 'lp1')
+lp1.newNodalLoad(n1.tag,xc.Vector([F,0,0]))
+lp2= modelSpace.newLoadPattern(name= 'lp2')
+lp2.newNodalLoad(n1.tag,xc.Vector([0,-F,F*L]))
+
+# Load combinations
+combContainer= combs.CombContainer()
+combContainer.ULS.perm.add('ULS01', '1.35*lp0+1.5*lp1')
+combContainer.ULS.perm.add('ULS02', '1.35*lp0+1.5*lp1+0.9*lp2')
+combContainer.ULS.perm.add('ULS03', '1.00*lp0 + 1.5*lp2')
+combContainer.ULS.perm.add('ULS04', '0.8*lp2')
+
+totalSet= preprocessor.getSets.getSet('total')
+cfg= default_config.get_temporary_env_config()
+lsd.LimitStateData.envConfig= cfg
+limitState= lsd.normalStressesResistance
+fixedNodes= modelSpace.defSet('fixedNodes', nodes= [n0])
+
+def readResults(ls):
+    ''' Read the internal forces and reactions written by saveAll.'''
+    with open(ls.getInternalForcesFileName()) as f:
+        intForces= json.load(f)
+    with open(ls.getReactionsFileName()) as f:
+        reactions= json.load(f)
+    return intForces, reactions
+
+# Solve each combination.
+limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes)
+refIntForces, refReactions= readResults(limitState)
+# Use linear superposition.
+limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes, superposition= True)
+intForces, reactions= readResults(limitState)
+
+err= 0.0
+for combName in refIntForces:
+    refComb= refIntForces[combName]
+    comb= intForces[combName]
+    for eTag in refComb:
+        refElemForces= refComb[eTag]['internalForces']
+        elemForces= comb[eTag]['internalForces']
+        for sectionId in refElemForces:
+            for key in refElemForces[sectionId]:
+                err+= (refElemForces[sectionId][key]-elemForces[sectionId][key])**2
+    refCombReactions= refReactions[combName]
+    combReactions= reactions[combName]
+    for nTag in refCombReactions:
+        refNodeReactions= refCombReactions[nTag]['reactions']
+        nodeReactions= combReactions[nTag]['reactions']
+        for key in refNodeReactions:
+            err+= (refNodeReactions[key]-nodeReactions[key])**2
+err= math.sqrt(err)/F
+
+# Superposition must be refused for non-linear solution procedures.
+feProblem.errFileName= "/tmp/erase.err" # Don't print errors.
+nonLinearResult= limitState.saveAll(combContainer, totalSet, solutionProcedureType= predefined_solutions.PenaltyNewtonRaphson, superposition= True)
+feProblem.errFileName= "cerr" # Print errors if any
+
+# Combinations with undefined load patterns are refused before solving.
+wrongCombContainer= combs.CombContainer()
+wrongCombContainer.ULS.perm.add('ULS05', '1.35*lp0+1.5*lp3')
+lmsg.setLevel(logging.CRITICAL) # Don't print errors.
+missingResult= limitState.saveAll(wrongCombContainer, totalSet, constrainedNodeSet= fixedNodes.nodes, superposition= True)
+lmsg.setLevel(logging.INFO) # Print errors if any.
+
+'''
+print('err= ', err)
+print('non-linear result: ', nonLinearResult)
+print('missing load pattern result: ', missingResult)
+'''
+
+cfg.cleandirs() # Clean after yourself.
+fname= os.path.basename(__file__)
+if((len(intForces)==4) and (err<1e-10) and (nonLinearResult!=0) and (missingResult==-1)):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
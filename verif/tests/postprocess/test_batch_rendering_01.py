@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+''' Check that the figures of a batch are rendered only when the results
+    of the load case or the display parameters change (the graphic files
+    are replaced here by small text files so the test doesn't need an
+    off-screen render window).'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import os
+import shutil
+import tempfile
+import geom
+import xc
+from model import predefined_spaces
+from materials import typical_materials
+from postprocess.reports import batch_rendering
+
+# Problem type
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+
+# Materials definition
+plateSection= typical_materials.defElasticMembranePlateSection(preprocessor, "plateSection",E= 30e9,nu= 0.2,rho= 2500,h= 0.25)
+
+# Mesh.
+points= preprocessor.getMultiBlockTopology.getPoints
+pt1= points.newPoint(geom.Pos3d(0,0,0))
+pt2= points.newPoint(geom.Pos3d(4,0,0))
+pt3= points.newPoint(geom.Pos3d(4,3,0))
+pt4= points.newPoint(geom.Pos3d(0,3,0))
+surfaces= preprocessor.getMultiBlockTopology.getSurfaces
+s= surfaces.newQuadSurfacePts(pt1.tag,pt2.tag,pt3.tag,pt4.tag)
+s.nDivI= 4
+s.nDivJ= 3
+seedElemHandler= preprocessor.getElementHandler.seedElemHandler
+seedElemHandler.defaultMaterial= plateSection.name
+elem= seedElemHandler.newElement("ShellMITC4",xc.ID([0,0,0,0]))
+s.genMesh(xc.meshDir.I)
+
+# Constraints
+for p in [pt1, pt2, pt3, pt4]:
+    modelSpace.fixNode000_FFF(p.getNode().tag)
+
+# Load patterns.
+xcTotalSet= modelSpace.getTotalSet()
+centerNode= xcTotalSet.nodes.getNearestNode(geom.Pos3d(2,1.5,0))
+lpA= modelSpace.newLoadPattern(name= 'A')
+lpA.newNodalLoad(centerNode.tag, xc.Vector([0,0,-100e3,0,0,0]))
+lpB= modelSpace.newLoadPattern(name= 'B')
+lpB.newNodalLoad(centerNode.tag, xc.Vector([0,0,-50e3,0,0,0]))
+
+# Replace the rendering by the writing of a small file.
+renderedFiles= list()
+def fakeRender(self, outputHandler):
+    with open(self.fileName, 'w') as f:
+        f.write(self.loadCaseName+' '+str(self.itemToDisp))
+    renderedFiles.append(self.fileName)
+batch_rendering.FigureRequest.render= fakeRender
+
+outputDir= tempfile.mkdtemp()
+manifestFileName= os.path.join(outputDir, 'figure_digests.json')
+def buildReport(loadCases, numProcesses= 1):
+    ''' Render the displacement figures of the given load cases.'''
+    figureBatch= batch_rendering.FigureBatch(modelSpace, manifestFileName= manifestFileName)
+    for name, expr in loadCases:
+        for itemToDisp in ['uX', 'uZ']:
+            figureBatch.addFigure('dispRot', name, expr, xcTotalSet, fileName= os.path.join(outputDir, name+itemToDisp+'.png'), itemToDisp= itemToDisp)
+    del renderedFiles[:]
+    figureBatch.render(numProcesses= numProcesses)
+    return figureBatch.statistics
+
+loadCases= [('ELU01', '1.0*A'), ('ELU02', '1.0*B')]
+# First build: all the figures are rendered.
+stats1= buildReport(loadCases, numProcesses= 2)
+ok1= (stats1['numRendered']==4) and (stats1['numSkipped']==0) and (stats1['numFailed']==0)
+# Nothing has changed.
+stats2= buildReport(loadCases)
+ok2= (stats2['numRendered']==0) and (stats2['numSkipped']==4)
+# The second load case changes.
+loadCases[1]= ('ELU02', '1.5*B')
+stats3= buildReport(loadCases)
+ok3= (stats3['numRendered']==2) and (stats3['numSkipped']==2) and all(['ELU02' in f for f in renderedFiles])
+# A graphic file is missing.
+os.remove(os.path.join(outputDir, 'ELU01uX.png'))
+stats4= buildReport(loadCases)
+ok4= (stats4['numRendered']==1) and (renderedFiles==[os.path.join(outputDir, 'ELU01uX.png')])
+# Load on a fixed node: the displacements don't change but the
+# loads do.
+lpA.newNodalLoad(pt1.getNode().tag, xc.Vector([0,0,-10e3,0,0,0]))
+stats5= buildReport(loadCases)
+ok5= (stats5['numRendered']==2) and all(['ELU01' in f for f in renderedFiles])
+
+shutil.rmtree(outputDir, ignore_errors= True)
+
+'''
+print(stats1, ok1)
+print(stats2, ok2)
+print(stats3, ok3)
+print(stats4, ok4)
+print(stats5, ok5)
+'''
+
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(ok1 and ok2 and ok3 and ok4 and ok5):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
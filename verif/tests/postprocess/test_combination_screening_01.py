@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+''' Check that the combinations discarded by the screening (see
+    combination_screening module) cannot govern the checking when the
+    efficiency fulfills the conditions of each screening method.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import numpy as np
+from materials.sections import internal_forces
+from postprocess import combination_screening as cs
+
+# Internal forces of each load pattern (G, Q1, Q2 and W) on each section.
+rng= np.random.default_rng(1234)
+loadPatternForces= dict()
+for tagElem in [1, 2, 3]:
+    for idSection in [0, 1]:
+        values= rng.normal(size= (4, 6))*[500e3, 50e3, 20e3, 5e3, 80e3, 120e3]
+        if(tagElem==3):
+            values[:,2:4]= 0.0 # Vz= T= 0 (degenerate hull).
+        loadPatternForces[(tagElem, idSection)]= values
+# Combination factors.
+combFactors= list()
+for fG in [1.0, 1.35]:
+    for fQ1 in [0.0, 1.05, 1.5]:
+        for fQ2 in [0.0, 0.9, 1.5]:
+            for fW in [0.0, 0.9, -0.9, 1.5, -1.5]:
+                combFactors.append([fG, fQ1, fQ2, fW])
+numCombs= len(combFactors)
+# Internal forces (three elements with two sections).
+internalForcesValues= dict()
+for (tagElem, idSection), values in loadPatternForces.items():
+    if(tagElem not in internalForcesValues):
+        internalForcesValues[tagElem]= list()
+    for i, factors in enumerate(combFactors):
+        iforce= internal_forces.CrossSectionInternalForces(*np.dot(factors, values))
+        iforce.idComb= 'ULS'+str(i)
+        iforce.tagElem= tagElem
+        iforce.idSection= idSection
+        internalForcesValues[tagElem].append(iforce)
+
+# Convex efficiency: gauge of a polytope (interaction diagram) that
+# contains the origin.
+normals= rng.normal(size= (40, 6))/[1e6, 1e5, 1e5, 1e4, 2e5, 3e5]
+def convexEfficiency(iforce):
+    return max(0.0, np.max(normals.dot(iforce.getComponents())))
+
+# Efficiency that increases with the absolute value of each component.
+weights= np.array([1/1e6, 1/1e5, 1/1e5, 1/1e4, 1/2e5, 1/3e5])
+def monotonicEfficiency(iforce):
+    return np.sum((np.abs(iforce.getComponents())*weights)**1.5)
+
+def checkScreening(method, efficiency):
+    ''' Return true if the governing combination of each section is
+        not discarded by the screening.'''
+    candidates, statistics= cs.screen_internal_forces(internalForcesValues, method)
+    retval= (statistics['numInternalForces']==6*numCombs) and (statistics['numSections']==6)
+    for key in internalForcesValues:
+        for idSection in [0, 1]:
+            allForces= [f for f in internalForcesValues[key] if f.idSection==idSection]
+            screenedForces= [f for f in candidates[key] if f.idSection==idSection]
+            maxValue= max([efficiency(f) for f in allForces])
+            maxScreenedValue= max([efficiency(f) for f in screenedForces])
+            retval= retval and (abs(maxValue-maxScreenedValue)<=1e-12*maxValue) and (len(screenedForces)<len(allForces))
+    return retval, statistics
+
+ok1, convexHullStatistics= checkScreening('convexHull', convexEfficiency)
+ok2, paretoStatistics= checkScreening('pareto', monotonicEfficiency)
+# Exact: no combinations discarded.
+candidates, exactStatistics= cs.screen_internal_forces(internalForcesValues, 'exact')
+ok3= (exactStatistics['numCandidates']==6*numCombs) and (exactStatistics['numCandidateCombinations']==numCombs)
+
+'''
+print(cs.get_statistics_message(convexHullStatistics))
+print(cs.get_statistics_message(paretoStatistics))
+print(cs.get_statistics_message(exactStatistics))
+print(ok1, ok2, ok3)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(ok1 and ok2 and ok3):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
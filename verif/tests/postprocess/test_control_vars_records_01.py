@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+''' Check the typed storage of the control vars (one table per record
+    type) and the reading of the legacy format (constructor strings)
+    without using eval.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022, LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import json
+import tempfile
+from postprocess import control_vars as cv
+from misc_utils import log_messages as lmsg
+
+# Control vars for some elements.
+elementControlVars= [(1, 'ULS_shearResistanceSect1', cv.RCShearControlVars(idSection= 's1', combName= 'ULS01', CF= 0.55, N= -1e3, Vy= 2e3)),
+                     (1, 'ULS_shearResistanceSect2', cv.RCShearControlVars(idSection= 's2', combName= 'ULS02', CF= 0.75, N= -2e3, Vy= 3e3)),
+                     (2, 'ULS_shearResistanceSect1', cv.RCShearControlVars(idSection= 's1', combName= 'ULS03', CF= 1.05, N= -3e3, Vy= 4e3)),
+                     (2, 'ULS_shearResistanceSect2', cv.CrackControlVars(idSection= 's2', crackControlBaseVarsPos= cv.CrackControlBaseVars(combName= 'SLS01', CF= 0.35, N= 1e3, steelStress= 200e6), crackControlBaseVarsNeg= cv.CrackControlBaseVars(combName= 'SLS02', CF= 0.45, N= 2e3, steelStress= 250e6)))]
+
+# Typed format.
+tables= cv.getControlVarsTables(elementControlVars)
+dataDict= {'formatVersion': cv.controlVarsFormatVersion, 'elementRecords': [table.getDict() for table in tables]}
+typedFileName= tempfile.mktemp(suffix= '.json')
+with open(typedFileName, 'w') as f:
+    json.dump(dataDict, f)
+# Legacy format.
+legacyDict= {'elementData': dict()}
+for eTag, propName, controlVar in elementControlVars:
+    legacyDict['elementData'].setdefault(eTag, dict())[propName]= controlVar.getStrConstructor()
+legacyFileName= tempfile.mktemp(suffix= '.json')
+with open(legacyFileName, 'w') as f:
+    json.dump(legacyDict, f)
+
+# Two tables expected: RCShearControlVars and CrackControlVars.
+ok= (len(tables)==2)
+
+# Read the objects back from the typed format.
+with open(typedFileName) as f:
+    readTables= cv.getControlVarsTablesFromDict(json.load(f))
+objects= dict()
+for table in readTables:
+    for i in range(0, table.getNumberOfRecords()):
+        objects[(table.elementTags[i], table.propNames[i])]= table.getObject(i)
+for eTag, propName, controlVar in elementControlVars:
+    readObject= objects[(eTag, propName)]
+    ok= ok and (type(readObject)==type(controlVar)) and (readObject.getStrConstructor()==controlVar.getStrConstructor())
+
+# Read the capacity factors as NumPy arrays from both formats.
+for fileName in [typedFileName, legacyFileName]:
+    cfArrays= cv.readControlVarsArrays(fileName, 'CF')
+    tags, cfs= cfArrays['ULS_shearResistanceSect1']
+    ok= ok and (list(tags)==[1, 2]) and (list(cfs)==[0.55, 1.05])
+    tags, cfs= cfArrays['ULS_shearResistanceSect2']
+    ok= ok and (list(tags)==[1, 2]) and (list(cfs)==[0.75, 0.45])
+vyArrays= cv.readControlVarsArrays(typedFileName, 'Vy')
+ok= ok and (list(vyArrays['ULS_shearResistanceSect1'][1])==[2e3, 4e3])
+
+# Read the records (namedtuples) from both formats.
+for fileName in [typedFileName, legacyFileName]:
+    records= cv.readControlVarsRecords(fileName)
+    shearRecords= records['ULS_shearResistanceSect1']
+    ok= ok and (len(shearRecords)==2) and (type(shearRecords[0]).__name__=='RCShearControlVarsRecord')
+    ok= ok and (shearRecords[1].elementTag==2) and (shearRecords[1].combName=='ULS03') and (shearRecords[1].Vy==4e3)
+    ok= ok and (type(shearRecords[0])==type(shearRecords[1]))
+    crackRecord= records['ULS_shearResistanceSect2'][1]
+    ok= ok and (crackRecord.elementTag==2) and (crackRecord.idSection=='s2')
+    ok= ok and (type(crackRecord.crackControlBaseVarsNeg).__name__=='CrackControlBaseVarsRecord')
+    ok= ok and (crackRecord.crackControlBaseVarsNeg.combName=='SLS02') and (crackRecord.crackControlBaseVarsNeg.steelStress==250e6)
+
+# The legacy strings are parsed, not evaluated.
+try:
+    cv.parseStrConstructor("__import__('os').getcwd()")
+    ok= False
+except ValueError:
+    pass
+
+os.remove(typedFileName)
+os.remove(legacyFileName)
+
+'''
+print(ok)
+'''
+
+fname= os.path.basename(__file__)
+if(ok):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
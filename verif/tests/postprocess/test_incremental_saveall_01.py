@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+''' Check that LimitStateData.saveAll with incremental= True solves
+    only the combinations that have changed since the previous run and
+    that the results are the same that those obtained solving all of
+    them.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022, LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import json
+import xc
+from model import predefined_spaces
+from materials import typical_materials
+from actions import combinations as combs
+from postprocess import limit_state_data as lsd
+from postprocess.config import default_config
+from misc_utils import log_messages as lmsg
+
+L= 1.0 # Length of the cantilever.
+F= 1e3 # Force magnitude.
+M= 1e3 # Moment magnitude.
+
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+
+# Problem geometry
+n0= nodes.newNodeXYZ(0.0,0.0,0.0)
+n1= nodes.newNodeXYZ(L,0.0,0.0)
+
+# Geometric transformation and material.
+lin= modelSpace.newLinearCrdTransf("lin", xc.Vector([0,-1,0]))
+scc= typical_materials.defElasticSection3d(preprocessor=preprocessor, name= "scc", A= 0.125, E= 30e9, G= 12.5e9, Iz= 2.6e-3, Iy= 6.5e-4, J= 1.8e-3)
+
+# Elements definition
+elements= preprocessor.getElementHandler
+elements.defaultTransformation= lin.name
+elements.defaultMaterial= scc.name
+beam3d= elements.newElement("ElasticBeam3d",xc.ID([n0.tag,n1.tag]))
+
+# Constraints
+modelSpace.fixNode000_000(n0.tag)
+
+# Loads definition
+lp0= modelSpace.newLoadPattern(name= 'lp0')
+lp0.newNodalLoad(n1.tag,xc.Vector([0,0,F,0,-M,0]))
+lp1= modelSpace.newLoadPattern(name= 'lp1')
+lp1.newNodalLoad(n1.tag,xc.Vector([0,F,0,0,0,-M]))
+pl= lp1.newElementalLoad("beam3d_point_load")
+pl.elementTags= xc.ID([beam3d.tag])
+pl.transZComponent= F
+pl.x= 0.5
+lp2= modelSpace.newLoadPattern(name= 'lp2')
+lp2.newNodalLoad(n1.tag,xc.Vector([F,0,0,M,0,0]))
+
+# Load combinations
+combContainer= combs.CombContainer()
+combContainer.ULS.perm.add('ULS01', '1.35*lp0+1.5*lp1')
+combContainer.ULS.perm.add('ULS02', '1.35*lp0+1.5*lp1+0.9*lp2')
+combContainer.ULS.perm.add('ULS03', '1.00*lp0 + 1.5*lp2')
+combContainer.ULS.perm.add('ULS04', '0.8*lp2')
+combContainer.ULS.perm.add('ULS05', '1.35*lp0+1.35*lp1+1.35*lp2')
+
+totalSet= preprocessor.getSets.getSet('total')
+cfg= default_config.get_temporary_env_config()
+lsd.LimitStateData.envConfig= cfg
+limitState= lsd.normalStressesResistance
+fixedNodes= modelSpace.defSet('fixedNodes', nodes= [n0])
+
+def readResults(ls):
+    ''' Read the results written by saveAll.'''
+    with open(ls.getInternalForcesFileName()) as f:
+        intForces= json.load(f)
+    with open(ls.getReactionsFileName()) as f:
+        reactions= json.load(f)
+    with open(ls.getDisplacementsFileName()) as f:
+        displacements= sorted(f.readlines())
+    return intForces, reactions, displacements
+
+# First run: all the combinations are computed.
+limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes, numProcesses= 1, incremental= True)
+statistics1= limitState.changeStatistics
+refResults= readResults(limitState)
+# Nothing changed: all the combinations are reused.
+limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes, numProcesses= 1, incremental= True)
+statistics2= limitState.changeStatistics
+results2= readResults(limitState)
+ok1= (statistics1=={'computed': 5, 'reused': 0}) and (statistics2=={'computed': 0, 'reused': 5}) and (results2==refResults)
+
+# Modify the loads of lp2: only ULS01 can be reused.
+lp2.newNodalLoad(n1.tag,xc.Vector([0,F,0,0,0,0]))
+limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes, numProcesses= 1, incremental= True)
+statistics3= limitState.changeStatistics
+results3= readResults(limitState)
+limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes, numProcesses= 1)
+refResults3= readResults(limitState)
+ok2= (statistics3=={'computed': 4, 'reused': 1}) and (results3==refResults3) and (results3!=refResults)
+# The stashed results of the previous run have been removed.
+ok3= not any([os.path.exists(fName) for fName in limitState.getStashedResultsFileNames()])
+
+# Move the point load of lp1: ULS03 and ULS04 can be reused.
+pl.x= 0.25
+limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes, numProcesses= 1, incremental= True)
+statistics4= limitState.changeStatistics
+# Modify the section of an element: nothing can be reused.
+beam3d.sectionProperties.E= 0.5*beam3d.sectionProperties.E
+limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes, numProcesses= 1, incremental= True)
+statistics5= limitState.changeStatistics
+ok4= (statistics4=={'computed': 3, 'reused': 2}) and (statistics5=={'computed': 5, 'reused': 0})
+
+'''
+print(statistics1, statistics2, statistics3, statistics4, statistics5)
+print(ok1, ok2, ok3, ok4)
+'''
+
+cfg.cleandirs() # Clean after yourself.
+fname= os.path.basename(__file__)
+if(ok1 and ok2 and ok3 and ok4):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
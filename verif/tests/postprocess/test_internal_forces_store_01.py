@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+''' Check that the internal forces read from a columnar store are the same
+    that those read from the equivalent JSON file.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022, LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import json
+import shutil
+import tempfile
+from postprocess import limit_state_data as lsd
+from postprocess import internal_forces_store as ifs
+from misc_utils import log_messages as lmsg
+
+# Internal forces dictionary (same format as the one written by
+# LimitStateData.saveAll).
+combNames= ['ULS01', 'ULS02', 'ULS03']
+internalForcesDict= dict()
+for i, comb in enumerate(combNames):
+    combDict= dict()
+    f= float(i+1)
+    # Beam element with two sections.
+    combDict[1]= {'type': 'XC::ElasticBeam3d', 'internalForces': {0: {'N': -1e3*f, 'Vy': 2e3*f, 'Vz': 3e3*f, 'T': 4e2*f, 'My': 5e3*f, 'Mz': 6e3*f}, 1: {'N': -1e3*f, 'Vy': 2e3*f, 'Vz': 3e3*f, 'T': 4e2*f, 'My': -5e3*f, 'Mz': -6e3*f, 'chiLT': 0.9, 'chiN': 0.8}}}
+    # Shell element with one section.
+    combDict[2]= {'type': 'XC::ShellMITC4', 'internalForces': {0: {'N': 7e3*f, 'Vy': 0.0, 'Vz': 1e2*f, 'T': 0.0, 'My': 8e3*f, 'Mz': -9e3*f}}}
+    internalForcesDict[comb]= combDict
+
+tmpDir= tempfile.mkdtemp()
+jsonFileName= os.path.join(tmpDir, 'intForce_test.json')
+with open(jsonFileName, 'w') as outfile:
+    json.dump(internalForcesDict, outfile)
+storeName= os.path.join(tmpDir, 'intForce_test'+ifs.storeSuffix)
+ifs.writeInternalForcesStore(storeName, internalForcesDict)
+
+# Read both files.
+jsonTags, jsonCombs, jsonValues= lsd.readIntForcesFile(jsonFileName)
+storeTags, storeCombs, storeValues= lsd.readIntForcesFile(storeName)
+
+def compareInternalForces(valuesA, valuesB):
+    ''' Return the maximum difference between the internal forces.'''
+    retval= 0.0
+    for tag in valuesA:
+        a= valuesA[tag]
+        b= valuesB[tag]
+        if(len(a)!=len(b)):
+            return 1e6
+        for ifA, ifB in zip(a, b):
+            if(ifA.idComb!=ifB.idComb):
+                return 1e6
+            if(getattr(ifA, 'chiLT', None)!=getattr(ifB, 'chiLT', None)):
+                return 1e6
+            for vA, vB in zip(ifA.getComponents(), ifB.getComponents()):
+                retval= max(retval, abs(vA-vB))
+    return retval
+
+err= compareInternalForces(jsonValues, storeValues)
+
+# Lazy reading of a subset.
+store= ifs.InternalForcesStore(storeName)
+subset= store.getInternalForcesDict(combNames= ['ULS02'], elementTags= [2])
+MzSubset= subset['ULS02'][2]['internalForces'][0]['Mz']
+errSubset= abs(MzSubset-internalForcesDict['ULS02'][2]['internalForces'][0]['Mz'])
+
+# Export to JSON (backward compatibility).
+exportedFileName= os.path.join(tmpDir, 'intForce_exported.json')
+store.exportToJSON(exportedFileName)
+with open(exportedFileName) as json_data:
+    exported= json.load(json_data)
+with open(jsonFileName) as json_data:
+    original= json.load(json_data)
+exportOK= (exported==original)
+
+shutil.rmtree(tmpDir)
+
+'''
+print(err)
+print(errSubset)
+print(exportOK)
+'''
+
+fname= os.path.basename(__file__)
+if((jsonTags==storeTags) and (jsonCombs==storeCombs) and (err<1e-9) and (errSubset<1e-9) and exportOK):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+''' Check that the results obtained solving the combinations in several
+    worker processes (LimitStateData.saveAll with numProcesses> 1) are
+    the same that those obtained solving them serially.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022, LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import json
+import xc
+from model import predefined_spaces
+from materials import typical_materials
+from actions import combinations as combs
+from postprocess import limit_state_data as lsd
+from postprocess.config import default_config
+from misc_utils import log_messages as lmsg
+
+L= 4.0 # Span of the beam.
+F= 1e3 # Force magnitude.
+M= 1e3 # Moment magnitude.
+
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+modelSpace= predefined_spaces.StructuralMechanics2D(nodes)
+
+# Problem geometry (simply supported beam).
+n0= nodes.newNodeXY(0.0,0.0)
+n1= nodes.newNodeXY(L/2.0,0.0)
+n2= nodes.newNodeXY(L,0.0)
+
+# Geometric transformation and material.
+lin= modelSpace.newLinearCrdTransf("lin")
+scc= typical_materials.defElasticSection2d(preprocessor, "scc", A= 0.125, E= 30e9, I= 2.6e-3)
+
+# Elements definition
+elements= preprocessor.getElementHandler
+elements.defaultTransformation= lin.name
+elements.defaultMaterial= scc.name
+beamA= elements.newElement("ElasticBeam2d",xc.ID([n0.tag,n1.tag]))
+beamB= elements.newElement("ElasticBeam2d",xc.ID([n1.tag,n2.tag]))
+
+# Constraints
+modelSpace.fixNode00F(n0.tag)
+modelSpace.fixNodeF0F(n2.tag)
+
+# Loads definition
+lp0= modelSpace.newLoadPattern(name= 'lp0')
+lp0.newNodalLoad(n1.tag,xc.Vector([0,-F,0]))
+lp1= modelSpace.newLoadPattern(name= 'lp1')
+lp1.newNodalLoad(n1.tag,xc.Vector([F,0,M]))
+lp2= modelSpace.newLoadPattern(name= 'lp2')
+lp2.newNodalLoad(n2.tag,xc.Vector([-F,0,-M]))
+
+# Load combinations
+combContainer= combs.CombContainer()
+combContainer.ULS.perm.add('ULS01', '1.35*lp0+1.5*lp1')
+combContainer.ULS.perm.add('ULS02', '1.35*lp0+1.5*lp1+0.9*lp2')
+combContainer.ULS.perm.add('ULS03', '1.00*lp0 + 1.5*lp2')
+combContainer.ULS.perm.add('ULS04', '0.8*lp2')
+combContainer.ULS.perm.add('ULS05', '1.35*lp0+1.35*lp1+1.35*lp2')
+
+totalSet= preprocessor.getSets.getSet('total')
+cfg= default_config.get_temporary_env_config()
+lsd.LimitStateData.envConfig= cfg
+limitState= lsd.normalStressesResistance
+fixedNodes= modelSpace.defSet('fixedNodes', nodes= [n0, n2])
+
+def readResults(ls):
+    ''' Read the results written by saveAll.'''
+    with open(ls.getInternalForcesFileName()) as f:
+        intForces= json.load(f)
+    with open(ls.getReactionsFileName()) as f:
+        reactions= json.load(f)
+    with open(ls.getDisplacementsFileName()) as f:
+        displacements= f.read()
+    return intForces, reactions, displacements
+
+# Solve the combinations serially.
+limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes, numProcesses= 1)
+refResults= readResults(limitState)
+# Solve the combinations using two worker processes.
+result= limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes, numProcesses= 2)
+results= readResults(limitState)
+# Check that the partial results have been removed.
+partialFilesRemoved= True
+for workerId in range(0,2):
+    for fName in limitState.getPartialResultsFileNames(workerId):
+        partialFilesRemoved= partialFilesRemoved and not os.path.exists(fName)
+
+# The default number of processes is read from the XC_NUM_PROCESSES
+# environment variable (saveAll and section level checking).
+os.environ['XC_NUM_PROCESSES']= '2'
+result2= limitState.saveAll(combContainer, totalSet, constrainedNodeSet= fixedNodes.nodes)
+results2= readResults(limitState)
+envOk= (result2==0) and (results2==refResults) and (lsd.VerifOutVars(sectionSolver= True).numProcesses==2)
+del os.environ['XC_NUM_PROCESSES']
+envOk= envOk and (lsd.VerifOutVars(sectionSolver= True).numProcesses==1)
+
+'''
+print(refResults[0])
+print(results[0])
+print(result)
+print(envOk)
+'''
+
+cfg.cleandirs() # Clean after yourself.
+fname= os.path.basename(__file__)
+if((len(results[0])==5) and (results==refResults) and (result==0) and partialFilesRemoved and envOk):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
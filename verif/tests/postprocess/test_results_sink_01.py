@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+''' Check that the results written by ResultsSink after resuming an
+    interrupted computation are the same that those obtained without
+    interruption.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022, LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import json
+import shutil
+import tempfile
+from postprocess import results_sink as rs
+from postprocess import internal_forces_store as ifs
+from misc_utils import log_messages as lmsg
+
+combNames= ['ULS%02d' % i for i in range(0, 7)]
+
+def getResults(combName):
+    ''' Return fake results for the given combination.'''
+    f= float(combNames.index(combName)+1)
+    internalForces= {combName: {1: {'type': 'XC::ElasticBeam3d', 'internalForces': {0: {'N': -1e3*f, 'Vy': 2e3*f, 'Vz': 0.0, 'T': 0.0, 'My': 5e3*f, 'Mz': 6e3*f}, 1: {'N': -1e3*f, 'Vy': 2e3*f, 'Vz': 0.0, 'T': 0.0, 'My': -5e3*f, 'Mz': -6e3*f}}}}}
+    reactions= {combName: {'forces': {'1': [f, 2*f, 3*f]}, 'moments': {'1': [0.0, 0.0, f]}}}
+    displacementLines= [combName+', 2, '+str(1e-3*f)+', 0.0, 0.0\n']
+    return internalForces, reactions, displacementLines
+
+def writeResults(folder, columnarStorage, interruptAt= None, resume= False):
+    ''' Write the results using a ResultsSink object.'''
+    suffix= '.json'
+    if(columnarStorage):
+        suffix= ifs.storeSuffix
+    fNameIntForc= os.path.join(folder, 'intForce'+suffix)
+    fNameReactions= os.path.join(folder, 'reactions.json')
+    fNameDispl= os.path.join(folder, 'displ.csv')
+    sink= rs.ResultsSink(fNameIntForc= fNameIntForc, fNameReactions= fNameReactions, fNameDispl= fNameDispl, checkpointFileName= os.path.join(folder, 'checkpoint.json'), checkpointInterval= 2, columnarStorage= columnarStorage)
+    checkpoint= None
+    if(resume):
+        checkpoint= sink.readCheckpoint(combNames)
+    if(not checkpoint):
+        with open(fNameDispl, 'w') as f:
+            f.write('Comb., Node, uX, uY, uZ\n')
+    written= sink.open(combNames, checkpoint)
+    computed= list()
+    for combName in combNames:
+        if(combName in written):
+            continue
+        if(combName==interruptAt): # The program "dies" here.
+            sink.internalForcesWriter.flush()
+            sink.reactionsWriter.flush()
+            sink.displacementsFile.flush()
+            return computed
+        internalForces, reactions, displacementLines= getResults(combName)
+        sink.writeCombination(combName, internalForces, reactions, displacementLines)
+        computed.append(combName)
+    sink.close()
+    return computed
+
+def readResults(folder, columnarStorage):
+    ''' Read the results.'''
+    if(columnarStorage):
+        store= ifs.InternalForcesStore(os.path.join(folder, 'intForce'+ifs.storeSuffix))
+        internalForces= store.getInternalForcesDict(stringKeys= True)
+    else:
+        with open(os.path.join(folder, 'intForce.json')) as f:
+            internalForces= json.load(f)
+    with open(os.path.join(folder, 'reactions.json')) as f:
+        reactions= json.load(f)
+    with open(os.path.join(folder, 'displ.csv')) as f:
+        displacements= f.read()
+    return internalForces, reactions, displacements
+
+ok= True
+for columnarStorage in [False, True]:
+    refFolder= tempfile.mkdtemp()
+    writeResults(refFolder, columnarStorage)
+    refResults= readResults(refFolder, columnarStorage)
+    folder= tempfile.mkdtemp()
+    firstRun= writeResults(folder, columnarStorage, interruptAt= 'ULS05')
+    checkpointExists= os.path.exists(os.path.join(folder, 'checkpoint.json'))
+    secondRun= writeResults(folder, columnarStorage, resume= True)
+    results= readResults(folder, columnarStorage)
+    checkpointRemoved= not os.path.exists(os.path.join(folder, 'checkpoint.json'))
+    # The last combination written in the first run (ULS04) is after the
+    # last checkpoint so it must be computed again.
+    ok= ok and (firstRun==combNames[:5]) and (secondRun==combNames[4:])
+    ok= ok and checkpointExists and checkpointRemoved
+    ok= ok and (results==refResults)
+    shutil.rmtree(refFolder)
+    shutil.rmtree(folder)
+
+'''
+print(ok)
+'''
+
+fname= os.path.basename(__file__)
+if(ok):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+''' Check that the results obtained when each combination starts from
+    the converged state of the nearest one (LimitStateData.saveAll with
+    warmStart= True) are the same that those obtained starting from the
+    initial state, and that the number of iterations doesn't increase.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT)"
+__copyright__= "Copyright 2022, LCPT"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com"
+
+import os
+import json
+import xc
+from model import predefined_spaces
+from materials import typical_materials
+from actions import combinations as combs
+from postprocess import limit_state_data as lsd
+from postprocess.config import default_config
+from solution import predefined_solutions
+from misc_utils import log_messages as lmsg
+
+H= 6.0 # Column height.
+numDiv= 6 # Number of elements.
+
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+
+# Problem geometry
+columnNodes= [nodes.newNodeXYZ(0.0,0.0,H*i/numDiv) for i in range(0,numDiv+1)]
+
+# Geometric transformation (geometric non-linearity).
+corot= modelSpace.newCorotCrdTransf("corot", xc.Vector([1,0,0]))
+
+# Materials definition
+scc= typical_materials.defElasticSection3d(preprocessor=preprocessor, name= "scc", A= 5.38e-3, E= 210e9, G= 81e9, Iz= 8.36e-5, Iy= 6.04e-6, J= 2.0e-7)
+
+# Elements definition
+elements= preprocessor.getElementHandler
+elements.defaultMaterial= scc.name
+elements.defaultTransformation= corot.name
+for n0, n1 in zip(columnNodes[:-1], columnNodes[1:]):
+    elements.newElement("ElasticBeam3d",xc.ID([n0.tag,n1.tag]))
+
+# Constraints
+modelSpace.fixNode000_000(columnNodes[0].tag)
+
+# Loads definition (the load factors grow with the pseudo-time, so they
+# must not accumulate when a combination starts from the previous one).
+modelSpace.newTimeSeries(name= 'ts', tsType= 'linear_ts')
+topNode= columnNodes[-1]
+G= modelSpace.newLoadPattern(name= 'G')
+G.newNodalLoad(topNode.tag,xc.Vector([0,0,-100e3,0,0,0]))
+Q= modelSpace.newLoadPattern(name= 'Q')
+Q.newNodalLoad(topNode.tag,xc.Vector([0,0,-80e3,0,0,0]))
+W= modelSpace.newLoadPattern(name= 'W')
+W.newNodalLoad(topNode.tag,xc.Vector([0,4e3,0,0,0,0]))
+
+# Load combinations (differing only in the wind load factor).
+combContainer= combs.CombContainer()
+for i, windFactor in enumerate([0.0, 0.9, 0.3, 1.5, 0.6, 1.2]):
+    combContainer.ULS.perm.add('ULS0'+str(i), '1.35*G+1.5*Q+'+str(windFactor)+'*W')
+combContainer.ULS.perm.add('ULS06', '1.0*G+1.5*W')
+
+totalSet= preprocessor.getSets.getSet('total')
+cfg= default_config.get_temporary_env_config()
+lsd.LimitStateData.envConfig= cfg
+limitState= lsd.normalStressesResistance
+fixedNodes= modelSpace.defSet('fixedNodes', nodes= [columnNodes[0]])
+
+def readInternalForces(ls):
+    ''' Read the internal forces written by saveAll.'''
+    with open(ls.getInternalForcesFileName()) as f:
+        retval= json.load(f)
+    return retval
+
+def getMaxDifference(a, b):
+    ''' Return the maximum difference between the numbers of the
+        dictionaries arguments.'''
+    retval= 0.0
+    if(isinstance(a, dict)):
+        if(set(a.keys())!=set(b.keys())):
+            retval= float('inf')
+        else:
+            for key in a:
+                retval= max(retval, getMaxDifference(a[key], b[key]))
+    elif(isinstance(a, float)):
+        retval= abs(a-b)
+    return retval
+
+# Solve each combination from the initial state.
+limitState.saveAll(combContainer, totalSet, solutionProcedureType= predefined_solutions.PenaltyNewtonRaphson, constrainedNodeSet= fixedNodes.nodes, numProcesses= 1)
+refInternalForces= readInternalForces(limitState)
+refIterations= limitState.getTotalIterations()
+# Solve each combination starting from the nearest one.
+limitState.saveAll(combContainer, totalSet, solutionProcedureType= predefined_solutions.PenaltyNewtonRaphson, constrainedNodeSet= fixedNodes.nodes, numProcesses= 1, warmStart= True)
+internalForces= readInternalForces(limitState)
+iterations= limitState.getTotalIterations()
+numWarmStarts= len([value for value in limitState.solutionStatistics.values() if value['warmStart']])
+err= getMaxDifference(refInternalForces, internalForces)
+# The statistics of the worker processes are merged.
+limitState.saveAll(combContainer, totalSet, solutionProcedureType= predefined_solutions.PenaltyNewtonRaphson, constrainedNodeSet= fixedNodes.nodes, numProcesses= 2, warmStart= True)
+parallelInternalForces= readInternalForces(limitState)
+numParallelWarmStarts= len([value for value in limitState.solutionStatistics.values() if value['warmStart']])
+parallelStatisticsOk= (len(limitState.solutionStatistics)==7) and (numParallelWarmStarts>0) and (limitState.getTotalIterations()>0)
+err= max(err, getMaxDifference(refInternalForces, parallelInternalForces))
+
+'''
+print(limitState.solutionStatistics)
+print(refIterations, iterations, numWarmStarts, numParallelWarmStarts)
+print(err)
+'''
+
+cfg.cleandirs() # Clean after yourself.
+fname= os.path.basename(__file__)
+if((len(internalForces)==7) and (err<1e-3) and (iterations<refIterations) and (numWarmStarts==6) and parallelStatisticsOk):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
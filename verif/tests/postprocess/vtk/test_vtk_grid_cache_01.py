@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+''' Check that the VTK grid topology of a set is computed once and reused
+    by the following figures, and that the points of the grid follow the
+    displacements of the nodes.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import geom
+import xc
+from model import predefined_spaces
+from model.sets import spatial_index
+from materials import typical_materials
+from postprocess.xcVtk.FE_model import vtk_grid_cache
+
+# Problem type
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+
+# Materials definition
+plateSection= typical_materials.defElasticMembranePlateSection(preprocessor, "plateSection",E= 30e9,nu= 0.2,rho= 2500,h= 0.25)
+
+# Mesh.
+points= preprocessor.getMultiBlockTopology.getPoints
+pt1= points.newPoint(geom.Pos3d(0,0,0))
+pt2= points.newPoint(geom.Pos3d(4,0,0))
+pt3= points.newPoint(geom.Pos3d(4,3,0))
+pt4= points.newPoint(geom.Pos3d(0,3,0))
+surfaces= preprocessor.getMultiBlockTopology.getSurfaces
+s= surfaces.newQuadSurfacePts(pt1.tag,pt2.tag,pt3.tag,pt4.tag)
+s.nDivI= 4
+s.nDivJ= 3
+seedElemHandler= preprocessor.getElementHandler.seedElemHandler
+seedElemHandler.defaultMaterial= plateSection.name
+elem= seedElemHandler.newElement("ShellMITC4",xc.ID([0,0,0,0]))
+s.genMesh(xc.meshDir.I)
+
+# Constraints
+for p in [pt1, pt2, pt3, pt4]:
+    modelSpace.fixNode000_FFF(p.getNode().tag)
+
+# Load.
+xcTotalSet= modelSpace.getTotalSet()
+lp0= modelSpace.newLoadPattern(name= '0')
+centerNode= xcTotalSet.nodes.getNearestNode(geom.Pos3d(2,1.5,0))
+lp0.newNodalLoad(centerNode.tag, xc.Vector([0,0,-100e3,0,0,0]))
+modelSpace.addLoadCaseToDomain(lp0.name)
+result= modelSpace.analyze(calculateNodalReactions= False)
+
+topology= vtk_grid_cache.get_grid_topology(xcTotalSet)
+cells= topology.cells
+# Second figure: the topology is reused.
+topology2= vtk_grid_cache.get_grid_topology(xcTotalSet)
+ok1= (topology2 is topology) and (topology2.cells is cells)
+
+# Grids for the undeformed and the deformed shape.
+defFScale= 10.0
+grid0= topology.getGrid(topology.getPoints())
+grid1= topology.getGrid(topology.getPoints(defFScale= defFScale))
+ok2= (grid0.GetNumberOfCells()==12) and (grid1.GetNumberOfCells()==12) and (grid0.GetNumberOfPoints()==20)
+err= 0.0
+for n in xcTotalSet.nodes:
+    p0= n.getInitialPos3d
+    p1= n.getCurrentPos3d(defFScale)
+    v0= grid0.GetPoint(n.getIdx)
+    v1= grid1.GetPoint(n.getIdx)
+    err+= (v0[0]-p0.x)**2+(v0[1]-p0.y)**2+(v0[2]-p0.z)**2
+    err+= (v1[0]-p1.x)**2+(v1[1]-p1.y)**2+(v1[2]-p1.z)**2
+centerDisp= grid1.GetPoint(centerNode.getIdx)[2]-grid0.GetPoint(centerNode.getIdx)[2]
+
+# Move a node and notify the change: the topology is computed again.
+centerNode.setPos(geom.Pos3d(2,1.5,0.1))
+spatial_index.notify_geometry_change()
+topology3= vtk_grid_cache.get_grid_topology(xcTotalSet)
+grid3= topology3.getGrid(topology3.getPoints())
+ok3= (topology3.cells is not cells) and (abs(grid3.GetPoint(centerNode.getIdx)[2]-0.1)<1e-12)
+
+'''
+print(ok1, ok2, ok3)
+print('err= ', err)
+print('centerDisp= ', centerDisp)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if((result==0) and ok1 and ok2 and ok3 and (err<1e-12) and (centerDisp<0.0)):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+''' Check that the merging of close points used by the DXF and FreeCAD
+    readers gives the same k-points that the point by point search.'''
+
+from __future__ import division
+from __future__ import print_function
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import os
+import numpy as np
+from scipy.spatial.distance import cdist
+from import_export import reader_base
+
+def weldPointsByPoint(coordinates, threshold):
+    ''' Point by point search of the k-points (reference results).'''
+    kPoints= [coordinates[0]]
+    kPointIndexes= [0]
+    pointKPointIndexes= [0]
+    for i, p in enumerate(coordinates[1:], 1):
+        indexNearestPoint= int(cdist([p], kPoints).argmin())
+        dist= cdist([p],[kPoints[indexNearestPoint]])[0][0]
+        if(dist>threshold): # new point.
+            indexNearestPoint= len(kPoints)
+            kPoints.append(p)
+            kPointIndexes.append(i)
+        pointKPointIndexes.append(indexNearestPoint)
+    return kPointIndexes, pointKPointIndexes
+
+# Points on a grid plus some points slightly displaced.
+points= list()
+for i in range(0,20):
+    for j in range(0,20):
+        points.append([0.5*i, 0.5*j, 0.0])
+points.extend([[p[0]+0.004, p[1]-0.003, p[2]] for p in points[::7]])
+raisedPoints= [[p[0], p[1], p[2]+0.2] for p in points[:400:11]]
+points.extend(raisedPoints)
+coordinates= np.array(points)
+
+ok= True
+for threshold in [0.0, 0.01, 0.3]:
+    result= reader_base.weldPoints(coordinates, threshold)
+    refResult= weldPointsByPoint(coordinates, threshold)
+    ok= ok and (result[0]==refResult[0]) and (result[1]==refResult[1])
+numKPoints= len(reader_base.weldPoints(coordinates, 0.01)[0])
+
+'''
+print(numKPoints)
+print(ok)
+'''
+
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(ok and (numKPoints==400+len(raisedPoints))):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
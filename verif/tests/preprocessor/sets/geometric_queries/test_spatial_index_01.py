@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+'''Check the node and element queries made through the spatial index of
+   a set against the node by node computation.'''
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import geom
+import xc
+from model import predefined_spaces
+from model.sets import sets_mng
+from model.sets import spatial_index
+from materials import typical_materials
+
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+modelSpace= predefined_spaces.SolidMechanics2D(nodes)
+
+# Problem geometry.
+pt0= modelSpace.newKPoint(0.0,0.0,0.0)
+pt1= modelSpace.newKPoint(2.0,0.0,0.0)
+pt2= modelSpace.newKPoint(2.0,1.0,0.0)
+pt3= modelSpace.newKPoint(0.0,1.0,0.0)
+s= modelSpace.newQuadSurface(pt0,pt1,pt2, pt3)
+
+# Material.
+elast2d= typical_materials.defElasticIsotropicPlaneStress(preprocessor, "elast2d",E= 1.0, nu= 0.3, rho= 0.0)
+
+# Mesh generation.
+seedElemHandler= preprocessor.getElementHandler.seedElemHandler
+seedElemHandler.defaultMaterial= elast2d.name
+elem= seedElemHandler.newElement("FourNodeQuad",xc.ID([0,0,0,0]))
+s.setElemSizeIJ(0.1, 0.1)
+s.genMesh(xc.meshDir.I)
+
+totalSet= modelSpace.getTotalSet()
+
+# Nodes on the plane x= 0.5
+nodesInPlane= sets_mng.get_set_nodes_plane_YZ('nodesInPlane', totalSet, xCoord= 0.5)
+refTags= [n.tag for n in totalSet.nodes if abs(n.getInitialPos3d.x-0.5)<=1e-4]
+ok1= (refTags==[n.tag for n in nodesInPlane.nodes]) and (len(refTags)==11)
+
+# Nodes on a wire.
+wire= [geom.Pos3d(0.0,0.0,0.0), geom.Pos3d(1.0,1.0,0.0), geom.Pos3d(2.0,1.0,0.0)]
+nodesOnWire= sets_mng.get_nodes_pos3D_wire(totalSet, wire, tol= 0.01)
+refTags= list()
+for p0, p1 in zip(wire[:-1], wire[1:]):
+    segment= geom.Segment3d(p0, p1)
+    for n in totalSet.nodes:
+        if((n.getInitialPos3d.dist(segment)<0.01) and (n.tag not in refTags)):
+            refTags.append(n.tag)
+ok2= (refTags==[n.tag for n in nodesOnWire]) and (len(refTags)==21)
+
+# Elements inside a prism.
+prismBase= geom.Polygon2d([geom.Pos2d(0.5,0.5), geom.Pos2d(1.5,0.5), geom.Pos2d(1.5,1.0), geom.Pos2d(0.5,1.0)])
+elementsInPrism= sets_mng.set_included_in_orthoPrism(preprocessor, totalSet, prismBase, 'Z', 'elementsInPrism')
+refTags= [e.tag for e in totalSet.elements if prismBase.In(geom.Pos2d(e.getPosCentroid(True).x,e.getPosCentroid(True).y),0)]
+ok3= (refTags==[e.tag for e in elementsInPrism.elements]) and (len(refTags)==50)
+
+# Nearest node.
+querySet= modelSpace.defSet('querySet')
+for n in totalSet.nodes:
+    querySet.nodes.append(n)
+index= spatial_index.get_spatial_index(querySet)
+nearestNode= index.getNearestNode(geom.Pos3d(1.02,0.47,0.0))
+nearestPos= nearestNode.getInitialPos3d
+ok4= (nearestPos.dist(geom.Pos3d(1.0,0.5,0.0))<1e-6)
+
+# Add a new node to the set and check that the index is updated.
+newNode= nodes.newNodeXY(5.0,5.0)
+querySet.nodes.append(newNode)
+nearestNode= index.getNearestNode(geom.Pos3d(4.9,5.1,0.0))
+ok5= (nearestNode.tag==newNode.tag)
+
+# Move the new node and check that the index is updated.
+newNode.setPos(geom.Pos3d(-5.0,-5.0,0.0))
+spatial_index.notify_geometry_change()
+nearestNode= index.getNearestNode(geom.Pos3d(-4.9,-5.1,0.0))
+ok6= (nearestNode.tag==newNode.tag)
+
+# Replace the nodes of the set by the same number of other nodes.
+otherNode= nodes.newNodeXY(9.0,9.0)
+querySet.nodes.clear()
+for n in totalSet.nodes:
+    if(n.tag not in [newNode.tag, otherNode.tag]):
+        querySet.nodes.append(n)
+querySet.nodes.append(otherNode)
+spatial_index.notify_geometry_change()
+nearestNode= index.getNearestNode(geom.Pos3d(-4.9,-5.1,0.0))
+ok7= (nearestNode.tag!=newNode.tag) and (index.getNearestNode(geom.Pos3d(8.9,9.1,0.0)).tag==otherNode.tag)
+
+'''
+print(ok1, ok2, ok3, ok4, ok5, ok6, ok7)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(ok1 and ok2 and ok3 and ok4 and ok5 and ok6 and ok7):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
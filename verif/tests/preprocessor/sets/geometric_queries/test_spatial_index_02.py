@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+'''Check that the regression plane stored in the spatial index of a set
+   is computed again after moving its nodes and notifying the change.'''
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@ciccp.es ana.ortega@ciccp.es"
+
+import geom
+import xc
+from model import predefined_spaces
+from model.sets import spatial_index
+
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+
+# Deck nodes.
+deckSet= modelSpace.defSet('deckSet')
+for i in range(5):
+    for j in range(4):
+        deckSet.nodes.append(nodes.newNodeXYZ(float(i), float(j), 0.0))
+index= spatial_index.get_spatial_index(deckSet)
+deckMidplane0= index.getNodesRegressionPlane()
+
+# Raise the deck: the stored plane is reused until the change is notified.
+for n in deckSet.nodes:
+    n.setPos(n.getInitialPos3d+geom.Vector3d(0,0,1.0))
+deckMidplane1= index.getNodesRegressionPlane()
+spatial_index.notify_geometry_change()
+deckMidplane2= index.getNodesRegressionPlane()
+
+ok1= (deckMidplane0.dist(geom.Pos3d(0,0,0))<1e-6)
+ok2= (deckMidplane1.dist(geom.Pos3d(0,0,0))<1e-6)
+ok3= (deckMidplane2.dist(geom.Pos3d(0,0,1))<1e-6)
+
+'''
+print(ok1, ok2, ok3)
+'''
+
+import os
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if(ok1 and ok2 and ok3):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+''' Check the response spectrum analysis (CQC combination of the modal
+    responses) using the model of the test_cqc_01.py test (example A87 of
+    Solvia Verification Manual, based on example E26.8 of the book
+    «Dynamics of Structures» by Clough, R. W., and Penzien, J.).'''
+
+from __future__ import print_function
+from __future__ import division
+
+__author__= "Luis C. Pérez Tato (LCPT) and Ana Ortega (AO_O)"
+__copyright__= "Copyright 2022, LCPT and AO_O"
+__license__= "GPL"
+__version__= "3.0"
+__email__= "l.pereztato@gmail.com ana.ortega@ciccp.es"
+
+import os
+import math
+import numpy
+import xc
+from model import predefined_spaces
+from materials import typical_materials
+from actions.quake import response_spectrum_analysis as rsa
+from postprocess import limit_state_data as lsd
+from postprocess.config import default_config
+
+masaExtremo= 1e-2 # Mass in kg.
+nodeMassMatrix= xc.Matrix([[masaExtremo,0,0,0,0,0],
+                           [0,masaExtremo,0,0,0,0],
+                           [0,0,masaExtremo,0,0,0],
+                           [0,0,0,0,0,0],
+                           [0,0,0,0,0,0],
+                           [0,0,0,0,0,0]])
+EMat= 1 # Elastic modulus.
+nuMat= 0 # Poisson's ratio.
+GMat= EMat/(2.0*(1+nuMat)) # Shear modulus.
+
+Iyy= 1 # Flexural inertia on y axis.
+Izz= 1 # Flexural inertia on z axis.
+Ir= 4/3.0 # Torsional inertia.
+area= 1e7 # Section area.
+Lx= 1
+Ly= 1
+Lz= 1
+
+# Problem type
+feProblem= xc.FEProblem()
+preprocessor=  feProblem.getPreprocessor
+nodes= preprocessor.getNodeHandler
+modelSpace= predefined_spaces.StructuralMechanics3D(nodes)
+nod0= nodes.newNodeXYZ(0,0,0)
+nod1= nodes.newNodeXYZ(0,-Ly,0)
+nod2= nodes.newNodeXYZ(0,-Ly,-Lz)
+nod3= nodes.newNodeXYZ(Lx,-Ly,-Lz)
+nod3.mass= nodeMassMatrix
+
+modelSpace.fixNode000_000(nod0.tag)
+
+# Materials definition
+scc= typical_materials.defElasticSection3d(preprocessor, "scc",area,EMat,GMat,Izz,Iyy,Ir)
+
+# Geometric transformation(s)
+linX= modelSpace.newLinearCrdTransf("linX",xc.Vector([1,0,0]))
+linY= modelSpace.newLinearCrdTransf("linY",xc.Vector([0,1,0]))
+
+# Elements definition
+elements= preprocessor.getElementHandler
+elements.defaultTransformation= linX.name
+elements.defaultMaterial= scc.name
+beam01= elements.newElement("ElasticBeam3d",xc.ID([nod0.tag,nod1.tag]))
+beam12= elements.newElement("ElasticBeam3d",xc.ID([nod1.tag,nod2.tag]))
+elements.defaultTransformation= linY.name
+beam23= elements.newElement("ElasticBeam3d",xc.ID([nod2.tag,nod3.tag]))
+
+# Spectral accelerations for each mode (taken from the Solvia manual).
+theorPeriods= numpy.array([2*math.pi/4.59,2*math.pi/4.83,2*math.pi/14.56])
+accelerations= [2.27,2.45,6.98]
+def spectrum(T):
+    ''' Return the spectral acceleration of the mode closer to T.'''
+    return accelerations[numpy.argmin(numpy.abs(theorPeriods-T))]
+
+# Response spectrum analysis.
+responseSpectrumAnalysis= rsa.ResponseSpectrumAnalysis(feProblem, spectra= {0: spectrum}, numModes= 3, dampings= 0.05, systemPrefix= 'full_gen')
+calcSet= modelSpace.defSet('calcSet', nodes= [nod3], elements= [beam01, beam12, beam23])
+fixedNodes= modelSpace.defSet('fixedNodes', nodes= [nod0])
+result= responseSpectrumAnalysis.run(setCalc= calcSet, constrainedNodeSet= fixedNodes.nodes)
+
+# Modal participation factors.
+modalParticipationFactorsXTeor= numpy.array([-.731/1.588,.271/1.075,-1/1.678])
+modalParticipationFactorsX= responseSpectrumAnalysis.participationFactors[:,0]
+ratio1= numpy.linalg.norm(numpy.abs(modalParticipationFactorsX)-numpy.abs(modalParticipationFactorsXTeor))
+
+# CQC coefficients (taken from the Solvia manual).
+crossCQCCoefficientsTeor= numpy.array([[1,0.79280,0.005705],[0.79280,1,0.006383],[0.005705,0.006383,1]])
+crossCQCCoefficients= responseSpectrumAnalysis.getCorrelationCoefficients()
+ratio2= numpy.linalg.norm(crossCQCCoefficients-crossCQCCoefficientsTeor)
+
+# Maximum displacements of the mass (taken from the Solvia manual).
+intForces, displacements, reactions= responseSpectrumAnalysis.getPeakResponses(modalCombination= 'CQC')
+maxDispCQCTeor= numpy.array([46.53e-3,19.18e-3,52.53e-3])
+ratio3= numpy.linalg.norm(displacements[0:3]-maxDispCQCTeor)
+# The SRSS combination overestimates the response of the closely spaced
+# modes 1 and 2 in the Y direction.
+intForcesSRSS, displacementsSRSS, reactionsSRSS= responseSpectrumAnalysis.getPeakResponses(modalCombination= 'SRSS')
+srssOk= (displacementsSRSS[1]>displacements[1])
+
+# The three modes mobilize all the mass of the model.
+totalMassRatio= responseSpectrumAnalysis.getCumulativeEffectiveModalMassRatios()[-1,0]
+ratio4= abs(totalMassRatio-1.0)
+ratio4+= abs(responseSpectrumAnalysis.totalMasses[0]-masaExtremo)/masaExtremo
+
+# 100/30 directional combination rule.
+directionalValues= numpy.array([[1.0,-2.0],[0.5,1.0],[2.0,0.0]])
+ratio5= numpy.linalg.norm(rsa.combine_directions(directionalValues, method= '100/30')-numpy.array([2.45, 2.3]))
+
+# Write the envelopes as the results of a limit state.
+cfg= default_config.get_temporary_env_config()
+lsd.LimitStateData.envConfig= cfg
+limitState= lsd.normalStressesResistance
+combNames= responseSpectrumAnalysis.saveEnvelope(limitState, combName= 'E')
+with open(limitState.getDisplacementsFileName()) as f:
+    displacementLines= [line for line in f.readlines() if line.startswith('E')]
+envelopeOk= (len(combNames)==8) and ('E+N-My+Mz' in combNames) and (len(displacementLines)==8)
+# Signs of the internal forces in one of the permutations.
+envelopes= responseSpectrumAnalysis.getEnvelopeCombinations(combName= 'E')
+components= responseSpectrumAnalysis.modalResults.getInternalForcesComponents()
+signedIntForces= envelopes['E+N-My+Mz'][0]
+for c, peak, value in zip(components, intForces, signedIntForces):
+    expected= -peak if (c=='My') else peak
+    envelopeOk= envelopeOk and (abs(value-expected)<1e-9*max(abs(peak), 1.0))
+# Per value envelope (not suitable for interaction checks).
+envelopes= responseSpectrumAnalysis.getEnvelopeCombinations(combName= 'E', signedComponents= None)
+envelopeOk= envelopeOk and (sorted(envelopes.keys())==['E+', 'E-'])
+
+# Run the analysis again (the modal load patterns are replaced).
+result2= responseSpectrumAnalysis.run(setCalc= calcSet, constrainedNodeSet= fixedNodes.nodes)
+intForces2, displacements2, reactions2= responseSpectrumAnalysis.getPeakResponses(modalCombination= 'CQC')
+rerunOk= (result2==0) and (numpy.linalg.norm(displacements2-displacements)<1e-12)
+
+'''
+print('modal participation factors: ', modalParticipationFactorsX)
+print('ratio1= ', ratio1)
+print('CQC coefficients: ', crossCQCCoefficients)
+print('ratio2= ', ratio2)
+print('maximum displacements (CQC): ', displacements[0:3]*1e3)
+print('maximum displacements (SRSS): ', displacementsSRSS[0:3]*1e3)
+print('ratio3= ', ratio3)
+print('total mass ratio: ', totalMassRatio)
+print('ratio4= ', ratio4)
+print('ratio5= ', ratio5)
+print('envelopes: ', displacementLines)
+print(envelopeOk, rerunOk)
+'''
+
+cfg.cleandirs() # Clean after yourself.
+from misc_utils import log_messages as lmsg
+fname= os.path.basename(__file__)
+if((result==0) and (ratio1<1e-3) and (ratio2<1e-3) and (ratio3<1e-5) and srssOk and (ratio4<1e-9) and (ratio5<1e-12) and envelopeOk and rerunOk):
+    print('test '+fname+': ok.')
+else:
+    lmsg.error(fname+' ERROR.')